@@ -12,9 +12,48 @@ import random
 # Import IT metric calculation functions
 from it_metrics_calculator import *
 
+# Memoize metric calculations across reruns (available when running inside the integrated dashboard)
+try:
+    from metric_cache import cache_calculators
+    cache_calculators(globals())
+except ImportError:
+    pass
+
+# Shared on-disk dataset store (available when running inside the integrated dashboard)
+try:
+    from dataset_store import load_workbook_tables, load_saved_tables
+except ImportError:
+    def load_workbook_tables(department, source, sheet_names=None):
+        return pd.read_excel(source, sheet_name=None)
+    def load_saved_tables(department, tables=None):
+        return {}
+
+# Background streaming export of loaded tables (Excel or zipped Parquet/CSV)
+try:
+    from data_export import show_export_panel
+except ImportError:
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from data_export import show_export_panel
+
+# Server-side reduction of large chart series to a point budget
+try:
+    from chart_reduction import downsample_line, cap_scatter_points
+except ImportError:
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from chart_reduction import downsample_line, cap_scatter_points
+
 # Chart creation functions - Sales App Style
-def create_chart(chart_type, data, **kwargs):
-    """Create charts with sales app styling"""
+def create_chart(chart_type, data, max_points=None, **kwargs):
+    """Create charts with sales app styling; line and scatter data is reduced to the point budget"""
+    
+    if chart_type == "line" and isinstance(kwargs.get('x'), str) and isinstance(kwargs.get('y'), str):
+        data = downsample_line(data, kwargs['x'], kwargs['y'], max_points, group_col=kwargs.get('color'))
+    elif chart_type == "scatter":
+        data = cap_scatter_points(data, max_points)
     
     if chart_type == "bar":
         fig = px.bar(data, **kwargs)
@@ -498,27 +537,24 @@ def create_template_for_download():
     return output
 
 def export_data_to_excel():
-    """Export current data to Excel file"""
+    """Export current data; the file is written in the background and offered for download when ready"""
     if 'servers_data' not in st.session_state or st.session_state.servers_data.empty:
         st.error("No data available to export. Please upload data first.")
         return None
     
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        # Write each dataset to a separate sheet
-        st.session_state.servers_data.to_excel(writer, sheet_name='Servers', index=False)
-        st.session_state.network_devices_data.to_excel(writer, sheet_name='Network_Devices', index=False)
-        st.session_state.applications_data.to_excel(writer, sheet_name='Applications', index=False)
-        st.session_state.incidents_data.to_excel(writer, sheet_name='Incidents', index=False)
-        st.session_state.tickets_data.to_excel(writer, sheet_name='Tickets', index=False)
-        st.session_state.assets_data.to_excel(writer, sheet_name='Assets', index=False)
-        st.session_state.security_events_data.to_excel(writer, sheet_name='Security_Events', index=False)
-        st.session_state.backups_data.to_excel(writer, sheet_name='Backups', index=False)
-        st.session_state.projects_data.to_excel(writer, sheet_name='Projects', index=False)
-        st.session_state.users_data.to_excel(writer, sheet_name='Users', index=False)
-    
-    output.seek(0)
-    return output
+    tables = {
+        'Servers': st.session_state.servers_data,
+        'Network_Devices': st.session_state.network_devices_data,
+        'Applications': st.session_state.applications_data,
+        'Incidents': st.session_state.incidents_data,
+        'Tickets': st.session_state.tickets_data,
+        'Assets': st.session_state.assets_data,
+        'Security_Events': st.session_state.security_events_data,
+        'Backups': st.session_state.backups_data,
+        'Projects': st.session_state.projects_data,
+        'Users': st.session_state.users_data
+    }
+    return show_export_panel(tables, key='it_export', file_prefix='it_analytics_export')
 
 def create_basic_sample_data():
     """Create basic sample data for IT analytics testing"""
@@ -1720,10 +1756,19 @@ def show_data_input():
             "Assets", "Security_Events", "Backups", "Projects", "Users"
         ]
     
-        if uploaded_file is not None:
+        # Fall back to the last workbook saved in the dataset store
+        excel_data = None
+        if uploaded_file is None and st.button("📂 Load Last Uploaded Dataset", key="load_saved_it_dataset", use_container_width=True):
+            excel_data = load_saved_tables('it', required_sheets)
+            if len(excel_data) < len(required_sheets):
+                st.warning("⚠️ No saved dataset found. Please upload an Excel file first.")
+                excel_data = None
+    
+        if uploaded_file is not None or excel_data is not None:
             try:
-                # Read all sheets from the Excel file
-                excel_data = pd.read_excel(uploaded_file, sheet_name=None)
+                # Read all sheets once; an unchanged workbook is served from the dataset store
+                if excel_data is None:
+                    excel_data = load_workbook_tables('it', uploaded_file)
                 
                 # Check if all required sheets are present
                 available_sheets = list(excel_data.keys())
@@ -2186,6 +2231,14 @@ def show_data_input():
     # Tab 4: Sample Data Sets
     with tab4:
         show_sample_data_sets()
+    
+    # Export data section
+    st.markdown("---")
+    st.markdown("### 📤 Export Data")
+    if 'servers_data' in st.session_state and not st.session_state.servers_data.empty:
+        export_data_to_excel()
+    else:
+        st.info("📝 No data to export. Please upload data first.")
 
     
 
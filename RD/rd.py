@@ -34,6 +34,55 @@ except ImportError as e:
     def calculate_innovation_metrics(projects_data, products_data, prototypes_data):
         return pd.DataFrame(), "Error: Could not import metrics calculator"
 
+# Memoize metric calculations across reruns (available when running inside the integrated dashboard)
+try:
+    from metric_cache import cache_calculators
+    cache_calculators(globals())
+except ImportError:
+    pass
+
+# Shared single-pass workbook reader (available when running inside the integrated dashboard)
+try:
+    from workbook_ingest import read_workbook, format_parse_timings
+except ImportError:
+    def read_workbook(source, sheet_names=None, schemas=None):
+        return pd.read_excel(source, sheet_name=sheet_names), {}
+    format_parse_timings = None
+
+# Column types applied while parsing uploaded R&D workbooks
+RD_TABLE_SCHEMAS = {
+    'Projects': {
+        'start_date': 'date', 'end_date': 'date', 'budget': 'number', 'actual_spend': 'number',
+        'trl_level': 'integer', 'milestones_completed': 'integer', 'total_milestones': 'integer'
+    },
+    'Researchers': {
+        'hire_date': 'date', 'experience_years': 'number', 'salary': 'number'
+    },
+    'Patents': {
+        'filing_date': 'date', 'grant_date': 'date', 'expiry_date': 'date',
+        'estimated_value': 'number', 'licensing_revenue': 'number'
+    },
+    'Equipment': {
+        'purchase_date': 'date', 'cost': 'number', 'total_hours': 'number',
+        'utilized_hours': 'number', 'maintenance_cost': 'number'
+    },
+    'Collaborations': {
+        'start_date': 'date', 'end_date': 'date', 'investment_amount': 'number', 'revenue_generated': 'number'
+    },
+    'Prototypes': {
+        'development_date': 'date', 'testing_date': 'date', 'cost': 'number',
+        'success_rate': 'number', 'iterations': 'integer'
+    },
+    'Products': {
+        'launch_date': 'date', 'development_cost': 'number', 'revenue_generated': 'number',
+        'customer_satisfaction': 'number'
+    },
+    'Training': {
+        'training_date': 'date', 'duration_hours': 'number', 'cost': 'number',
+        'pre_performance_score': 'number', 'post_performance_score': 'number', 'effectiveness_rating': 'number'
+    }
+}
+
 def apply_common_layout(fig):
     """Apply a common layout to Plotly figures for consistent style."""
     fig.update_layout(
@@ -552,64 +601,69 @@ def load_custom_css():
 
 
 
-# Initialize session state for R&D data storage
-if 'projects' not in st.session_state:
-    st.session_state.projects = pd.DataFrame(columns=[
-        'project_id', 'project_name', 'project_type', 'start_date', 'end_date', 
-        'status', 'budget', 'actual_spend', 'team_lead_id', 'department', 'priority',
-        'technology_area', 'trl_level', 'milestones_completed', 'total_milestones'
-    ])
+def initialize_session_state():
+    """Initialize R&D data tables in session state with their empty schemas"""
+    if 'projects' not in st.session_state:
+        st.session_state.projects = pd.DataFrame(columns=[
+            'project_id', 'project_name', 'project_type', 'start_date', 'end_date', 
+            'status', 'budget', 'actual_spend', 'team_lead_id', 'department', 'priority',
+            'technology_area', 'trl_level', 'milestones_completed', 'total_milestones'
+        ])
 
-if 'researchers' not in st.session_state:
-    st.session_state.researchers = pd.DataFrame(columns=[
-        'researcher_id', 'first_name', 'last_name', 'email', 'department', 
-        'specialization', 'hire_date', 'education_level', 'experience_years', 
-        'status', 'salary', 'manager_id'
-    ])
+    if 'researchers' not in st.session_state:
+        st.session_state.researchers = pd.DataFrame(columns=[
+            'researcher_id', 'first_name', 'last_name', 'email', 'department', 
+            'specialization', 'hire_date', 'education_level', 'experience_years', 
+            'status', 'salary', 'manager_id'
+        ])
 
-if 'patents' not in st.session_state:
-    st.session_state.patents = pd.DataFrame(columns=[
-        'patent_id', 'project_id', 'patent_title', 'filing_date', 'grant_date', 
-        'status', 'researcher_id', 'technology_area', 'estimated_value', 
-        'licensing_revenue', 'expiry_date'
-    ])
+    if 'patents' not in st.session_state:
+        st.session_state.patents = pd.DataFrame(columns=[
+            'patent_id', 'project_id', 'patent_title', 'filing_date', 'grant_date', 
+            'status', 'researcher_id', 'technology_area', 'estimated_value', 
+            'licensing_revenue', 'expiry_date'
+        ])
 
-if 'equipment' not in st.session_state:
-    st.session_state.equipment = pd.DataFrame(columns=[
-        'equipment_id', 'equipment_name', 'equipment_type', 'purchase_date', 
-        'cost', 'location', 'status', 'total_hours', 'utilized_hours', 
-        'maintenance_cost', 'department'
-    ])
+    if 'equipment' not in st.session_state:
+        st.session_state.equipment = pd.DataFrame(columns=[
+            'equipment_id', 'equipment_name', 'equipment_type', 'purchase_date', 
+            'cost', 'location', 'status', 'total_hours', 'utilized_hours', 
+            'maintenance_cost', 'department'
+        ])
 
-if 'collaborations' not in st.session_state:
-    st.session_state.collaborations = pd.DataFrame(columns=[
-        'collaboration_id', 'partner_name', 'partner_type', 'start_date', 
-        'end_date', 'project_id', 'investment_amount', 'revenue_generated', 
-        'status', 'collaboration_type', 'researcher_id'
-    ])
+    if 'collaborations' not in st.session_state:
+        st.session_state.collaborations = pd.DataFrame(columns=[
+            'collaboration_id', 'partner_name', 'partner_type', 'start_date', 
+            'end_date', 'project_id', 'investment_amount', 'revenue_generated', 
+            'status', 'collaboration_type', 'researcher_id'
+        ])
 
-if 'prototypes' not in st.session_state:
-    st.session_state.prototypes = pd.DataFrame(columns=[
-        'prototype_id', 'project_id', 'prototype_name', 'development_date', 
-        'testing_date', 'cost', 'status', 'success_rate', 'iterations', 
-        'researcher_id', 'technology_used'
-    ])
+    if 'prototypes' not in st.session_state:
+        st.session_state.prototypes = pd.DataFrame(columns=[
+            'prototype_id', 'project_id', 'prototype_name', 'development_date', 
+            'testing_date', 'cost', 'status', 'success_rate', 'iterations', 
+            'researcher_id', 'technology_used'
+        ])
 
-if 'products' not in st.session_state:
-    st.session_state.products = pd.DataFrame(columns=[
-        'product_id', 'project_id', 'product_name', 'launch_date', 'development_cost', 
-        'revenue_generated', 'market_response', 'customer_satisfaction', 
-        'patent_id', 'status', 'target_market'
-    ])
+    if 'products' not in st.session_state:
+        st.session_state.products = pd.DataFrame(columns=[
+            'product_id', 'project_id', 'product_name', 'launch_date', 'development_cost', 
+            'revenue_generated', 'market_response', 'customer_satisfaction', 
+            'patent_id', 'status', 'target_market'
+        ])
+
+    if 'training' not in st.session_state:
+        st.session_state.training = pd.DataFrame(columns=[
+            'training_id', 'researcher_id', 'training_type', 'training_date', 
+            'duration_hours', 'cost', 'pre_performance_score', 'post_performance_score', 
+            'effectiveness_rating', 'trainer_name'
+        ])
 
-if 'training' not in st.session_state:
-    st.session_state.training = pd.DataFrame(columns=[
-        'training_id', 'researcher_id', 'training_type', 'training_date', 
-        'duration_hours', 'cost', 'pre_performance_score', 'post_performance_score', 
-        'effectiveness_rating', 'trainer_name'
-    ])
 
 def main():
+    # Initialize data tables for this browser session
+    initialize_session_state()
+    
     # Configure page for wide layout
     st.set_page_config(
         page_title="R&D Analytics Dashboard",
@@ -1040,28 +1094,32 @@ def show_data_input():
         
         if uploaded_file is not None:
             try:
-                # Read all sheets from the uploaded file
-                excel_file = pd.ExcelFile(uploaded_file)
+                # Read all required sheets in a single pass over the uploaded file
                 required_sheets = ['Projects', 'Researchers', 'Patents', 'Equipment', 'Collaborations', 'Prototypes', 'Products', 'Training']
+                excel_data, parse_timings = read_workbook(uploaded_file, required_sheets, RD_TABLE_SCHEMAS)
                 
-                missing_sheets = [sheet for sheet in required_sheets if sheet not in excel_file.sheet_names]
+                missing_sheets = [sheet for sheet in required_sheets if sheet not in excel_data]
                 
                 if missing_sheets:
                     st.error(f"❌ Missing required sheets: {', '.join(missing_sheets)}")
                     st.info("Please ensure your Excel file contains all required sheets. You can download a template below.")
                 else:
                     # Load data into session state
-                    st.session_state.projects = pd.read_excel(uploaded_file, sheet_name='Projects')
-                    st.session_state.researchers = pd.read_excel(uploaded_file, sheet_name='Researchers')
-                    st.session_state.patents = pd.read_excel(uploaded_file, sheet_name='Patents')
-                    st.session_state.equipment = pd.read_excel(uploaded_file, sheet_name='Equipment')
-                    st.session_state.collaborations = pd.read_excel(uploaded_file, sheet_name='Collaborations')
-                    st.session_state.prototypes = pd.read_excel(uploaded_file, sheet_name='Prototypes')
-                    st.session_state.products = pd.read_excel(uploaded_file, sheet_name='Products')
-                    st.session_state.training = pd.read_excel(uploaded_file, sheet_name='Training')
+                    st.session_state.projects = excel_data['Projects']
+                    st.session_state.researchers = excel_data['Researchers']
+                    st.session_state.patents = excel_data['Patents']
+                    st.session_state.equipment = excel_data['Equipment']
+                    st.session_state.collaborations = excel_data['Collaborations']
+                    st.session_state.prototypes = excel_data['Prototypes']
+                    st.session_state.products = excel_data['Products']
+                    st.session_state.training = excel_data['Training']
                     
                     st.success("✅ Data uploaded successfully!")
                     
+                    if parse_timings and format_parse_timings is not None:
+                        with st.expander("⏱️ Parse timings"):
+                            display_dataframe_with_index_1(format_parse_timings(parse_timings, excel_data), use_container_width=True)
+                    
                     # Display data summary
                     st.markdown("""
                     <div class="metric-card" style="margin: 20px 0;">
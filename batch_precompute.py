@@ -0,0 +1,372 @@
+"""
+Headless precompute of department metrics into the results store.
+
+Each department's tables are loaded from the dataset store (the same
+Parquet tables the dashboards load after an upload), every calculate_*
+function of its metric groups is run without Streamlit, and the results
+are written to results_store.py keyed on the metric cache key of the call.
+A dashboard calling the same metric on the same tables finds the stored
+result on its first cache miss instead of computing it.
+
+Procurement metrics are also precomputed on the default filtered view of
+the purchase orders (latest year, all quarters) that the pages pass.
+
+Work is split into tasks of a few functions each (department x metric
+group) and run in a process pool. Results whose inputs and module source
+are unchanged are skipped unless --force is given.
+
+    python batch_precompute.py --workbook procurement=pro/pro.xlsx
+    python batch_precompute.py --department procurement --workers 4
+    python batch_precompute.py --list
+"""
+
+import os
+import sys
+import ast
+import time
+import inspect
+import argparse
+import importlib
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Departments whose uploads go through the dataset store. 'tables' maps stored
+# sheet names to the session-state names the calculators use as parameters;
+# 'aliases' binds other parameter names to a table; 'groups' are the modules
+# (in the department folder) whose calculate_* functions are precomputed;
+# 'views' adds the filtered tables the pages pass by default.
+DEPARTMENTS = {
+    'procurement': {
+        'folder': 'pro',
+        'store': 'procurement',
+        'tables': {
+            'suppliers': 'suppliers', 'items': 'items_data', 'purchase_orders': 'purchase_orders',
+            'contracts': 'contracts', 'deliveries': 'deliveries', 'invoices': 'invoices',
+            'budgets': 'budgets', 'rfqs': 'rfqs'
+        },
+        'groups': {'metrics': 'metrics_calculator', 'cost': 'advanced_cost_metrics', 'risk': 'risk_analyzer'},
+        'prepare': 'compact_procurement_tables',
+        'views': 'procurement_filter_views'
+    },
+    'customer_support': {
+        'folder': 'cs',
+        'store': 'customer_service',
+        'tables': {
+            'Customers': 'customers', 'Tickets': 'tickets', 'Agents': 'agents', 'Interactions': 'interactions',
+            'Feedback': 'feedback', 'SLA': 'sla', 'Knowledge_Base': 'knowledge_base', 'Training': 'training'
+        },
+        'groups': {'metrics': 'cs_metrics_calculator'}
+    },
+    'finance': {
+        'folder': 'fin',
+        'store': 'finance',
+        'tables': {
+            name: name for name in (
+                'income_statement', 'balance_sheet', 'cash_flow', 'budget', 'forecast',
+                'market_data', 'customer_data', 'product_data', 'value_chain'
+            )
+        },
+        'groups': {'metrics': 'finance_metrics_calculator', 'valuation': 'valuation_engine', 'ratios': 'ratio_cube'},
+        'schemas': ('fin', 'FINANCE_TABLE_SCHEMAS')
+    },
+    'hr': {
+        'folder': 'hr',
+        'store': 'hr',
+        'tables': {
+            'Employees': 'employees', 'Recruitment': 'recruitment', 'Performance': 'performance',
+            'Compensation': 'compensation', 'Training': 'training', 'Engagement': 'engagement',
+            'Turnover': 'turnover', 'Benefits': 'benefits'
+        },
+        'aliases': {'df': 'employees'},
+        'groups': {'metrics': 'hr_metrics_calculator', 'risk': 'hr'}
+    },
+    'it': {
+        'folder': 'IT',
+        'store': 'it',
+        'tables': {
+            'Servers': 'servers_data', 'Network_Devices': 'network_devices_data', 'Applications': 'applications_data',
+            'Incidents': 'incidents_data', 'Tickets': 'tickets_data', 'Assets': 'assets_data',
+            'Security_Events': 'security_events_data', 'Backups': 'backups_data', 'Projects': 'projects_data',
+            'Users': 'users_data'
+        },
+        'groups': {'metrics': 'it_metrics_calculator'}
+    }
+}
+
+DEFAULT_TASK_SIZE = 8
+
+def _prepare_process():
+    """Make the root and department folders importable and keep Streamlit quiet outside a script run."""
+    os.environ.setdefault('STREAMLIT_LOG_LEVEL', 'error')
+    warnings.filterwarnings('ignore')
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+    for spec in DEPARTMENTS.values():
+        folder = os.path.join(ROOT_DIR, spec['folder'])
+        if folder not in sys.path:
+            sys.path.append(folder)
+
+def compact_procurement_tables(tables):
+    """Apply the procurement ingest schema, as compact_session_tables does after an upload."""
+    from ingest_schema import SESSION_TABLE_KEYS, compact_table
+    sheet_for_key = {key: sheet for sheet, key in SESSION_TABLE_KEYS.items()}
+    return {
+        key: compact_table(df, sheet_for_key[key])[0] if key in sheet_for_key and not df.empty else df
+        for key, df in tables.items()
+    }
+
+def procurement_filter_views(tables):
+    """
+    Tables as the procurement pages pass them before any filter is touched.
+
+    Pages call most metrics with get_filtered_po_df(): purchase orders from
+    the date partition index (sorted by quarter, with year/quarter columns)
+    for the latest year and all quarters, so that frame is precomputed too.
+    """
+    from date_partitions import DatePartitionIndex, PO_FILTER_MIN_ROWS
+    po_df = tables.get('purchase_orders')
+    if po_df is None or po_df.empty or 'order_date' not in po_df.columns:
+        return []
+    partitions = DatePartitionIndex(po_df, 'order_date')
+    if partitions.table.empty:
+        return []
+    default_view = partitions.select(partitions.years[-1], 'All', min_rows=PO_FILTER_MIN_ROWS)
+    return [{**tables, 'purchase_orders': default_view}]
+
+def group_functions(department: str, module_name: str):
+    """calculate_* functions defined at the top level of a group module, found by parsing its source."""
+    path = os.path.join(ROOT_DIR, DEPARTMENTS[department]['folder'], f"{module_name}.py")
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    return [
+        node.name for node in tree.body
+        if isinstance(node, ast.FunctionDef) and node.name.startswith('calculate_')
+    ]
+
+def plan_tasks(departments, task_size: int = DEFAULT_TASK_SIZE):
+    """(department, group, module, function names) tasks, plus groups whose module is missing."""
+    tasks = []
+    missing = []
+    for department in departments:
+        for group, module_name in DEPARTMENTS[department]['groups'].items():
+            names = group_functions(department, module_name)
+            if names is None:
+                missing.append((department, group, module_name))
+                continue
+            for start in range(0, len(names), max(task_size, 1)):
+                tasks.append((department, group, module_name, names[start:start + task_size]))
+    return tasks, missing
+
+def load_department_tables(department: str, data_dir=None):
+    """A department's stored tables under their session-state names, prepared like the dashboard does."""
+    from dataset_store import DatasetStore
+    spec = DEPARTMENTS[department]
+    stored = DatasetStore(data_dir).load_tables(spec['store'], list(spec['tables']))
+    tables = {spec['tables'][sheet]: df for sheet, df in stored.items()}
+    if spec.get('prepare'):
+        tables = globals()[spec['prepare']](tables)
+    return tables
+
+def bind_tables(func, tables, aliases):
+    """
+    Keyword-argument sets to precompute func with, or [] if a required table is missing.
+
+    Parameters are matched by name: the session-state name itself, the name
+    without a _data suffix (income_statement_data -> income_statement), or a
+    department alias. Optional parameters that are not tables keep their
+    defaults. Optional tables (e.g. calculate_spend_trends(purchase_orders,
+    items_data=None)) are passed by some pages and omitted by others, so such
+    functions get a second set with only the required tables.
+    """
+    required = {}
+    optional = {}
+    for param in inspect.signature(func).parameters.values():
+        if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            continue
+        name = param.name
+        table = aliases.get(name, name)
+        if table not in tables and name.endswith('_data'):
+            table = name[:-len('_data')]
+        if table in tables:
+            (required if param.default is inspect.Parameter.empty else optional)[name] = table
+        elif param.default is inspect.Parameter.empty:
+            return []
+    variants = [{**required, **optional}, required] if optional else [required]
+    # Shallow copies: under copy-on-write a calculator adding columns cannot alter the next call's inputs
+    return [{name: tables[table].copy(deep=False) for name, table in variant.items()} for variant in variants]
+
+def run_task(department, group, module_name, function_names, force=False, data_dir=None, results_dir=None):
+    """Run one task in a worker process and return a result entry per function."""
+    _prepare_process()
+    from metric_cache import make_cache_key
+    from results_store import ResultsStore, result_digest
+
+    results = ResultsStore(results_dir)
+    tables = load_department_tables(department, data_dir)
+    views = DEPARTMENTS[department].get('views')
+    table_sets = [tables] + (globals()[views](tables) if views else [])
+    module = importlib.import_module(module_name)
+    aliases = DEPARTMENTS[department].get('aliases', {})
+
+    entries = []
+    for name in function_names:
+        entry = {'department': department, 'group': group, 'function': f"{module_name}.{name}"}
+        func = inspect.unwrap(getattr(module, name))
+        variants = [kwargs for table_set in table_sets for kwargs in bind_tables(func, table_set, aliases)]
+        if not variants:
+            entries.append({**entry, 'status': 'skipped'})
+            continue
+
+        digests = set()
+        for kwargs in variants:
+            digest = result_digest(func, make_cache_key(func, (), kwargs))
+            # Functions that do not take purchase orders get the same key from every view
+            if digest in digests:
+                continue
+            digests.add(digest)
+            if not force and results.has(digest):
+                entries.append({**entry, 'digest': digest, 'status': 'unchanged'})
+                continue
+
+            start = time.perf_counter()
+            try:
+                value = func(**kwargs)
+            except Exception as e:
+                entries.append({**entry, 'digest': digest, 'status': 'error', 'error': f"{type(e).__name__}: {e}"})
+                continue
+            seconds = time.perf_counter() - start
+            entries.append({
+                **entry,
+                'digest': digest,
+                'status': 'computed',
+                'seconds': round(seconds, 4),
+                'size_bytes': results.put(digest, value),
+                'computed_at': datetime.now().isoformat(timespec='seconds')
+            })
+    return entries
+
+def ingest_workbooks(workbooks, data_dir=None):
+    """Ingest department=path workbooks into the dataset store before precomputing."""
+    from dataset_store import DatasetStore
+    store = DatasetStore(data_dir)
+    for department, path in workbooks.items():
+        spec = DEPARTMENTS[department]
+        schemas = None
+        if spec.get('schemas'):
+            module_name, attr = spec['schemas']
+            schemas = getattr(importlib.import_module(module_name), attr)
+        tables, reused = store.ingest_workbook(spec['store'], path, list(spec['tables']), schemas)
+        state = 'unchanged' if reused else 'ingested'
+        print(f"{department}: {state} {len(tables)} tables from {path}")
+
+def run_precompute(departments, workers=None, force=False, task_size=DEFAULT_TASK_SIZE, data_dir=None, results_dir=None):
+    """
+    Precompute every metric group of the departments in a process pool.
+
+    Returns the result entries of all functions. The results index is updated
+    once at the end; stored results of a department that ran without errors
+    but were not produced again are removed.
+    """
+    from dataset_store import DatasetStore
+    from results_store import ResultsStore
+
+    store = DatasetStore(data_dir)
+    stored_departments = []
+    for department in departments:
+        if store.list_tables(DEPARTMENTS[department]['store']):
+            stored_departments.append(department)
+        else:
+            print(f"{department}: no dataset in the store, skipped")
+    departments = stored_departments
+
+    tasks, missing = plan_tasks(departments, task_size)
+    for department, group, module_name in missing:
+        print(f"{department}/{group}: module {module_name}.py not found, skipped")
+
+    entries = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_prepare_process) as pool:
+        futures = {
+            pool.submit(run_task, department, group, module_name, names, force, data_dir, results_dir): (department, group, module_name, names)
+            for department, group, module_name, names in tasks
+        }
+        for future in as_completed(futures):
+            department, group, module_name, names = futures[future]
+            try:
+                entries.extend(future.result())
+            except Exception as e:
+                # Import or load failure: the whole task is lost
+                entries.extend(
+                    {'department': department, 'group': group, 'function': f"{module_name}.{name}", 'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+                    for name in names
+                )
+
+    results = ResultsStore(results_dir)
+    index = results.read_index()
+    stored = []
+    for entry in entries:
+        if entry['status'] == 'computed':
+            stored.append({k: entry[k] for k in ('digest', 'department', 'group', 'function', 'computed_at', 'seconds', 'size_bytes')})
+        elif entry['status'] == 'unchanged' and entry['digest'] in index:
+            stored.append({'digest': entry['digest'], **index[entry['digest']]})
+    complete = [d for d in departments if not any(e['department'] == d and e['status'] == 'error' for e in entries)]
+    results.update_index(stored, replace_departments=complete)
+    return entries
+
+def _parse_workbooks(values):
+    workbooks = {}
+    for value in values or []:
+        department, sep, path = value.partition('=')
+        if not sep or department not in DEPARTMENTS:
+            raise SystemExit(f"--workbook expects department=path with department in {', '.join(DEPARTMENTS)}")
+        workbooks[department] = path
+    return workbooks
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute department metrics into the results store")
+    parser.add_argument('--department', action='append', choices=list(DEPARTMENTS), help="Department to precompute (repeatable, default all)")
+    parser.add_argument('--workbook', action='append', metavar='DEPARTMENT=PATH', help="Ingest a workbook into the dataset store first (repeatable)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--task-size', type=int, default=DEFAULT_TASK_SIZE, help="Metric functions per worker task")
+    parser.add_argument('--force', action='store_true', help="Recompute results whose inputs are unchanged")
+    parser.add_argument('--data-dir', default=None, help="Dataset store directory (default: AZ_DATA_STORE_DIR or ./data_store)")
+    parser.add_argument('--results-dir', default=None, help="Results store directory (default: AZ_RESULTS_STORE_DIR or ./results_store)")
+    parser.add_argument('--list', action='store_true', help="List stored results and exit")
+    args = parser.parse_args()
+
+    _prepare_process()
+
+    if args.list:
+        from results_store import ResultsStore
+        frame = ResultsStore(args.results_dir).index_frame()
+        print(frame.to_string(index=False) if not frame.empty else "No stored results")
+        return
+
+    workbooks = _parse_workbooks(args.workbook)
+    if workbooks:
+        ingest_workbooks(workbooks, args.data_dir)
+
+    departments = args.department or list(workbooks) or list(DEPARTMENTS)
+    start = time.perf_counter()
+    entries = run_precompute(departments, args.workers, args.force, args.task_size, args.data_dir, args.results_dir)
+
+    print(f"{'department':<18}{'group':<10}{'computed':>10}{'unchanged':>11}{'skipped':>9}{'errors':>8}{'seconds':>10}")
+    groups = sorted({(e['department'], e['group']) for e in entries})
+    for department, group in groups:
+        rows = [e for e in entries if e['department'] == department and e['group'] == group]
+        counts = {status: sum(e['status'] == status for e in rows) for status in ('computed', 'unchanged', 'skipped', 'error')}
+        seconds = sum(e.get('seconds', 0) for e in rows if e['status'] == 'computed')
+        print(f"{department:<18}{group:<10}{counts['computed']:>10}{counts['unchanged']:>11}{counts['skipped']:>9}{counts['error']:>8}{seconds:>10.2f}")
+    for entry in entries:
+        if entry['status'] == 'error':
+            print(f"  {entry['function']}: {entry['error']}")
+    print(f"Finished in {time.perf_counter() - start:.1f}s")
+
+    sys.exit(1 if any(e['status'] == 'error' for e in entries) else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Cold-start benchmark for the department applications.
+
+Each department is imported in a fresh interpreter so nothing is shared
+between measurements. The shell dependencies every page needs (streamlit,
+pandas, plotly.express) are imported first and timed separately, so the
+department figure is the cost of the department module itself.
+
+Exits with status 1 when a department exceeds its budget in
+startup_budget.json (or --budget-file).
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BUDGET_FILE = os.path.join(ROOT_DIR, 'startup_budget.json')
+
+# Mirrors DepartmentRouter.departments without importing streamlit in the parent process
+DEPARTMENTS = {
+    'procurement': ('pro', 'pro/pro.py'),
+    'customer_support': ('cs', 'cs/cs.py'),
+    'finance': ('fin', 'fin/fin.py'),
+    'hr': ('hr', 'hr/hr.py'),
+    'it': ('it', 'IT/it.py'),
+    'marketing': ('marketing', 'marketing/mark.py'),
+    'rd': ('rd', 'RD/rd.py'),
+    'sales': ('sale', 'sale/sale.py')
+}
+
+MEASURE_SCRIPT = r"""
+import os, sys, json, time, warnings
+warnings.filterwarnings('ignore')
+root, module_name, module_file = sys.argv[1], sys.argv[2], sys.argv[3]
+sys.path.insert(0, root)
+for folder in ('pro', 'cs', 'fin', 'hr', 'IT', 'marketing', 'RD', 'sale'):
+    sys.path.append(os.path.join(root, folder))
+
+start = time.perf_counter()
+import streamlit, pandas, plotly.express
+shell_seconds = time.perf_counter() - start
+
+from department_registry import get_department_registry
+result = {'shell_seconds': shell_seconds, 'import_seconds': None, 'error': None}
+start = time.perf_counter()
+try:
+    get_department_registry().get_module(module_name, os.path.join(root, module_file))
+    result['import_seconds'] = time.perf_counter() - start
+except Exception as e:
+    result['error'] = f"{type(e).__name__}: {e}"
+    result['import_seconds'] = time.perf_counter() - start
+sys.stdout.write('\n@@RESULT@@' + json.dumps(result))
+"""
+
+def load_budgets(budget_file):
+    """Load per-department import budgets in seconds."""
+    if not os.path.exists(budget_file):
+        return {}
+    with open(budget_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def measure_department(dept_key, repeats=3):
+    """Import a department in fresh interpreters and return the fastest measurement."""
+    module_name, module_file = DEPARTMENTS[dept_key]
+    best = None
+    for _ in range(repeats):
+        proc = subprocess.run(
+            [sys.executable, '-c', MEASURE_SCRIPT, ROOT_DIR, module_name, module_file],
+            capture_output=True, text=True, cwd=ROOT_DIR,
+            env=dict(os.environ, STREAMLIT_LOG_LEVEL='error')
+        )
+        marker = proc.stdout.rfind('@@RESULT@@')
+        if marker < 0:
+            return {'shell_seconds': None, 'import_seconds': None, 'error': proc.stderr.strip()[-500:] or 'no result'}
+        result = json.loads(proc.stdout[marker + len('@@RESULT@@'):])
+        if result['error']:
+            return result
+        if best is None or result['import_seconds'] < best['import_seconds']:
+            best = result
+    return best
+
+def run_startup_benchmark(departments=None, repeats=3, budget_file=DEFAULT_BUDGET_FILE):
+    """Measure cold import time per department and compare it with the configured budget."""
+    budgets = load_budgets(budget_file)
+    default_budget = budgets.get('default')
+    rows = []
+    for dept_key in departments or DEPARTMENTS:
+        result = measure_department(dept_key, repeats)
+        budget = budgets.get(dept_key, default_budget)
+        over_budget = (
+            budget is not None and result['error'] is None
+            and result['import_seconds'] > budget
+        )
+        rows.append({
+            'department': dept_key,
+            'shell_seconds': result['shell_seconds'],
+            'import_seconds': result['import_seconds'],
+            'budget_seconds': budget,
+            'over_budget': over_budget,
+            'error': result['error']
+        })
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold import time of each department app")
+    parser.add_argument('--department', action='append', choices=list(DEPARTMENTS), help="Department to measure (repeatable)")
+    parser.add_argument('--repeats', type=int, default=3, help="Fresh interpreters per department (fastest is kept)")
+    parser.add_argument('--budget-file', default=DEFAULT_BUDGET_FILE, help="JSON file of per-department budgets in seconds")
+    parser.add_argument('--fail-on-error', action='store_true', help="Also fail when a department cannot be imported")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    rows = run_startup_benchmark(args.department, args.repeats, args.budget_file)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print(f"{'department':<18}{'shell (s)':>10}{'import (s)':>12}{'budget (s)':>12}  status")
+        for row in rows:
+            shell = f"{row['shell_seconds']:.2f}" if row['shell_seconds'] is not None else '-'
+            imported = f"{row['import_seconds']:.2f}" if row['import_seconds'] is not None else '-'
+            budget = f"{row['budget_seconds']:.2f}" if row['budget_seconds'] is not None else '-'
+            if row['error']:
+                status = f"ERROR {row['error']}"
+            else:
+                status = 'OVER BUDGET' if row['over_budget'] else 'ok'
+            print(f"{row['department']:<18}{shell:>10}{imported:>12}{budget:>12}  {status}")
+
+    failed = any(row['over_budget'] for row in rows)
+    if args.fail_on_error:
+        failed = failed or any(row['error'] for row in rows)
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
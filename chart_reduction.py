@@ -0,0 +1,177 @@
+import os
+from typing import Optional
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# Most points a single chart sends to the browser; override with AZ_CHART_POINT_BUDGET
+DEFAULT_POINT_BUDGET = int(os.environ.get('AZ_CHART_POINT_BUDGET', '2000'))
+
+# Outliers drawn next to a server-side box plot
+MAX_BOX_OUTLIERS = 200
+
+def _budget(max_points: Optional[int]) -> int:
+    return DEFAULT_POINT_BUDGET if max_points is None else int(max_points)
+
+def _as_float(values) -> np.ndarray:
+    """Numeric view of an axis for area computations (datetimes as integer nanoseconds, NaT as NaN)."""
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        if isinstance(values.dtype, pd.DatetimeTZDtype):
+            values = values.dt.tz_convert('UTC').dt.tz_localize(None)
+        numeric = values.astype('datetime64[ns]').astype('int64').to_numpy(dtype=float)
+        numeric[values.isna().to_numpy()] = np.nan
+        return numeric
+    return pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+
+def _shares(sizes, budget: int) -> np.ndarray:
+    """Split a point budget across lines: small lines are kept whole and the rest share what is left evenly."""
+    sizes = np.asarray(sizes, dtype=np.int64)
+    shares = np.zeros(len(sizes), dtype=np.int64)
+    remaining = budget
+    for left, i in zip(range(len(sizes), 0, -1), np.argsort(sizes, kind='stable')):
+        shares[i] = min(sizes[i], remaining // left)
+        remaining -= shares[i]
+    return shares
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+
+    x must be sorted ascending. The first and last points are always kept and
+    each of the n_out - 2 buckets in between contributes the point forming the
+    largest triangle with the previously kept point and the next bucket's
+    average, which preserves peaks and the overall shape of the series.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (n_out - 2)
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0] = 0
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        stop = int((i + 1) * every) + 1
+        next_stop = min(int((i + 2) * every) + 1, n)
+        if stop < next_stop:
+            avg_x = x[stop:next_stop].mean()
+            avg_y = y[stop:next_stop].mean()
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        kept[i + 1] = a
+    kept[-1] = n - 1
+    return kept
+
+def downsample_line(data: pd.DataFrame, x_col: str, y_col: str, max_points: Optional[int] = None,
+                    group_col: Optional[str] = None) -> pd.DataFrame:
+    """
+    Rows of a line chart's frame reduced to the point budget.
+
+    Each line (one per group_col value, missing values included) is sorted by
+    x and LTTB-downsampled to its share of the budget; lines given fewer than
+    three points, and non-numeric x axes, are thinned with an even stride
+    instead. The total stays within budget unless there are more lines than
+    points in it, in which case each line keeps one point. Frames within
+    budget are returned unchanged.
+    """
+    budget = _budget(max_points)
+    if data is None or len(data) <= budget or x_col not in data.columns or y_col not in data.columns:
+        return data
+
+    groups = [data] if group_col is None or group_col not in data.columns else [
+        group for _, group in data.groupby(group_col, sort=False, observed=True, dropna=False)]
+    shares = np.maximum(_shares([len(group) for group in groups], budget), 1)
+
+    reduced = []
+    for group, share in zip(groups, shares):
+        if share >= len(group):
+            reduced.append(group)
+            continue
+        x = _as_float(group[x_col])
+        y = _as_float(group[y_col])
+        if np.isnan(x).all() or share < 3:
+            # Categorical/text x axis (or too few points for LTTB): keep the original order and take an even stride
+            keep = np.unique(np.linspace(0, len(group) - 1, share).astype(np.int64))
+            reduced.append(group.iloc[keep])
+            continue
+        valid = ~np.isnan(x) & ~np.isnan(y)
+        order = np.flatnonzero(valid)[np.argsort(x[valid], kind='stable')]
+        keep = lttb_indices(x[order], y[order], share)
+        reduced.append(group.iloc[order[keep]])
+    return pd.concat(reduced) if len(reduced) > 1 else reduced[0]
+
+def cap_scatter_points(data: pd.DataFrame, max_points: Optional[int] = None, random_state: int = 0) -> pd.DataFrame:
+    """Uniform random sample of a scatter chart's rows (in original order) when it exceeds the point budget."""
+    budget = _budget(max_points)
+    if data is None or len(data) <= budget:
+        return data
+    return data.sample(n=budget, random_state=random_state).sort_index()
+
+def histogram_trace(values, nbins: int = 20, max_points: Optional[int] = None, **trace_kwargs):
+    """
+    Histogram trace that ships bin counts instead of raw values.
+
+    Above the point budget the values are binned server-side into nbins
+    equal-width bins and drawn as adjoining bars; %{x} in a hovertemplate is
+    the bin centre and %{y} the count. Within budget a regular go.Histogram
+    is returned.
+    """
+    values = pd.Series(values)
+    if len(values) <= _budget(max_points):
+        return go.Histogram(x=values, nbinsx=nbins, **trace_kwargs)
+
+    finite = _as_float(values)
+    finite = finite[np.isfinite(finite)]
+    if len(finite) == 0:
+        return go.Bar(x=[], y=[], **trace_kwargs)
+    counts, edges = np.histogram(finite, bins=nbins)
+    return go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges), **trace_kwargs)
+
+def box_stats(values) -> dict:
+    """Quartiles, mean and Tukey whisker ends (most extreme points within 1.5 IQR) of the finite values."""
+    finite = _as_float(values)
+    finite = finite[np.isfinite(finite)]
+    if len(finite) == 0:
+        return {}
+    q1, median, q3 = np.percentile(finite, [25, 50, 75])
+    iqr = q3 - q1
+    within = finite[(finite >= q1 - 1.5 * iqr) & (finite <= q3 + 1.5 * iqr)]
+    return {
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'mean': finite.mean(),
+        'lowerfence': within.min(),
+        'upperfence': within.max(),
+        'outliers': finite[(finite < within.min()) | (finite > within.max())]
+    }
+
+def box_traces(values, name: str = '', max_points: Optional[int] = None, marker_color=None, **trace_kwargs) -> list:
+    """
+    Vertical box plot traces with quartiles computed server-side.
+
+    Above the point budget the box is drawn from precomputed statistics and
+    at most MAX_BOX_OUTLIERS outliers are sent as a separate marker trace.
+    Within budget a regular go.Box over the raw values is returned.
+    """
+    values = pd.Series(values)
+    if len(values) <= _budget(max_points):
+        return [go.Box(y=values, name=name, marker_color=marker_color, **trace_kwargs)]
+
+    stats = box_stats(values)
+    if not stats:
+        return [go.Box(y=[], name=name, marker_color=marker_color, **trace_kwargs)]
+    outliers = stats.pop('outliers')
+    box = go.Box(x=[name], name=name, marker_color=marker_color, boxpoints=False,
+                 **{key: [value] for key, value in stats.items()}, **trace_kwargs)
+    if len(outliers) > MAX_BOX_OUTLIERS:
+        outliers = np.random.default_rng(0).choice(outliers, MAX_BOX_OUTLIERS, replace=False)
+    points = go.Scatter(x=[name] * len(outliers), y=outliers, mode='markers', name=f"{name} outliers",
+                        marker=dict(color=marker_color, size=4), hoverinfo='y', showlegend=False)
+    return [box, points]
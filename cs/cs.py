@@ -12,6 +12,49 @@ import textwrap
 # Import customer service metric calculation functions
 from cs_metrics_calculator import *
 
+# Memoize metric calculations across reruns (available when running inside the integrated dashboard)
+try:
+    from metric_cache import cache_calculators
+    cache_calculators(globals())
+except ImportError:
+    pass
+
+# Shared on-disk dataset store (available when running inside the integrated dashboard)
+try:
+    from dataset_store import load_workbook_tables, load_saved_tables
+except ImportError:
+    def load_workbook_tables(department, source, sheet_names=None):
+        return pd.read_excel(source, sheet_name=None)
+    def load_saved_tables(department, tables=None):
+        return {}
+
+# Typed metric results: summaries are parsed once and pages read raw values instead of re-parsing strings
+try:
+    from metric_results import MetricResult
+except ImportError:
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from metric_results import MetricResult
+
+# Background streaming export of loaded tables (Excel or zipped Parquet/CSV)
+try:
+    from data_export import show_export_panel
+except ImportError:
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from data_export import show_export_panel
+
+# Server-side binning and box statistics for large ticket distributions
+try:
+    from chart_reduction import histogram_trace, box_traces
+except ImportError:
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from chart_reduction import histogram_trace, box_traces
+
 def display_dataframe_with_index_1(df, **kwargs):
     """Display dataframe with index starting from 1"""
     if not df.empty:
@@ -119,8 +162,8 @@ def create_template_for_download():
 def process_uploaded_excel(uploaded_file):
     """Process uploaded Excel file and load data into session state"""
     try:
-        # Read all sheets from the Excel file
-        excel_data = pd.read_excel(uploaded_file, sheet_name=None)
+        # Read all sheets once; an unchanged workbook is served from the dataset store
+        excel_data = load_workbook_tables('customer_service', uploaded_file)
         
         # Check if all required sheets are present
         required_sheets = ['Customers', 'Tickets', 'Agents', 'Interactions', 'Feedback', 'SLA', 'Knowledge_Base', 'Training']
@@ -144,6 +187,31 @@ def process_uploaded_excel(uploaded_file):
     except Exception as e:
         return False, f"Error reading Excel file: {str(e)}"
 
+def load_saved_dataset():
+    """Load the last uploaded workbook from the dataset store into session state"""
+    try:
+        required_sheets = ['Customers', 'Tickets', 'Agents', 'Interactions', 'Feedback', 'SLA', 'Knowledge_Base', 'Training']
+        excel_data = load_saved_tables('customer_service', required_sheets)
+        missing_sheets = [sheet for sheet in required_sheets if sheet not in excel_data.keys()]
+        
+        if missing_sheets:
+            return False, "No saved dataset found. Please upload an Excel file first."
+        
+        # Load data into session state
+        st.session_state.customers = excel_data['Customers']
+        st.session_state.tickets = excel_data['Tickets']
+        st.session_state.agents = excel_data['Agents']
+        st.session_state.interactions = excel_data['Interactions']
+        st.session_state.feedback = excel_data['Feedback']
+        st.session_state.sla = excel_data['SLA']
+        st.session_state.knowledge_base = excel_data['Knowledge_Base']
+        st.session_state.training = excel_data['Training']
+        
+        return True, f"Saved dataset loaded! Loaded {len(st.session_state.customers)} customers, {len(st.session_state.tickets)} tickets, {len(st.session_state.agents)} agents, and more..."
+        
+    except Exception as e:
+        return False, f"Error loading saved dataset: {str(e)}"
+
 def load_sample_dataset(file_path):
     """Load sample dataset from Excel file for testing purposes"""
     try:
@@ -173,26 +241,22 @@ def load_sample_dataset(file_path):
         return False, f"Error loading sample dataset: {str(e)}"
 
 def export_data_to_excel():
-    """Exports all customer service data from session state to a single Excel file."""
-    with pd.ExcelWriter('customer_service_data_export.xlsx', engine='xlsxwriter') as writer:
-        if not st.session_state.customers.empty:
-            st.session_state.customers.to_excel(writer, sheet_name='Customers', index=False)
-        if not st.session_state.tickets.empty:
-            st.session_state.tickets.to_excel(writer, sheet_name='Tickets', index=False)
-        if not st.session_state.agents.empty:
-            st.session_state.agents.to_excel(writer, sheet_name='Agents', index=False)
-        if not st.session_state.interactions.empty:
-            st.session_state.interactions.to_excel(writer, sheet_name='Interactions', index=False)
-        if not st.session_state.feedback.empty:
-            st.session_state.feedback.to_excel(writer, sheet_name='Feedback', index=False)
-        if not st.session_state.sla.empty:
-            st.session_state.sla.to_excel(writer, sheet_name='SLA', index=False)
-        if not st.session_state.knowledge_base.empty:
-            st.session_state.knowledge_base.to_excel(writer, sheet_name='Knowledge_Base', index=False)
-        if not st.session_state.training.empty:
-            st.session_state.training.to_excel(writer, sheet_name='Training', index=False)
-        
-        st.success("Customer service data exported successfully as 'customer_service_data_export.xlsx'")
+    """Exports all loaded customer service tables as one file, written in the background and downloadable when ready."""
+    tables = {
+        'Customers': st.session_state.customers,
+        'Tickets': st.session_state.tickets,
+        'Agents': st.session_state.agents,
+        'Interactions': st.session_state.interactions,
+        'Feedback': st.session_state.feedback,
+        'SLA': st.session_state.sla,
+        'Knowledge_Base': st.session_state.knowledge_base,
+        'Training': st.session_state.training
+    }
+    tables = {sheet: df for sheet, df in tables.items() if not df.empty}
+    if not tables:
+        st.warning("No data to export. Please load data first.")
+        return None
+    return show_export_panel(tables, key='cs_export', file_prefix='customer_service_data_export')
 
 # Page configuration
 st.set_page_config(
@@ -550,59 +614,64 @@ def load_custom_css():
 # Load custom CSS
 load_custom_css()
 
-# Initialize session state for customer service data storage
-if 'customers' not in st.session_state:
-    st.session_state.customers = pd.DataFrame(columns=[
-        'customer_id', 'customer_name', 'email', 'phone', 'company', 'industry', 
-        'region', 'country', 'customer_segment', 'acquisition_date', 'status',
-        'lifetime_value', 'last_interaction_date', 'preferred_channel'
-    ])
+def initialize_session_state():
+    """Initialize customer service data tables in session state with their empty schemas"""
+    if 'customers' not in st.session_state:
+        st.session_state.customers = pd.DataFrame(columns=[
+            'customer_id', 'customer_name', 'email', 'phone', 'company', 'industry', 
+            'region', 'country', 'customer_segment', 'acquisition_date', 'status',
+            'lifetime_value', 'last_interaction_date', 'preferred_channel'
+        ])
 
-if 'tickets' not in st.session_state:
-    st.session_state.tickets = pd.DataFrame(columns=[
-        'ticket_id', 'customer_id', 'agent_id', 'ticket_type', 'priority', 'status',
-        'created_date', 'first_response_date', 'resolved_date', 'escalated_date',
-        'channel', 'category', 'subcategory', 'description', 'resolution_notes'
-    ])
+    if 'tickets' not in st.session_state:
+        st.session_state.tickets = pd.DataFrame(columns=[
+            'ticket_id', 'customer_id', 'agent_id', 'ticket_type', 'priority', 'status',
+            'created_date', 'first_response_date', 'resolved_date', 'escalated_date',
+            'channel', 'category', 'subcategory', 'description', 'resolution_notes'
+        ])
 
-if 'agents' not in st.session_state:
-    st.session_state.agents = pd.DataFrame(columns=[
-        'agent_id', 'first_name', 'last_name', 'email', 'department', 'team',
-        'hire_date', 'status', 'manager_id', 'specialization', 'performance_score'
-    ])
+    if 'agents' not in st.session_state:
+        st.session_state.agents = pd.DataFrame(columns=[
+            'agent_id', 'first_name', 'last_name', 'email', 'department', 'team',
+            'hire_date', 'status', 'manager_id', 'specialization', 'performance_score'
+        ])
 
-if 'interactions' not in st.session_state:
-    st.session_state.interactions = pd.DataFrame(columns=[
-        'interaction_id', 'ticket_id', 'customer_id', 'agent_id', 'interaction_type',
-        'start_time', 'end_time', 'duration_minutes', 'channel', 'satisfaction_score',
-        'notes', 'outcome'
-    ])
+    if 'interactions' not in st.session_state:
+        st.session_state.interactions = pd.DataFrame(columns=[
+            'interaction_id', 'ticket_id', 'customer_id', 'agent_id', 'interaction_type',
+            'start_time', 'end_time', 'duration_minutes', 'channel', 'satisfaction_score',
+            'notes', 'outcome'
+        ])
 
-if 'feedback' not in st.session_state:
-    st.session_state.feedback = pd.DataFrame(columns=[
-        'feedback_id', 'ticket_id', 'customer_id', 'agent_id', 'feedback_type',
-        'rating', 'sentiment', 'comments', 'submitted_date', 'response_date'
-    ])
+    if 'feedback' not in st.session_state:
+        st.session_state.feedback = pd.DataFrame(columns=[
+            'feedback_id', 'ticket_id', 'customer_id', 'agent_id', 'feedback_type',
+            'rating', 'sentiment', 'comments', 'submitted_date', 'response_date'
+        ])
 
-if 'sla' not in st.session_state:
-    st.session_state.sla = pd.DataFrame(columns=[
-        'sla_id', 'ticket_type', 'priority', 'first_response_target_hours',
-        'resolution_target_hours', 'business_hours_only', 'description'
-    ])
+    if 'sla' not in st.session_state:
+        st.session_state.sla = pd.DataFrame(columns=[
+            'sla_id', 'ticket_type', 'priority', 'first_response_target_hours',
+            'resolution_target_hours', 'business_hours_only', 'description'
+        ])
 
-if 'knowledge_base' not in st.session_state:
-    st.session_state.knowledge_base = pd.DataFrame(columns=[
-        'kb_id', 'title', 'category', 'content', 'created_date', 'updated_date',
-        'author_id', 'views', 'helpful_votes', 'status'
-    ])
+    if 'knowledge_base' not in st.session_state:
+        st.session_state.knowledge_base = pd.DataFrame(columns=[
+            'kb_id', 'title', 'category', 'content', 'created_date', 'updated_date',
+            'author_id', 'views', 'helpful_votes', 'status'
+        ])
+
+    if 'training' not in st.session_state:
+        st.session_state.training = pd.DataFrame(columns=[
+            'training_id', 'agent_id', 'training_type', 'start_date', 'completion_date',
+            'score', 'status', 'trainer_id', 'notes'
+        ])
 
-if 'training' not in st.session_state:
-    st.session_state.training = pd.DataFrame(columns=[
-        'training_id', 'agent_id', 'training_type', 'start_date', 'completion_date',
-        'score', 'status', 'trainer_id', 'notes'
-    ])
 
 def main():
+    # Initialize data tables for this browser session
+    initialize_session_state()
+    
     # Load custom CSS styling
     load_custom_css()
     
@@ -1022,6 +1091,12 @@ def show_data_input():
                     st.error(f"❌ {message}")
             except Exception as e:
                 st.error(f"❌ Error processing file: {str(e)}")
+        elif st.button("📂 Load Last Uploaded Dataset", key="load_saved_dataset", use_container_width=True):
+            success, message = load_saved_dataset()
+            if success:
+                st.success(f"✅ {message}")
+            else:
+                st.warning(f"⚠️ {message}")
     
     with main_tab3:
         st.markdown("""
@@ -1461,6 +1536,11 @@ def show_data_input():
         </div>
         """, unsafe_allow_html=True)
 
+    # Export data section
+    st.markdown("---")
+    st.markdown("### 📤 Export Data")
+    export_data_to_excel()
+
 # Analytics functions for the main sections
 def show_customer_satisfaction():
     st.markdown("""
@@ -1781,11 +1861,12 @@ def show_customer_satisfaction():
         """)
         
         ces_summary, ces_message = calculate_ces_score(st.session_state.feedback)
+        ces_result = MetricResult.from_summary_frame(ces_summary, ces_message)
         
         if not ces_summary.empty:
             # Display CES score prominently
-            ces_score_str = ces_summary.iloc[0]['Value']
-            ces_score = float(ces_score_str)
+            ces_score_str = ces_result.format(0)
+            ces_score = ces_result.value(0)
             st.metric("CES Score", ces_score_str, delta=None)
             
             # Display other metrics
@@ -1829,12 +1910,13 @@ def show_customer_satisfaction():
         """)
         
         sentiment_summary, sentiment_message = calculate_sentiment_analysis(st.session_state.feedback)
+        sentiment_percentage_result = MetricResult.from_summary_frame(sentiment_summary, sentiment_message, value_column='Percentage')
         
         if not sentiment_summary.empty:
             # Display sentiment distribution
-            positive_pct = float(sentiment_summary.iloc[0]['Percentage'].rstrip('%'))
-            neutral_pct = float(sentiment_summary.iloc[1]['Percentage'].rstrip('%'))
-            negative_pct = float(sentiment_summary.iloc[2]['Percentage'].rstrip('%'))
+            positive_pct = sentiment_percentage_result.value(0)
+            neutral_pct = sentiment_percentage_result.value(1)
+            negative_pct = sentiment_percentage_result.value(2)
             
             col1, col2, col3 = st.columns(3)
             with col1:
@@ -1886,10 +1968,11 @@ def show_customer_satisfaction():
             resolution_summary, resolution_message = calculate_complaint_resolution_satisfaction(
                 st.session_state.tickets, st.session_state.feedback
             )
+            resolution_result = MetricResult.from_summary_frame(resolution_summary, resolution_message)
             
             if not resolution_summary.empty:
                 # Display satisfaction rate prominently
-                satisfaction_rate = float(resolution_summary.iloc[2]['Value'].rstrip('%'))
+                satisfaction_rate = resolution_result.value(2)
                 st.metric("Resolution Satisfaction", f"{satisfaction_rate:.1f}%", delta=None)
                 
                 # Display other metrics
@@ -1944,8 +2027,9 @@ def show_customer_satisfaction():
     
     if not st.session_state.feedback.empty:
         csat_summary, _ = calculate_csat_score(st.session_state.feedback)
+        csat_result = MetricResult.from_summary_frame(csat_summary)
         if not csat_summary.empty:
-            csat_score = float(csat_summary.iloc[0]['Value'].rstrip('%'))
+            csat_score = csat_result.value(0)
             if csat_score < 70:
                 insights.append("🔴 **Low CSAT Score:** Consider improving response times and agent training")
             elif csat_score > 85:
@@ -1964,8 +2048,9 @@ def show_customer_satisfaction():
                 insights.append("🟡 **Positive NPS:** Good foundation, work on converting passives to promoters")
         
         sentiment_summary, _ = calculate_sentiment_analysis(st.session_state.feedback)
+        sentiment_percentage_result = MetricResult.from_summary_frame(sentiment_summary, value_column='Percentage')
         if not sentiment_summary.empty:
-            negative_pct = float(sentiment_summary.iloc[2]['Percentage'].rstrip('%'))
+            negative_pct = sentiment_percentage_result.value(2)
             if negative_pct > 20:
                 insights.append("🔴 **High Negative Sentiment:** Investigate root causes and improve service delivery")
     
@@ -2013,27 +2098,28 @@ def show_response_resolution():
         """)
         
         frt_summary, frt_message = calculate_first_response_time(st.session_state.tickets)
+        frt_result = MetricResult.from_summary_frame(frt_summary, frt_message)
         
         if not frt_summary.empty:
             # Display metrics in columns
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                st.metric("Average FRT", frt_summary.iloc[0]['Value'])
+                st.metric("Average FRT", frt_result.format(0))
             with col2:
-                st.metric("Median FRT", frt_summary.iloc[1]['Value'])
+                st.metric("Median FRT", frt_result.format(1))
             with col3:
-                st.metric("Total Queries", frt_summary.iloc[2]['Value'])
+                st.metric("Total Queries", frt_result.format(2))
             with col4:
-                st.metric("Min FRT", frt_summary.iloc[3]['Value'])
+                st.metric("Min FRT", frt_result.format(3))
             
             # Display additional metrics
             col1, col2 = st.columns(2)
             with col1:
-                st.metric("Max FRT", frt_summary.iloc[4]['Value'])
+                st.metric("Max FRT", frt_result.format(4))
             with col2:
                 # Calculate SLA compliance for FRT
                 if not st.session_state.sla.empty:
-                    avg_frt_hours = float(frt_summary.iloc[0]['Value'].split()[0])
+                    avg_frt_hours = frt_result.value(0)
                     sla_target = st.session_state.sla['first_response_target_hours'].mean()
                     sla_compliance = "✅ Within SLA" if avg_frt_hours <= sla_target else "❌ Exceeds SLA"
                     st.metric("SLA Status", sla_compliance)
@@ -2058,9 +2144,9 @@ def show_response_resolution():
                 with col1:
                     # Enhanced histogram with better styling
                     fig = go.Figure(data=[
-                        go.Histogram(x=tickets_with_frt['response_time_hours'], nbinsx=20, 
-                                    marker_color='#1f77b4', opacity=0.7,
-                                    hovertemplate='Response Time: %{x:.1f} hours<br>Count: %{y}<extra></extra>')
+                        histogram_trace(tickets_with_frt['response_time_hours'], nbins=20, 
+                                        marker_color='#1f77b4', opacity=0.7,
+                                        hovertemplate='Response Time: %{x:.1f} hours<br>Count: %{y}<extra></extra>')
                     ])
                     fig.update_layout(
                         title="First Response Time Distribution",
@@ -2076,12 +2162,10 @@ def show_response_resolution():
                 
                 with col2:
                     # Box plot for FRT distribution
-                    fig = go.Figure(data=[
-                        go.Box(y=tickets_with_frt['response_time_hours'],
-                               marker_color='#1f77b4',
-                               name='FRT Distribution',
-                               hovertemplate='Response Time: %{y:.1f} hours<extra></extra>')
-                    ])
+                    fig = go.Figure(data=box_traces(tickets_with_frt['response_time_hours'],
+                                                    marker_color='#1f77b4',
+                                                    name='FRT Distribution',
+                                                    hovertemplate='Response Time: %{y:.1f} hours<extra></extra>'))
                     fig.update_layout(
                         title="FRT Distribution (Box Plot)",
                         yaxis_title="Response Time (Hours)",
@@ -2181,26 +2265,27 @@ def show_response_resolution():
         """)
         
         art_summary, art_message = calculate_average_resolution_time(st.session_state.tickets)
+        art_result = MetricResult.from_summary_frame(art_summary, art_message)
         
         if not art_summary.empty:
             # Display metrics in columns
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                st.metric("Average ART", art_summary.iloc[0]['Value'])
+                st.metric("Average ART", art_result.format(0))
             with col2:
-                st.metric("Median ART", art_summary.iloc[1]['Value'])
+                st.metric("Median ART", art_result.format(1))
             with col3:
-                st.metric("Total Resolved", art_summary.iloc[2]['Value'])
+                st.metric("Total Resolved", art_result.format(2))
             with col4:
-                st.metric("Min ART", art_summary.iloc[3]['Value'])
+                st.metric("Min ART", art_result.format(3))
             
             # Display additional metrics
             col1, col2 = st.columns(2)
             with col1:
-                st.metric("Max ART", art_summary.iloc[4]['Value'])
+                st.metric("Max ART", art_result.format(4))
             with col2:
                 # Calculate resolution efficiency
-                avg_art_hours = float(art_summary.iloc[0]['Value'].split()[0])
+                avg_art_hours = art_result.value(0)
                 efficiency_status = "✅ Excellent" if avg_art_hours <= 24 else ("🟡 Good" if avg_art_hours <= 48 else "❌ Needs Improvement")
                 st.metric("Efficiency Status", efficiency_status)
             
@@ -2220,8 +2305,8 @@ def show_response_resolution():
                 
                 # Create histogram
                 fig = go.Figure(data=[
-                    go.Histogram(x=resolved_tickets['resolution_time_hours'], nbinsx=20,
-                                marker_color='#4caf50', opacity=0.7)
+                    histogram_trace(resolved_tickets['resolution_time_hours'], nbins=20,
+                                    marker_color='#4caf50', opacity=0.7)
                 ])
                 fig.update_layout(
                     title="Resolution Time Distribution",
@@ -2259,29 +2344,30 @@ def show_response_resolution():
         """)
         
         fcr_summary, fcr_message = calculate_first_call_resolution(st.session_state.tickets)
+        fcr_result = MetricResult.from_summary_frame(fcr_summary, fcr_message)
         
         if not fcr_summary.empty:
             # Display FCR rate prominently
-            fcr_rate = float(fcr_summary.iloc[0]['Value'].rstrip('%'))
+            fcr_rate = fcr_result.value(0)
             st.metric("FCR Rate", f"{fcr_rate:.1f}%", delta=None)
             
             # Display breakdown in columns
             col1, col2, col3 = st.columns(3)
             with col1:
-                st.metric("First Interaction Resolved", int(fcr_summary.iloc[1]['Value']))
+                st.metric("First Interaction Resolved", fcr_result.value(1))
             with col2:
-                st.metric("Total Issues", int(fcr_summary.iloc[2]['Value']))
+                st.metric("Total Issues", fcr_result.value(2))
             with col3:
-                st.metric("Multiple Interaction Issues", int(fcr_summary.iloc[3]['Value']))
+                st.metric("Multiple Interaction Issues", fcr_result.value(3))
             
             # Display detailed table
             st.subheader("📋 FCR Analysis Details")
             st.dataframe(fcr_summary, use_container_width=True)
             
             # Create visualization
-            total_issues = int(fcr_summary.iloc[2]['Value'])
-            first_resolved = int(fcr_summary.iloc[1]['Value'])
-            multiple_interactions = int(fcr_summary.iloc[3]['Value'])
+            total_issues = fcr_result.value(2)
+            first_resolved = fcr_result.value(1)
+            multiple_interactions = fcr_result.value(3)
             
             fig = go.Figure(data=[
                 go.Pie(labels=['First Interaction Resolved', 'Multiple Interactions Required'],
@@ -2353,8 +2439,8 @@ def show_response_resolution():
                 
                 # Create histogram
                 fig = go.Figure(data=[
-                    go.Histogram(x=escalated_tickets['escalation_time_hours'], nbinsx=15,
-                                marker_color='#ff5722', opacity=0.7)
+                    histogram_trace(escalated_tickets['escalation_time_hours'], nbins=15,
+                                    marker_color='#ff5722', opacity=0.7)
                 ])
                 fig.update_layout(
                     title="Escalation Time Distribution",
@@ -2451,8 +2537,8 @@ def show_response_resolution():
                 
                 # Create visualization
                 fig = go.Figure(data=[
-                    go.Histogram(x=tickets_with_wait['wait_time_hours'], nbinsx=20,
-                                marker_color='#9c27b0', opacity=0.7)
+                    histogram_trace(tickets_with_wait['wait_time_hours'], nbins=20,
+                                    marker_color='#9c27b0', opacity=0.7)
                 ])
                 fig.update_layout(
                     title="Queue Wait Time Distribution",
@@ -2496,8 +2582,9 @@ def show_response_resolution():
     if not st.session_state.tickets.empty:
         # FRT insights
         frt_summary, _ = calculate_first_response_time(st.session_state.tickets)
+        frt_result = MetricResult.from_summary_frame(frt_summary)
         if not frt_summary.empty:
-            avg_frt = float(frt_summary.iloc[0]['Value'].split()[0])
+            avg_frt = frt_result.value(0)
             if avg_frt > 24:
                 insights.append("🔴 **Slow First Response:** Consider increasing staffing or improving processes")
             elif avg_frt <= 4:
@@ -2507,8 +2594,9 @@ def show_response_resolution():
         
         # ART insights
         art_summary, _ = calculate_average_resolution_time(st.session_state.tickets)
+        art_result = MetricResult.from_summary_frame(art_summary)
         if not art_summary.empty:
-            avg_art = float(art_summary.iloc[0]['Value'].split()[0])
+            avg_art = art_result.value(0)
             if avg_art > 72:
                 insights.append("🔴 **Long Resolution Times:** Investigate bottlenecks and improve workflows")
             elif avg_art <= 24:
@@ -2518,8 +2606,9 @@ def show_response_resolution():
         
         # FCR insights
         fcr_summary, _ = calculate_first_call_resolution(st.session_state.tickets)
+        fcr_result = MetricResult.from_summary_frame(fcr_summary)
         if not fcr_summary.empty:
-            fcr_rate = float(fcr_summary.iloc[0]['Value'].rstrip('%'))
+            fcr_rate = fcr_result.value(0)
             if fcr_rate < 60:
                 insights.append("🔴 **Low FCR Rate:** Focus on agent training and knowledge base improvement")
             elif fcr_rate > 80:
@@ -2992,10 +3081,11 @@ def show_service_efficiency():
         
         if not st.session_state.sla.empty:
             sla_summary, sla_message = calculate_sla_compliance(st.session_state.tickets, st.session_state.sla)
+            sla_result = MetricResult.from_summary_frame(sla_summary, sla_message)
             
             if not sla_summary.empty:
                 # Display SLA compliance rate prominently
-                compliance_rate = float(sla_summary.iloc[0]['Value'].rstrip('%'))
+                compliance_rate = sla_result.value(0)
                 st.metric("SLA Compliance Rate", f"{compliance_rate:.1f}%", delta=None)
                 
                 # Display breakdown in columns
@@ -3269,8 +3359,9 @@ def show_service_efficiency():
         
         # Channel performance insights
         channel_summary, _ = calculate_channel_performance_analysis(st.session_state.tickets)
+        channel_result = MetricResult.from_summary_frame(channel_summary)
         if not channel_summary.empty:
-            avg_resolution_rate = float(channel_summary.iloc[0]['Value'].rstrip('%'))
+            avg_resolution_rate = channel_result.value(0)
             if avg_resolution_rate < 70:
                 insights.append("🔴 **Low Channel Resolution:** Investigate channel-specific issues")
             elif avg_resolution_rate > 90:
@@ -3281,8 +3372,9 @@ def show_service_efficiency():
         # SLA compliance insights
         if not st.session_state.sla.empty:
             sla_summary, _ = calculate_sla_compliance(st.session_state.tickets, st.session_state.sla)
+            sla_result = MetricResult.from_summary_frame(sla_summary)
             if not sla_summary.empty:
-                compliance_rate = float(sla_summary.iloc[0]['Value'].rstrip('%'))
+                compliance_rate = sla_result.value(0)
                 if compliance_rate < 80:
                     insights.append("🔴 **Low SLA Compliance:** Review SLA targets and agent training")
                 elif compliance_rate > 95:
@@ -3333,10 +3425,11 @@ def show_customer_retention():
         """)
         
         churn_summary, churn_message = calculate_churn_rate_analysis(st.session_state.customers)
+        churn_result = MetricResult.from_summary_frame(churn_summary, churn_message)
         
         if not churn_summary.empty:
             # Display churn rate prominently
-            churn_rate = float(churn_summary.iloc[0]['Value'].rstrip('%'))
+            churn_rate = churn_result.value(0)
             st.metric("Churn Rate", f"{churn_rate:.1f}%", delta=None)
             
             # Display breakdown in columns
@@ -3803,8 +3896,9 @@ def show_customer_retention():
     if not st.session_state.customers.empty:
         # Churn rate insights
         churn_summary, _ = calculate_churn_rate_analysis(st.session_state.customers)
+        churn_result = MetricResult.from_summary_frame(churn_summary)
         if not churn_summary.empty:
-            churn_rate = float(churn_summary.iloc[0]['Value'].rstrip('%'))
+            churn_rate = churn_result.value(0)
             if churn_rate > 15:
                 insights.append("🔴 **High Churn Rate:** Implement retention strategies and improve customer experience")
             elif churn_rate < 5:
@@ -3882,11 +3976,12 @@ def show_agent_performance():
             performance_summary, performance_message = calculate_agent_performance_score(
                 st.session_state.agents, st.session_state.tickets, st.session_state.feedback
             )
+            performance_result = MetricResult.from_summary_frame(performance_summary, performance_message)
             
             if not performance_summary.empty:
                 # Display average performance prominently
-                avg_performance_str = performance_summary.iloc[0]['Value']
-                avg_performance = float(avg_performance_str)
+                avg_performance_str = performance_result.format(0)
+                avg_performance = performance_result.value(0)
                 st.metric("Average Performance Score", avg_performance_str, delta=None)
                 
                 # Display breakdown in columns
@@ -4002,10 +4097,11 @@ def show_agent_performance():
             training_summary, training_message = calculate_training_effectiveness(
                 st.session_state.training, st.session_state.agents
             )
+            training_result = MetricResult.from_summary_frame(training_summary, training_message)
             
             if not training_summary.empty:
                 # Display average improvement prominently
-                avg_improvement = float(training_summary.iloc[0]['Value'].split()[0])
+                avg_improvement = training_result.value(0)
                 st.metric("Average Training Improvement", f"{avg_improvement:.1f} points", delta=None)
                 
                 # Display breakdown in columns
@@ -4417,9 +4513,10 @@ def show_agent_performance():
             performance_summary, _ = calculate_agent_performance_score(
                 st.session_state.agents, st.session_state.tickets, st.session_state.feedback
             )
+            performance_result = MetricResult.from_summary_frame(performance_summary)
             if not performance_summary.empty:
-                avg_performance_str = performance_summary.iloc[0]['Value']
-                avg_performance = float(avg_performance_str)
+                avg_performance_str = performance_result.format(0)
+                avg_performance = performance_result.value(0)
                 if avg_performance < 60:
                     insights.append("🔴 **Low Agent Performance:** Implement performance improvement programs")
                 elif avg_performance > 85:
@@ -4494,6 +4591,7 @@ def show_interaction_analysis():
         """)
         
         trends_summary, trends_message = calculate_interaction_volume_trends(st.session_state.interactions)
+        trends_result = MetricResult.from_summary_frame(trends_summary, trends_message)
         
         if not trends_summary.empty:
             # Display metrics in columns
@@ -4513,7 +4611,7 @@ def show_interaction_analysis():
                 st.metric("Total Interactions", trends_summary.iloc[4]['Value'])
             with col2:
                 # Calculate trend direction
-                avg_daily = float(trends_summary.iloc[0]['Value'].split()[0])
+                avg_daily = trends_result.value(0)
                 trend_direction = "📈 Increasing" if avg_daily > 50 else ("📉 Decreasing" if avg_daily < 20 else "➡️ Stable")
                 st.metric("Trend Direction", trend_direction)
             
@@ -4767,10 +4865,11 @@ def show_interaction_analysis():
         """)
         
         abandonment_summary, abandonment_message = calculate_abandonment_rate(st.session_state.interactions)
+        abandonment_result = MetricResult.from_summary_frame(abandonment_summary, abandonment_message)
         
         if not abandonment_summary.empty:
             # Display abandonment rate prominently
-            abandonment_rate = float(abandonment_summary.iloc[0]['Value'].rstrip('%'))
+            abandonment_rate = abandonment_result.value(0)
             st.metric("Overall Abandonment Rate", f"{abandonment_rate:.1f}%", delta=None)
             
             # Display breakdown in columns
@@ -4961,8 +5060,9 @@ def show_interaction_analysis():
     if not st.session_state.interactions.empty:
         # Volume trends insights
         trends_summary, _ = calculate_interaction_volume_trends(st.session_state.interactions)
+        trends_result = MetricResult.from_summary_frame(trends_summary)
         if not trends_summary.empty:
-            avg_daily = float(trends_summary.iloc[0]['Value'].split()[0])
+            avg_daily = trends_result.value(0)
             if avg_daily > 100:
                 insights.append("🔴 **High Interaction Volume:** Consider increasing staffing during peak periods")
             elif avg_daily < 20:
@@ -4972,8 +5072,9 @@ def show_interaction_analysis():
         
         # Abandonment rate insights
         abandonment_summary, _ = calculate_abandonment_rate(st.session_state.interactions)
+        abandonment_result = MetricResult.from_summary_frame(abandonment_summary)
         if not abandonment_summary.empty:
-            abandonment_rate = float(abandonment_summary.iloc[0]['Value'].rstrip('%'))
+            abandonment_rate = abandonment_result.value(0)
             if abandonment_rate > 20:
                 insights.append("🔴 **High Abandonment Rate:** Investigate wait times and agent availability")
             elif abandonment_rate < 5:
@@ -5503,10 +5604,11 @@ def show_business_impact():
             recovery_summary, recovery_message = calculate_revenue_recovery_analysis(
                 st.session_state.customers, st.session_state.tickets
             )
+            recovery_result = MetricResult.from_summary_frame(recovery_summary, recovery_message)
             
             if not recovery_summary.empty:
                 # Display recovery rate prominently
-                recovery_rate = float(recovery_summary.iloc[0]['Value'].rstrip('%'))
+                recovery_rate = recovery_result.value(0)
                 st.metric("Revenue Recovery Rate", f"{recovery_rate:.1f}%", delta=None)
                 
                 # Display breakdown in columns
@@ -5893,8 +5995,9 @@ def show_business_impact():
         recovery_summary, _ = calculate_revenue_recovery_analysis(
             st.session_state.customers, st.session_state.tickets
         )
+        recovery_result = MetricResult.from_summary_frame(recovery_summary)
         if not recovery_summary.empty:
-            recovery_rate = float(recovery_summary.iloc[0]['Value'].rstrip('%'))
+            recovery_rate = recovery_result.value(0)
             if recovery_rate < 20:
                 insights.append("🔴 **Low Revenue Recovery:** Implement proactive retention strategies")
             elif recovery_rate > 50:
@@ -5963,11 +6066,12 @@ def show_predictive_analytics():
             journey_summary, journey_message = calculate_customer_journey_analysis(
                 st.session_state.customers, st.session_state.tickets, st.session_state.interactions
             )
+            journey_result = MetricResult.from_summary_frame(journey_summary, journey_message)
             
             if not journey_summary.empty:
                 # Display journey metrics prominently
-                avg_journey_length_str = journey_summary.iloc[0]['Value']
-                avg_journey_length = float(avg_journey_length_str.split()[0])  # Extract numeric part
+                avg_journey_length_str = journey_result.format(0)
+                avg_journey_length = journey_result.value(0)
                 st.metric("Average Journey Length", avg_journey_length_str, delta=None)
                 
                 # Display breakdown in columns
@@ -6056,11 +6160,12 @@ def show_predictive_analytics():
             churn_prediction_summary, churn_prediction_message = calculate_churn_prediction_models(
                 st.session_state.customers, st.session_state.tickets, st.session_state.interactions
             )
+            churn_prediction_result = MetricResult.from_summary_frame(churn_prediction_summary, churn_prediction_message)
             
             if not churn_prediction_summary.empty:
                 # Display churn prediction metrics prominently
-                avg_churn_probability_str = churn_prediction_summary.iloc[0]['Value']
-                avg_churn_probability = float(avg_churn_probability_str.rstrip('%'))
+                avg_churn_probability_str = churn_prediction_result.format(0)
+                avg_churn_probability = churn_prediction_result.value(0)
                 st.metric("Average Churn Probability", avg_churn_probability_str, delta=None)
                 
                 # Display breakdown in columns
@@ -6265,21 +6370,22 @@ def show_predictive_analytics():
             demand_forecast_summary, demand_forecast_message = calculate_demand_forecasting(
                 st.session_state.tickets, st.session_state.interactions
             )
+            demand_forecast_result = MetricResult.from_summary_frame(demand_forecast_summary, demand_forecast_message)
             
             if not demand_forecast_summary.empty:
                 # Display forecast metrics prominently
-                forecasted_demand_str = demand_forecast_summary.iloc[0]['Value']
-                forecasted_demand = float(forecasted_demand_str.split()[0])  # Extract numeric part
+                forecasted_demand_str = demand_forecast_result.format(0)
+                forecasted_demand = demand_forecast_result.value(0)
                 st.metric("Forecasted Monthly Demand", forecasted_demand_str, delta=None)
                 
                 # Display breakdown in columns
                 col1, col2, col3, col4 = st.columns(4)
                 with col1:
-                    st.metric("Total Forecast (12 months)", demand_forecast_summary.iloc[1]['Value'])
+                    st.metric("Total Forecast (12 months)", demand_forecast_result.format(1))
                 with col2:
-                    st.metric("Growth Rate", demand_forecast_summary.iloc[2]['Value'])
+                    st.metric("Growth Rate", demand_forecast_result.format(2))
                 with col3:
-                    st.metric("Current Monthly Average", demand_forecast_summary.iloc[3]['Value'])
+                    st.metric("Current Monthly Average", demand_forecast_result.format(3))
                 with col4:
                     st.metric("Forecast Periods", "12 months")
                 
@@ -6392,9 +6498,10 @@ def show_predictive_analytics():
         churn_prediction_summary, _ = calculate_churn_prediction_models(
             st.session_state.customers, st.session_state.tickets, st.session_state.interactions
         )
+        churn_prediction_result = MetricResult.from_summary_frame(churn_prediction_summary)
         if not churn_prediction_summary.empty:
-            avg_churn_probability_str = churn_prediction_summary.iloc[0]['Value']
-            avg_churn_probability = float(avg_churn_probability_str.rstrip('%'))
+            avg_churn_probability_str = churn_prediction_result.format(0)
+            avg_churn_probability = churn_prediction_result.value(0)
             if avg_churn_probability > 25:
                 insights.append("🔴 **High Churn Risk:** Implement immediate retention strategies")
             elif avg_churn_probability < 10:
@@ -0,0 +1,339 @@
+import io
+import os
+import time
+import zipfile
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional
+import pandas as pd
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+# Parquet support is optional; without it Parquet bundles fall back to CSV members
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    pa = None
+    pq = None
+    PARQUET_AVAILABLE = False
+
+# Export format -> (label, file suffix, MIME type)
+EXPORT_FORMATS = {
+    'xlsx': ('Excel workbook (.xlsx)', '.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'parquet': ('Parquet bundle (.zip)', '.zip', 'application/zip'),
+    'csv': ('CSV bundle (.zip)', '.zip', 'application/zip')
+}
+
+# Rows per sheet allowed by Excel; longer tables continue on '<sheet>_2', '<sheet>_3', ...
+EXCEL_MAX_ROWS = 1048576
+
+DEFAULT_CHUNK_ROWS = 10000
+
+# Exports run here so page reruns never wait for a workbook to be written
+_EXPORT_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix='data-export')
+
+def _chunk_records(df: pd.DataFrame, start: int, stop: int):
+    """Rows start..stop as tuples of Python values, with missing values as None."""
+    chunk = df.iloc[start:stop]
+    values = chunk.astype(object).where(chunk.notna(), None)
+    return values.itertuples(index=False, name=None)
+
+def _write_record(worksheet, row: int, record) -> None:
+    """Write one row, falling back to text for values xlsxwriter cannot store natively."""
+    try:
+        worksheet.write_row(row, 0, record)
+    except TypeError:
+        worksheet.write_row(row, 0, [value if value is None or isinstance(value, (str, int, float, bool, datetime)) else str(value)
+                                     for value in record])
+
+class StreamingExcelWriter:
+    """
+    XLSX writer in xlsxwriter's constant-memory mode that accepts tables in chunks.
+
+    Each append writes a chunk of rows below the rows already written to that
+    table's sheet; only the row being written is held in memory. Chunks of
+    different tables may be interleaved. A table that outgrows Excel's row
+    limit continues on '<sheet>_2', '<sheet>_3', ...
+    """
+
+    def __init__(self, path: str, sheet_titles: Optional[Dict[str, str]] = None, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        if xlsxwriter is None:
+            raise ImportError("xlsxwriter is required for Excel exports")
+        self.path = path
+        self.sheet_titles = sheet_titles or {}
+        self.chunk_rows = chunk_rows
+        self.workbook = xlsxwriter.Workbook(path, {
+            'constant_memory': True,
+            'nan_inf_to_errors': True,
+            'remove_timezone': True
+        })
+        self.header_format = self.workbook.add_format({'bold': True, 'border': 1, 'align': 'center'})
+        self.date_format = self.workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm:ss'})
+        self.title_format = self.workbook.add_format({
+            'bold': True,
+            'font_size': 14,
+            'bg_color': '#667eea',
+            'font_color': 'white',
+            'align': 'center'
+        })
+        # table name -> [worksheet, next row, part number, columns]
+        self._sheets = {}
+
+    def _new_sheet(self, table_name: str, columns, part: int, date_columns):
+        name = table_name[:31] if part == 1 else f"{table_name[:27]}_{part}"
+        worksheet = self.workbook.add_worksheet(name)
+        for i in date_columns:
+            worksheet.set_column(i, i, 19, self.date_format)
+
+        # constant_memory requires rows in order: title, header, then data
+        title = self.sheet_titles.get(table_name)
+        if title:
+            if len(columns) > 1:
+                worksheet.merge_range(0, 0, 0, len(columns) - 1, title, self.title_format)
+            else:
+                worksheet.write(0, 0, title, self.title_format)
+        first_row = 2 if title else 1
+        worksheet.write_row(first_row - 1, 0, [str(col) for col in columns], self.header_format)
+        self._sheets[table_name] = [worksheet, first_row, part, list(columns)]
+
+    def append(self, table_name: str, df: pd.DataFrame) -> None:
+        """Write the rows of df below the rows already written for table_name (creating its sheet on first use)."""
+        date_columns = [i for i, col in enumerate(df.columns) if pd.api.types.is_datetime64_any_dtype(df[col])]
+        if table_name not in self._sheets:
+            self._new_sheet(table_name, df.columns, 1, date_columns)
+
+        start = 0
+        while start < len(df):
+            worksheet, row, part, columns = self._sheets[table_name]
+            if row >= EXCEL_MAX_ROWS:
+                self._new_sheet(table_name, columns, part + 1, date_columns)
+                continue
+            stop = min(start + self.chunk_rows, start + EXCEL_MAX_ROWS - row, len(df))
+            for record in _chunk_records(df, start, stop):
+                _write_record(worksheet, row, record)
+                row += 1
+            self._sheets[table_name][1] = row
+            start = stop
+
+    def close(self) -> None:
+        self.workbook.close()
+
+def write_excel_streaming(tables: Dict[str, pd.DataFrame], path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                          sheet_titles: Optional[Dict[str, str]] = None) -> str:
+    """
+    Write tables to an XLSX file in xlsxwriter's constant-memory mode.
+
+    Rows are flushed to disk one at a time while the sheet is written and
+    only chunk_rows rows are converted to Python values at once, so memory
+    stays flat regardless of table size. sheet_titles adds a merged title
+    row above a sheet's header.
+    """
+    writer = StreamingExcelWriter(path, sheet_titles, chunk_rows)
+    try:
+        for sheet_name, df in tables.items():
+            writer.append(sheet_name, df)
+    finally:
+        writer.close()
+    return path
+
+class ParquetTableWriter:
+    """Appends chunks of one table to a Parquet file, one row group per chunk, with the first chunk's schema."""
+
+    def __init__(self, path: str):
+        if not PARQUET_AVAILABLE:
+            raise ImportError("pyarrow is required for Parquet output")
+        self.path = path
+        self.schema = None
+        self._writer = None
+
+    def append(self, df: pd.DataFrame) -> None:
+        table = pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+        if self._writer is None:
+            self.schema = table.schema
+            self._writer = pq.ParquetWriter(self.path, self.schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+def write_table_chunks(chunks, path: str, file_format: str = 'parquet', sheet_titles: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+    """
+    Write an iterable of (table_name, DataFrame chunk) pairs without holding whole tables.
+
+    'parquet' writes one <table>.parquet file per table into the directory
+    path; 'xlsx' writes one sheet per table into the workbook path. Returns
+    the number of rows written per table.
+    """
+    rows = {}
+    if file_format == 'xlsx':
+        writer = StreamingExcelWriter(path, sheet_titles)
+        try:
+            for table_name, chunk in chunks:
+                writer.append(table_name, chunk)
+                rows[table_name] = rows.get(table_name, 0) + len(chunk)
+        finally:
+            writer.close()
+        return rows
+
+    os.makedirs(path, exist_ok=True)
+    writers = {}
+    try:
+        for table_name, chunk in chunks:
+            if table_name not in writers:
+                writers[table_name] = ParquetTableWriter(os.path.join(path, f"{table_name}.parquet"))
+            writers[table_name].append(chunk)
+            rows[table_name] = rows.get(table_name, 0) + len(chunk)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return rows
+
+def _write_parquet_member(zf: zipfile.ZipFile, arcname: str, df: pd.DataFrame, chunk_rows: int) -> None:
+    """Write one table as a Parquet member, one row group per chunk, via a temporary file."""
+    fd, temp_path = tempfile.mkstemp(suffix='.parquet')
+    os.close(fd)
+    try:
+        writer = ParquetTableWriter(temp_path)
+        try:
+            for start in range(0, max(len(df), 1), chunk_rows):
+                writer.append(df.iloc[start:start + chunk_rows])
+        finally:
+            writer.close()
+        zf.write(temp_path, arcname, compress_type=zipfile.ZIP_STORED)
+    finally:
+        os.remove(temp_path)
+
+def _write_csv_member(zf: zipfile.ZipFile, arcname: str, df: pd.DataFrame, chunk_rows: int) -> None:
+    """Stream one table into a deflated CSV member."""
+    info = zipfile.ZipInfo(arcname, date_time=datetime.now().timetuple()[:6])
+    info.compress_type = zipfile.ZIP_DEFLATED
+    with zf.open(info, 'w') as raw, io.TextIOWrapper(raw, encoding='utf-8', newline='') as text:
+        df.to_csv(text, index=False, chunksize=chunk_rows)
+
+def write_bundle_zip(tables: Dict[str, pd.DataFrame], path: str, file_format: str = 'parquet',
+                     chunk_rows: int = DEFAULT_CHUNK_ROWS) -> str:
+    """
+    Write tables as a ZIP of one Parquet or CSV file per table.
+
+    A table whose columns Arrow cannot type (for example mixed objects) is
+    written as CSV instead, so a bundle is always complete.
+    """
+    with zipfile.ZipFile(path, 'w') as zf:
+        for name, df in tables.items():
+            if file_format == 'parquet' and PARQUET_AVAILABLE:
+                try:
+                    _write_parquet_member(zf, f"{name}.parquet", df, chunk_rows)
+                    continue
+                except (pa.ArrowException, TypeError, ValueError):
+                    pass
+            _write_csv_member(zf, f"{name}.csv", df, chunk_rows)
+    return path
+
+class ExportJob:
+    """An export being written on the background executor to a temporary file."""
+
+    def __init__(self, future, path: str, file_name: str, mime: str):
+        self.future = future
+        self.path = path
+        self.file_name = file_name
+        self.mime = mime
+        self.started = time.perf_counter()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        """The exception raised while writing, or None."""
+        return self.future.exception() if self.future.done() else None
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def discard(self) -> None:
+        """Delete the exported file once the job has finished (a running job is left to finish first)."""
+        if self.future.done() and os.path.exists(self.path):
+            os.remove(self.path)
+        elif not self.future.done():
+            self.future.add_done_callback(lambda _: os.path.exists(self.path) and os.remove(self.path))
+
+def start_export(tables: Dict[str, pd.DataFrame], export_format: str, file_prefix: str,
+                 sheet_titles: Optional[Dict[str, str]] = None, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> ExportJob:
+    """Begin writing tables in the background as 'xlsx', 'parquet' or 'csv'; returns the running job."""
+    _, suffix, mime = EXPORT_FORMATS[export_format]
+    tables = {name: df for name, df in tables.items() if df is not None}
+    fd, path = tempfile.mkstemp(prefix=f"{file_prefix}_", suffix=suffix)
+    os.close(fd)
+
+    if export_format == 'xlsx':
+        future = _EXPORT_EXECUTOR.submit(write_excel_streaming, tables, path, chunk_rows, sheet_titles)
+    else:
+        future = _EXPORT_EXECUTOR.submit(write_bundle_zip, tables, path, export_format, chunk_rows)
+    file_name = f"{file_prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{suffix}"
+    return ExportJob(future, path, file_name, mime)
+
+def show_export_panel(tables: Dict[str, pd.DataFrame], key: str, file_prefix: str,
+                      sheet_titles: Optional[Dict[str, str]] = None) -> Optional[ExportJob]:
+    """
+    Streamlit export controls: pick a format, prepare the file in the background, then download it.
+
+    The page keeps rendering while the file is written; the download button
+    appears once the job has finished.
+    """
+    import streamlit as st
+
+    job_key = f"{key}_job"
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        export_format = st.selectbox("Export format", list(EXPORT_FORMATS), key=f"{key}_format",
+                                     format_func=lambda fmt: EXPORT_FORMATS[fmt][0])
+    with col2:
+        st.markdown("<div style='height: 28px'></div>", unsafe_allow_html=True)
+        prepare = st.button("📤 Prepare Export", key=f"{key}_prepare", use_container_width=True)
+
+    if prepare:
+        previous = st.session_state.get(job_key)
+        if previous is not None:
+            previous.discard()
+        st.session_state[job_key] = start_export(tables, export_format, file_prefix, sheet_titles)
+
+    job = st.session_state.get(job_key)
+    if job is None:
+        return None
+
+    if not job.done():
+        fragment = getattr(st, 'fragment', None)
+        if fragment is not None:
+            # Poll without rerunning the page; a full rerun shows the download button once ready
+            @fragment(run_every=1.0)
+            def _poll_export():
+                if job.done():
+                    st.rerun()
+                st.info(f"⏳ Preparing {job.file_name}... ({job.elapsed:.0f}s)")
+            _poll_export()
+        else:
+            st.info(f"⏳ Preparing {job.file_name}... ({job.elapsed:.0f}s)")
+            st.button("🔄 Check Export Status", key=f"{key}_refresh")
+        return job
+
+    if job.error is not None:
+        st.error(f"❌ Export failed: {job.error}")
+        return job
+
+    with open(job.path, 'rb') as exported:
+        st.download_button(
+            label=f"📥 Download {job.file_name}",
+            data=exported,
+            file_name=job.file_name,
+            mime=job.mime,
+            key=f"{key}_download"
+        )
+    return job
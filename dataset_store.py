@@ -0,0 +1,253 @@
+import os
+import re
+import json
+import shutil
+import hashlib
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Any
+import pandas as pd
+
+from workbook_ingest import read_workbook
+
+# Parquet/Arrow support is optional; without it the store is disabled and callers read Excel directly
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    pa = None
+    pq = None
+    PARQUET_AVAILABLE = False
+
+DEFAULT_DATA_DIR = os.environ.get(
+    'AZ_DATA_STORE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data_store')
+)
+
+MANIFEST_FILE = 'manifest.json'
+
+def compute_content_hash(source) -> str:
+    """Compute a SHA-256 hash of an uploaded file, path or raw bytes."""
+    hasher = hashlib.sha256()
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        hasher.update(source)
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                hasher.update(chunk)
+    elif hasattr(source, 'getvalue'):
+        # Streamlit UploadedFile and BytesIO expose the full buffer
+        hasher.update(source.getvalue())
+    else:
+        position = source.tell()
+        source.seek(0)
+        for chunk in iter(lambda: source.read(1024 * 1024), b''):
+            hasher.update(chunk)
+        source.seek(position)
+
+    return hasher.hexdigest()
+
+def _safe_name(name: str) -> str:
+    """Turn a department or table name into a safe file name."""
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', str(name)).strip('_') or 'table'
+
+def _to_arrow_table(df: pd.DataFrame):
+    """Convert a DataFrame to Arrow, stringifying mixed-type object columns Excel often produces."""
+    df = df.copy()
+    df.columns = [str(col) for col in df.columns]
+
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        pass
+
+    for col in df.columns:
+        if df[col].dtype == object:
+            try:
+                pa.array(df[col], from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                df[col] = df[col].map(lambda v: v if pd.isna(v) else str(v))
+
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+class DatasetStore:
+    """Columnar on-disk store of department tables, keyed by department and table name."""
+
+    def __init__(self, data_dir: Optional[str] = None):
+        self.data_dir = data_dir or DEFAULT_DATA_DIR
+
+    @property
+    def available(self) -> bool:
+        """Whether Parquet storage can be used in this environment."""
+        return PARQUET_AVAILABLE
+
+    def _department_dir(self, department: str) -> str:
+        return os.path.join(self.data_dir, _safe_name(department))
+
+    def table_path(self, department: str, table: str) -> str:
+        """Path of the Parquet file backing a table."""
+        return os.path.join(self._department_dir(department), f"{_safe_name(table)}.parquet")
+
+    def _read_manifest(self, department: str) -> Dict[str, Any]:
+        manifest_path = os.path.join(self._department_dir(department), MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return {'tables': {}, 'workbook': None}
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'tables': {}, 'workbook': None}
+
+    def _write_manifest(self, department: str, manifest: Dict[str, Any]):
+        dept_dir = self._department_dir(department)
+        os.makedirs(dept_dir, exist_ok=True)
+        manifest_path = os.path.join(dept_dir, MANIFEST_FILE)
+        tmp_path = manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+
+    def list_tables(self, department: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the manifest entries of the stored tables for a department.
+
+        Once a workbook has been ingested only its sheets are listed, so sheets
+        left behind by an earlier workbook are not served as current data.
+        """
+        manifest = self._read_manifest(department)
+        workbook = manifest.get('workbook')
+        current = set(workbook.get('tables', [])) if workbook else None
+        return {
+            table: info for table, info in manifest.get('tables', {}).items()
+            if (current is None or table in current) and os.path.exists(self.table_path(department, table))
+        }
+
+    def get_table_info(self, department: str, table: str) -> Optional[Dict[str, Any]]:
+        """Return the manifest entry (hash, rows, columns, ingest time) for a table."""
+        return self.list_tables(department).get(table)
+
+    def has_table(self, department: str, table: str) -> bool:
+        """Check whether a table is stored for a department."""
+        return self.get_table_info(department, table) is not None
+
+    def is_current(self, department: str, table: str, content_hash: str) -> bool:
+        """Check whether a stored table was ingested from content with this hash."""
+        info = self.get_table_info(department, table)
+        return info is not None and info.get('content_hash') == content_hash
+
+    def save_table(self, department: str, table: str, df: pd.DataFrame,
+                   content_hash: Optional[str] = None, source: Optional[str] = None):
+        """Write a table to Parquet and record it in the department manifest."""
+        if not self.available:
+            raise RuntimeError("pyarrow is required for the dataset store")
+
+        os.makedirs(self._department_dir(department), exist_ok=True)
+        path = self.table_path(department, table)
+        tmp_path = path + '.tmp'
+        pq.write_table(_to_arrow_table(df), tmp_path)
+        os.replace(tmp_path, path)
+
+        manifest = self._read_manifest(department)
+        manifest.setdefault('tables', {})[table] = {
+            'content_hash': content_hash,
+            'source': source,
+            'rows': int(len(df)),
+            'columns': [str(col) for col in df.columns],
+            'size_bytes': os.path.getsize(path),
+            'ingested_at': datetime.now().isoformat(timespec='seconds')
+        }
+        self._write_manifest(department, manifest)
+
+    def load_table(self, department: str, table: str) -> Optional[pd.DataFrame]:
+        """Load a stored table, memory-mapping the Parquet file."""
+        if not self.available:
+            return None
+        path = self.table_path(department, table)
+        if not os.path.exists(path):
+            return None
+        return pq.read_table(path, memory_map=True).to_pandas()
+
+    def load_tables(self, department: str, tables: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+        """Load several stored tables for a department (all of them by default)."""
+        names = tables if tables is not None else list(self.list_tables(department).keys())
+        loaded = {}
+        for table in names:
+            df = self.load_table(department, table)
+            if df is not None:
+                loaded[table] = df
+        return loaded
+
+    def ingest_workbook(self, department: str, source, sheet_names: Optional[List[str]] = None,
+                        schemas: Optional[Dict[str, Dict[str, str]]] = None) -> Tuple[Dict[str, pd.DataFrame], bool]:
+        """
+        Ingest an Excel workbook into the store, one table per sheet.
+
+        Returns the tables and whether they were served from the store because
+        the same workbook content had already been ingested.
+        """
+        content_hash = compute_content_hash(source)
+        manifest = self._read_manifest(department)
+        workbook = manifest.get('workbook') or {}
+
+        if workbook.get('content_hash') == content_hash:
+            stored_sheets = workbook.get('tables', [])
+            wanted = [s for s in stored_sheets if sheet_names is None or s in sheet_names]
+            if all(self.is_current(department, table, content_hash) for table in wanted):
+                return self.load_tables(department, wanted), True
+
+        excel_data, timings = read_workbook(source, schemas=schemas)
+
+        source_name = getattr(source, 'name', None) if not isinstance(source, (str, os.PathLike)) else os.path.basename(str(source))
+        for sheet, df in excel_data.items():
+            self.save_table(department, sheet, df, content_hash=content_hash, source=source_name)
+
+        manifest = self._read_manifest(department)
+        manifest['workbook'] = {
+            'content_hash': content_hash,
+            'source': source_name,
+            'tables': list(excel_data.keys()),
+            'parse_ms': {sheet: round(seconds * 1000, 1) for sheet, seconds in timings.items()}
+        }
+        self._write_manifest(department, manifest)
+
+        if sheet_names is not None:
+            excel_data = {sheet: df for sheet, df in excel_data.items() if sheet in sheet_names}
+        return excel_data, False
+
+    def remove_department(self, department: str):
+        """Delete every stored table for a department."""
+        dept_dir = self._department_dir(department)
+        if os.path.isdir(dept_dir):
+            shutil.rmtree(dept_dir)
+
+_store = None
+
+def get_dataset_store() -> DatasetStore:
+    """Return the process-wide dataset store."""
+    global _store
+    if _store is None:
+        _store = DatasetStore()
+    return _store
+
+def load_workbook_tables(department: str, source, sheet_names: Optional[List[str]] = None,
+                         schemas: Optional[Dict[str, Dict[str, str]]] = None) -> Dict[str, pd.DataFrame]:
+    """Read a workbook through the dataset store, falling back to a single-pass Excel read."""
+    store = get_dataset_store()
+    if store.available:
+        try:
+            tables, _ = store.ingest_workbook(department, source, sheet_names, schemas)
+            return tables
+        except OSError:
+            # Read-only or full disk: still serve the upload without persisting it
+            pass
+
+    excel_data, _ = read_workbook(source, sheet_names, schemas)
+    return excel_data
+
+def load_saved_tables(department: str, tables: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+    """Load previously ingested tables for a department, or an empty dict if none are stored."""
+    store = get_dataset_store()
+    if not store.available:
+        return {}
+    return store.load_tables(department, tables)
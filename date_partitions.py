@@ -0,0 +1,145 @@
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from metric_cache import share_fingerprint
+
+# Procurement pages apply a year/quarter filter only if it keeps at least this many orders
+PO_FILTER_MIN_ROWS = 5
+
+def _copy_on_write_enabled() -> bool:
+    """Whether row slices are safe to hand out (pandas copy-on-write semantics)."""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    try:
+        return pd.get_option('mode.copy_on_write') is True
+    except (KeyError, pd.errors.OptionError):
+        return False
+
+def parse_quarter(quarter) -> Optional[int]:
+    """Quarter number from a 'Q1'..'Q4' selection, or None for 'All' / invalid values."""
+    if not quarter or quarter == 'All':
+        return None
+    try:
+        quarter_num = int(str(quarter)[1])
+    except (ValueError, IndexError):
+        return None
+    return quarter_num if 1 <= quarter_num <= 4 else None
+
+class DatePartitionIndex:
+    """
+    Date-typed copy of a table partitioned by year and quarter.
+
+    The date column is parsed once, rows with invalid dates are dropped and the
+    table is stably sorted by (year, quarter), so every year and every
+    year/quarter is one contiguous block of rows (original index labels and
+    row order within a quarter are kept). Filters are answered from a
+    dictionary of row ranges and return slices of the canonical table instead
+    of re-parsing and masking the full frame.
+    """
+
+    def __init__(self, df: pd.DataFrame, date_column: str):
+        self.source = df
+        self.source_rows = len(df)
+        self.date_column = date_column
+
+        dates = pd.to_datetime(df[date_column], errors='coerce')
+        valid = dates.notna().to_numpy()
+        years = dates.dt.year.to_numpy()[valid].astype(np.int64)
+        quarters = dates.dt.quarter.to_numpy()[valid].astype(np.int64)
+
+        order = np.lexsort((quarters, years))
+        table = df.iloc[np.flatnonzero(valid)[order]].copy()
+        table[date_column] = dates.to_numpy()[valid][order]
+        table['year'] = years[order].astype('int32')
+        table['quarter'] = quarters[order].astype('int32')
+        self.table = table
+
+        # (year, quarter) -> [start, stop) and year -> [start, stop)
+        self.quarter_ranges: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        self.year_ranges: Dict[int, Tuple[int, int]] = {}
+        sorted_years = years[order]
+        sorted_quarters = quarters[order]
+        if len(sorted_years):
+            keys = sorted_years * 10 + sorted_quarters
+            boundaries = np.flatnonzero(np.diff(keys)) + 1
+            starts = np.concatenate([[0], boundaries])
+            stops = np.concatenate([boundaries, [len(keys)]])
+            for start, stop in zip(starts, stops):
+                year, quarter = int(sorted_years[start]), int(sorted_quarters[start])
+                self.quarter_ranges[(year, quarter)] = (int(start), int(stop))
+                year_start, _ = self.year_ranges.get(year, (int(start), int(stop)))
+                self.year_ranges[year] = (year_start, int(stop))
+
+        self._views = _copy_on_write_enabled()
+        # Row ranges -> the frame selected for them, so repeated selections share one metric cache fingerprint
+        self._selections: Dict[Tuple[Tuple[int, int], ...], pd.DataFrame] = {}
+
+    @property
+    def years(self) -> List[int]:
+        """Years present in the table, ascending."""
+        return sorted(self.year_ranges)
+
+    def is_current(self, df: pd.DataFrame) -> bool:
+        """Whether the index was built from this exact table object."""
+        return df is self.source and len(df) == self.source_rows
+
+    def _rows(self, ranges) -> pd.DataFrame:
+        """
+        Rows of one or more [start, stop) ranges of the table, as a new frame.
+
+        The selection is built once per set of ranges and handed out as a copy
+        (shallow under copy-on-write) that shares its fingerprint, so cached
+        metrics on a filtered page do not rehash it on every rerun.
+        """
+        ranges = tuple(ranges)
+        rows = self._selections.get(ranges)
+        if rows is None:
+            if len(ranges) == 1:
+                rows = self.table.iloc[ranges[0][0]:ranges[0][1]]
+            else:
+                # One block per year; gathering k blocks costs O(k)
+                rows = pd.concat([self.table.iloc[start:stop] for start, stop in ranges])
+            self._selections[ranges] = rows
+        selection = rows.copy(deep=not self._views)
+        share_fingerprint(selection, rows)
+        return selection
+
+    def _slice(self, start: int, stop: int) -> pd.DataFrame:
+        return self._rows([(start, stop)])
+
+    def count(self, year=None, quarter=None) -> int:
+        """Number of rows in a year and/or quarter without materializing them."""
+        quarter_num = parse_quarter(quarter)
+        if year is not None and quarter_num is not None:
+            start, stop = self.quarter_ranges.get((int(year), quarter_num), (0, 0))
+            return stop - start
+        if year is not None:
+            start, stop = self.year_ranges.get(int(year), (0, 0))
+            return stop - start
+        if quarter_num is not None:
+            return sum(stop - start for (_, q), (start, stop) in self.quarter_ranges.items() if q == quarter_num)
+        return len(self.table)
+
+    def select(self, year=None, quarter=None, min_rows: int = 0) -> pd.DataFrame:
+        """
+        Rows for a year and/or quarter ('Q1'..'Q4' or 'All').
+
+        Each filter is applied only if it keeps at least min_rows rows; with
+        min_rows=0 filters always apply, possibly returning an empty frame.
+        """
+        quarter_num = parse_quarter(quarter)
+
+        use_year = year is not None and self.count(year=year) >= min_rows
+        if use_year and quarter_num is not None and self.count(year=year, quarter=quarter) >= min_rows:
+            start, stop = self.quarter_ranges.get((int(year), quarter_num), (0, 0))
+            return self._slice(start, stop)
+        if use_year:
+            start, stop = self.year_ranges.get(int(year), (0, 0))
+            return self._slice(start, stop)
+
+        if quarter_num is not None and self.count(quarter=quarter) >= min_rows:
+            ranges = [rows for (_, q), rows in sorted(self.quarter_ranges.items()) if q == quarter_num]
+            return self._rows(ranges or [(0, 0)])
+
+        return self._slice(0, len(self.table))
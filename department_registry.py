@@ -0,0 +1,123 @@
+import os
+import ast
+import time
+import threading
+import importlib.util
+from typing import Any, Dict, Optional
+
+class DepartmentRegistry:
+    """
+    Process-wide registry of department modules.
+
+    Each department file is executed at most once per process (again only if
+    the file changes on disk). Health checks resolve the module spec and parse
+    the source for its entry point without executing it.
+    """
+
+    def __init__(self):
+        self._modules = {}
+        self._import_times = {}
+        self._errors = {}
+        self._entry_points = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _mtime(module_path: str) -> Optional[float]:
+        try:
+            return os.path.getmtime(module_path)
+        except OSError:
+            return None
+
+    def get_module(self, module_name: str, module_path: str) -> Any:
+        """Return the department module, executing its file only on first use or after it changes."""
+        mtime = self._mtime(module_path)
+        cached = self._modules.get(module_path)
+        if cached is not None and cached[1] == mtime:
+            return cached[0]
+
+        with self._lock:
+            cached = self._modules.get(module_path)
+            if cached is not None and cached[1] == mtime:
+                return cached[0]
+
+            start = time.perf_counter()
+            try:
+                spec = importlib.util.spec_from_file_location(module_name, module_path)
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+            except Exception as e:
+                self._errors[module_path] = (str(e), mtime)
+                raise
+
+            self._import_times[module_path] = time.perf_counter() - start
+            self._errors.pop(module_path, None)
+            self._modules[module_path] = (module, mtime)
+            return module
+
+    def is_loaded(self, module_path: str) -> bool:
+        """Whether the department module has already been imported in this process."""
+        return module_path in self._modules
+
+    def _has_entry_point(self, module_path: str, entry_point: str) -> bool:
+        """Parse the source (cached by modification time) and look for a top-level entry function."""
+        mtime = self._mtime(module_path)
+        cache_key = (module_path, entry_point)
+        cached = self._entry_points.get(cache_key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with open(module_path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=module_path)
+        found = any(
+            isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == entry_point
+            for node in tree.body
+        )
+        self._entry_points[cache_key] = (mtime, found)
+        return found
+
+    def check_health(self, module_name: str, module_path: str, entry_point: str = 'main') -> str:
+        """Return 'active', 'warning' or 'error' for a department without executing it."""
+        if not os.path.exists(module_path):
+            return "error"
+        error = self._errors.get(module_path)
+        if error is not None and error[1] == self._mtime(module_path):
+            return "error"
+
+        cached = self._modules.get(module_path)
+        if cached is not None:
+            return "active" if callable(getattr(cached[0], entry_point, None)) else "warning"
+
+        try:
+            spec = importlib.util.spec_from_file_location(module_name, module_path)
+            if spec is None or spec.loader is None:
+                return "error"
+            return "active" if self._has_entry_point(module_path, entry_point) else "warning"
+        except (SyntaxError, UnicodeDecodeError, OSError):
+            return "error"
+
+    def get_import_time(self, module_path: str) -> Optional[float]:
+        """Seconds the last import of a department took, or None if it has not been imported."""
+        return self._import_times.get(module_path)
+
+    def get_error(self, module_path: str) -> Optional[str]:
+        """The error raised by the last failed import of a department, if any."""
+        error = self._errors.get(module_path)
+        return error[0] if error is not None else None
+
+    def get_import_times(self) -> Dict[str, float]:
+        """Import time in seconds for every department imported so far, keyed by file path."""
+        return dict(self._import_times)
+
+    def clear(self):
+        """Forget all imported modules so the next access re-imports them."""
+        with self._lock:
+            self._modules.clear()
+            self._import_times.clear()
+            self._errors.clear()
+            self._entry_points.clear()
+
+_registry = DepartmentRegistry()
+
+def get_department_registry() -> DepartmentRegistry:
+    """Return the process-wide department registry."""
+    return _registry
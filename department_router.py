@@ -1,10 +1,15 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import os
 import sys
-import importlib.util
 from typing import Dict, Any, Optional
 import pandas as pd
 
+from department_registry import get_department_registry
+from perf_instrumentation import (
+    get_perf_recorder, instrument_namespace, timed, session_frame_sizes, export_json, export_csv
+)
+
 class DepartmentRouter:
     """Handles routing and integration between different department applications"""
     
@@ -112,14 +117,11 @@ class DepartmentRouter:
                 st.error(f"Department file not found: {module_path}")
                 return None
             
-            # Load the module
-            spec = importlib.util.spec_from_file_location(
-                dept_info['module_name'], 
-                module_path
-            )
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
+            # Import once per process; later navigations and reruns reuse the module
+            module = get_department_registry().get_module(dept_info['module_name'], module_path)
             
+            # Time page functions when instrumentation is on (wrapping is idempotent)
+            instrument_namespace(vars(module), 'show_', 'page', dept_key)
             return module
             
         except Exception as e:
@@ -142,7 +144,7 @@ class DepartmentRouter:
                 st.session_state.department_name = dept_info['name']
                 
                 # Run the department's main function
-                main_function()
+                timed(main_function, 'department', dept_info['main_function'], dept_key)()
                 return True
             else:
                 st.error(f"Main function '{dept_info['main_function']}' not found in {dept_info['module_name']}")
@@ -185,6 +187,9 @@ class DepartmentRouter:
         
         if st.sidebar.button("⚙️ Settings"):
             st.session_state.show_settings = True
+        
+        if st.sidebar.button("⏱️ Performance"):
+            st.session_state.show_performance = True
     
     def get_department_status(self, dept_key: str) -> str:
         """Get the status of a department (active, inactive, error)"""
@@ -192,19 +197,20 @@ class DepartmentRouter:
             dept_info = self.departments[dept_key]
             module_path = os.path.join(self.current_dir, dept_info['file'])
             
-            if not os.path.exists(module_path):
-                return "error"
-            
-            # Try to load the module to check if it's working
-            module = self.load_department_module(dept_key)
-            if module:
-                return "active"
-            else:
-                return "warning"
+            # Resolve the spec and entry point without executing the department file
+            return get_department_registry().check_health(
+                dept_info['module_name'], module_path, dept_info['main_function']
+            )
                 
         except Exception:
             return "error"
     
+    def get_department_import_time(self, dept_key: str) -> Optional[float]:
+        """Get how long the department module took to import, or None if not imported yet"""
+        dept_info = self.departments[dept_key]
+        module_path = os.path.join(self.current_dir, dept_info['file'])
+        return get_department_registry().get_import_time(module_path)
+    
     def create_department_overview(self):
         """Create an overview of all departments with their status"""
         st.subheader("🏢 Department Status Overview")
@@ -214,6 +220,8 @@ class DepartmentRouter:
         for i, (dept_key, dept_info) in enumerate(self.departments.items()):
             with cols[i % 2]:
                 status = self.get_department_status(dept_key)
+                import_time = self.get_department_import_time(dept_key)
+                import_text = f"Loaded in {import_time:.2f}s" if import_time is not None else "Not loaded yet"
                 
                 # Status color mapping
                 status_colors = {
@@ -233,6 +241,7 @@ class DepartmentRouter:
                     <h4 style="margin: 0 0 10px 0;">{dept_info['icon']} {dept_info['name']}</h4>
                     <p style="font-size: 12px; color: #666; margin: 0 0 10px 0;">{dept_info['description']}</p>
                     <span style="color: {status_colors[status]}; font-weight: 600;">{status_text[status]}</span>
+                    <span style="font-size: 12px; color: #666; margin-left: 10px;">{import_text}</span>
                 </div>
                 """, unsafe_allow_html=True)
     
@@ -318,6 +327,78 @@ class DepartmentRouter:
             
             st.success("Settings saved successfully!")
     
+    def create_performance_view(self):
+        """Create a view of page/metric timings, rerun memory and session data sizes"""
+        st.subheader("⏱️ Performance")
+        recorder = get_perf_recorder()
+        
+        enabled = st.toggle(
+            "Enable instrumentation",
+            value=recorder.enabled,
+            help="Time department pages and metric calculations and record memory per rerun of this session. "
+                 "While off, instrumented calls only check this switch."
+        )
+        if enabled != recorder.enabled:
+            recorder.enabled = enabled
+            st.session_state.perf_instrumentation = enabled
+        
+        # Measurements are shared by every session of the server process
+        session = current_session_id() if st.checkbox("Only this session", value=False) else None
+        spans = recorder.spans_frame(session)
+        reruns = recorder.reruns_frame(session)
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Recorded Reruns", len(reruns))
+        with col2:
+            st.metric("Recorded Spans", len(spans))
+        with col3:
+            rss = reruns['rss_mb'].dropna()
+            st.metric("Process Memory", f"{rss.iloc[-1]:,.0f} MB" if not rss.empty else "N/A")
+        with col4:
+            peak = reruns['peak_rss_mb'].dropna()
+            st.metric("Peak Memory", f"{peak.iloc[-1]:,.0f} MB" if not peak.empty else "N/A")
+        
+        if spans.empty and reruns.empty:
+            st.info("No measurements yet. Enable instrumentation and open a department page.")
+        
+        tab1, tab2, tab3, tab4 = st.tabs(["📄 Pages", "🧮 Metrics", "🔁 Reruns", "🗃️ Session Data"])
+        with tab1:
+            st.dataframe(recorder.summary('page', session), use_container_width=True)
+            departments = recorder.summary('department', session)
+            if not departments.empty:
+                st.markdown("**Department entry points**")
+                st.dataframe(departments, use_container_width=True)
+        with tab2:
+            st.dataframe(recorder.summary('metric', session), use_container_width=True)
+        with tab3:
+            if not reruns.empty:
+                st.line_chart(reruns.set_index('rerun')[['seconds']], height=200)
+                st.line_chart(reruns.set_index('rerun')[['rss_mb', 'peak_rss_mb']], height=200)
+            st.dataframe(reruns.iloc[::-1], use_container_width=True)
+        with tab4:
+            frames = session_frame_sizes(st.session_state)
+            st.caption(f"{len(frames)} DataFrames, {frames['memory_mb'].sum():,.1f} MB in session state")
+            st.dataframe(frames, use_container_width=True)
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.download_button("📥 Export JSON", export_json(recorder, frames, session),
+                               file_name="performance.json", mime="application/json")
+        with col2:
+            st.download_button("📥 Spans CSV", export_csv(spans), file_name="performance_spans.csv", mime="text/csv")
+        with col3:
+            st.download_button("📥 Reruns CSV", export_csv(reruns), file_name="performance_reruns.csv", mime="text/csv")
+        with col4:
+            if st.button("🗑️ Clear Measurements"):
+                recorder.clear()
+                st.rerun()
+        
+        # Unlike the other views this one stays open across its own widget interactions
+        if st.button("✖️ Close Performance View"):
+            st.session_state.show_performance = False
+            st.rerun()
+    
     def handle_navigation(self):
         """Main navigation handler"""
         # Check if a department is selected
@@ -357,6 +438,14 @@ class DepartmentRouter:
             if st.session_state.get('show_settings', False):
                 self.create_settings_view()
                 st.session_state.show_settings = False
+            
+            if st.session_state.get('show_performance', False):
+                self.create_performance_view()
+
+def current_session_id():
+    """Id of the Streamlit session running this script, or None outside a script run."""
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
 
 # Global router instance
 router = DepartmentRouter()
@@ -374,11 +463,16 @@ def main():
     if 'active_department' not in st.session_state:
         st.session_state.active_department = None
     
-    # Create navigation
-    router.create_department_navigation()
-    
-    # Handle navigation
-    router.handle_navigation()
+    recorder = get_perf_recorder()
+    recorder.begin_rerun(st.session_state.active_department, current_session_id(), st.session_state.get('perf_instrumentation'))
+    try:
+        # Create navigation
+        router.create_department_navigation()
+        
+        # Handle navigation
+        router.handle_navigation()
+    finally:
+        recorder.end_rerun()
 
 if __name__ == "__main__":
     main()
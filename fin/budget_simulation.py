@@ -0,0 +1,273 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+try:
+    from synthetic_data import chunk_rng
+except ImportError:
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from synthetic_data import chunk_rng
+
+DEFAULT_SIMULATION_PATHS = 100000
+SIMULATION_CHUNK_PATHS = 20000
+DEFAULT_SIMULATION_SEED = 42
+DEFAULT_HORIZON = 12
+
+# Used when there is too little history to estimate volatility and correlation
+DEFAULT_REVENUE_VOLATILITY = 0.05
+DEFAULT_EXPENSE_VOLATILITY = 0.04
+DEFAULT_SHOCK_CORRELATION = 0.3
+MIN_HISTORY_POINTS = 3
+
+PERCENTILES = (5, 50, 95)
+
+# Partial bands are recomputed over all paths so far every this many chunks (and after the last)
+BAND_REFRESH_CHUNKS = 2
+BAND_COLUMNS = ['period', 'metric', 'p5', 'p50', 'p95', 'budget']
+
+SIMULATION_WORKERS = int(os.environ.get('AZ_SIMULATION_WORKERS', min(4, os.cpu_count() or 1)))
+
+def _period_totals(df: pd.DataFrame, columns) -> pd.DataFrame:
+    """Sum columns per period (budget rows may be split by category), keeping first-seen period order."""
+    if df.empty or not all(col in df.columns for col in columns):
+        return pd.DataFrame(columns=['period', *columns])
+    values = df[list(columns)].apply(pd.to_numeric, errors='coerce')
+    if 'period' not in df.columns:
+        return values.assign(period=np.arange(1, len(values) + 1))[['period', *columns]]
+    return values.groupby(df['period'], sort=False).sum().reset_index()
+
+def _actuals(income_statement: pd.DataFrame) -> pd.DataFrame:
+    """Actual revenue and expenses (cost of goods sold + operating expenses) per period."""
+    if income_statement.empty or 'revenue' not in income_statement.columns:
+        return pd.DataFrame(columns=['period', 'revenue', 'expenses'])
+    actuals = income_statement.copy()
+    expense_cols = [col for col in ('cost_of_goods_sold', 'operating_expenses') if col in actuals.columns]
+    actuals['expenses'] = actuals[expense_cols].apply(pd.to_numeric, errors='coerce').sum(axis=1) if expense_cols else np.nan
+    return _period_totals(actuals, ('revenue', 'expenses'))
+
+def _shock_parameters(actuals: pd.DataFrame, forecast: pd.DataFrame) -> Tuple[np.ndarray, float, str]:
+    """
+    Per-period volatility of (revenue, expenses) and their correlation.
+
+    Relative forecast errors are used where forecasts overlap actuals,
+    otherwise period-over-period changes of the actuals, otherwise defaults.
+    """
+    changes = pd.DataFrame()
+    source = 'defaults'
+    if not forecast.empty and not actuals.empty:
+        overlap = forecast.merge(actuals, on='period', suffixes=('_forecast', '_actual'))
+        if len(overlap) >= MIN_HISTORY_POINTS:
+            changes = pd.DataFrame({
+                'revenue': overlap['revenue_actual'] / overlap['revenue_forecast'] - 1,
+                'expenses': overlap['expenses_actual'] / overlap['expenses_forecast'] - 1
+            })
+            source = 'forecast errors'
+    if changes.empty and len(actuals) > MIN_HISTORY_POINTS:
+        changes = actuals[['revenue', 'expenses']].pct_change().iloc[1:]
+        source = 'historical changes'
+
+    changes = changes.replace([np.inf, -np.inf], np.nan).dropna()
+    if len(changes) < MIN_HISTORY_POINTS:
+        return np.array([DEFAULT_REVENUE_VOLATILITY, DEFAULT_EXPENSE_VOLATILITY]), DEFAULT_SHOCK_CORRELATION, 'defaults'
+
+    volatility = changes.std().to_numpy(dtype=float)
+    volatility = np.where(volatility > 0, volatility, [DEFAULT_REVENUE_VOLATILITY, DEFAULT_EXPENSE_VOLATILITY])
+    correlation = changes['revenue'].corr(changes['expenses'])
+    correlation = float(np.clip(correlation, -0.95, 0.95)) if pd.notna(correlation) else DEFAULT_SHOCK_CORRELATION
+    return volatility, correlation, source
+
+def simulation_inputs(income_statement: pd.DataFrame, budget: pd.DataFrame, forecast: pd.DataFrame,
+                      horizon: int = DEFAULT_HORIZON) -> Optional[Dict]:
+    """
+    Base paths, budget reference and shock parameters for the simulation, or None without data.
+
+    The base path is the forecast, else the budget, else the latest actual
+    held flat for horizon periods.
+    """
+    actuals = _actuals(income_statement)
+    forecast_totals = _period_totals(forecast, ('revenue', 'expenses'))
+    budget_totals = _period_totals(budget, ('revenue', 'expenses'))
+
+    if not forecast_totals.empty:
+        base, base_source = forecast_totals, 'forecast'
+    elif not budget_totals.empty:
+        base, base_source = budget_totals, 'budget'
+    elif not actuals.empty:
+        latest = actuals.iloc[-1]
+        base = pd.DataFrame({
+            'period': [f"+{h}" for h in range(1, horizon + 1)],
+            'revenue': latest['revenue'],
+            'expenses': latest['expenses']
+        })
+        base_source = 'latest actual'
+    else:
+        return None
+
+    base = base.fillna(0.0)
+    reference = base[['period']].merge(budget_totals, on='period', how='left')
+    volatility, correlation, shock_source = _shock_parameters(actuals, forecast_totals)
+    return {
+        'periods': base['period'].astype(str).tolist(),
+        'base': base[['revenue', 'expenses']].to_numpy(dtype=float).T,
+        'budget': reference[['revenue', 'expenses']].to_numpy(dtype=float).T,
+        'volatility': volatility,
+        'correlation': correlation,
+        'base_source': base_source,
+        'shock_source': shock_source
+    }
+
+def simulate_chunk(base: np.ndarray, volatility: np.ndarray, correlation: float, seed: int,
+                   chunk_index: int, n_paths: int) -> Tuple[int, np.ndarray, np.ndarray]:
+    """
+    Revenue and expense paths for one chunk, as (n_paths x periods) float32 arrays.
+
+    Correlated (revenue, expense) shocks are drawn as one matrix and
+    compounded along each path, so uncertainty widens with the horizon.
+    The chunk's generator depends only on (seed, chunk_index).
+    """
+    rng = chunk_rng(seed, chunk_index)
+    covariance = np.array([
+        [volatility[0] ** 2, correlation * volatility[0] * volatility[1]],
+        [correlation * volatility[0] * volatility[1], volatility[1] ** 2]
+    ])
+    shocks = rng.standard_normal((n_paths, base.shape[1], 2)) @ np.linalg.cholesky(covariance).T
+    # Drift correction keeps the mean path on the base path
+    growth = np.exp(np.cumsum(shocks - 0.5 * volatility ** 2, axis=1))
+    revenue = (base[0] * growth[..., 0]).astype(np.float32)
+    expenses = (base[1] * growth[..., 1]).astype(np.float32)
+    return chunk_index, revenue, expenses
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_simulation_pool(workers: int = SIMULATION_WORKERS) -> Optional[ProcessPoolExecutor]:
+    """Process-wide worker pool for simulation chunks, or None when running in-process."""
+    global _pool
+    if workers <= 1:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # forkserver/spawn workers start clean instead of copying the server's threads
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        return _pool
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        _pool = None
+
+def _bands(inputs: Dict, revenue: np.ndarray, expenses: np.ndarray) -> pd.DataFrame:
+    """P5/P50/P95 per period of revenue, expenses, profit and profit variance against budget."""
+    budget_revenue, budget_expenses = inputs['budget']
+    budget_profit = budget_revenue - budget_expenses
+    profit = revenue - expenses
+    metrics = {
+        'revenue': (revenue, budget_revenue),
+        'expenses': (expenses, budget_expenses),
+        'profit': (profit, budget_profit),
+        # Same fan as profit, shifted by the budgeted profit of each period
+        'profit_variance': (profit, budget_profit)
+    }
+    frames = []
+    for metric, (values, budget) in metrics.items():
+        bands = np.percentile(values, PERCENTILES, axis=0).astype(float)
+        if metric == 'profit_variance':
+            bands = bands - budget
+            budget = np.where(np.isnan(budget), np.nan, 0.0)
+        frames.append(pd.DataFrame({
+            'period': inputs['periods'],
+            'metric': metric,
+            'p5': bands[0],
+            'p50': bands[1],
+            'p95': bands[2],
+            'budget': budget
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+def iter_budget_simulation(inputs: Dict, n_paths: int = DEFAULT_SIMULATION_PATHS, seed: int = DEFAULT_SIMULATION_SEED,
+                           chunk_paths: int = SIMULATION_CHUNK_PATHS, workers: int = SIMULATION_WORKERS) -> Iterator[Tuple[int, Optional[pd.DataFrame]]]:
+    """
+    Yield (paths simulated so far, percentile bands so far) as chunks complete.
+
+    Bands are only recomputed every BAND_REFRESH_CHUNKS chunks and after the
+    last one; other chunks yield None for them. Chunks run in the simulation
+    process pool (in-process for a single worker) and pending ones are
+    cancelled if the caller stops early. Every path lands in a fixed slot, so
+    the final bands are the same for a given seed whatever order the chunks
+    finish in.
+    """
+    n_periods = inputs['base'].shape[1]
+    sizes = [min(chunk_paths, n_paths - start) for start in range(0, n_paths, chunk_paths)]
+    offsets = np.r_[0, np.cumsum(sizes)]
+    revenue = np.empty((n_paths, n_periods), dtype=np.float32)
+    expenses = np.empty((n_paths, n_periods), dtype=np.float32)
+    filled = np.zeros(n_paths, dtype=bool)
+    args = (inputs['base'], inputs['volatility'], inputs['correlation'], seed)
+
+    def completed():
+        pool = get_simulation_pool(workers)
+        if pool is not None:
+            futures = []
+            try:
+                futures = [pool.submit(simulate_chunk, *args, index, size) for index, size in enumerate(sizes)]
+                for future in as_completed(futures):
+                    yield future.result()
+                return
+            except (BrokenProcessPool, OSError):
+                # Workers could not start (or died); finish in-process
+                _reset_pool()
+            finally:
+                for future in futures:
+                    future.cancel()
+        for index, size in enumerate(sizes):
+            if not filled[offsets[index]]:
+                yield simulate_chunk(*args, index, size)
+
+    done = chunks = 0
+    for index, chunk_revenue, chunk_expenses in completed():
+        if filled[offsets[index]]:
+            continue
+        start, stop = offsets[index], offsets[index + 1]
+        revenue[start:stop] = chunk_revenue
+        expenses[start:stop] = chunk_expenses
+        filled[start:stop] = True
+        done += stop - start
+        chunks += 1
+        if done == n_paths:
+            yield done, _bands(inputs, revenue, expenses)
+        elif chunks % BAND_REFRESH_CHUNKS == 0:
+            yield done, _bands(inputs, revenue[filled], expenses[filled])
+        else:
+            yield done, None
+
+def calculate_budget_simulation(income_statement: pd.DataFrame, budget: pd.DataFrame, forecast: pd.DataFrame,
+                                n_paths: int = DEFAULT_SIMULATION_PATHS, seed: int = DEFAULT_SIMULATION_SEED):
+    """Monte Carlo P5/P50/P95 bands of revenue, expenses, profit and profit variance per period."""
+    inputs = simulation_inputs(income_statement, budget, forecast)
+    if inputs is None:
+        return pd.DataFrame(columns=BAND_COLUMNS), "No budget, forecast or income statement data available"
+
+    bands = pd.DataFrame(columns=BAND_COLUMNS)
+    for _, bands in iter_budget_simulation(inputs, n_paths, seed):
+        pass
+    return bands, simulation_message(inputs, n_paths)
+
+def simulation_message(inputs: Dict, n_paths: int) -> str:
+    return (f"{n_paths:,} paths over {len(inputs['periods'])} periods from the {inputs['base_source']}; "
+            f"shocks from {inputs['shock_source']} (revenue σ {inputs['volatility'][0]:.1%}, "
+            f"expenses σ {inputs['volatility'][1]:.1%}, correlation {inputs['correlation']:.2f})")
+
+# Memoize the simulation on its input fingerprints (shared metric cache at the repo root)
+try:
+    from metric_cache import cache_calculators
+    cache_calculators(globals())
+except ImportError:
+    pass
@@ -3,7 +3,6 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from datetime import datetime
 import io
 import base64
@@ -15,10 +14,6 @@ import plotly.express as px
 import plotly.graph_objects as go
 import plotly.io as pio
 
-# Machine Learning imports
-from sklearn.ensemble import IsolationForest, RandomForestRegressor
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
 import time
 
 # Import Finance metric calculation functions
@@ -32,6 +27,45 @@ except ImportError as e:
     def calculate_liquidity_solvency_metrics(balance_sheet_data, cash_flow_data):
         return pd.DataFrame(), "Error: Could not import metrics calculator"
 
+# Memoize metric calculations across reruns (available when running inside the integrated dashboard)
+try:
+    from metric_cache import cache_calculators
+    cache_calculators(globals())
+except ImportError:
+    pass
+
+# Typed metric results: summaries are parsed once and pages read raw values instead of re-parsing strings
+try:
+    from metric_results import MetricResult
+except ImportError:
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from metric_results import MetricResult
+
+# Vectorized NPV/IRR/payback/EVA over project x discount-rate grids
+from valuation_engine import (
+    DEFAULT_DISCOUNT_RATE, DEFAULT_WACC, NPV_CURVE_RATES, cash_flow_matrix, npv_grid, irr,
+    payback_periods, economic_value_added, calculate_npv_profile, calculate_project_valuations
+)
+
+# Period-aligned ratio cube over the income statement, balance sheet and cash flow
+from ratio_cube import calculate_ratio_cube, entity_view
+
+# Monte Carlo revenue/expense paths for budget and forecast variance fans
+from budget_simulation import (
+    DEFAULT_SIMULATION_PATHS, DEFAULT_SIMULATION_SEED, simulation_inputs, iter_budget_simulation, simulation_message
+)
+
+# Background streaming export of loaded tables (Excel or zipped Parquet/CSV)
+try:
+    from data_export import show_export_panel
+except ImportError:
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from data_export import show_export_panel
+
 # Import auto insights functionality
 try:
     from finance_auto_insights import (
@@ -113,6 +147,49 @@ except ImportError as e:
     display_finance_predictive_analytics_dashboard = None
     FinancePredictiveAnalytics = None
 
+# Shared on-disk dataset store and workbook reader (available when running inside the integrated dashboard)
+try:
+    from dataset_store import load_workbook_tables
+    from workbook_ingest import read_table_file
+except ImportError:
+    def load_workbook_tables(department, source, sheet_names=None, schemas=None):
+        excel_data = pd.read_excel(source, sheet_name=None)
+        return {sheet: df for sheet, df in excel_data.items() if sheet_names is None or sheet in sheet_names}
+    def read_table_file(source, schema=None):
+        if source.name.endswith('.csv'):
+            return pd.read_csv(source), 0.0
+        return pd.read_excel(source), 0.0
+
+# Column types applied while parsing uploaded finance tables
+FINANCE_TABLE_SCHEMAS = {
+    'income_statement': {
+        'revenue': 'number', 'cost_of_goods_sold': 'number', 'gross_profit': 'number', 'operating_expenses': 'number',
+        'operating_income': 'number', 'interest_expense': 'number', 'income_tax_expense': 'number', 'net_income': 'number'
+    },
+    'balance_sheet': {
+        'cash_and_equivalents': 'number', 'accounts_receivable': 'number', 'inventory': 'number', 'current_assets': 'number',
+        'total_assets': 'number', 'accounts_payable': 'number', 'current_liabilities': 'number', 'total_liabilities': 'number',
+        'shareholder_equity': 'number', 'shares_outstanding': 'number'
+    },
+    'cash_flow': {
+        'net_income': 'number', 'depreciation': 'number', 'working_capital_change': 'number', 'operating_cash_flow': 'number',
+        'capital_expenditures': 'number', 'free_cash_flow': 'number', 'initial_investment': 'number', 'cash_flow': 'number',
+        'nopat': 'number'
+    },
+    'budget': {'revenue': 'number', 'expenses': 'number', 'profit': 'number', 'category': 'text'},
+    'forecast': {'revenue': 'number', 'expenses': 'number', 'profit': 'number', 'confidence_level': 'number'},
+    'market_data': {'market_price': 'number', 'dividends_per_share': 'number', 'volume': 'number', 'market_cap': 'number'},
+    'customer_data': {
+        'revenue': 'number', 'profit_margin': 'number', 'profitability': 'number', 'costs_to_serve': 'number',
+        'lifetime_value': 'number'
+    },
+    'product_data': {
+        'revenue': 'number', 'cost': 'number', 'total_costs': 'number', 'direct_costs': 'number',
+        'allocated_costs': 'number', 'margin': 'number'
+    },
+    'value_chain': {'cost': 'number', 'percentage': 'number'}
+}
+
 def format_ai_recommendations(recommendations_text):
     """
     Format AI recommendations text to display properly in Streamlit with each bullet point on a separate line.
@@ -835,31 +912,27 @@ def create_template_for_download():
     output.seek(0)
     return output
 
+def get_export_tables():
+    """Finance tables included in data exports, keyed by sheet name"""
+    return {
+        'Income_Statement': st.session_state.income_statement,
+        'Balance_Sheet': st.session_state.balance_sheet,
+        'Cash_Flow': st.session_state.cash_flow,
+        'Budget': st.session_state.budget,
+        'Forecast': st.session_state.forecast,
+        'Market_Data': st.session_state.market_data,
+        'Customer_Data': st.session_state.customer_data,
+        'Product_Data': st.session_state.product_data,
+        'Value_Chain': st.session_state.value_chain
+    }
+
 def export_data_to_excel():
-    """Export all Finance data to Excel file"""
-    if (st.session_state.income_statement.empty and st.session_state.balance_sheet.empty and 
-        st.session_state.cash_flow.empty and st.session_state.budget.empty and
-        st.session_state.forecast.empty and st.session_state.market_data.empty and
-        st.session_state.customer_data.empty and st.session_state.product_data.empty and
-        st.session_state.value_chain.empty):
+    """Export all Finance data; the file is written in the background and offered for download when ready"""
+    if all(df.empty for df in get_export_tables().values()):
         st.warning("No data to export. Please add data first.")
         return None
     
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        # Write each DataFrame to a separate sheet
-        st.session_state.income_statement.to_excel(writer, sheet_name='Income_Statement', index=False)
-        st.session_state.balance_sheet.to_excel(writer, sheet_name='Balance_Sheet', index=False)
-        st.session_state.cash_flow.to_excel(writer, sheet_name='Cash_Flow', index=False)
-        st.session_state.budget.to_excel(writer, sheet_name='Budget', index=False)
-        st.session_state.forecast.to_excel(writer, sheet_name='Forecast', index=False)
-        st.session_state.market_data.to_excel(writer, sheet_name='Market_Data', index=False)
-        st.session_state.customer_data.to_excel(writer, sheet_name='Customer_Data', index=False)
-        st.session_state.product_data.to_excel(writer, sheet_name='Product_Data', index=False)
-        st.session_state.value_chain.to_excel(writer, sheet_name='Value_Chain', index=False)
-    
-    output.seek(0)
-    return output
+    return show_export_panel(get_export_tables(), key='fin_export', file_prefix='finance_analytics_export')
 
 # Page configuration
 st.set_page_config(
@@ -870,91 +943,98 @@ st.set_page_config(
 )
 
 # Custom CSS for styling
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        color: #1f77b4;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .metric-card {
-        background-color: #f0f2f6;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin: 0.5rem 0;
-    }
-    .formula-box {
-        background-color: #e8f4fd;
-        padding: 0.5rem;
-        border-left: 4px solid #1f77b4;
-        margin: 0.5rem 0;
-    }
-    .section-header {
-        background: linear-gradient(90deg, #1e3c72 0%, #2a5298 100%);
-        padding: 20px;
-        border-radius: 10px;
-        margin: 20px 0;
-    }
-    .section-header h3 {
-        color: white;
-        margin: 0;
-        text-align: center;
-    }
-</style>
-""", unsafe_allow_html=True)
+def load_base_css():
+    """Inject the base page styles shared by all sections"""
+    st.markdown("""
+    <style>
+        .main-header {
+            font-size: 2.5rem;
+            color: #1f77b4;
+            text-align: center;
+            margin-bottom: 2rem;
+        }
+        .metric-card {
+            background-color: #f0f2f6;
+            padding: 1rem;
+            border-radius: 0.5rem;
+            margin: 0.5rem 0;
+        }
+        .formula-box {
+            background-color: #e8f4fd;
+            padding: 0.5rem;
+            border-left: 4px solid #1f77b4;
+            margin: 0.5rem 0;
+        }
+        .section-header {
+            background: linear-gradient(90deg, #1e3c72 0%, #2a5298 100%);
+            padding: 20px;
+            border-radius: 10px;
+            margin: 20px 0;
+        }
+        .section-header h3 {
+            color: white;
+            margin: 0;
+            text-align: center;
+        }
+    </style>
+    """, unsafe_allow_html=True)
 
-# Initialize session state for Finance data storage
-if 'income_statement' not in st.session_state:
-    st.session_state.income_statement = pd.DataFrame(columns=[
-        'period', 'revenue', 'cost_of_goods_sold', 'gross_profit', 'operating_expenses',
-        'operating_income', 'interest_expense', 'income_tax_expense', 'net_income'
-    ])
+def initialize_session_state():
+    """Initialize Finance data tables in session state with their empty schemas"""
+    if 'income_statement' not in st.session_state:
+        st.session_state.income_statement = pd.DataFrame(columns=[
+            'period', 'revenue', 'cost_of_goods_sold', 'gross_profit', 'operating_expenses',
+            'operating_income', 'interest_expense', 'income_tax_expense', 'net_income'
+        ])
 
-if 'balance_sheet' not in st.session_state:
-    st.session_state.balance_sheet = pd.DataFrame(columns=[
-        'period', 'cash_and_equivalents', 'accounts_receivable', 'inventory', 'current_assets',
-        'total_assets', 'accounts_payable', 'current_liabilities', 'total_liabilities',
-        'shareholder_equity', 'shares_outstanding'
-    ])
+    if 'balance_sheet' not in st.session_state:
+        st.session_state.balance_sheet = pd.DataFrame(columns=[
+            'period', 'cash_and_equivalents', 'accounts_receivable', 'inventory', 'current_assets',
+            'total_assets', 'accounts_payable', 'current_liabilities', 'total_liabilities',
+            'shareholder_equity', 'shares_outstanding'
+        ])
 
-if 'cash_flow' not in st.session_state:
-    st.session_state.cash_flow = pd.DataFrame(columns=[
-        'period', 'net_income', 'depreciation', 'working_capital_change', 'operating_cash_flow',
-        'capital_expenditures', 'free_cash_flow', 'initial_investment', 'cash_flow', 'nopat'
-    ])
+    if 'cash_flow' not in st.session_state:
+        st.session_state.cash_flow = pd.DataFrame(columns=[
+            'period', 'net_income', 'depreciation', 'working_capital_change', 'operating_cash_flow',
+            'capital_expenditures', 'free_cash_flow', 'initial_investment', 'cash_flow', 'nopat'
+        ])
 
-if 'budget' not in st.session_state:
-    st.session_state.budget = pd.DataFrame(columns=[
-        'period', 'revenue', 'expenses', 'profit', 'category'
-    ])
+    if 'budget' not in st.session_state:
+        st.session_state.budget = pd.DataFrame(columns=[
+            'period', 'revenue', 'expenses', 'profit', 'category'
+        ])
 
-if 'forecast' not in st.session_state:
-    st.session_state.forecast = pd.DataFrame(columns=[
-        'period', 'revenue', 'expenses', 'profit', 'confidence_level'
-    ])
+    if 'forecast' not in st.session_state:
+        st.session_state.forecast = pd.DataFrame(columns=[
+            'period', 'revenue', 'expenses', 'profit', 'confidence_level'
+        ])
 
-if 'market_data' not in st.session_state:
-    st.session_state.market_data = pd.DataFrame(columns=[
-        'period', 'market_price', 'dividends_per_share', 'volume', 'market_cap'
-    ])
+    if 'market_data' not in st.session_state:
+        st.session_state.market_data = pd.DataFrame(columns=[
+            'period', 'market_price', 'dividends_per_share', 'volume', 'market_cap'
+        ])
 
-if 'customer_data' not in st.session_state:
-    st.session_state.customer_data = pd.DataFrame(columns=[
-        'customer_id', 'customer_name', 'revenue', 'costs_to_serve', 'profitability'
-    ])
+    if 'customer_data' not in st.session_state:
+        st.session_state.customer_data = pd.DataFrame(columns=[
+            'customer_id', 'customer_name', 'revenue', 'costs_to_serve', 'profitability'
+        ])
 
-if 'product_data' not in st.session_state:
-    st.session_state.product_data = pd.DataFrame(columns=[
-        'product_id', 'product_name', 'revenue', 'direct_costs', 'allocated_costs', 'total_costs'
-    ])
+    if 'product_data' not in st.session_state:
+        st.session_state.product_data = pd.DataFrame(columns=[
+            'product_id', 'product_name', 'revenue', 'direct_costs', 'allocated_costs', 'total_costs'
+        ])
+
+    if 'value_chain' not in st.session_state:
+        st.session_state.value_chain = pd.DataFrame(columns=[
+            'function', 'cost', 'percentage', 'period'
+        ])
 
-if 'value_chain' not in st.session_state:
-    st.session_state.value_chain = pd.DataFrame(columns=[
-        'function', 'cost', 'percentage', 'period'
-    ])
 
 def main():
+    # Initialize data tables for this browser session
+    initialize_session_state()
+    
     # Configure page for wide layout
     st.set_page_config(
         page_title="Finance Analytics",
@@ -964,6 +1044,7 @@ def main():
     )
     
     # Load custom CSS
+    load_base_css()
     load_custom_css()
     
     # Modern header
@@ -1387,9 +1468,6 @@ def show_data_input():
         
         if uploaded_complete_dataset is not None:
             try:
-                # Read all sheets from the Excel file
-                excel_file = pd.ExcelFile(uploaded_complete_dataset)
-                
                 # Dictionary to store loaded data
                 loaded_data = {}
                 
@@ -1406,10 +1484,13 @@ def show_data_input():
                     'value_chain': 'value_chain'
                 }
                 
+                # Read all sheets once; an unchanged workbook is served from the dataset store
+                excel_data = load_workbook_tables('finance', uploaded_complete_dataset, list(expected_sheets.keys()), FINANCE_TABLE_SCHEMAS)
+                
                 # Load each sheet if it exists
                 for sheet_name, session_key in expected_sheets.items():
-                    if sheet_name in excel_file.sheet_names:
-                        loaded_data[session_key] = pd.read_excel(uploaded_complete_dataset, sheet_name=sheet_name)
+                    if sheet_name in excel_data:
+                        loaded_data[session_key] = excel_data[sheet_name]
                         st.markdown(f"""
                         <div style="background: linear-gradient(135deg, #22c55e 0%, #16a34a 100%); color: white; padding: 10px 15px; border-radius: 10px; margin: 10px 0;">
                             ✅ {sheet_name} loaded: {len(loaded_data[session_key])} records
@@ -1464,147 +1545,32 @@ def show_data_input():
             uploaded_product_data = st.file_uploader("📦 Product Data", type=['xlsx', 'csv'], key="product_data_upload")
         
         # Process uploaded files with modern success/error styling
-        if uploaded_income_statement is not None:
-            try:
-                if uploaded_income_statement.name.endswith('.csv'):
-                    st.session_state.income_statement = pd.read_csv(uploaded_income_statement)
-                else:
-                    st.session_state.income_statement = pd.read_excel(uploaded_income_statement)
-                st.markdown(f"""
-                <div style="background: linear-gradient(135deg, #22c55e 0%, #16a34a 100%); color: white; padding: 10px 15px; border-radius: 10px; margin: 10px 0;">
-                    ✅ Income statement data loaded: {len(st.session_state.income_statement)} records
-                </div>
-                """, unsafe_allow_html=True)
-            except Exception as e:
-                st.markdown(f"""
-                <div style="background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%); color: white; padding: 10px 15px; border-radius: 10px; margin: 10px 0;">
-                    ❌ Error loading income statement data: {str(e)}
-                </div>
-                """, unsafe_allow_html=True)
+        individual_uploads = [
+            (uploaded_income_statement, 'income_statement', 'Income statement'),
+            (uploaded_balance_sheet, 'balance_sheet', 'Balance sheet'),
+            (uploaded_cash_flow, 'cash_flow', 'Cash flow'),
+            (uploaded_budget, 'budget', 'Budget'),
+            (uploaded_forecast, 'forecast', 'Forecast'),
+            (uploaded_market_data, 'market_data', 'Market'),
+            (uploaded_customer_data, 'customer_data', 'Customer'),
+            (uploaded_product_data, 'product_data', 'Product')
+        ]
         
-        if uploaded_balance_sheet is not None:
+        for uploaded_table, session_key, label in individual_uploads:
+            if uploaded_table is None:
+                continue
             try:
-                if uploaded_balance_sheet.name.endswith('.csv'):
-                    st.session_state.balance_sheet = pd.read_csv(uploaded_balance_sheet)
-                else:
-                    st.session_state.balance_sheet = pd.read_excel(uploaded_balance_sheet)
+                table_data, _ = read_table_file(uploaded_table, FINANCE_TABLE_SCHEMAS.get(session_key))
+                setattr(st.session_state, session_key, table_data)
                 st.markdown(f"""
                 <div style="background: linear-gradient(135deg, #22c55e 0%, #16a34a 100%); color: white; padding: 10px 15px; border-radius: 10px; margin: 10px 0;">
-                    ✅ Balance sheet data loaded: {len(st.session_state.balance_sheet)} records
+                    ✅ {label} data loaded: {len(table_data)} records
                 </div>
                 """, unsafe_allow_html=True)
             except Exception as e:
                 st.markdown(f"""
                 <div style="background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%); color: white; padding: 10px 15px; border-radius: 10px; margin: 10px 0;">
-                    ❌ Error loading balance sheet data: {str(e)}
-                </div>
-                """, unsafe_allow_html=True)
-        
-        if uploaded_cash_flow is not None:
-            try:
-                if uploaded_cash_flow.name.endswith('.csv'):
-                    st.session_state.cash_flow = pd.read_csv(uploaded_cash_flow)
-                else:
-                    st.session_state.cash_flow = pd.read_excel(uploaded_cash_flow)
-                st.markdown(f"""
-                <div style="background: linear-gradient(135deg, #22c55e 0%, #16a34a 100%); color: white; padding: 10px 15px; border-radius: 10px; margin: 10px 0;">
-                    ✅ Cash flow data loaded: {len(st.session_state.cash_flow)} records
-                </div>
-                """, unsafe_allow_html=True)
-            except Exception as e:
-                st.markdown(f"""
-                <div style="background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%); color: white; padding: 10px 15px; border-radius: 10px; margin: 10px 0;">
-                    ❌ Error loading cash flow data: {str(e)}
-                </div>
-                """, unsafe_allow_html=True)
-        
-        if uploaded_budget is not None:
-            try:
-                if uploaded_budget.name.endswith('.csv'):
-                    st.session_state.budget = pd.read_csv(uploaded_budget)
-                else:
-                    st.session_state.budget = pd.read_excel(uploaded_budget)
-                st.markdown(f"""
-                <div style="background: linear-gradient(135deg, #22c55e 0%, #16a34a 100%); color: white; padding: 10px 15px; border-radius: 10px; margin: 10px 0;">
-                    ✅ Budget data loaded: {len(st.session_state.budget)} records
-                </div>
-                """, unsafe_allow_html=True)
-            except Exception as e:
-                st.markdown(f"""
-                <div style="background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%); color: white; padding: 10px 15px; border-radius: 10px; margin: 10px 0;">
-                    ❌ Error loading budget data: {str(e)}
-                </div>
-                """, unsafe_allow_html=True)
-        
-        if uploaded_forecast is not None:
-            try:
-                if uploaded_forecast.name.endswith('.csv'):
-                    st.session_state.forecast = pd.read_csv(uploaded_forecast)
-                else:
-                    st.session_state.forecast = pd.read_excel(uploaded_forecast)
-                st.markdown(f"""
-                <div style="background: linear-gradient(135deg, #22c55e 0%, #16a34a 100%); color: white; padding: 10px 15px; border-radius: 10px; margin: 10px 0;">
-                    ✅ Forecast data loaded: {len(st.session_state.forecast)} records
-                </div>
-                """, unsafe_allow_html=True)
-            except Exception as e:
-                st.markdown(f"""
-                <div style="background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%); color: white; padding: 10px 15px; border-radius: 10px; margin: 10px 0;">
-                    ❌ Error loading forecast data: {str(e)}
-                </div>
-                """, unsafe_allow_html=True)
-        
-        if uploaded_market_data is not None:
-            try:
-                if uploaded_market_data.name.endswith('.csv'):
-                    st.session_state.market_data = pd.read_csv(uploaded_market_data)
-                else:
-                    st.session_state.market_data = pd.read_excel(uploaded_market_data)
-                st.markdown(f"""
-                <div style="background: linear-gradient(135deg, #22c55e 0%, #16a34a 100%); color: white; padding: 10px 15px; border-radius: 10px; margin: 10px 0;">
-                    ✅ Market data loaded: {len(st.session_state.market_data)} records
-                </div>
-                """, unsafe_allow_html=True)
-            except Exception as e:
-                st.markdown(f"""
-                <div style="background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%); color: white; padding: 10px 15px; border-radius: 10px; margin: 10px 0;">
-                    ❌ Error loading market data: {str(e)}
-                </div>
-                """, unsafe_allow_html=True)
-        
-        if uploaded_customer_data is not None:
-            try:
-                if uploaded_customer_data.name.endswith('.csv'):
-                    st.session_state.customer_data = pd.read_csv(uploaded_customer_data)
-                else:
-                    st.session_state.customer_data = pd.read_excel(uploaded_customer_data)
-                st.markdown(f"""
-                <div style="background: linear-gradient(135deg, #22c55e 0%, #16a34a 100%); color: white; padding: 10px 15px; border-radius: 10px; margin: 10px 0;">
-                    ✅ Customer data loaded: {len(st.session_state.customer_data)} records
-                </div>
-                """, unsafe_allow_html=True)
-            except Exception as e:
-                st.markdown(f"""
-                <div style="background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%); color: white; padding: 10px 15px; border-radius: 10px; margin: 10px 0;">
-                    ❌ Error loading customer data: {str(e)}
-                </div>
-                """, unsafe_allow_html=True)
-        
-        if uploaded_product_data is not None:
-            try:
-                if uploaded_product_data.name.endswith('.csv'):
-                    st.session_state.product_data = pd.read_csv(uploaded_product_data)
-                else:
-                    st.session_state.product_data = pd.read_excel(uploaded_product_data)
-                st.markdown(f"""
-                <div style="background: linear-gradient(135deg, #22c55e 0%, #16a34a 100%); color: white; padding: 10px 15px; border-radius: 10px; margin: 10px 0;">
-                    ✅ Product data loaded: {len(st.session_state.product_data)} records
-                </div>
-                """, unsafe_allow_html=True)
-            except Exception as e:
-                st.markdown(f"""
-                <div style="background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%); color: white; padding: 10px 15px; border-radius: 10px; margin: 10px 0;">
-                    ❌ Error loading product data: {str(e)}
+                    ❌ Error loading {label.lower()} data: {str(e)}
                 </div>
                 """, unsafe_allow_html=True)
     
@@ -2101,14 +2067,7 @@ def show_data_input():
         not st.session_state.customer_data.empty or not st.session_state.product_data.empty or 
         not st.session_state.value_chain.empty):
         
-        export_output = export_data_to_excel()
-        
-        st.download_button(
-            label="📤 Export All Data",
-            data=export_output.getvalue(),
-            file_name=f"finance_analytics_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
+        export_data_to_excel()
         
         st.markdown("""
         <div class="chart-container">
@@ -2309,6 +2268,17 @@ def show_predictive_analytics():
     )
 
 # Analytics functions for the main sections
+def get_ratio_view():
+    """Ratio cube rows for the selected entity (consolidated by default when statements cover several)."""
+    cube, _ = calculate_ratio_cube(
+        st.session_state.income_statement, st.session_state.balance_sheet, st.session_state.cash_flow
+    )
+    if cube.empty:
+        return cube
+    entities = cube['entity'].unique().tolist()
+    entity = st.selectbox("Entity", entities, key="ratio_entity") if len(entities) > 1 else None
+    return entity_view(cube, entity)
+
 def show_financial_performance():
     st.markdown("""
     <div class="section-header">
@@ -2358,6 +2328,9 @@ def show_financial_performance():
     st.info(performance_message)
     
     # Detailed analytics tabs
+    # Ratios for every tab, built in one pass over the statements
+    ratios = get_ratio_view()
+    
     tab1, tab2, tab3, tab4 = st.tabs([
         "📈 Revenue Analysis", "💰 Margin Analysis", "📊 Profitability Trends", "📋 Performance Insights"
     ])
@@ -2407,10 +2380,7 @@ def show_financial_performance():
         
         if not st.session_state.income_statement.empty:
             # Margin analysis
-            margin_analysis = st.session_state.income_statement.copy()
-            margin_analysis['gross_margin_pct'] = ((margin_analysis['revenue'] - margin_analysis['cost_of_goods_sold']) / margin_analysis['revenue'] * 100).round(1)
-            margin_analysis['operating_margin_pct'] = (margin_analysis['operating_income'] / margin_analysis['revenue'] * 100).round(1)
-            margin_analysis['net_margin_pct'] = (margin_analysis['net_income'] / margin_analysis['revenue'] * 100).round(1)
+            margin_analysis = ratios.round({'gross_margin_pct': 1, 'operating_margin_pct': 1, 'net_margin_pct': 1})
             
             col1, col2 = st.columns(2)
             with col1:
@@ -2469,11 +2439,7 @@ def show_financial_performance():
         
         if not st.session_state.income_statement.empty:
             # Profitability trends
-            profitability_trends = st.session_state.income_statement.groupby('period').agg({
-                'revenue': 'sum',
-                'net_income': 'sum'
-            }).reset_index()
-            profitability_trends['profitability_ratio'] = (profitability_trends['net_income'] / profitability_trends['revenue'] * 100).round(1)
+            profitability_trends = ratios.assign(profitability_ratio=ratios['net_margin_pct'].round(1))
             
             fig = go.Figure(data=[
                 go.Scatter(x=profitability_trends['period'], y=profitability_trends['profitability_ratio'],
@@ -2601,6 +2567,9 @@ def show_liquidity_solvency():
     st.info(liquidity_message)
     
     # Detailed analytics tabs
+    # Ratios for every tab, built in one pass over the statements
+    ratios = get_ratio_view()
+    
     tab1, tab2, tab3, tab4 = st.tabs([
         "💧 Liquidity Analysis", "📊 Solvency Metrics", "💰 Cash Flow Analysis", "📋 Risk Assessment"
     ])
@@ -2610,8 +2579,7 @@ def show_liquidity_solvency():
         
         if not st.session_state.balance_sheet.empty:
             # Current ratio trend
-            current_ratio_trend = st.session_state.balance_sheet.copy()
-            current_ratio_trend['current_ratio'] = (current_ratio_trend['current_assets'] / current_ratio_trend['current_liabilities']).round(2)
+            current_ratio_trend = ratios.round({'current_ratio': 2})
             
             fig = go.Figure(data=[
                 go.Scatter(x=current_ratio_trend['period'], y=current_ratio_trend['current_ratio'],
@@ -2632,9 +2600,7 @@ def show_liquidity_solvency():
             st.plotly_chart(fig, use_container_width=True, key="chart_5")
             
             # Quick ratio analysis
-            quick_ratio_data = st.session_state.balance_sheet.copy()
-            quick_ratio_data['quick_ratio'] = ((quick_ratio_data['cash_and_equivalents'] + quick_ratio_data['accounts_receivable']) / 
-                                              quick_ratio_data['current_liabilities']).round(2)
+            quick_ratio_data = ratios.round({'quick_ratio': 2})
             
             col1, col2 = st.columns(2)
             with col1:
@@ -2657,8 +2623,7 @@ def show_liquidity_solvency():
             
             with col2:
                 # Working capital analysis
-                working_capital_data = st.session_state.balance_sheet.copy()
-                working_capital_data['working_capital'] = working_capital_data['current_assets'] - working_capital_data['current_liabilities']
+                working_capital_data = ratios
                 
                 fig = go.Figure(data=[
                     go.Scatter(x=working_capital_data['period'], y=working_capital_data['working_capital'],
@@ -2698,13 +2663,10 @@ def show_liquidity_solvency():
         
         if not st.session_state.balance_sheet.empty:
             # Debt-to-equity ratio
-            debt_equity_data = st.session_state.balance_sheet.copy()
+            debt_equity_data = ratios.round({'debt_to_equity': 2})
             
-            # Check if required columns exist
-            required_cols = ['total_liabilities', 'shareholder_equity']
-            if all(col in debt_equity_data.columns for col in required_cols):
-                debt_equity_data['debt_to_equity'] = (debt_equity_data['total_liabilities'] / debt_equity_data['shareholder_equity']).round(2)
-            else:
+            # The cube leaves the ratio empty when its line items are missing
+            if ratios.empty or ratios['debt_to_equity'].isna().all():
                 st.warning("⚠️ Required columns for debt-to-equity calculation not found. Please ensure your balance sheet data includes 'total_liabilities' and 'shareholder_equity' columns.")
                 return
             
@@ -2821,8 +2783,7 @@ def show_liquidity_solvency():
             
             with col2:
                 # Cash flow quality analysis
-                cf_quality_data = st.session_state.cash_flow.copy()
-                cf_quality_data['cf_quality'] = (cf_quality_data['operating_cash_flow'] / cf_quality_data['net_income']).round(2)
+                cf_quality_data = ratios.round({'cf_quality': 2})
                 
                 fig = go.Figure(data=[
                     go.Scatter(x=cf_quality_data['period'], y=cf_quality_data['cf_quality'],
@@ -2864,14 +2825,14 @@ def show_liquidity_solvency():
         
         if not st.session_state.balance_sheet.empty:
             # Risk metrics summary
-            latest_bs = st.session_state.balance_sheet.iloc[-1]
-            
-            # Check if required columns exist for risk metrics
-            risk_cols = ['current_assets', 'current_liabilities', 'total_liabilities', 'shareholder_equity']
-            if all(col in latest_bs.index for col in risk_cols):
-                current_ratio = latest_bs['current_assets'] / latest_bs['current_liabilities']
-                debt_to_equity = latest_bs['total_liabilities'] / latest_bs['shareholder_equity']
-                working_capital = latest_bs['current_assets'] - latest_bs['current_liabilities']
+            latest_ratios = ratios.iloc[-1] if not ratios.empty else pd.Series(dtype=float)
+            
+            # Check the ratios behind the risk metrics are available
+            risk_cols = ['current_ratio', 'debt_to_equity', 'working_capital']
+            if latest_ratios.reindex(risk_cols).notna().all():
+                current_ratio = latest_ratios['current_ratio']
+                debt_to_equity = latest_ratios['debt_to_equity']
+                working_capital = latest_ratios['working_capital']
                 
                 col1, col2, col3 = st.columns(3)
                 with col1:
@@ -2973,6 +2934,9 @@ def show_efficiency_productivity():
     st.info(efficiency_message)
     
     # Detailed analytics tabs
+    # Ratios for every tab, built in one pass over the statements
+    ratios = get_ratio_view()
+    
     tab1, tab2, tab3, tab4 = st.tabs([
         "📊 ROA & ROE Analysis", "🔄 Asset Turnover", "💰 Expense Efficiency", "📈 Productivity Trends"
     ])
@@ -2981,13 +2945,13 @@ def show_efficiency_productivity():
     efficiency_data = None
     if not st.session_state.income_statement.empty and not st.session_state.balance_sheet.empty:
         try:
-            efficiency_data = st.session_state.income_statement.merge(
-                st.session_state.balance_sheet[['period', 'total_assets', 'shareholder_equity']], 
-                on='period', how='inner'
+            # Periods covered by both the income statement and the balance sheet
+            efficiency_data = ratios[ratios['revenue'].notna() & ratios['total_assets'].notna()]
+            efficiency_data = efficiency_data.assign(
+                roa=efficiency_data['roa_pct'].round(2),
+                roe=efficiency_data['roe_pct'].round(2),
+                asset_turnover=efficiency_data['asset_turnover'].round(2)
             )
-            efficiency_data['roa'] = (efficiency_data['net_income'] / efficiency_data['total_assets'] * 100).round(2)
-            efficiency_data['roe'] = (efficiency_data['net_income'] / efficiency_data['shareholder_equity'] * 100).round(2)
-            efficiency_data['asset_turnover'] = (efficiency_data['revenue'] / efficiency_data['total_assets']).round(2)
             
             # Debug: Show efficiency data structure
             if st.checkbox("Show efficiency data debug"):
@@ -3139,9 +3103,10 @@ def show_efficiency_productivity():
         
         if not st.session_state.income_statement.empty:
             # Operating expense ratio analysis
-            expense_data = st.session_state.income_statement.copy()
-            expense_data['op_exp_ratio'] = (expense_data['operating_expenses'] / expense_data['revenue'] * 100).round(2)
-            expense_data['cogs_ratio'] = (expense_data['cost_of_goods_sold'] / expense_data['revenue'] * 100).round(2)
+            expense_data = ratios.assign(
+                op_exp_ratio=ratios['op_exp_ratio_pct'].round(2),
+                cogs_ratio=ratios['cogs_ratio_pct'].round(2)
+            )
             
             fig = go.Figure()
             fig.add_trace(go.Scatter(x=expense_data['period'], y=expense_data['op_exp_ratio'],
@@ -3204,9 +3169,10 @@ def show_efficiency_productivity():
         if efficiency_data is not None and not efficiency_data.empty:
             try:
                 # Productivity metrics
-                productivity_data = efficiency_data.copy()
-                productivity_data['revenue_per_asset'] = (productivity_data['revenue'] / productivity_data['total_assets']).round(2)
-                productivity_data['profit_per_asset'] = (productivity_data['net_income'] / productivity_data['total_assets']).round(2)
+                productivity_data = efficiency_data.assign(
+                    revenue_per_asset=efficiency_data['asset_turnover'],
+                    profit_per_asset=(efficiency_data['roa_pct'] / 100).round(2)
+                )
             except Exception as e:
                 st.error(f"❌ Error creating productivity data: {str(e)}")
                 return
@@ -3298,6 +3264,93 @@ def show_efficiency_productivity():
             else:
                 st.error("AI recommendations function not available. Please check the import.")
 
+SIMULATION_METRICS = {
+    'profit_variance': 'Profit Variance vs Budget',
+    'profit': 'Profit',
+    'revenue': 'Revenue',
+    'expenses': 'Expenses'
+}
+
+def create_simulation_fan_chart(bands, metric, paths_done):
+    """P5-P95 fan with the median and budget line for one simulated metric"""
+    data = bands[bands['metric'] == metric]
+    label = SIMULATION_METRICS[metric]
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=data['period'], y=data['p95'], mode='lines', line=dict(width=0),
+                             name='P95', showlegend=False))
+    fig.add_trace(go.Scatter(x=data['period'], y=data['p5'], mode='lines', line=dict(width=0),
+                             fill='tonexty', fillcolor='rgba(31, 119, 180, 0.25)', name='P5–P95'))
+    fig.add_trace(go.Scatter(x=data['period'], y=data['p50'], mode='lines+markers',
+                             line=dict(color='#1f77b4', width=3), name='P50'))
+    if data['budget'].notna().any():
+        fig.add_trace(go.Scatter(x=data['period'], y=data['budget'], mode='lines',
+                                 line=dict(color='black', dash='dash'), name='Budget' if metric != 'profit_variance' else 'On Budget'))
+    fig.update_layout(
+        title=f"{label}: P5 / P50 / P95 over {paths_done:,} simulated paths",
+        xaxis_title="Period",
+        yaxis_title=f"{label} ($)",
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(size=12),
+        margin=dict(l=50, r=50, t=80, b=50)
+    )
+    return fig
+
+def show_budget_simulation():
+    """Monte Carlo variance fans, streamed into the chart as simulation chunks complete"""
+    st.subheader("🎲 Monte Carlo Variance Fan")
+    
+    simulation = simulation_inputs(
+        st.session_state.income_statement, st.session_state.budget, st.session_state.forecast
+    )
+    if simulation is None:
+        st.info("Monte Carlo simulation requires budget, forecast or income statement data with revenue and expenses.")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        n_paths = st.selectbox("Simulated paths", [10000, 50000, 100000, 250000],
+                               index=[10000, 50000, 100000, 250000].index(DEFAULT_SIMULATION_PATHS),
+                               format_func=lambda n: f"{n:,}", key="simulation_paths")
+    with col2:
+        seed = int(st.number_input("Random seed", value=DEFAULT_SIMULATION_SEED, step=1, key="simulation_seed"))
+    with col3:
+        metric = st.selectbox("Metric", list(SIMULATION_METRICS), format_func=SIMULATION_METRICS.get, key="simulation_metric")
+    
+    # Re-simulate only when the inputs, path count or seed change
+    signature = (
+        tuple(simulation['periods']), simulation['base'].tobytes(), simulation['budget'].tobytes(),
+        simulation['volatility'].tobytes(), simulation['correlation'], n_paths, seed
+    )
+    stored = st.session_state.get('budget_simulation')
+    chart = st.empty()
+    if stored is not None and stored['signature'] == signature:
+        bands = stored['bands']
+    else:
+        progress = st.progress(0.0, text="Simulating paths...")
+        bands = None
+        for paths_done, partial_bands in iter_budget_simulation(simulation, n_paths, seed):
+            if partial_bands is not None:
+                bands = partial_bands
+                chart.plotly_chart(create_simulation_fan_chart(bands, metric, paths_done), use_container_width=True,
+                                   key=f"simulation_fan_{paths_done}")
+            progress.progress(paths_done / n_paths, text=f"Simulated {paths_done:,} of {n_paths:,} paths")
+        progress.empty()
+        st.session_state.budget_simulation = {'signature': signature, 'bands': bands}
+    chart.plotly_chart(create_simulation_fan_chart(bands, metric, n_paths), use_container_width=True, key="simulation_fan")
+    st.caption(simulation_message(simulation, n_paths))
+    
+    # Band values at the end of the horizon (profit when no budget covers it)
+    final = bands[bands['period'] == simulation['periods'][-1]].set_index('metric')
+    summary = 'profit_variance' if pd.notna(final.loc['profit_variance', 'p50']) else 'profit'
+    columns = st.columns(3)
+    for column, percentile in zip(columns, ['p5', 'p50', 'p95']):
+        with column:
+            st.metric(f"{percentile.upper()} {SIMULATION_METRICS[summary]}", f"${final.loc[summary, percentile]:,.0f}")
+    
+    with st.expander("Percentile bands by period", expanded=False):
+        display_dataframe_with_index_1(bands[bands['metric'] == metric].round(2))
+
 def show_budget_forecasting():
     st.markdown("""
     <div class="section-header">
@@ -3682,6 +3735,8 @@ def show_budget_forecasting():
             st.subheader("Scenario Details")
             display_dataframe_with_index_1(scenario_df.round(2))
             
+            show_budget_simulation()
+            
             # AI Strategic Recommendations
             st.markdown("---")
             st.markdown("### 🤖 AI Strategic Recommendations")
@@ -3802,6 +3857,9 @@ def show_cash_flow():
     st.info(cash_flow_message)
     
     # Detailed analytics tabs
+    # Ratios for every tab, built in one pass over the statements
+    ratios = get_ratio_view()
+    
     tab1, tab2, tab3, tab4 = st.tabs([
         "💰 Operating Cash Flow", "🔄 Free Cash Flow", "📊 Working Capital", "📈 Cash Flow Trends"
     ])
@@ -3853,8 +3911,7 @@ def show_cash_flow():
             
             with col2:
                 # Cash flow quality analysis
-                cf_quality_data = st.session_state.cash_flow.copy()
-                cf_quality_data['cf_quality'] = (cf_quality_data['operating_cash_flow'] / cf_quality_data['net_income']).round(2)
+                cf_quality_data = ratios.round({'cf_quality': 2})
                 
                 fig = go.Figure(data=[
                     go.Scatter(x=cf_quality_data['period'], y=cf_quality_data['cf_quality'],
@@ -3970,9 +4027,7 @@ def show_cash_flow():
         
         if not st.session_state.balance_sheet.empty:
             # Working capital calculation
-            working_capital_data = st.session_state.balance_sheet.copy()
-            working_capital_data['working_capital'] = working_capital_data['current_assets'] - working_capital_data['current_liabilities']
-            working_capital_data['working_capital_ratio'] = (working_capital_data['current_assets'] / working_capital_data['current_liabilities']).round(2)
+            working_capital_data = ratios.assign(working_capital_ratio=ratios['current_ratio'].round(2))
             
             # Working capital trend
             fig = go.Figure(data=[
@@ -4170,6 +4225,9 @@ def show_capital_structure():
     st.info(capital_message)
     
     # Detailed analytics tabs
+    # Ratios for every tab, built in one pass over the statements
+    ratios = get_ratio_view()
+    
     tab1, tab2, tab3, tab4 = st.tabs([
         "📊 Debt Analysis", "💰 WACC Calculation", "🏦 Interest Coverage", "📈 Capital Optimization"
     ])
@@ -4179,9 +4237,7 @@ def show_capital_structure():
         
         if not st.session_state.balance_sheet.empty:
             # Debt-to-equity trend
-            debt_analysis = st.session_state.balance_sheet.copy()
-            debt_analysis['debt_to_equity'] = (debt_analysis['total_liabilities'] / debt_analysis['shareholder_equity']).round(2)
-            debt_analysis['debt_ratio'] = (debt_analysis['total_liabilities'] / debt_analysis['total_assets'] * 100).round(2)
+            debt_analysis = ratios.round({'debt_to_equity': 2}).assign(debt_ratio=ratios['debt_ratio_pct'].round(2))
             
             fig = go.Figure(data=[
                 go.Scatter(x=debt_analysis['period'], y=debt_analysis['debt_to_equity'],
@@ -4344,8 +4400,7 @@ def show_capital_structure():
             
             try:
                 # Interest coverage analysis
-                coverage_data = st.session_state.income_statement.copy()
-                coverage_data['interest_coverage'] = (coverage_data['operating_income'] / coverage_data['interest_expense']).round(2)
+                coverage_data = ratios.round({'interest_coverage': 2})
             except Exception as e:
                 st.error(f"❌ Error in interest coverage analysis: {str(e)}")
                 return
@@ -4428,17 +4483,15 @@ def show_capital_structure():
         
         if not st.session_state.balance_sheet.empty and not st.session_state.income_statement.empty:
             # Capital optimization analysis
-            latest_bs = st.session_state.balance_sheet.iloc[-1]
-            latest_is = st.session_state.income_statement.iloc[-1]
+            latest_ratios = ratios.iloc[-1]
             
-            debt_to_equity = latest_bs['total_liabilities'] / latest_bs['shareholder_equity']
-            debt_ratio = latest_bs['total_liabilities'] / latest_bs['total_assets']
+            debt_to_equity = latest_ratios['debt_to_equity']
+            debt_ratio = latest_ratios['debt_ratio_pct'] / 100
             
-            # Calculate interest coverage if data is available
-            if 'interest_expense' in latest_is.index and 'operating_income' in latest_is.index:
-                interest_coverage = latest_is['operating_income'] / latest_is['interest_expense'] if latest_is['interest_expense'] > 0 else float('inf')
-            else:
-                interest_coverage = float('inf')  # No interest expense means excellent coverage
+            # Missing or zero interest expense means excellent coverage
+            interest_coverage = latest_ratios['interest_coverage']
+            if pd.isna(interest_coverage) or latest_ratios.get('interest_expense', 0) <= 0:
+                interest_coverage = float('inf')
             
             col1, col2, col3 = st.columns(3)
             with col1:
@@ -4484,7 +4537,7 @@ def show_capital_structure():
             st.subheader("Optimal Capital Structure Simulation")
             
             # Simulate different debt levels
-            equity_base = latest_bs['shareholder_equity']
+            equity_base = latest_ratios['shareholder_equity']
             debt_levels = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7]
             
             simulation_results = []
@@ -4538,6 +4591,7 @@ def show_investment_valuation():
     investment_summary, investment_message = calculate_investment_valuation_metrics(
         st.session_state.cash_flow, st.session_state.balance_sheet
     )
+    investment_result = MetricResult.from_summary_frame(investment_summary, investment_message)
     
     # Display summary metrics
     st.subheader("📈 Investment & Valuation Overview")
@@ -4545,17 +4599,17 @@ def show_investment_valuation():
     
     with col1:
         if not investment_summary.empty:
-            npv = investment_summary.iloc[0]['Value']
+            npv = investment_result.format(0)
             st.metric("Net Present Value (NPV)", npv)
     
     with col2:
         if not investment_summary.empty and len(investment_summary) > 1:
-            payback_period = investment_summary.iloc[1]['Value']
+            payback_period = investment_result.format(1)
             st.metric("Payback Period", payback_period)
     
     with col3:
         if not investment_summary.empty and len(investment_summary) > 2:
-            eva = investment_summary.iloc[2]['Value']
+            eva = investment_result.format(2)
             st.metric("Economic Value Added (EVA)", eva)
     
     st.info(investment_message)
@@ -4569,36 +4623,26 @@ def show_investment_valuation():
         st.subheader("💰 NPV Analysis")
         
         if not st.session_state.cash_flow.empty:
-            # NPV calculation with different discount rates
-            cash_flows = st.session_state.cash_flow['cash_flow'].values
-            initial_investment = st.session_state.cash_flow['initial_investment'].iloc[0]
-            
-            discount_rates = [0.05, 0.08, 0.10, 0.12, 0.15, 0.20]
-            npv_results = []
-            
-            for rate in discount_rates:
-                npv = -initial_investment
-                for i, cf in enumerate(cash_flows):
-                    npv += cf / ((1 + rate) ** (i + 1))
-                npv_results.append({
-                    'Discount Rate': f"{rate:.1%}",
-                    'NPV': npv,
-                    'Decision': 'Accept' if npv > 0 else 'Reject'
-                })
-            
-            npv_df = pd.DataFrame(npv_results)
-            
-            # NPV vs Discount Rate chart
+            # NPV of every project over a dense discount-rate grid in one broadcast
+            project_ids, cash_flows, initial_investments = cash_flow_matrix(st.session_state.cash_flow)
+            npv_curves = npv_grid(cash_flows, initial_investments, NPV_CURVE_RATES)
+            project_irr = irr(cash_flows, initial_investments)
+            npv_profile, _ = calculate_npv_profile(st.session_state.cash_flow)
+            
+            # NPV vs Discount Rate chart (the projects with the highest NPV at the default rate)
+            default_column = int(np.argmin(np.abs(NPV_CURVE_RATES - DEFAULT_DISCOUNT_RATE)))
+            shown = np.argsort(-npv_curves[:, default_column])[:10]
             fig = go.Figure(data=[
-                go.Scatter(x=[float(x.strip('%'))/100 for x in npv_df['Discount Rate']], 
-                          y=npv_df['NPV'],
-                          mode='lines+markers', line=dict(color='#1f77b4', width=3),
-                          marker=dict(size=8), name='NPV')
+                go.Scatter(x=NPV_CURVE_RATES, y=npv_curves[row],
+                          mode='lines', line=dict(width=3), name=str(project_ids[row]))
+                for row in shown
             ])
             fig.update_layout(
                 title="NPV vs Discount Rate",
                 xaxis_title="Discount Rate",
                 yaxis_title="Net Present Value ($)",
+                xaxis_tickformat='.0%',
+                showlegend=len(project_ids) > 1,
                 plot_bgcolor='rgba(0,0,0,0)',
                 paper_bgcolor='rgba(0,0,0,0)',
                 font=dict(size=12),
@@ -4609,36 +4653,43 @@ def show_investment_valuation():
             
             # NPV results table
             st.subheader("NPV Analysis Results")
-            display_dataframe_with_index_1(npv_df.round(2))
-            
-            # IRR estimation (simplified)
-            st.subheader("Internal Rate of Return (IRR) Estimation")
+            if len(project_ids) == 1:
+                npv_df = pd.DataFrame({
+                    'Discount Rate': npv_profile['discount_rate'].map(lambda rate: f"{rate:.1%}"),
+                    'NPV': npv_profile['npv'],
+                    'Decision': npv_profile['decision']
+                })
+                display_dataframe_with_index_1(npv_df.round(2))
+            else:
+                valuations, valuations_msg = calculate_project_valuations(st.session_state.cash_flow)
+                st.caption(valuations_msg)
+                display_dataframe_with_index_1(valuations.round(4))
             
-            # Find IRR using interpolation
-            positive_npv = npv_df[npv_df['NPV'] > 0]
-            negative_npv = npv_df[npv_df['NPV'] < 0]
+            # IRR (root of each project's NPV curve)
+            st.subheader("Internal Rate of Return (IRR)")
             
-            if not positive_npv.empty and not negative_npv.empty:
-                # Simple interpolation to estimate IRR
-                pos_rate = float(positive_npv.iloc[-1]['Discount Rate'].strip('%')) / 100
-                neg_rate = float(negative_npv.iloc[0]['Discount Rate'].strip('%')) / 100
-                pos_npv = positive_npv.iloc[-1]['NPV']
-                neg_npv = negative_npv.iloc[0]['NPV']
-                
-                irr = pos_rate + (pos_npv / (pos_npv - neg_npv)) * (neg_rate - pos_rate)
-                
+            if len(project_ids) == 1 and not np.isnan(project_irr[0]):
+                irr_value = project_irr[0]
                 col1, col2 = st.columns(2)
                 with col1:
-                    st.metric("Estimated IRR", f"{irr:.1%}")
+                    st.metric("IRR", f"{irr_value:.1%}")
                 with col2:
-                    if irr > 0.15:
+                    if irr_value > 0.15:
                         st.success("✅ High IRR (Excellent)")
-                    elif irr > 0.10:
+                    elif irr_value > 0.10:
                         st.info("ℹ️ Good IRR (Acceptable)")
                     else:
                         st.warning("⚠️ Low IRR (Marginal)")
+            elif len(project_ids) > 1 and not np.isnan(project_irr).all():
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Median IRR", f"{np.nanmedian(project_irr):.1%}")
+                with col2:
+                    st.metric("Projects with IRR > 15%", f"{int((project_irr > 0.15).sum()):,}")
+                with col3:
+                    st.metric("Projects with IRR ≤ 10%", f"{int((project_irr <= 0.10).sum()):,}")
             else:
-                st.info("IRR calculation requires both positive and negative NPV values")
+                st.info("IRR calculation requires cash flows whose NPV changes sign")
             
             # AI Strategic Recommendations
             st.markdown("---")
@@ -4660,27 +4711,20 @@ def show_investment_valuation():
         st.subheader("⏱️ Payback Period")
         
         if not st.session_state.cash_flow.empty:
-            # Payback period calculation
-            cash_flows = st.session_state.cash_flow['cash_flow'].values
-            initial_investment = st.session_state.cash_flow['initial_investment'].iloc[0]
-            
-            cumulative_cf = 0
-            payback_period = 0
-            payback_data = []
-            
-            for i, cf in enumerate(cash_flows):
-                cumulative_cf += cf
-                payback_data.append({
-                    'Period': i + 1,
-                    'Cash Flow': cf,
-                    'Cumulative CF': cumulative_cf,
-                    'Remaining Investment': initial_investment - cumulative_cf
-                })
-                
-                if cumulative_cf >= initial_investment and payback_period == 0:
-                    payback_period = i + 1
-            
-            payback_df = pd.DataFrame(payback_data)
+            # Payback period calculation (first project when the table holds several)
+            project_ids, cash_flows, initial_investments = cash_flow_matrix(st.session_state.cash_flow)
+            project_flows = cash_flows[0]
+            initial_investment = initial_investments[0]
+            payback = payback_periods(cash_flows[:1], initial_investments[:1])[0]
+            discounted_payback = payback_periods(cash_flows[:1], initial_investments[:1], DEFAULT_DISCOUNT_RATE)[0]
+            
+            cumulative_cf = np.cumsum(project_flows)
+            payback_df = pd.DataFrame({
+                'Period': np.arange(1, len(project_flows) + 1),
+                'Cash Flow': project_flows,
+                'Cumulative CF': cumulative_cf,
+                'Remaining Investment': initial_investment - cumulative_cf
+            })
             
             # Payback period visualization
             fig = go.Figure()
@@ -4700,18 +4744,21 @@ def show_investment_valuation():
             st.plotly_chart(fig, use_container_width=True, key="chart_32")
             
             # Payback period results
-            col1, col2, col3 = st.columns(3)
+            col1, col2, col3, col4 = st.columns(4)
             with col1:
                 st.metric("Initial Investment", f"${initial_investment:,.0f}")
             with col2:
-                st.metric("Payback Period", f"{payback_period} years")
+                st.metric("Payback Period", f"{payback:.1f} years" if not np.isnan(payback) else "Not reached")
             with col3:
-                if payback_period <= 3:
+                st.metric(f"Discounted Payback ({DEFAULT_DISCOUNT_RATE:.0%})",
+                          f"{discounted_payback:.1f} years" if not np.isnan(discounted_payback) else "Not reached")
+            with col4:
+                if np.isnan(payback) or payback > 5:
+                    st.warning("⚠️ Long Payback (>5 years)")
+                elif payback <= 3:
                     st.success("✅ Quick Payback (≤3 years)")
-                elif payback_period <= 5:
-                    st.info("ℹ️ Moderate Payback (≤5 years)")
                 else:
-                    st.warning("⚠️ Long Payback (>5 years)")
+                    st.info("ℹ️ Moderate Payback (≤5 years)")
             
             # Payback period table
             st.subheader("Payback Period Details")
@@ -4743,9 +4790,9 @@ def show_investment_valuation():
             
             nopat = latest_cf['nopat']
             capital_employed = latest_bs['total_assets']
-            wacc = 0.092  # From previous calculation
+            wacc = DEFAULT_WACC  # From previous calculation
             
-            eva = nopat - (wacc * capital_employed)
+            eva = float(economic_value_added(nopat, capital_employed, wacc))
             
             # EVA components
             eva_components = {
@@ -4779,7 +4826,7 @@ def show_investment_valuation():
             # EVA trend analysis
             if len(st.session_state.cash_flow) > 1:
                 eva_trend = st.session_state.cash_flow.copy()
-                eva_trend['eva'] = eva_trend['nopat'] - (wacc * capital_employed)
+                eva_trend['eva'] = economic_value_added(pd.to_numeric(eva_trend['nopat'], errors='coerce'), capital_employed, wacc)
                 
                 fig = go.Figure(data=[
                     go.Scatter(x=eva_trend['period'], y=eva_trend['eva'],
@@ -4819,9 +4866,9 @@ def show_investment_valuation():
         
         if not st.session_state.cash_flow.empty:
             # Investment decision framework
-            latest_npv = float(investment_summary.iloc[0]['Value'].replace('$', '').replace(',', '')) if not investment_summary.empty else 0
-            latest_payback = int(investment_summary.iloc[1]['Value'].split()[0]) if not investment_summary.empty and len(investment_summary) > 1 else 0
-            latest_eva = float(investment_summary.iloc[2]['Value'].replace('$', '').replace(',', '')) if not investment_summary.empty and len(investment_summary) > 2 else 0
+            latest_npv = investment_result.value(0)
+            latest_payback = investment_result.value(1)
+            latest_eva = investment_result.value(2)
             
             col1, col2, col3 = st.columns(3)
             with col1:
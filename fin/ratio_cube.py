@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple
+
+# Columns identifying the reporting entity when statements cover several subsidiaries
+ENTITY_COLUMNS = ('entity_id', 'entity', 'subsidiary', 'company')
+SINGLE_ENTITY = 'Company'
+CONSOLIDATED_ENTITY = 'Consolidated'
+
+# Statement line items held in the cube, per source table
+STATEMENT_COMPONENTS = {
+    'income_statement': (
+        'revenue', 'cost_of_goods_sold', 'gross_profit', 'operating_expenses', 'operating_income',
+        'interest_expense', 'income_tax_expense', 'net_income'
+    ),
+    'balance_sheet': (
+        'cash_and_equivalents', 'accounts_receivable', 'inventory', 'current_assets', 'total_assets',
+        'accounts_payable', 'current_liabilities', 'total_liabilities', 'shareholder_equity', 'shares_outstanding'
+    ),
+    'cash_flow': (
+        'net_income', 'depreciation', 'working_capital_change', 'operating_cash_flow',
+        'capital_expenditures', 'free_cash_flow'
+    )
+}
+
+# name: (numerator terms, denominator or None, scale); a leading '-' subtracts the term
+RATIO_DEFINITIONS = {
+    # Profitability
+    'gross_margin_pct': (('revenue', '-cost_of_goods_sold'), 'revenue', 100),
+    'operating_margin_pct': (('operating_income',), 'revenue', 100),
+    'net_margin_pct': (('net_income',), 'revenue', 100),
+    'op_exp_ratio_pct': (('operating_expenses',), 'revenue', 100),
+    'cogs_ratio_pct': (('cost_of_goods_sold',), 'revenue', 100),
+    # Liquidity
+    'current_ratio': (('current_assets',), 'current_liabilities', 1),
+    'quick_ratio': (('cash_and_equivalents', 'accounts_receivable'), 'current_liabilities', 1),
+    'cash_ratio': (('cash_and_equivalents',), 'current_liabilities', 1),
+    'working_capital': (('current_assets', '-current_liabilities'), None, 1),
+    # Solvency and capital structure
+    'debt_to_equity': (('total_liabilities',), 'shareholder_equity', 1),
+    'debt_ratio_pct': (('total_liabilities',), 'total_assets', 100),
+    'equity_multiplier': (('total_assets',), 'shareholder_equity', 1),
+    'interest_coverage': (('operating_income',), 'interest_expense', 1),
+    # Efficiency and returns
+    'roa_pct': (('net_income',), 'total_assets', 100),
+    'roe_pct': (('net_income',), 'shareholder_equity', 100),
+    'asset_turnover': (('revenue',), 'total_assets', 1),
+    'receivables_turnover': (('revenue',), 'accounts_receivable', 1),
+    'inventory_turnover': (('cost_of_goods_sold',), 'inventory', 1),
+    'payables_turnover': (('cost_of_goods_sold',), 'accounts_payable', 1),
+    'earnings_per_share': (('net_income',), 'shares_outstanding', 1),
+    # Cash flow
+    'cf_quality': (('operating_cash_flow',), 'cf_net_income', 1),
+    'fcf_margin_pct': (('free_cash_flow',), 'revenue', 100),
+    'capex_to_ocf_pct': (('capital_expenditures',), 'operating_cash_flow', 100),
+    'ocf_to_liabilities': (('operating_cash_flow',), 'total_liabilities', 1)
+}
+
+def _entity_column(df: pd.DataFrame) -> Optional[str]:
+    return next((col for col in ENTITY_COLUMNS if col in df.columns), None)
+
+def _statement_frame(df: pd.DataFrame, components, rename: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """Numeric line items summed per (entity, period), keeping first-seen order."""
+    present = [col for col in components if col in df.columns]
+    if df.empty or not present:
+        return pd.DataFrame()
+    values = df[present].apply(pd.to_numeric, errors='coerce')
+    entity_col = _entity_column(df)
+    entity = df[entity_col].astype(str) if entity_col else pd.Series(SINGLE_ENTITY, index=df.index)
+    # Tables without a period column are read as consecutive periods
+    period = df['period'].astype(str) if 'period' in df.columns else pd.Series(np.arange(1, len(df) + 1).astype(str), index=df.index)
+    frame = values.groupby([entity.rename('entity'), period.rename('period')], sort=False).sum(min_count=1)
+    return frame.rename(columns=rename or {})
+
+def _term_matrices(columns) -> Tuple[np.ndarray, np.ndarray]:
+    """(components x ratios) numerator signs and the denominator column of each ratio (-1 for none)."""
+    position = {col: i for i, col in enumerate(columns)}
+    signs = np.zeros((len(columns), len(RATIO_DEFINITIONS)))
+    denominators = np.full(len(RATIO_DEFINITIONS), -1)
+    for j, (terms, denominator, _) in enumerate(RATIO_DEFINITIONS.values()):
+        for term in terms:
+            signs[position[term.lstrip('-')], j] = -1.0 if term.startswith('-') else 1.0
+        if denominator is not None:
+            denominators[j] = position[denominator]
+    return signs, denominators
+
+def ratio_matrix(components: pd.DataFrame) -> pd.DataFrame:
+    """
+    Every ratio in RATIO_DEFINITIONS for every row of a line-item frame.
+
+    Numerators of all ratios come from one matrix product of the line items
+    with a sign matrix; a ratio is NaN where any of its terms is missing or
+    its denominator is zero.
+    """
+    columns = list(dict.fromkeys(
+        term.lstrip('-') for terms, denominator, _ in RATIO_DEFINITIONS.values()
+        for term in (*terms, *([denominator] if denominator else []))
+    ))
+    values = components.reindex(columns=columns).to_numpy(dtype=float)
+    missing = np.isnan(values)
+    signs, denominators = _term_matrices(columns)
+    scale = np.array([definition[2] for definition in RATIO_DEFINITIONS.values()], dtype=float)
+
+    numerators = np.where(missing, 0.0, values) @ signs
+    numerators[(missing.astype(float) @ np.abs(signs)) > 0] = np.nan
+    divisors = np.where(denominators >= 0, values[:, np.maximum(denominators, 0)], 1.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = np.where(divisors != 0, numerators / divisors, np.nan) * scale
+    return pd.DataFrame(ratios, index=components.index, columns=list(RATIO_DEFINITIONS))
+
+def build_ratio_cube(income_statement: pd.DataFrame, balance_sheet: pd.DataFrame, cash_flow: pd.DataFrame) -> pd.DataFrame:
+    """
+    Line items and ratios for every (entity, period), plus a consolidated entity.
+
+    The three statements are aligned on entity (entity_id, entity, subsidiary
+    or company column, else a single entity) and period. With several
+    entities, a Consolidated entity sums the line items per period before
+    its ratios are taken, so consolidated ratios are ratios of totals.
+    """
+    frames = [
+        _statement_frame(income_statement, STATEMENT_COMPONENTS['income_statement']),
+        _statement_frame(balance_sheet, STATEMENT_COMPONENTS['balance_sheet']),
+        # Cash flow net income is kept apart for earnings quality and fills gaps in the income statement
+        _statement_frame(cash_flow, STATEMENT_COMPONENTS['cash_flow'], {'net_income': 'cf_net_income'})
+    ]
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    components = pd.concat(frames, axis=1, sort=False)
+    if 'cf_net_income' in components.columns:
+        components['net_income'] = components.get('net_income', components['cf_net_income']).fillna(components['cf_net_income'])
+
+    if components.index.get_level_values('entity').nunique() > 1:
+        consolidated = components.groupby(level='period', sort=False).sum(min_count=1)
+        consolidated.index = pd.MultiIndex.from_arrays(
+            [np.full(len(consolidated), CONSOLIDATED_ENTITY, dtype=object), consolidated.index], names=['entity', 'period']
+        )
+        components = pd.concat([consolidated, components])
+
+    cube = pd.concat([components, ratio_matrix(components)], axis=1)
+    return cube.reset_index()
+
+def entity_view(cube: pd.DataFrame, entity: Optional[str] = None) -> pd.DataFrame:
+    """One entity's rows in period order; the consolidated (or only) entity by default."""
+    if cube.empty:
+        return cube
+    if entity is None:
+        entity = CONSOLIDATED_ENTITY if (cube['entity'] == CONSOLIDATED_ENTITY).any() else cube['entity'].iloc[0]
+    return cube[cube['entity'] == entity].reset_index(drop=True)
+
+def calculate_ratio_cube(income_statement: pd.DataFrame, balance_sheet: pd.DataFrame, cash_flow: pd.DataFrame):
+    """Period-aligned line items and financial ratios for every entity and period."""
+    cube = build_ratio_cube(income_statement, balance_sheet, cash_flow)
+    if cube.empty:
+        return cube, "No income statement, balance sheet or cash flow data available"
+    entities = cube.loc[cube['entity'] != CONSOLIDATED_ENTITY, 'entity'].nunique()
+    return cube, f"{len(RATIO_DEFINITIONS)} ratios over {cube['period'].nunique():,} period(s) for {entities:,} entit{'y' if entities == 1 else 'ies'}"
+
+# Memoize the cube on its input fingerprints (shared metric cache at the repo root)
+try:
+    from metric_cache import cache_calculators
+    cache_calculators(globals())
+except ImportError:
+    pass
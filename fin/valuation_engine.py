@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+from typing import Optional, Sequence, Tuple
+
+# Rates shown in the NPV results table; the NPV curve uses a dense grid
+DEFAULT_DISCOUNT_RATES = [0.05, 0.08, 0.10, 0.12, 0.15, 0.20]
+NPV_CURVE_RATES = np.linspace(0.0, 0.30, 121)
+DEFAULT_DISCOUNT_RATE = 0.10
+DEFAULT_WACC = 0.092
+
+# Columns identifying a project when the cash flow table holds several
+PROJECT_COLUMNS = ('project_id', 'project', 'project_name')
+
+# Coarse rate ladder used to bracket each project's IRR before refining it
+IRR_BRACKET_RATES = np.concatenate([np.linspace(-0.99, -0.1, 10), np.linspace(-0.09, 1.0, 110), np.geomspace(1.05, 100.0, 40)])
+
+def cash_flow_matrix(cash_flow: pd.DataFrame, value_col: str = 'cash_flow',
+                     investment_col: str = 'initial_investment') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Project ids, a (projects x periods) cash flow matrix and each project's initial investment.
+
+    Rows are periods in table order; a project column (project_id, project or
+    project_name) splits the table into one row of the matrix per project.
+    Shorter projects are padded with zero cash flows.
+    """
+    project_col = next((col for col in PROJECT_COLUMNS if col in cash_flow.columns), None)
+    values = pd.to_numeric(cash_flow[value_col], errors='coerce').fillna(0.0).to_numpy(dtype=float)
+    investment = pd.to_numeric(cash_flow[investment_col], errors='coerce').fillna(0.0).to_numpy(dtype=float) \
+        if investment_col in cash_flow.columns else np.zeros(len(cash_flow))
+
+    if project_col is None:
+        initial = investment[:1] if len(investment) else np.zeros(1)
+        return np.array(['Project'], dtype=object), values[None, :], initial
+
+    codes, project_ids = pd.factorize(cash_flow[project_col], sort=False)
+    valid = codes >= 0
+    codes, values, investment = codes[valid], values[valid], investment[valid]
+    # Position of each row within its project, in table order
+    order = np.argsort(codes, kind='stable')
+    starts = np.r_[0, np.flatnonzero(np.diff(codes[order])) + 1]
+    counts = np.diff(np.r_[starts, len(order)])
+    periods = np.empty(len(codes), dtype=np.int64)
+    periods[order] = np.arange(len(order)) - np.repeat(starts, counts)
+
+    matrix = np.zeros((len(project_ids), periods.max() + 1 if len(periods) else 0))
+    matrix[codes, periods] = values
+    initial = np.zeros(len(project_ids))
+    initial[codes[order[starts]]] = investment[order[starts]]
+    return np.asarray(project_ids, dtype=object), matrix, initial
+
+def discount_factors(rates, n_periods: int) -> np.ndarray:
+    """(rates x periods) factors 1 / (1 + r) ** t for periods t = 1..n_periods."""
+    rates = np.asarray(rates, dtype=float)
+    return (1.0 + rates)[..., None] ** -np.arange(1, n_periods + 1, dtype=float)
+
+def npv_grid(cash_flows: np.ndarray, initial_investment: np.ndarray, rates) -> np.ndarray:
+    """NPV of every project at every rate as a (projects x rates) array, in one matrix product."""
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    factors = discount_factors(rates, cash_flows.shape[1])
+    return cash_flows @ factors.T - np.asarray(initial_investment, dtype=float)[:, None]
+
+def irr(cash_flows: np.ndarray, initial_investment: np.ndarray, tol: float = 1e-9, max_iter: int = 100) -> np.ndarray:
+    """
+    Internal rate of return of every project at once (NaN where NPV never changes sign).
+
+    The sign change of NPV on IRR_BRACKET_RATES nearest 0% gives each project a
+    bracket; Newton steps refine all projects together, falling back to
+    bisection whenever a step leaves its bracket.
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    initial_investment = np.asarray(initial_investment, dtype=float)
+    n_projects, n_periods = cash_flows.shape
+    result = np.full(n_projects, np.nan)
+    if n_projects == 0 or n_periods == 0:
+        return result
+
+    ladder = npv_grid(cash_flows, initial_investment, IRR_BRACKET_RATES)
+    crossing = np.signbit(ladder[:, :-1]) != np.signbit(ladder[:, 1:])
+    exact = ladder == 0
+    has_root = crossing.any(axis=1)
+    # Non-conventional cash flows can have several roots; report the one nearest 0%
+    midpoints = np.abs(IRR_BRACKET_RATES[:-1] + IRR_BRACKET_RATES[1:]) / 2
+    first = np.argmin(np.where(crossing, midpoints, np.inf), axis=1)
+    rows = np.flatnonzero(has_root)
+    if rows.size == 0:
+        return result
+
+    cf = cash_flows[rows]
+    invest = initial_investment[rows]
+    lo = IRR_BRACKET_RATES[first[rows]]
+    hi = IRR_BRACKET_RATES[first[rows] + 1]
+    f_lo = ladder[rows, first[rows]]
+    t = np.arange(1, n_periods + 1, dtype=float)
+
+    rate = (lo + hi) / 2
+    for _ in range(max_iter):
+        discount = (1.0 + rate)[:, None] ** -t
+        value = (cf * discount).sum(axis=1) - invest
+        slope = -(cf * t * discount / (1.0 + rate)[:, None]).sum(axis=1)
+
+        same_side = np.signbit(value) == np.signbit(f_lo)
+        lo = np.where(same_side, rate, lo)
+        f_lo = np.where(same_side, value, f_lo)
+        hi = np.where(same_side, hi, rate)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = rate - value / slope
+        bisect = ~np.isfinite(step) | (step <= lo) | (step >= hi)
+        new_rate = np.where(bisect, (lo + hi) / 2, step)
+        done = np.abs(new_rate - rate) < tol
+        rate = new_rate
+        if done.all():
+            break
+
+    result[rows] = rate
+    # A rate on the ladder that is already an exact root wins
+    exact_rows = exact.any(axis=1) & ~has_root
+    result[exact_rows] = IRR_BRACKET_RATES[np.argmax(exact[exact_rows], axis=1)]
+    return result
+
+def payback_periods(cash_flows: np.ndarray, initial_investment: np.ndarray, rate: float = 0.0) -> np.ndarray:
+    """
+    Periods until cumulative (discounted, for rate > 0) cash flow covers the investment.
+
+    Fractional within the recovery period, assuming even cash flow across
+    it; NaN for projects that never pay back.
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    initial_investment = np.asarray(initial_investment, dtype=float)
+    flows = cash_flows * discount_factors(rate, cash_flows.shape[1]) if rate else cash_flows
+    cumulative = np.cumsum(flows, axis=1)
+    reached = cumulative >= initial_investment[:, None]
+    result = np.full(len(cash_flows), np.nan)
+    rows = np.flatnonzero(reached.any(axis=1))
+    if rows.size == 0:
+        return result
+
+    period = np.argmax(reached[rows], axis=1)
+    before = np.where(period > 0, cumulative[rows, np.maximum(period - 1, 0)], 0.0)
+    flow = flows[rows, period]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraction = np.where(flow > 0, (initial_investment[rows] - before) / flow, 1.0)
+    result[rows] = period + np.clip(fraction, 0.0, 1.0)
+    return result
+
+def economic_value_added(nopat, capital_employed, wacc=DEFAULT_WACC) -> np.ndarray:
+    """EVA = NOPAT - WACC x capital employed, broadcast over projects, periods or WACC scenarios."""
+    return np.asarray(nopat, dtype=float) - np.asarray(wacc, dtype=float) * np.asarray(capital_employed, dtype=float)
+
+def calculate_npv_profile(cash_flow: pd.DataFrame, discount_rates: Optional[Sequence[float]] = None):
+    """NPV of each project at each discount rate, with the accept/reject decision."""
+    if cash_flow.empty or 'cash_flow' not in cash_flow.columns:
+        return pd.DataFrame(), "No cash flow data available"
+
+    rates = np.asarray(DEFAULT_DISCOUNT_RATES if discount_rates is None else discount_rates, dtype=float)
+    project_ids, matrix, initial = cash_flow_matrix(cash_flow)
+    grid = npv_grid(matrix, initial, rates)
+    profile = pd.DataFrame({
+        'project': np.repeat(project_ids, len(rates)),
+        'discount_rate': np.tile(rates, len(project_ids)),
+        'npv': grid.ravel()
+    })
+    profile['decision'] = np.where(profile['npv'] > 0, 'Accept', 'Reject')
+    return profile, f"NPV of {len(project_ids):,} project(s) at {len(rates)} discount rates"
+
+def calculate_project_valuations(cash_flow: pd.DataFrame, discount_rate: float = DEFAULT_DISCOUNT_RATE):
+    """NPV, IRR, simple and discounted payback per project, highest NPV first."""
+    if cash_flow.empty or 'cash_flow' not in cash_flow.columns:
+        return pd.DataFrame(), "No cash flow data available"
+
+    project_ids, matrix, initial = cash_flow_matrix(cash_flow)
+    valuations = pd.DataFrame({
+        'project': project_ids,
+        'initial_investment': initial,
+        'npv': npv_grid(matrix, initial, [discount_rate])[:, 0],
+        'irr': irr(matrix, initial),
+        'payback_period': payback_periods(matrix, initial),
+        'discounted_payback_period': payback_periods(matrix, initial, discount_rate)
+    })
+    valuations = valuations.sort_values('npv', ascending=False, ignore_index=True)
+    accepted = int((valuations['npv'] > 0).sum())
+    return valuations, f"{accepted:,} of {len(valuations):,} project(s) have a positive NPV at {discount_rate:.0%}"
+
+# Memoize the valuation calculators on their input fingerprints (shared metric cache at the repo root)
+try:
+    from metric_cache import cache_calculators
+    cache_calculators(globals())
+except ImportError:
+    pass
@@ -3,7 +3,6 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from datetime import datetime
 import io
 import base64
@@ -36,15 +35,44 @@ import plotly.express as px
 import plotly.graph_objects as go
 import plotly.io as pio
 
-# Machine Learning imports
-from sklearn.ensemble import IsolationForest, RandomForestRegressor
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
 import time
 
 # Import HR metric calculation functions
 from hr_metrics_calculator import *
 
+# Memoize metric calculations across reruns (available when running inside the integrated dashboard)
+try:
+    from metric_cache import cache_calculators
+    cache_calculators(globals())
+except ImportError:
+    pass
+
+# Year/quarter partition index over hire dates (shared with the procurement app)
+try:
+    from date_partitions import DatePartitionIndex
+except ImportError:
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from date_partitions import DatePartitionIndex
+
+# Background streaming export of loaded tables (Excel or zipped Parquet/CSV)
+try:
+    from data_export import show_export_panel
+except ImportError:
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from data_export import show_export_panel
+
+# Shared on-disk dataset store (also read by batch_precompute.py)
+try:
+    from dataset_store import load_workbook_tables
+except ImportError:
+    def load_workbook_tables(department, source, sheet_names=None, schemas=None):
+        excel_data = pd.read_excel(source, sheet_name=None)
+        return {sheet: df for sheet, df in excel_data.items() if sheet_names is None or sheet in sheet_names}
+
 # Import auto insights functionality
 from hr_auto_insights import HRAutoInsights, display_hr_insights_section
 
@@ -167,6 +195,12 @@ def calculate_hr_risk_assessment(df):
     
     return df
 
+# The risk assessment is defined after the calculator import above; memoize it too
+try:
+    cache_calculators(globals())
+except NameError:
+    pass
+
 def get_variable_list(df):
     """Return a list of numeric variables for scoring, excluding employee/name/id columns."""
     return [
@@ -243,23 +277,28 @@ def truncate_col(text, max_len=20):
         return text[:max_len-3] + "..."
     return str(text)
 
+def get_hr_partitions():
+    """Date-typed employee records partitioned by hire year and quarter, rebuilt only when the table is replaced."""
+    employees_df = st.session_state.employees
+    if employees_df.empty or 'hire_date' not in employees_df.columns:
+        return None
+    
+    partitions = st.session_state.get('hr_partitions')
+    if partitions is None or not partitions.is_current(employees_df):
+        partitions = DatePartitionIndex(employees_df, 'hire_date')
+        st.session_state.hr_partitions = partitions
+    return partitions
+
 def get_filtered_hr_df():
     """Get filtered HR data based on selected year and quarter."""
-    employees_df = st.session_state.employees.copy()
-    if not employees_df.empty and 'hire_date' in employees_df.columns:
-        employees_df['hire_date'] = pd.to_datetime(employees_df['hire_date'], errors='coerce')
-        employees_df = employees_df.dropna(subset=['hire_date'])
-        employees_df['year'] = employees_df['hire_date'].dt.year
-        employees_df['quarter'] = employees_df['hire_date'].dt.quarter
-        
-        if 'selected_year' in st.session_state and st.session_state.selected_year:
-            employees_df = employees_df[employees_df['year'] == st.session_state.selected_year]
-        
-        if 'selected_quarter' in st.session_state and st.session_state.selected_quarter != 'All':
-            quarter_num = int(st.session_state.selected_quarter[1])
-            employees_df = employees_df[employees_df['quarter'] == quarter_num]
+    partitions = get_hr_partitions()
+    if partitions is None:
+        return st.session_state.employees.copy()
     
-    return employees_df
+    return partitions.select(
+        st.session_state.get('selected_year') or None,
+        st.session_state.get('selected_quarter')
+    )
 
 def load_custom_css():
     """Load custom CSS for professional styling."""
@@ -460,26 +499,22 @@ def create_template_for_download():
     st.markdown(href, unsafe_allow_html=True)
 
 def export_data_to_excel():
-    """Exports all HR data from session state to a single Excel file."""
-    with pd.ExcelWriter('hr_data_export.xlsx', engine='xlsxwriter') as writer:
-        if not st.session_state.employees.empty:
-            st.session_state.employees.to_excel(writer, sheet_name='Employees', index=False)
-        if not st.session_state.recruitment.empty:
-            st.session_state.recruitment.to_excel(writer, sheet_name='Recruitment', index=False)
-        if not st.session_state.performance.empty:
-            st.session_state.performance.to_excel(writer, sheet_name='Performance', index=False)
-        if not st.session_state.compensation.empty:
-            st.session_state.compensation.to_excel(writer, sheet_name='Compensation', index=False)
-        if not st.session_state.training.empty:
-            st.session_state.training.to_excel(writer, sheet_name='Training', index=False)
-        if not st.session_state.engagement.empty:
-            st.session_state.engagement.to_excel(writer, sheet_name='Engagement', index=False)
-        if not st.session_state.turnover.empty:
-            st.session_state.turnover.to_excel(writer, sheet_name='Turnover', index=False)
-        if not st.session_state.benefits.empty:
-            st.session_state.benefits.to_excel(writer, sheet_name='Benefits', index=False)
-        
-        st.success("HR data exported successfully as 'hr_data_export.xlsx'")
+    """Exports all loaded HR tables as one file, written in the background and downloadable when ready."""
+    tables = {
+        'Employees': st.session_state.employees,
+        'Recruitment': st.session_state.recruitment,
+        'Performance': st.session_state.performance,
+        'Compensation': st.session_state.compensation,
+        'Training': st.session_state.training,
+        'Engagement': st.session_state.engagement,
+        'Turnover': st.session_state.turnover,
+        'Benefits': st.session_state.benefits
+    }
+    tables = {sheet: df for sheet, df in tables.items() if not df.empty}
+    if not tables:
+        st.warning("No data to export. Please load data first.")
+        return None
+    return show_export_panel(tables, key='hr_export', file_prefix='hr_data_export')
 
 # Page configuration
 st.set_page_config(
@@ -490,81 +525,88 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        color: #1f77b4;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .metric-card {
-        background-color: #f0f2f6;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin: 0.5rem 0;
-    }
-    .formula-box {
-        background-color: #e8f4fd;
-        padding: 0.5rem;
-        border-left: 4px solid #1f77b4;
-        margin: 0.5rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
+def load_base_css():
+    """Inject the base page styles shared by all sections"""
+    st.markdown("""
+    <style>
+        .main-header {
+            font-size: 2.5rem;
+            color: #1f77b4;
+            text-align: center;
+            margin-bottom: 2rem;
+        }
+        .metric-card {
+            background-color: #f0f2f6;
+            padding: 1rem;
+            border-radius: 0.5rem;
+            margin: 0.5rem 0;
+        }
+        .formula-box {
+            background-color: #e8f4fd;
+            padding: 0.5rem;
+            border-left: 4px solid #1f77b4;
+            margin: 0.5rem 0;
+        }
+    </style>
+    """, unsafe_allow_html=True)
 
-# Initialize session state for HR data storage
-if 'employees' not in st.session_state:
-    st.session_state.employees = pd.DataFrame(columns=[
-        'employee_id', 'first_name', 'last_name', 'email', 'hire_date', 'department', 
-        'job_title', 'salary', 'manager_id', 'location', 'gender', 'age', 'ethnicity',
-        'education_level', 'performance_rating', 'tenure_days', 'status'
-    ])
+def initialize_session_state():
+    """Initialize HR data tables in session state with their empty schemas"""
+    if 'employees' not in st.session_state:
+        st.session_state.employees = pd.DataFrame(columns=[
+            'employee_id', 'first_name', 'last_name', 'email', 'hire_date', 'department', 
+            'job_title', 'salary', 'manager_id', 'location', 'gender', 'age', 'ethnicity',
+            'education_level', 'performance_rating', 'tenure_days', 'status'
+        ])
 
-if 'recruitment' not in st.session_state:
-    st.session_state.recruitment = pd.DataFrame(columns=[
-        'job_posting_id', 'position_title', 'department', 'posting_date', 'closing_date',
-        'applications_received', 'candidates_interviewed', 'offers_made', 'hires_made',
-        'recruitment_source', 'recruitment_cost', 'time_to_hire_days'
-    ])
+    if 'recruitment' not in st.session_state:
+        st.session_state.recruitment = pd.DataFrame(columns=[
+            'job_posting_id', 'position_title', 'department', 'posting_date', 'closing_date',
+            'applications_received', 'candidates_interviewed', 'offers_made', 'hires_made',
+            'recruitment_source', 'recruitment_cost', 'time_to_hire_days'
+        ])
 
-if 'performance' not in st.session_state:
-    st.session_state.performance = pd.DataFrame(columns=[
-        'review_id', 'employee_id', 'review_date', 'reviewer_id', 'performance_rating',
-        'goal_achievement_rate', 'productivity_score', 'skills_assessment', 'review_cycle'
-    ])
+    if 'performance' not in st.session_state:
+        st.session_state.performance = pd.DataFrame(columns=[
+            'review_id', 'employee_id', 'review_date', 'reviewer_id', 'performance_rating',
+            'goal_achievement_rate', 'productivity_score', 'skills_assessment', 'review_cycle'
+        ])
 
-if 'compensation' not in st.session_state:
-    st.session_state.compensation = pd.DataFrame(columns=[
-        'compensation_id', 'employee_id', 'effective_date', 'base_salary', 'bonus_amount',
-        'benefits_value', 'total_compensation', 'pay_grade', 'compensation_reason'
-    ])
+    if 'compensation' not in st.session_state:
+        st.session_state.compensation = pd.DataFrame(columns=[
+            'compensation_id', 'employee_id', 'effective_date', 'base_salary', 'bonus_amount',
+            'benefits_value', 'total_compensation', 'pay_grade', 'compensation_reason'
+        ])
 
-if 'training' not in st.session_state:
-    st.session_state.training = pd.DataFrame(columns=[
-        'training_id', 'employee_id', 'training_program', 'start_date', 'completion_date',
-        'training_cost', 'skills_improvement', 'performance_impact', 'training_type'
-    ])
+    if 'training' not in st.session_state:
+        st.session_state.training = pd.DataFrame(columns=[
+            'training_id', 'employee_id', 'training_program', 'start_date', 'completion_date',
+            'training_cost', 'skills_improvement', 'performance_impact', 'training_type'
+        ])
 
-if 'engagement' not in st.session_state:
-    st.session_state.engagement = pd.DataFrame(columns=[
-        'survey_id', 'employee_id', 'survey_date', 'engagement_score', 'satisfaction_score',
-        'work_life_balance_score', 'recommendation_score', 'survey_type'
-    ])
+    if 'engagement' not in st.session_state:
+        st.session_state.engagement = pd.DataFrame(columns=[
+            'survey_id', 'employee_id', 'survey_date', 'engagement_score', 'satisfaction_score',
+            'work_life_balance_score', 'recommendation_score', 'survey_type'
+        ])
 
-if 'turnover' not in st.session_state:
-            st.session_state.turnover = pd.DataFrame(columns=[
-            'turnover_id', 'employee_id', 'separation_date', 'separation_reason', 'turnover_reason_detail', 'exit_interview_score',
-            'rehire_eligibility', 'knowledge_transfer_completed', 'replacement_hired', 'turnover_cost', 'notice_period_days'
+    if 'turnover' not in st.session_state:
+                st.session_state.turnover = pd.DataFrame(columns=[
+                'turnover_id', 'employee_id', 'separation_date', 'separation_reason', 'turnover_reason_detail', 'exit_interview_score',
+                'rehire_eligibility', 'knowledge_transfer_completed', 'replacement_hired', 'turnover_cost', 'notice_period_days'
+            ])
+
+    if 'benefits' not in st.session_state:
+        st.session_state.benefits = pd.DataFrame(columns=[
+            'benefit_id', 'employee_id', 'benefit_type', 'enrollment_date', 'utilization_rate',
+            'benefit_cost', 'provider', 'coverage_level'
         ])
 
-if 'benefits' not in st.session_state:
-    st.session_state.benefits = pd.DataFrame(columns=[
-        'benefit_id', 'employee_id', 'benefit_type', 'enrollment_date', 'utilization_rate',
-        'benefit_cost', 'provider', 'coverage_level'
-    ])
 
 def main():
+    # Initialize data tables for this browser session
+    initialize_session_state()
+    
     # Configure page for wide layout
     st.set_page_config(
         page_title="HR Analytics Dashboard",
@@ -574,6 +616,7 @@ def main():
     )
     
     # Load custom CSS
+    load_base_css()
     load_custom_css()
     
     # Modern header
@@ -667,13 +710,9 @@ def main():
             st.session_state.current_page = "📊 Strategic HR Analytics"
         
         # --- Year and Quarter Filter ---
-        employees_df = st.session_state.employees.copy()
-        if not employees_df.empty and 'hire_date' in employees_df.columns:
-            employees_df['hire_date'] = pd.to_datetime(employees_df['hire_date'], errors='coerce')
-            employees_df = employees_df.dropna(subset=['hire_date'])
-            employees_df['year'] = employees_df['hire_date'].dt.year
-            employees_df['quarter'] = employees_df['hire_date'].dt.quarter
-            years = sorted(employees_df['year'].dropna().unique())
+        hr_partitions = get_hr_partitions()
+        if hr_partitions is not None:
+            years = hr_partitions.years
             quarters = ['All', 'Q1', 'Q2', 'Q3', 'Q4']
             
             # Store default values in session state
@@ -1840,11 +1879,11 @@ def show_data_input():
         
         if uploaded_file is not None:
             try:
-                # Read all sheets from the uploaded file
-                excel_data = pd.read_excel(uploaded_file, sheet_name=None)
+                # Read all sheets once; an unchanged workbook is served from the dataset store
+                required_sheets = ['Employees', 'Recruitment', 'Performance', 'Compensation', 'Training', 'Engagement', 'Turnover', 'Benefits']
+                excel_data = load_workbook_tables('hr', uploaded_file, required_sheets)
                 
                 # Check if all required sheets are present
-                required_sheets = ['Employees', 'Recruitment', 'Performance', 'Compensation', 'Training', 'Engagement', 'Turnover', 'Benefits']
                 missing_sheets = [sheet for sheet in required_sheets if sheet not in excel_data.keys()]
                 
                 if missing_sheets:
@@ -2306,6 +2345,11 @@ def show_data_input():
         • Test all visualization types and charts
         """)
 
+    # Export data section
+    st.markdown("---")
+    st.markdown("### 📤 Export Data")
+    export_data_to_excel()
+
 # ============================================================================
 # RECRUITMENT ANALYSIS
 # ============================================================================
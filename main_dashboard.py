@@ -3,12 +3,10 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import os
 import sys
 from datetime import datetime
 import warnings
-import importlib.util
 warnings.filterwarnings('ignore')
 
 # Configure Streamlit page
@@ -32,6 +30,8 @@ sys.path.extend([
     os.path.join(current_dir, 'sale')
 ])
 
+from department_registry import get_department_registry
+
 # Custom CSS for modern dashboard styling
 def load_custom_css():
     st.markdown("""
@@ -221,15 +221,8 @@ def load_department_module(dept_key):
             st.error(f"Department file not found: {module_path}")
             return None
         
-        # Load the module
-        spec = importlib.util.spec_from_file_location(
-            dept_info['module_name'], 
-            module_path
-        )
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        
-        return module
+        # Import once per process; later navigations and reruns reuse the module
+        return get_department_registry().get_module(dept_info['module_name'], module_path)
         
     except Exception as e:
         st.error(f"Error loading department module: {str(e)}")
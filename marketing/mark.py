@@ -19,6 +19,13 @@ CATEGORICAL_COLOR_SEQUENCE = px.colors.qualitative.Pastel
 # Import marketing metric calculation functions
 from marketing_metrics_calculator import *
 
+# Memoize metric calculations across reruns (available when running inside the integrated dashboard)
+try:
+    from metric_cache import cache_calculators
+    cache_calculators(globals())
+except ImportError:
+    pass
+
 def apply_common_layout(fig):
     """Apply common layout settings to Plotly figures"""
     fig.update_layout(
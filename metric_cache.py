@@ -0,0 +1,282 @@
+import os
+import sys
+import hashlib
+import inspect
+import functools
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+import numpy as np
+import pandas as pd
+
+from perf_instrumentation import timed
+from results_store import get_results_store, result_digest
+
+DEFAULT_MAX_ENTRIES = int(os.environ.get('AZ_METRIC_CACHE_ENTRIES', 512))
+DEFAULT_MAX_BYTES = int(os.environ.get('AZ_METRIC_CACHE_MB', 512)) * 1024 * 1024
+
+def _row_hash(df: pd.DataFrame) -> str:
+    """Deterministic hash of every row (and the index) of a frame in order, stable across processes."""
+    try:
+        row_hashes = pd.util.hash_pandas_object(df, index=True)
+    except TypeError:
+        # Unhashable cell values (lists, dicts): hash their text form instead
+        row_hashes = pd.util.hash_pandas_object(df.astype(str), index=True)
+    return hashlib.blake2b(row_hashes.to_numpy().tobytes(), digest_size=16).hexdigest()
+
+# id(frame) -> (weak reference, layout, fingerprint, source) of frames already hashed; frames
+# registered through share_fingerprint start with no fingerprint and a weak reference to their source
+_fingerprints: Dict[int, tuple] = {}
+_fingerprints_lock = threading.Lock()
+
+def _layout(obj) -> tuple:
+    """Shape, column names and dtypes of a DataFrame or Series."""
+    if isinstance(obj, pd.Series):
+        return (obj.shape, (str(obj.name),), (str(obj.dtype),))
+    return (obj.shape, tuple(str(col) for col in obj.columns), tuple(str(dtype) for dtype in obj.dtypes))
+
+def _forget_fingerprint(key: int, ref):
+    with _fingerprints_lock:
+        entry = _fingerprints.get(key)
+        if entry is not None and entry[0] is ref:
+            del _fingerprints[key]
+
+def _remember_fingerprint(obj, layout: tuple, fingerprint: Optional[tuple], source=None):
+    key = id(obj)
+    ref = weakref.ref(obj, lambda ref, key=key: _forget_fingerprint(key, ref))
+    with _fingerprints_lock:
+        _fingerprints[key] = (ref, layout, fingerprint, source)
+
+def frame_fingerprint(df) -> tuple:
+    """
+    Fingerprint of a DataFrame (or Series): shape, columns, dtypes and an ordered hash of every row.
+
+    The hash is stable across processes, so keys built by the batch precompute
+    job match the dashboards'. Hashing every row costs about a second per
+    million orders, so it is done once per frame object: later calls with the
+    same object reuse it while its shape, columns and dtypes are unchanged.
+    Cell edits made in place on an already hashed frame are not seen; pages
+    replace their tables (new objects) rather than edit them.
+    """
+    layout = _layout(df)
+    with _fingerprints_lock:
+        entry = _fingerprints.get(id(df))
+    if entry is not None and entry[0]() is df and entry[1] == layout:
+        if entry[2] is not None:
+            return entry[2]
+        source = entry[3]()
+        if source is not None and _layout(source) == layout:
+            fingerprint = frame_fingerprint(source)
+            _remember_fingerprint(df, layout, fingerprint)
+            return fingerprint
+
+    fingerprint = ('frame',) + layout + (_row_hash(df),)
+    _remember_fingerprint(df, layout, fingerprint)
+    return fingerprint
+
+def share_fingerprint(copy, original):
+    """
+    Let copy reuse original's fingerprint instead of hashing its own rows.
+
+    For a copy that holds exactly the original's rows, e.g. a cached partition
+    slice handed out again as a shallow copy on each rerun. Nothing is hashed
+    until a fingerprint is first needed, and then only the original (once).
+    """
+    _remember_fingerprint(copy, _layout(copy), None, weakref.ref(original))
+
+def _fingerprint_value(value: Any):
+    """Fingerprint one function argument for use in a cache key."""
+    if isinstance(value, pd.DataFrame):
+        return frame_fingerprint(value)
+    if isinstance(value, pd.Series):
+        return ('series', value.name) + frame_fingerprint(value)[1:]
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            data_hash = _row_hash(pd.DataFrame({'value': value.ravel()}))
+        else:
+            data_hash = hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()
+        return ('array', value.shape, str(value.dtype), data_hash)
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__,) + tuple(_fingerprint_value(v) for v in value)
+    if isinstance(value, dict):
+        return ('dict',) + tuple(sorted((str(k), _fingerprint_value(v)) for k, v in value.items()))
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return ('repr', repr(value))
+
+@functools.lru_cache(maxsize=1024)
+def _signature(func: Callable) -> inspect.Signature:
+    return inspect.signature(func)
+
+def make_cache_key(func: Callable, args: tuple, kwargs: Dict[str, Any]) -> tuple:
+    """
+    Build a cache key from the function identity and fingerprints of its arguments.
+
+    Arguments are bound to parameter names with defaults filled in, so
+    f(df, 5), f(df, n=5) and f(df) (with n=5 the default) share one key; the
+    batch precompute job and the dashboards rely on this to find each other's results.
+    """
+    try:
+        bound = _signature(func).bind(*args, **kwargs)
+    except (TypeError, ValueError):
+        return (
+            func.__module__,
+            func.__qualname__,
+            tuple(_fingerprint_value(arg) for arg in args),
+            tuple(sorted((key, _fingerprint_value(value)) for key, value in kwargs.items()))
+        )
+    bound.apply_defaults()
+    return (
+        func.__module__,
+        func.__qualname__,
+        tuple((name, _fingerprint_value(value)) for name, value in bound.arguments.items())
+    )
+
+def estimate_size(value: Any) -> int:
+    """Approximate the memory held by a cached result in bytes."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value.values())
+    if hasattr(value, 'nbytes'):
+        # numpy arrays and objects that report their own footprint (e.g. SupplierRiskEngine)
+        return int(value.nbytes)
+    return sys.getsizeof(value)
+
+def _copy_result(value: Any) -> Any:
+    """Copy pandas objects in a result so callers can modify what they get back."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    if isinstance(value, tuple):
+        return tuple(_copy_result(v) for v in value)
+    if isinstance(value, list):
+        return [_copy_result(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _copy_result(v) for k, v in value.items()}
+    return value
+
+class MetricCache:
+    """Process-wide LRU cache of metric results with an entry limit and a memory budget."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return (True, value) for a cached key, moving it to most recently used, else (False, None)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, key, value):
+        """Store a result, evicting least recently used entries to stay within budget."""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+
+            while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every cached result."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current memory use."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'size_mb': self._total_bytes / (1024 * 1024),
+                'budget_mb': self.max_bytes / (1024 * 1024),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups > 0 else 0.0
+            }
+
+_metric_cache = MetricCache()
+
+def get_metric_cache() -> MetricCache:
+    """Return the process-wide metric cache."""
+    return _metric_cache
+
+def load_precomputed(func: Callable, key: tuple):
+    """Return (True, value) if the batch precompute job stored this exact call, else (False, None)."""
+    store = get_results_store()
+    if not store.available:
+        return False, None
+    try:
+        return store.get(result_digest(func, key))
+    except Exception:
+        return False, None
+
+def cached_metric(func: Callable) -> Callable:
+    """Memoize a calculate_* function on its input fingerprints and parameters, reusing precomputed results on a miss."""
+    if getattr(func, '_metric_cached', False):
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        cache = get_metric_cache()
+        if not cache.enabled:
+            return func(*args, **kwargs)
+
+        try:
+            key = make_cache_key(func, args, kwargs)
+        except Exception:
+            return func(*args, **kwargs)
+
+        found, value = cache.get(key)
+        if not found:
+            found, value = load_precomputed(func, key)
+            if not found:
+                value = func(*args, **kwargs)
+            cache.put(key, value)
+        return _copy_result(value)
+
+    wrapper._metric_cached = True
+    return wrapper
+
+def cache_calculators(namespace: Dict[str, Any], prefix: str = 'calculate_') -> int:
+    """
+    Wrap every callable named prefix* in a module namespace (e.g. globals()) with cached_metric.
+
+    The cached function is also timed as a 'metric' span (cache hits included)
+    while performance instrumentation is enabled.
+    """
+    wrapped = 0
+    for name, value in list(namespace.items()):
+        if name.startswith(prefix) and callable(value) and not isinstance(value, type):
+            namespace[name] = timed(cached_metric(value), 'metric', name)
+            wrapped += 1
+    return wrapped
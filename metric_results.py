@@ -0,0 +1,181 @@
+import re
+import math
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterator, List, Optional, Union
+import pandas as pd
+
+# Units written before the number; every other unit is written after it
+PREFIX_UNITS = ('$',)
+
+# A sign may come before the currency symbol ('-$1,234', as MetricValue.format writes it) or after it
+_NUMBER_PATTERN = re.compile(
+    r'^\s*(?:(?P<sign>[-+])\s*(?=\$))?(?P<prefix>\$)?\s*(?P<number>(?(sign)|[-+]?)(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.(?P<decimals>\d+))?)\s*(?P<suffix>%|[A-Za-z][A-Za-z /()-]*)?\s*$'
+)
+
+@dataclass(frozen=True)
+class MetricValue:
+    """
+    A single metric kept as its raw value plus the hints needed to display it.
+
+    `value` stays numeric (or None / plain text for non-numeric metrics);
+    `unit` is '$', '%' or a word such as 'hours'; `precision` is the number of
+    decimals shown and `thousands` whether digits are grouped with commas.
+    """
+    name: str
+    value: Any
+    unit: str = ''
+    precision: int = 2
+    thousands: bool = True
+
+    @property
+    def is_numeric(self) -> bool:
+        return isinstance(self.value, (int, float)) and not isinstance(self.value, bool)
+
+    def format(self) -> str:
+        """Render the value with its unit, e.g. '$1,234.50', '87.5%' or '4.2 hours'."""
+        if self.value is None or (isinstance(self.value, float) and math.isnan(self.value)):
+            return 'N/A'
+        if not self.is_numeric:
+            return str(self.value)
+
+        spec = f"{',' if self.thousands else ''}.{self.precision}f"
+        number = format(self.value, spec)
+        if not self.unit:
+            return number
+        if self.unit in PREFIX_UNITS:
+            return f"-{self.unit}{number[1:]}" if number.startswith('-') else f"{self.unit}{number}"
+        if self.unit == '%':
+            return f"{number}%"
+        return f"{number} {self.unit}"
+
+    def __str__(self) -> str:
+        return self.format()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MetricValue':
+        return cls(**data)
+
+def parse_formatted_value(name: str, text: Any) -> MetricValue:
+    """Recover a MetricValue from a pre-formatted cell such as '$1,234', '45.2%' or '12.5 hours'."""
+    if text is None or isinstance(text, bool):
+        return MetricValue(name, text, precision=0)
+    if isinstance(text, (int, float)):
+        if isinstance(text, float) and not text.is_integer():
+            return MetricValue(name, float(text), precision=2, thousands=False)
+        return MetricValue(name, int(text), precision=0, thousands=False)
+    if hasattr(text, 'item') and not isinstance(text, str):
+        # numpy scalars
+        return parse_formatted_value(name, text.item())
+
+    match = _NUMBER_PATTERN.match(str(text))
+    if match is None:
+        return MetricValue(name, str(text), precision=0)
+
+    number = match.group('number')
+    decimals = match.group('decimals')
+    unit = match.group('prefix') or (match.group('suffix') or '').strip()
+    digits = (match.group('sign') or '') + number.replace(',', '')
+    value = float(digits) if decimals is not None else int(digits)
+    return MetricValue(
+        name,
+        value,
+        unit=unit,
+        precision=len(decimals) if decimals is not None else 0,
+        thousands=',' in number
+    )
+
+class MetricResult:
+    """
+    Ordered collection of MetricValues plus the calculator's message.
+
+    Metrics are looked up by position or by name. Results compare by value,
+    round-trip through to_dict/from_dict, and are only turned into display
+    strings by format() or to_frame().
+    """
+
+    def __init__(self, metrics: Optional[List[MetricValue]] = None, message: str = ''):
+        self.metrics = list(metrics or [])
+        self.message = message
+
+    def _find(self, key: Union[int, str]) -> Optional[MetricValue]:
+        if isinstance(key, int):
+            return self.metrics[key] if -len(self.metrics) <= key < len(self.metrics) else None
+        for metric in self.metrics:
+            if metric.name == key:
+                return metric
+        return None
+
+    def __getitem__(self, key: Union[int, str]) -> MetricValue:
+        metric = self._find(key)
+        if metric is None:
+            raise KeyError(key)
+        return metric
+
+    def __contains__(self, key: Union[int, str]) -> bool:
+        return self._find(key) is not None
+
+    def __iter__(self) -> Iterator[MetricValue]:
+        return iter(self.metrics)
+
+    def __len__(self) -> int:
+        return len(self.metrics)
+
+    @property
+    def empty(self) -> bool:
+        return not self.metrics
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, MetricResult):
+            return NotImplemented
+        return self.metrics == other.metrics and self.message == other.message
+
+    def __repr__(self) -> str:
+        return f"MetricResult({len(self.metrics)} metrics, message={self.message!r})"
+
+    def value(self, key: Union[int, str], default: Any = math.nan) -> Any:
+        """Raw value of a metric, or default (NaN unless given) when it is missing or not numeric."""
+        metric = self._find(key)
+        if metric is None or not metric.is_numeric:
+            return default
+        return metric.value
+
+    def format(self, key: Union[int, str], default: str = 'N/A') -> str:
+        """Display string of a metric."""
+        metric = self._find(key)
+        return metric.format() if metric is not None else default
+
+    def to_frame(self, name_column: str = 'Metric', value_column: str = 'Value') -> pd.DataFrame:
+        """Render the result as the two-column summary table the pages display."""
+        return pd.DataFrame({
+            name_column: [metric.name for metric in self.metrics],
+            value_column: [metric.format() for metric in self.metrics]
+        })
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'message': self.message, 'metrics': [metric.to_dict() for metric in self.metrics]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MetricResult':
+        return cls([MetricValue.from_dict(m) for m in data.get('metrics', [])], data.get('message', ''))
+
+    @classmethod
+    def from_summary_frame(cls, summary_df: pd.DataFrame, message: str = '',
+                           value_column: str = 'Value', name_column: Optional[str] = None) -> 'MetricResult':
+        """
+        Parse a legacy (summary_df, message) result once into typed metrics.
+
+        Used at the boundary with calculators that still return formatted
+        strings, so pages read numbers from .value() instead of re-parsing text.
+        """
+        if summary_df is None or summary_df.empty or value_column not in summary_df.columns:
+            return cls([], message)
+
+        if name_column is None:
+            name_column = next((col for col in summary_df.columns if col != value_column), None)
+        names = summary_df[name_column].astype(str).tolist() if name_column is not None else [str(i) for i in range(len(summary_df))]
+
+        metrics = [parse_formatted_value(name, text) for name, text in zip(names, summary_df[value_column].tolist())]
+        return cls(metrics, message)
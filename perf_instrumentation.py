@@ -0,0 +1,238 @@
+import os
+import io
+import json
+import time
+import functools
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Spans and reruns kept in memory; older records are dropped first
+MAX_SPANS = 5000
+MAX_RERUNS = 500
+
+SPAN_COLUMNS = ['timestamp', 'session', 'rerun', 'kind', 'department', 'name', 'seconds', 'error']
+RERUN_COLUMNS = ['rerun', 'session', 'timestamp', 'department', 'seconds', 'rss_mb', 'peak_rss_mb', 'peak_increase_mb', 'spans']
+
+def current_rss_mb() -> Optional[float]:
+    """Resident memory of this process in MB (Linux /proc), or None where unavailable."""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError, IndexError):
+        return None
+
+def peak_rss_mb() -> Optional[float]:
+    """Highest resident memory of this process so far in MB, or None where unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if os.uname().sysname == 'Darwin' else peak / 1024
+
+class PerfRecorder:
+    """
+    Process-wide recorder of timing spans and per-rerun memory.
+
+    Instrumented functions check enabled before doing anything else, so the
+    cost while disabled is one attribute lookup per call. Records live in
+    bounded deques shared by all sessions of the process and carry the
+    session they came from. Streamlit runs each session's reruns on its own
+    script thread, so the rerun in progress (and whether it is instrumented)
+    is kept per thread: sessions neither overwrite each other's rerun timing
+    nor switch instrumentation on or off for each other.
+    """
+
+    def __init__(self, enabled: bool = False):
+        # Used by threads outside an instrumented rerun (and by reruns that do not choose)
+        self.default_enabled = enabled
+        self.spans = deque(maxlen=MAX_SPANS)
+        self.reruns = deque(maxlen=MAX_RERUNS)
+        self._lock = threading.Lock()
+        self._rerun_count = 0
+        self._local = threading.local()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether calls on the current thread (its rerun) are instrumented."""
+        return getattr(self._local, 'enabled', self.default_enabled)
+
+    @enabled.setter
+    def enabled(self, value: bool):
+        self._local.enabled = value
+
+    def record_span(self, kind: str, name: str, seconds: float, error: bool = False, department: Optional[str] = None):
+        """Store one timed call, attributed to the rerun in progress on this thread."""
+        local = self._local
+        with self._lock:
+            self.spans.append({
+                'timestamp': datetime.now().isoformat(timespec='milliseconds'),
+                'session': getattr(local, 'session', None),
+                'rerun': getattr(local, 'rerun_id', None),
+                'kind': kind,
+                'department': department or getattr(local, 'department', None),
+                'name': name,
+                'seconds': seconds,
+                'error': error
+            })
+        local.spans = getattr(local, 'spans', 0) + 1
+
+    def begin_rerun(self, department: Optional[str] = None, session: Optional[str] = None, enabled: Optional[bool] = None):
+        """Mark the start of a script rerun of a session on this thread; enabled overrides default_enabled for it."""
+        local = self._local
+        local.enabled = self.default_enabled if enabled is None else enabled
+        local.start = None
+        local.session = session
+        local.department = department
+        if not local.enabled:
+            return
+        with self._lock:
+            self._rerun_count += 1
+            local.rerun_id = self._rerun_count
+        local.start = time.perf_counter()
+        local.spans = 0
+        local.peak = peak_rss_mb()
+
+    def end_rerun(self):
+        """Record the duration and memory of the rerun started by begin_rerun on this thread."""
+        local = self._local
+        if not self.enabled or getattr(local, 'start', None) is None:
+            return
+        peak = peak_rss_mb()
+        with self._lock:
+            self.reruns.append({
+                'rerun': local.rerun_id,
+                'session': local.session,
+                'timestamp': datetime.now().isoformat(timespec='milliseconds'),
+                'department': local.department,
+                'seconds': time.perf_counter() - local.start,
+                'rss_mb': current_rss_mb(),
+                'peak_rss_mb': peak,
+                # Non-zero only when this rerun pushed the process to a new memory high
+                'peak_increase_mb': peak - local.peak if peak is not None and local.peak is not None else None,
+                'spans': local.spans
+            })
+        local.start = None
+
+    def clear(self):
+        """Drop all recorded spans and reruns."""
+        with self._lock:
+            self.spans.clear()
+            self.reruns.clear()
+
+    def spans_frame(self, session: Optional[str] = None) -> pd.DataFrame:
+        """Recorded spans, optionally of one session only."""
+        with self._lock:
+            spans = pd.DataFrame(list(self.spans), columns=SPAN_COLUMNS)
+        return spans if session is None else spans[spans['session'] == session].reset_index(drop=True)
+
+    def reruns_frame(self, session: Optional[str] = None) -> pd.DataFrame:
+        """Recorded reruns, optionally of one session only."""
+        with self._lock:
+            reruns = pd.DataFrame(list(self.reruns), columns=RERUN_COLUMNS)
+        return reruns if session is None else reruns[reruns['session'] == session].reset_index(drop=True)
+
+    def summary(self, kind: Optional[str] = None, session: Optional[str] = None) -> pd.DataFrame:
+        """Per-function call count, total, mean, p95 and max seconds, slowest total first."""
+        spans = self.spans_frame(session)
+        if kind is not None:
+            spans = spans[spans['kind'] == kind]
+        if spans.empty:
+            return pd.DataFrame(columns=['department', 'name', 'calls', 'total_s', 'mean_s', 'p95_s', 'max_s', 'errors'])
+        grouped = spans.groupby(['department', 'name'], dropna=False)['seconds']
+        summary = pd.DataFrame({
+            'calls': grouped.size(),
+            'total_s': grouped.sum(),
+            'mean_s': grouped.mean(),
+            'p95_s': grouped.quantile(0.95),
+            'max_s': grouped.max(),
+            'errors': spans.groupby(['department', 'name'], dropna=False)['error'].sum().astype(int)
+        }).reset_index()
+        return summary.sort_values('total_s', ascending=False, ignore_index=True)
+
+_recorder = PerfRecorder(enabled=os.environ.get('AZ_PERF_INSTRUMENTATION', '0') == '1')
+
+def get_perf_recorder() -> PerfRecorder:
+    """Return the process-wide performance recorder."""
+    return _recorder
+
+def timed(func: Callable, kind: str, name: Optional[str] = None, department: Optional[str] = None) -> Callable:
+    """Wrap func so that each call is recorded as a span while instrumentation is enabled."""
+    if getattr(func, '_perf_timed', False):
+        return func
+    span_name = name or func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        recorder = _recorder
+        if not recorder.enabled:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        failed = False
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            # Streamlit's rerun/stop signals are BaseExceptions and still close the span
+            recorder.record_span(kind, span_name, time.perf_counter() - start, failed, department)
+
+    wrapper._perf_timed = True
+    return wrapper
+
+def instrument_namespace(namespace: Dict[str, Any], prefix: str, kind: str, department: Optional[str] = None) -> int:
+    """Wrap every function named prefix* in a module namespace (e.g. vars(module)) with timed."""
+    wrapped = 0
+    for name, value in list(namespace.items()):
+        if name.startswith(prefix) and callable(value) and not isinstance(value, type):
+            namespace[name] = timed(value, kind, name, department)
+            wrapped += 1
+    return wrapped
+
+def session_frame_sizes(session_state) -> pd.DataFrame:
+    """Rows, columns and deep memory of every DataFrame held in session state (one level into dicts)."""
+    rows = []
+    for key in list(session_state.keys()):
+        value = session_state[key]
+        candidates = [(str(key), value)]
+        if isinstance(value, dict):
+            candidates = [(f"{key}[{sub_key}]", sub_value) for sub_key, sub_value in value.items()]
+        for label, frame in candidates:
+            if isinstance(frame, pd.DataFrame):
+                rows.append({
+                    'key': label,
+                    'rows': len(frame),
+                    'columns': frame.shape[1],
+                    'memory_mb': frame.memory_usage(index=True, deep=True).sum() / (1024 * 1024)
+                })
+    if not rows:
+        return pd.DataFrame(columns=['key', 'rows', 'columns', 'memory_mb'])
+    return pd.DataFrame(rows).sort_values('memory_mb', ascending=False, ignore_index=True)
+
+def export_json(recorder: Optional[PerfRecorder] = None, session_frames: Optional[pd.DataFrame] = None,
+                session: Optional[str] = None) -> str:
+    """Spans, reruns (optionally of one session) and session DataFrame sizes as a JSON document."""
+    recorder = recorder or _recorder
+    document = {
+        'exported_at': datetime.now().isoformat(timespec='seconds'),
+        'spans': json.loads(recorder.spans_frame(session).to_json(orient='records')),
+        'reruns': json.loads(recorder.reruns_frame(session).to_json(orient='records'))
+    }
+    if session_frames is not None:
+        document['session_frames'] = json.loads(session_frames.to_json(orient='records'))
+    return json.dumps(document, indent=2)
+
+def export_csv(frame: pd.DataFrame) -> str:
+    """A recorder table as CSV text."""
+    buffer = io.StringIO()
+    frame.to_csv(buffer, index=False)
+    return buffer.getvalue()
@@ -4,6 +4,8 @@ from typing import Tuple, Dict, List
 import warnings
 warnings.filterwarnings('ignore')
 
+from price_stats import get_price_stats_index, item_lookup
+
 def calculate_benchmark_price_efficiency(purchase_orders: pd.DataFrame, items_data: pd.DataFrame) -> Tuple[pd.DataFrame, str]:
     """
     Calculate Benchmark-Based Price Efficiency to detect overpayment per item or supplier.
@@ -23,49 +25,40 @@ def calculate_benchmark_price_efficiency(purchase_orders: pd.DataFrame, items_da
         if merged_data.empty:
             return pd.DataFrame(), "No matching data found after merge"
         
-        # Calculate benchmark prices for each item
-        item_benchmarks = merged_data.groupby('item_id').agg({
-            'unit_price': ['mean', 'median', 'min'],
-            'item_name': 'first',
-            'category': 'first'
-        }).reset_index()
+        # Benchmark prices per item from the shared price statistics index
+        item_benchmarks = get_price_stats_index(purchase_orders).item_stats(quantiles=(0.5,))
+        
+        # Broadcast each item's benchmark onto its POs (median, falling back to average)
+        benchmark_price = item_benchmarks['p50'].fillna(item_benchmarks['mean'])
+        benchmark_map = pd.Series(benchmark_price.to_numpy(), index=item_benchmarks['item_id'])
         
-        # Flatten column names
-        item_benchmarks.columns = ['item_id', 'avg_price', 'median_price', 'min_price', 'item_name', 'category']
-        
-        # Calculate price efficiency metrics
-        efficiency_data = []
-        
-        for _, item in item_benchmarks.iterrows():
-            item_pos = merged_data[merged_data['item_id'] == item['item_id']]
-            
-            # Calculate efficiency for each PO of this item
-            for _, po in item_pos.iterrows():
-                # Use median as primary benchmark, fallback to average
-                benchmark_price = item['median_price'] if not pd.isna(item['median_price']) else item['avg_price']
-                
-                if benchmark_price and benchmark_price > 0:
-                    efficiency_index = po['unit_price'] / benchmark_price
-                    deviation_pct = (efficiency_index - 1) * 100
-                    
-                    efficiency_data.append({
-                        'item_id': po['item_id'],
-                        'item_name': po['item_name'],
-                        'category': po['category'],
-                        'supplier_id': po['supplier_id'],
-                        'actual_price': po['unit_price'],
-                        'benchmark_price': benchmark_price,
-                        'efficiency_index': efficiency_index,
-                        'deviation_pct': deviation_pct,
-                        'is_overpriced': efficiency_index > 1.1,  # >110% of benchmark
-                        'quantity': po['quantity'],
-                        'total_spend': po['quantity'] * po['unit_price']
-                    })
-        
-        if not efficiency_data:
+        # Stable sort keeps POs grouped by item in their original order
+        item_pos = merged_data[merged_data['item_id'].notna()].sort_values('item_id', kind='stable')
+        po_benchmark = item_pos['item_id'].map(benchmark_map)
+        valid = (po_benchmark > 0).to_numpy()
+        item_pos = item_pos[valid]
+        po_benchmark = po_benchmark[valid].to_numpy(dtype=float)
+        
+        if item_pos.empty:
             return pd.DataFrame(), "No efficiency data calculated"
         
-        efficiency_df = pd.DataFrame(efficiency_data)
+        unit_price = item_pos['unit_price'].to_numpy(dtype=float)
+        quantity = item_pos['quantity'].to_numpy()
+        efficiency_index = unit_price / po_benchmark
+        
+        efficiency_df = pd.DataFrame({
+            'item_id': item_pos['item_id'].to_numpy(),
+            'item_name': item_pos['item_name'].to_numpy(),
+            'category': item_pos['category'].to_numpy(),
+            'supplier_id': item_pos['supplier_id'].to_numpy(),
+            'actual_price': unit_price,
+            'benchmark_price': po_benchmark,
+            'efficiency_index': efficiency_index,
+            'deviation_pct': (efficiency_index - 1) * 100,
+            'is_overpriced': efficiency_index > 1.1,  # >110% of benchmark
+            'quantity': quantity,
+            'total_spend': quantity * unit_price
+        })
         
         # Calculate summary metrics
         overpriced_items = efficiency_df[efficiency_df['is_overpriced']]
@@ -93,72 +86,50 @@ def calculate_negotiation_opportunity_index(purchase_orders: pd.DataFrame, items
         if purchase_orders.empty or items_data.empty:
             return pd.DataFrame(), "No data available for negotiation opportunity analysis"
         
-        # Merge PO data with items data
-        merged_data = purchase_orders.merge(items_data, on='item_id', how='left', suffixes=('', '_item'))
+        # Price statistics per item and supplier, to find items with multiple suppliers
+        item_supplier_analysis = get_price_stats_index(purchase_orders).item_supplier_stats().rename(
+            columns={'mean': 'avg_price', 'std': 'price_std', 'count': 'po_count'}
+        )
+        item_supplier_analysis['item_name'] = item_supplier_analysis['item_id'].map(item_lookup(items_data, 'item_name'))
+        item_supplier_analysis['category'] = item_supplier_analysis['item_id'].map(item_lookup(items_data, 'category'))
         
-        if merged_data.empty:
-            return pd.DataFrame(), "No matching data found after merge"
+        # Calculate opportunity scores with item-level transforms instead of per-row filtering
+        item_groups = item_supplier_analysis.groupby('item_id')['total_quantity']
         
-        # Calculate opportunity metrics by item-supplier combination
-        opportunity_data = []
+        # Volume weight (higher volume = more leverage)
+        volume_weight = np.minimum(item_supplier_analysis['total_quantity'] / item_groups.transform('max'), 1.0)
         
-        # Group by item to find items with multiple suppliers
-        item_supplier_analysis = merged_data.groupby(['item_id', 'supplier_id']).agg({
-            'unit_price': ['mean', 'std', 'count'],
-            'quantity': 'sum',
-            'item_name': 'first',
-            'category': 'first'
-        }).reset_index()
+        # Price variation (lower variation = more leverage); missing std yields no leverage
+        avg_price = item_supplier_analysis['avg_price']
+        price_cv = np.where(avg_price > 0, item_supplier_analysis['price_std'] / avg_price, 0)
+        price_variation = 1 - price_cv
+        price_variation_factor = np.where(price_variation > 0, price_variation, 0.0)
         
-        # Flatten column names
-        item_supplier_analysis.columns = ['item_id', 'supplier_id', 'avg_price', 'price_std', 'po_count', 'total_quantity', 'item_name', 'category']
-        
-        # Calculate opportunity scores
-        for _, row in item_supplier_analysis.iterrows():
-            # Get all suppliers for this item
-            item_suppliers = item_supplier_analysis[item_supplier_analysis['item_id'] == row['item_id']]
-            
-            # Volume weight (higher volume = more leverage)
-            volume_weight = min(row['total_quantity'] / item_suppliers['total_quantity'].max(), 1.0)
-            
-            # Price variation (lower variation = more leverage)
-            price_cv = row['price_std'] / row['avg_price'] if row['avg_price'] > 0 else 0
-            price_variation_factor = max(0, 1 - price_cv)
-            
-            # Competition factor (more suppliers = more competition)
-            competition_factor = min(len(item_suppliers) / 3, 1.0)  # Normalize to max 3 suppliers
-            
-            # Calculate opportunity score
-            opportunity_score = volume_weight * price_variation_factor * competition_factor
-            
-            # Determine opportunity level
-            if opportunity_score >= 0.7:
-                opportunity_level = "High"
-            elif opportunity_score >= 0.4:
-                opportunity_level = "Medium"
-            else:
-                opportunity_level = "Low"
-            
-            opportunity_data.append({
-                'item_id': row['item_id'],
-                'item_name': row['item_name'],
-                'category': row['category'],
-                'supplier_id': row['supplier_id'],
-                'avg_price': row['avg_price'],
-                'price_std': row['price_std'],
-                'po_count': row['po_count'],
-                'total_quantity': row['total_quantity'],
-                'volume_weight': volume_weight,
-                'price_variation_factor': price_variation_factor,
-                'competition_factor': competition_factor,
-                'opportunity_score': opportunity_score,
-                'opportunity_level': opportunity_level
-            })
-        
-        if not opportunity_data:
-            return pd.DataFrame(), "No opportunity data calculated"
+        # Competition factor (more suppliers = more competition), normalized to max 3 suppliers
+        competition_factor = np.minimum(item_groups.transform('size') / 3, 1.0)
         
-        opportunity_df = pd.DataFrame(opportunity_data)
+        # Calculate opportunity score
+        opportunity_score = volume_weight * price_variation_factor * competition_factor
+        
+        # Determine opportunity level
+        opportunity_level = np.select(
+            [opportunity_score >= 0.7, opportunity_score >= 0.4],
+            ['High', 'Medium'],
+            default='Low'
+        )
+        
+        opportunity_df = item_supplier_analysis[[
+            'item_id', 'item_name', 'category', 'supplier_id', 'avg_price',
+            'price_std', 'po_count', 'total_quantity'
+        ]].copy()
+        opportunity_df['volume_weight'] = volume_weight
+        opportunity_df['price_variation_factor'] = price_variation_factor
+        opportunity_df['competition_factor'] = competition_factor
+        opportunity_df['opportunity_score'] = opportunity_score
+        opportunity_df['opportunity_level'] = opportunity_level
+        
+        if opportunity_df.empty:
+            return pd.DataFrame(), "No opportunity data calculated"
         
         # Calculate summary metrics
         high_opportunity = opportunity_df[opportunity_df['opportunity_level'] == 'High']
@@ -184,10 +155,13 @@ def calculate_tail_spend_optimization(purchase_orders: pd.DataFrame, suppliers:
         if purchase_orders.empty or suppliers.empty:
             return pd.DataFrame(), "No data available for tail spend analysis"
         
-        # Calculate spend by supplier
-        supplier_spend = purchase_orders.groupby('supplier_id').agg({
+        # Calculate spend by supplier from a precomputed line total
+        po_spend = purchase_orders[['supplier_id', 'quantity', 'po_id']].assign(
+            line_spend=purchase_orders['quantity'] * purchase_orders['unit_price']
+        )
+        supplier_spend = po_spend.groupby('supplier_id').agg({
             'quantity': 'sum',
-            'unit_price': lambda x: (x * purchase_orders.loc[x.index, 'quantity']).sum(),
+            'line_spend': 'sum',
             'po_id': 'count'
         }).reset_index()
         
@@ -214,24 +188,14 @@ def calculate_tail_spend_optimization(purchase_orders: pd.DataFrame, suppliers:
         avg_po_value_tail = tail_suppliers['total_spend'].sum() / tail_suppliers['po_count'].sum() if tail_suppliers['po_count'].sum() > 0 else 0
         
         # Identify consolidation opportunities
-        consolidation_data = []
-        for _, supplier in tail_suppliers.iterrows():
-            # Calculate potential savings from consolidation
+        if tail_suppliers.empty:
+            consolidation_df = pd.DataFrame()
+        else:
+            consolidation_df = tail_suppliers[['supplier_id', 'supplier_name', 'total_spend', 'spend_pct', 'po_count']].reset_index(drop=True)
+            consolidation_df['avg_po_value'] = consolidation_df['total_spend'] / consolidation_df['po_count']
             # Assume 15% savings from reducing transaction costs and better pricing
-            potential_savings = supplier['total_spend'] * 0.15
-            
-            consolidation_data.append({
-                'supplier_id': supplier['supplier_id'],
-                'supplier_name': supplier['supplier_name'],
-                'total_spend': supplier['total_spend'],
-                'spend_pct': supplier['spend_pct'],
-                'po_count': supplier['po_count'],
-                'avg_po_value': supplier['total_spend'] / supplier['po_count'],
-                'potential_savings': potential_savings,
-                'consolidation_priority': 'High' if supplier['po_count'] > 5 else 'Medium'
-            })
-        
-        consolidation_df = pd.DataFrame(consolidation_data)
+            consolidation_df['potential_savings'] = consolidation_df['total_spend'] * 0.15
+            consolidation_df['consolidation_priority'] = np.where(consolidation_df['po_count'] > 5, 'High', 'Medium')
         
         summary_msg = f"Tail Spend: ${tail_spend_total:,.0f} ({tail_spend_pct:.1f}% of total) | Tail Suppliers: {len(tail_suppliers)} | Avg PO Value: ${avg_po_value_tail:,.0f}"
         
@@ -262,57 +226,72 @@ def calculate_unit_cost_trend_analysis(purchase_orders: pd.DataFrame, items_data
         merged_data['order_date'] = pd.to_datetime(merged_data['order_date'])
         merged_data['month'] = merged_data['order_date'].dt.to_period('M')
         
-        # Calculate monthly trends by item
-        trend_data = []
-        
-        for item_id in merged_data['item_id'].unique():
-            item_data = merged_data[merged_data['item_id'] == item_id]
-            item_name = item_data['item_name'].iloc[0]
-            category = item_data['category'].iloc[0]
-            
-            # Monthly aggregation
-            monthly_data = item_data.groupby('month').agg({
-                'unit_price': ['mean', 'std', 'count'],
-                'quantity': 'sum'
-            }).reset_index()
-            
-            monthly_data.columns = ['month', 'avg_price', 'price_std', 'po_count', 'total_quantity']
-            
-            # Calculate trend metrics
-            if len(monthly_data) > 1:
-                # Price trend (linear regression slope)
-                x = np.arange(len(monthly_data))
-                y = monthly_data['avg_price'].values
-                slope = np.polyfit(x, y, 1)[0]
-                
-                # Price volatility
-                price_volatility = monthly_data['price_std'].mean() / monthly_data['avg_price'].mean() if monthly_data['avg_price'].mean() > 0 else 0
-                
-                # Identify anomalies (prices > 2 std dev from mean)
-                overall_mean = monthly_data['avg_price'].mean()
-                overall_std = monthly_data['avg_price'].std()
-                anomaly_threshold = overall_mean + 2 * overall_std
-                
-                anomalies = monthly_data[monthly_data['avg_price'] > anomaly_threshold]
-                
-                trend_data.append({
-                    'item_id': item_id,
-                    'item_name': item_name,
-                    'category': category,
-                    'trend_slope': slope,
-                    'price_volatility': price_volatility,
-                    'trend_direction': 'Increasing' if slope > 0 else 'Decreasing',
-                    'anomaly_count': len(anomalies),
-                    'avg_price': overall_mean,
-                    'price_range': monthly_data['avg_price'].max() - monthly_data['avg_price'].min(),
-                    'total_quantity': monthly_data['total_quantity'].sum(),
-                    'po_count': monthly_data['po_count'].sum()
-                })
-        
-        if not trend_data:
+        # Monthly aggregation for every item in one pass
+        monthly_data = merged_data.groupby(['item_id', 'month']).agg({
+            'unit_price': ['mean', 'std', 'count'],
+            'quantity': 'sum'
+        }).reset_index()
+        
+        monthly_data.columns = ['item_id', 'month', 'avg_price', 'price_std', 'po_count', 'total_quantity']
+        
+        # Only items with more than one month of history have a trend
+        month_counts = monthly_data.groupby('item_id')['month'].transform('size')
+        monthly_data = monthly_data[month_counts > 1].copy()
+        
+        if monthly_data.empty:
             return pd.DataFrame(), "No trend data calculated"
         
-        trend_df = pd.DataFrame(trend_data)
+        # Price trend (least-squares slope of monthly average price over month index)
+        monthly_data['x'] = monthly_data.groupby('item_id').cumcount().astype(float)
+        by_item = monthly_data.groupby('item_id')
+        x_dev = monthly_data['x'] - by_item['x'].transform('mean')
+        y_dev = monthly_data['avg_price'] - by_item['avg_price'].transform('mean')
+        monthly_data['xy'] = x_dev * y_dev
+        monthly_data['xx'] = x_dev * x_dev
+        # A month without a usable price leaves the item without a slope, as np.polyfit did
+        monthly_data['finite_price'] = np.isfinite(monthly_data['avg_price'].to_numpy(dtype=float))
+        
+        # Identify anomalies (prices > 2 std dev from mean)
+        anomaly_threshold = by_item['avg_price'].transform('mean') + 2 * by_item['avg_price'].transform('std')
+        monthly_data['is_anomaly'] = monthly_data['avg_price'] > anomaly_threshold
+        
+        item_trends = monthly_data.groupby('item_id').agg(
+            xy=('xy', 'sum'),
+            xx=('xx', 'sum'),
+            finite_price=('finite_price', 'all'),
+            mean_std=('price_std', 'mean'),
+            avg_price=('avg_price', 'mean'),
+            max_price=('avg_price', 'max'),
+            min_price=('avg_price', 'min'),
+            anomaly_count=('is_anomaly', 'sum'),
+            total_quantity=('total_quantity', 'sum'),
+            po_count=('po_count', 'sum')
+        )
+        slope = (item_trends['xy'] / item_trends['xx']).where(item_trends['finite_price'])
+        
+        # Keep items in order of first appearance with their first-seen name and category
+        item_info = merged_data.drop_duplicates('item_id')[['item_id', 'item_name', 'category']]
+        item_info = item_info[item_info['item_id'].isin(item_trends.index)]
+        item_trends = item_trends.loc[item_info['item_id']]
+        slope = slope.loc[item_info['item_id']]
+        
+        trend_df = pd.DataFrame({
+            'item_id': item_info['item_id'].to_numpy(),
+            'item_name': item_info['item_name'].to_numpy(),
+            'category': item_info['category'].to_numpy(),
+            'trend_slope': slope.to_numpy(),
+            'price_volatility': np.where(
+                item_trends['avg_price'] > 0,
+                item_trends['mean_std'] / item_trends['avg_price'],
+                0
+            ),
+            'trend_direction': np.where(slope > 0, 'Increasing', 'Decreasing'),
+            'anomaly_count': item_trends['anomaly_count'].astype(int).to_numpy(),
+            'avg_price': item_trends['avg_price'].to_numpy(),
+            'price_range': (item_trends['max_price'] - item_trends['min_price']).to_numpy(),
+            'total_quantity': item_trends['total_quantity'].to_numpy(),
+            'po_count': item_trends['po_count'].to_numpy()
+        })
         
         # Calculate summary metrics
         increasing_items = trend_df[trend_df['trend_direction'] == 'Increasing']
@@ -345,48 +324,44 @@ def calculate_savings_realization_tracking(purchase_orders: pd.DataFrame, rfqs:
             return pd.DataFrame(), "No matching RFQ-PO data found for savings tracking"
         
         # Calculate savings realization metrics
-        realization_data = []
-        
-        for _, row in merged_data.iterrows():
-            # Calculate actual savings
-            actual_savings = row['rfq_cost'] - row['po_cost']
-            actual_savings_pct = (actual_savings / row['rfq_cost']) * 100 if row['rfq_cost'] > 0 else 0
-            
-            # Assume target savings of 5% (this could be configurable)
-            target_savings_pct = 5.0
-            target_savings = row['rfq_cost'] * (target_savings_pct / 100)
-            
-            # Calculate savings gap
-            savings_gap = target_savings - actual_savings
-            savings_gap_pct = (savings_gap / row['rfq_cost']) * 100 if row['rfq_cost'] > 0 else 0
-            
-            # Determine realization status
-            if actual_savings_pct >= target_savings_pct:
-                realization_status = "Exceeded Target"
-            elif actual_savings_pct >= target_savings_pct * 0.8:
-                realization_status = "Near Target"
-            else:
-                realization_status = "Below Target"
-            
-            realization_data.append({
-                'item_id': row['item_id'],
-                'supplier_id': row['supplier_id'],
-                'rfq_cost': row['rfq_cost'],
-                'po_cost': row['po_cost'],
-                'actual_savings': actual_savings,
-                'actual_savings_pct': actual_savings_pct,
-                'target_savings': target_savings,
-                'target_savings_pct': target_savings_pct,
-                'savings_gap': savings_gap,
-                'savings_gap_pct': savings_gap_pct,
-                'realization_status': realization_status,
-                'quantity': row['quantity']
-            })
-        
-        if not realization_data:
-            return pd.DataFrame(), "No realization data calculated"
-        
-        realization_df = pd.DataFrame(realization_data)
+        rfq_cost = merged_data['rfq_cost'].to_numpy(dtype=float)
+        po_cost = merged_data['po_cost'].to_numpy(dtype=float)
+        has_cost = rfq_cost > 0
+        safe_cost = np.where(has_cost, rfq_cost, 1.0)
+        
+        # Calculate actual savings
+        actual_savings = rfq_cost - po_cost
+        actual_savings_pct = np.where(has_cost, actual_savings / safe_cost * 100, 0)
+        
+        # Assume target savings of 5% (this could be configurable)
+        target_savings_pct = 5.0
+        target_savings = rfq_cost * (target_savings_pct / 100)
+        
+        # Calculate savings gap
+        savings_gap = target_savings - actual_savings
+        savings_gap_pct = np.where(has_cost, savings_gap / safe_cost * 100, 0)
+        
+        # Determine realization status
+        realization_status = np.select(
+            [actual_savings_pct >= target_savings_pct, actual_savings_pct >= target_savings_pct * 0.8],
+            ["Exceeded Target", "Near Target"],
+            default="Below Target"
+        )
+        
+        realization_df = pd.DataFrame({
+            'item_id': merged_data['item_id'].to_numpy(),
+            'supplier_id': merged_data['supplier_id'].to_numpy(),
+            'rfq_cost': rfq_cost,
+            'po_cost': po_cost,
+            'actual_savings': actual_savings,
+            'actual_savings_pct': actual_savings_pct,
+            'target_savings': target_savings,
+            'target_savings_pct': target_savings_pct,
+            'savings_gap': savings_gap,
+            'savings_gap_pct': savings_gap_pct,
+            'realization_status': realization_status,
+            'quantity': merged_data['quantity'].to_numpy()
+        })
         
         # Calculate summary metrics
         exceeded_target = realization_df[realization_df['realization_status'] == 'Exceeded Target']
@@ -413,68 +388,51 @@ def calculate_spend_avoidance_detection(purchase_orders: pd.DataFrame, items_dat
         if purchase_orders.empty or items_data.empty:
             return pd.DataFrame(), "No data available for spend avoidance analysis"
         
-        # Merge PO data with items data
-        merged_data = purchase_orders.merge(items_data, on='item_id', how='left', suffixes=('', '_item'))
-        
-        if merged_data.empty:
-            return pd.DataFrame(), "No matching data found after merge"
-        
-        # Calculate spend avoidance opportunities
-        avoidance_data = []
+        # Price variations, supplier count, quantity and spend per item from the shared price statistics index
+        item_analysis = get_price_stats_index(purchase_orders).item_stats().rename(columns={
+            'mean': 'avg_price', 'min': 'min_price', 'max': 'max_price', 'std': 'price_std',
+            'total_quantity': 'quantity', 'total_spend': 'line_spend'
+        })
+        item_analysis['item_name'] = item_analysis['item_id'].map(item_lookup(items_data, 'item_name'))
+        item_analysis['category'] = item_analysis['item_id'].map(item_lookup(items_data, 'category'))
         
-        # Group by item to find price variations
-        item_analysis = merged_data.groupby('item_id').agg({
-            'unit_price': ['mean', 'min', 'max', 'std'],
-            'item_name': 'first',
-            'category': 'first',
-            'supplier_id': 'nunique'
-        }).reset_index()
+        # Calculate potential savings from switching to lowest price supplier
+        item_analysis = item_analysis[
+            (item_analysis['supplier_count'] > 1) & (item_analysis['min_price'] < item_analysis['avg_price'])
+        ]
         
-        # Flatten column names
-        item_analysis.columns = ['item_id', 'avg_price', 'min_price', 'max_price', 'price_std', 'item_name', 'category', 'supplier_count']
-        
-        for _, item in item_analysis.iterrows():
-            # Get all POs for this item
-            item_pos = merged_data[merged_data['item_id'] == item['item_id']]
-            
-            # Calculate potential savings from switching to lowest price supplier
-            if item['supplier_count'] > 1 and item['min_price'] < item['avg_price']:
-                # Calculate current spend
-                current_spend = (item_pos['quantity'] * item_pos['unit_price']).sum()
-                
-                # Calculate potential spend at minimum price
-                potential_spend = (item_pos['quantity'] * item['min_price']).sum()
-                
-                # Calculate avoided cost
-                avoided_cost = current_spend - potential_spend
-                avoided_cost_pct = (avoided_cost / current_spend) * 100 if current_spend > 0 else 0
-                
-                # Determine avoidance type
-                if item['price_std'] / item['avg_price'] > 0.2:  # High price variation
-                    avoidance_type = "Supplier Switching"
-                else:
-                    avoidance_type = "Price Negotiation"
-                
-                avoidance_data.append({
-                    'item_id': item['item_id'],
-                    'item_name': item['item_name'],
-                    'category': item['category'],
-                    'current_avg_price': item['avg_price'],
-                    'min_price': item['min_price'],
-                    'price_variation_pct': ((item['max_price'] - item['min_price']) / item['avg_price']) * 100,
-                    'supplier_count': item['supplier_count'],
-                    'current_spend': current_spend,
-                    'potential_spend': potential_spend,
-                    'avoided_cost': avoided_cost,
-                    'avoided_cost_pct': avoided_cost_pct,
-                    'avoidance_type': avoidance_type,
-                    'priority': 'High' if avoided_cost_pct > 10 else 'Medium'
-                })
-        
-        if not avoidance_data:
+        if item_analysis.empty:
             return pd.DataFrame(), "No avoidance opportunities found"
         
-        avoidance_df = pd.DataFrame(avoidance_data)
+        current_spend = item_analysis['line_spend']
+        
+        # Calculate potential spend at minimum price
+        potential_spend = item_analysis['quantity'] * item_analysis['min_price']
+        
+        # Calculate avoided cost
+        avoided_cost = current_spend - potential_spend
+        avoided_cost_pct = np.where(current_spend > 0, avoided_cost / current_spend * 100, 0)
+        
+        avoidance_df = pd.DataFrame({
+            'item_id': item_analysis['item_id'].to_numpy(),
+            'item_name': item_analysis['item_name'].to_numpy(),
+            'category': item_analysis['category'].to_numpy(),
+            'current_avg_price': item_analysis['avg_price'].to_numpy(),
+            'min_price': item_analysis['min_price'].to_numpy(),
+            'price_variation_pct': ((item_analysis['max_price'] - item_analysis['min_price']) / item_analysis['avg_price'] * 100).to_numpy(),
+            'supplier_count': item_analysis['supplier_count'].to_numpy(),
+            'current_spend': current_spend.to_numpy(),
+            'potential_spend': potential_spend.to_numpy(),
+            'avoided_cost': avoided_cost.to_numpy(),
+            'avoided_cost_pct': avoided_cost_pct,
+            # High price variation suggests switching; otherwise negotiate
+            'avoidance_type': np.where(
+                item_analysis['price_std'] / item_analysis['avg_price'] > 0.2,
+                "Supplier Switching",
+                "Price Negotiation"
+            ),
+            'priority': np.where(avoided_cost_pct > 10, 'High', 'Medium')
+        })
         
         # Calculate summary metrics
         total_avoided_cost = avoidance_df['avoided_cost'].sum()
@@ -529,7 +487,7 @@ def calculate_contract_leakage(purchase_orders: pd.DataFrame, contracts: pd.Data
         # Analyze leakage by category
         leakage_by_category = contract_analysis.groupby('category').agg({
             'total_spend': 'sum',
-            'is_contracted': lambda x: (x == True).sum(),
+            'is_contracted': 'sum',
             'po_id': 'count'
         }).reset_index()
         
@@ -563,4 +521,11 @@ def calculate_contract_leakage(purchase_orders: pd.DataFrame, contracts: pd.Data
         return result_data, summary_msg
         
     except Exception as e:
-        return pd.DataFrame(), f"Error calculating contract leakage: {str(e)}" 
\ No newline at end of file
+        return pd.DataFrame(), f"Error calculating contract leakage: {str(e)}"
+
+# Memoize every calculate_* function on its input fingerprints (shared metric cache at the repo root)
+try:
+    from metric_cache import cache_calculators
+    cache_calculators(globals())
+except ImportError:
+    pass
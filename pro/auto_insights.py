@@ -1,7 +1,20 @@
 import pandas as pd
 import numpy as np
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-import streamlit as st
+
+# Insight sections in display order: (key, generator method)
+INSIGHT_SECTIONS = [
+    ('executive_summary', 'generate_executive_summary'),
+    ('spend', 'generate_spend_insights'),
+    ('supplier_performance', 'generate_supplier_performance_insights'),
+    ('cost_savings', 'generate_cost_savings_insights'),
+    ('process_efficiency', 'generate_process_efficiency_insights'),
+    ('compliance_risk', 'generate_compliance_risk_insights'),
+    ('sustainability', 'generate_sustainability_insights')
+]
 
 def format_ai_recommendations(recommendations_list):
     """
@@ -43,6 +56,105 @@ class ProcurementInsights:
         self.budgets = budgets
         self.rfqs = rfqs
         
+        # Aggregates shared by the generators, computed once on first use
+        self._shared = {}
+        self._shared_locks = {}
+        self._shared_guard = threading.Lock()
+    
+    def _get_shared(self, key, compute):
+        """Return a shared aggregate, computing it once even when several generators ask for it concurrently"""
+        with self._shared_guard:
+            if key in self._shared:
+                return self._shared[key]
+            key_lock = self._shared_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if key not in self._shared:
+                self._shared[key] = compute()
+            return self._shared[key]
+    
+    def _total_spend(self):
+        """Total PO spend at purchase order prices"""
+        return self._get_shared('total_spend', lambda: self.purchase_orders['quantity'].mul(self.purchase_orders['unit_price']).sum())
+    
+    def _po_items(self):
+        """Purchase orders joined to items, with total_spend at purchase order prices"""
+        def compute():
+            merged_data = self.purchase_orders.merge(self.items_data, on='item_id', how='left')
+            # Handle potential column renaming after merge
+            unit_price_col = 'unit_price' if 'unit_price' in merged_data.columns else 'unit_price_x'
+            merged_data['total_spend'] = merged_data['quantity'] * merged_data[unit_price_col]
+            return merged_data
+        return self._get_shared('po_items', compute)
+    
+    def _category_spend(self):
+        """Spend by item category, largest first"""
+        return self._get_shared('category_spend', lambda: self._po_items().groupby('category')['total_spend'].sum().sort_values(ascending=False))
+    
+    def _supplier_spend(self):
+        """Spend by supplier name, largest first"""
+        def compute():
+            supplier_spend = self.purchase_orders.merge(self.suppliers, on='supplier_id', how='left')
+            # Handle potential column renaming after merge
+            unit_price_col = 'unit_price' if 'unit_price' in supplier_spend.columns else 'unit_price_x'
+            supplier_spend['total_spend'] = supplier_spend['quantity'] * supplier_spend[unit_price_col]
+            return supplier_spend.groupby('supplier_name')['total_spend'].sum().sort_values(ascending=False)
+        return self._get_shared('supplier_spend', compute)
+    
+    def _budget_utilization(self):
+        """Budget amount, spend and utilization rate per budget code"""
+        def compute():
+            budget_analysis = self.purchase_orders.merge(self.budgets, on='budget_code', how='left')
+            # Handle potential column renaming after merge
+            unit_price_col = 'unit_price' if 'unit_price' in budget_analysis.columns else 'unit_price_x'
+            budget_analysis['total_spend'] = budget_analysis['quantity'] * budget_analysis[unit_price_col]
+            budget_utilization = budget_analysis.groupby('budget_code').agg({
+                'amount': 'first',  # Use 'amount' instead of 'budget_amount' based on the schema
+                'total_spend': 'sum'
+            }).reset_index()
+            budget_utilization['utilization_rate'] = (budget_utilization['total_spend'] / budget_utilization['amount']) * 100
+            return budget_utilization
+        return self._get_shared('budget_utilization', compute)
+    
+    def _po_deliveries(self):
+        """Purchase orders joined to deliveries, with an on_time flag where both delivery dates are present"""
+        def compute():
+            delivery_analysis = self.purchase_orders.merge(self.deliveries, on='po_id', how='left')
+            if 'delivery_date_actual' in delivery_analysis.columns and 'delivery_date' in delivery_analysis.columns:
+                delivery_analysis['on_time'] = pd.to_datetime(delivery_analysis['delivery_date_actual']) <= pd.to_datetime(delivery_analysis['delivery_date'])
+            return delivery_analysis
+        return self._get_shared('po_deliveries', compute)
+    
+    def _noncompliant_active_contracts(self):
+        """Contracts still running that are not marked compliant"""
+        return self._get_shared('noncompliant_active_contracts', lambda: self.contracts[
+            (pd.to_datetime(self.contracts['end_date']) >= datetime.now()) &
+            (self.contracts['compliance_status'] != 'Compliant')
+        ])
+    
+    def iter_insights(self, sections=None, max_workers=None):
+        """
+        Run insight generators concurrently and yield (key, text) as each one finishes.
+        
+        Generators share the aggregates above, so joins used by several
+        sections (including the executive summary) are computed only once.
+        A generator that fails yields its error message as its text.
+        """
+        methods = dict(INSIGHT_SECTIONS)
+        keys = list(sections) if sections is not None else list(methods)
+        with ThreadPoolExecutor(max_workers=max_workers or min(len(keys), os.cpu_count() or 1)) as executor:
+            futures = {executor.submit(getattr(self, methods[key])): key for key in keys}
+            for future in as_completed(futures):
+                try:
+                    text = future.result()
+                except Exception as e:
+                    text = f"Unable to generate insights: {str(e)}"
+                yield futures[future], text
+    
+    def generate_all_insights(self, max_workers=None):
+        """All insight sections, generated concurrently, keyed as in INSIGHT_SECTIONS"""
+        results = dict(self.iter_insights(max_workers=max_workers))
+        return {key: results[key] for key, _ in INSIGHT_SECTIONS}
+        
     def generate_spend_insights(self):
         """Generate insights for spend analysis"""
         if self.purchase_orders.empty:
@@ -51,7 +163,7 @@ class ProcurementInsights:
         insights = []
         
         # Calculate basic metrics using purchase_orders unit_price
-        total_spend = self.purchase_orders['quantity'].mul(self.purchase_orders['unit_price']).sum()
+        total_spend = self._total_spend()
         total_orders = len(self.purchase_orders)
         avg_order_value = total_spend / total_orders if total_orders > 0 else 0
         
@@ -63,11 +175,7 @@ class ProcurementInsights:
         
         # Spend concentration analysis
         if not self.items_data.empty:
-            merged_data = self.purchase_orders.merge(self.items_data, on='item_id', how='left')
-            # Handle potential column renaming after merge
-            unit_price_col = 'unit_price' if 'unit_price' in merged_data.columns else 'unit_price_x'
-            merged_data['total_spend'] = merged_data['quantity'] * merged_data[unit_price_col]
-            category_spend = merged_data.groupby('category')['total_spend'].sum().sort_values(ascending=False)
+            category_spend = self._category_spend()
             
             if not category_spend.empty:
                 top_category = category_spend.index[0]
@@ -84,11 +192,7 @@ class ProcurementInsights:
         
         # Supplier concentration
         if not self.suppliers.empty:
-            supplier_spend = self.purchase_orders.merge(self.suppliers, on='supplier_id', how='left')
-            # Handle potential column renaming after merge
-            unit_price_col = 'unit_price' if 'unit_price' in supplier_spend.columns else 'unit_price_x'
-            supplier_spend['total_spend'] = supplier_spend['quantity'] * supplier_spend[unit_price_col]
-            top_suppliers = supplier_spend.groupby('supplier_name')['total_spend'].sum().sort_values(ascending=False)
+            top_suppliers = self._supplier_spend()
             
             if not top_suppliers.empty:
                 top_supplier = top_suppliers.index[0]
@@ -103,15 +207,7 @@ class ProcurementInsights:
         
         # Budget analysis
         if not self.budgets.empty:
-            budget_analysis = self.purchase_orders.merge(self.budgets, on='budget_code', how='left')
-            # Handle potential column renaming after merge
-            unit_price_col = 'unit_price' if 'unit_price' in budget_analysis.columns else 'unit_price_x'
-            budget_analysis['total_spend'] = budget_analysis['quantity'] * budget_analysis[unit_price_col]
-            budget_utilization = budget_analysis.groupby('budget_code').agg({
-                'amount': 'first',  # Use 'amount' instead of 'budget_amount' based on the schema
-                'total_spend': 'sum'
-            }).reset_index()
-            budget_utilization['utilization_rate'] = (budget_utilization['total_spend'] / budget_utilization['amount']) * 100
+            budget_utilization = self._budget_utilization()
             
             over_budget = budget_utilization[budget_utilization['utilization_rate'] > 100]
             under_budget = budget_utilization[budget_utilization['utilization_rate'] < 80]
@@ -131,21 +227,13 @@ class ProcurementInsights:
         
         # Calculate category percentage for recommendations
         if not self.items_data.empty:
-            merged_data = self.purchase_orders.merge(self.items_data, on='item_id', how='left')
-            # Handle potential column renaming after merge
-            unit_price_col = 'unit_price' if 'unit_price' in merged_data.columns else 'unit_price_x'
-            merged_data['total_spend'] = merged_data['quantity'] * merged_data[unit_price_col]
-            category_spend = merged_data.groupby('category')['total_spend'].sum().sort_values(ascending=False)
+            category_spend = self._category_spend()
             if not category_spend.empty:
                 top_category_pct = (category_spend.iloc[0] / total_spend) * 100
         
         # Calculate supplier percentage for recommendations
         if not self.suppliers.empty:
-            supplier_spend = self.purchase_orders.merge(self.suppliers, on='supplier_id', how='left')
-            # Handle potential column renaming after merge
-            unit_price_col = 'unit_price' if 'unit_price' in supplier_spend.columns else 'unit_price_x'
-            supplier_spend['total_spend'] = supplier_spend['quantity'] * supplier_spend[unit_price_col]
-            top_suppliers = supplier_spend.groupby('supplier_name')['total_spend'].sum().sort_values(ascending=False)
+            top_suppliers = self._supplier_spend()
             if not top_suppliers.empty:
                 top_supplier_pct = (top_suppliers.iloc[0] / total_spend) * 100
         
@@ -177,13 +265,10 @@ class ProcurementInsights:
         insights = []
         
         # On-time delivery analysis
-        delivery_analysis = self.purchase_orders.merge(self.deliveries, on='po_id', how='left')
-        delivery_analysis = delivery_analysis.merge(self.suppliers, on='supplier_id', how='left')
+        delivery_analysis = self._po_deliveries().merge(self.suppliers, on='supplier_id', how='left')
         
         # Calculate on-time delivery rate
-        if 'delivery_date_actual' in delivery_analysis.columns and 'delivery_date' in delivery_analysis.columns:
-            delivery_analysis['on_time'] = pd.to_datetime(delivery_analysis['delivery_date_actual']) <= pd.to_datetime(delivery_analysis['delivery_date'])
-        else:
+        if 'on_time' not in delivery_analysis.columns:
             delivery_analysis['on_time'] = True
         
         otif_rate = delivery_analysis['on_time'].mean() * 100 if not delivery_analysis.empty else 0
@@ -261,10 +346,8 @@ class ProcurementInsights:
         
         # Unit cost analysis
         if not self.items_data.empty:
-            merged_data = self.purchase_orders.merge(self.items_data, on='item_id', how='left')
-            # Handle potential column renaming after merge
+            merged_data = self._po_items()
             unit_price_col = 'unit_price' if 'unit_price' in merged_data.columns else 'unit_price_x'
-            merged_data['total_spend'] = merged_data['quantity'] * merged_data[unit_price_col]
             
             # Identify high-cost items
             item_costs = merged_data.groupby(['item_name', 'category']).agg({
@@ -323,15 +406,15 @@ class ProcurementInsights:
         insights = []
         
         # Lead time analysis
-        delivery_analysis = self.purchase_orders.merge(self.deliveries, on='po_id', how='left')
+        delivery_analysis = self._po_deliveries()
         if 'delivery_date_actual' in delivery_analysis.columns:
-            delivery_analysis['lead_time'] = (pd.to_datetime(delivery_analysis['delivery_date_actual']) - 
-                                            pd.to_datetime(delivery_analysis['order_date'])).dt.days
+            lead_time = (pd.to_datetime(delivery_analysis['delivery_date_actual']) - 
+                         pd.to_datetime(delivery_analysis['order_date'])).dt.days
         else:
-            delivery_analysis['lead_time'] = 0  # Default if we can't calculate
+            lead_time = pd.Series(0, index=delivery_analysis.index)  # Default if we can't calculate
         
-        avg_lead_time = delivery_analysis['lead_time'].mean()
-        lead_time_std = delivery_analysis['lead_time'].std()
+        avg_lead_time = lead_time.mean()
+        lead_time_std = lead_time.std()
         
         insights.append(f"⏱️ **Average Lead Time**: {avg_lead_time:.1f} days")
         insights.append(f"📊 **Lead Time Variability**: {lead_time_std:.1f} days standard deviation")
@@ -376,10 +459,7 @@ class ProcurementInsights:
         
         # Contract compliance
         if not self.contracts.empty:
-            active_contracts = self.contracts[
-                (pd.to_datetime(self.contracts['end_date']) >= datetime.now()) &
-                (self.contracts['compliance_status'] != 'Compliant')
-            ]
+            active_contracts = self._noncompliant_active_contracts()
             
             if not active_contracts.empty:
                 insights.append(f"⚠️ **Contract Compliance**: {len(active_contracts)} active contracts with compliance issues")
@@ -445,14 +525,14 @@ class ProcurementInsights:
         
         # Carbon footprint
         if 'carbon_score' in self.items_data.columns:
-            carbon_analysis = self.purchase_orders.merge(self.items_data, on='item_id', how='left')
-            carbon_analysis['total_carbon'] = carbon_analysis['quantity'] * carbon_analysis['carbon_score']
-            total_carbon = carbon_analysis['total_carbon'].sum()
+            carbon_analysis = self._po_items()
+            total_carbon_by_row = carbon_analysis['quantity'] * carbon_analysis['carbon_score']
+            total_carbon = total_carbon_by_row.sum()
             
             insights.append(f"🌍 **Carbon Footprint**: {total_carbon:,.0f} total carbon units")
             
             # Identify high-carbon items
-            high_carbon_items = carbon_analysis.groupby('item_name')['total_carbon'].sum().nlargest(3)
+            high_carbon_items = total_carbon_by_row.groupby(carbon_analysis['item_name']).sum().nlargest(3)
             if not high_carbon_items.empty:
                 insights.append(f"🔥 **High Carbon Items**: Top 3 items contribute {high_carbon_items.sum():,.0f} carbon units")
         
@@ -474,7 +554,7 @@ class ProcurementInsights:
             return "Insufficient data for executive summary."
         
         # Calculate key metrics
-        total_spend = self.purchase_orders['quantity'].mul(self.purchase_orders['unit_price']).sum()
+        total_spend = self._total_spend()
         total_orders = len(self.purchase_orders)
         avg_order_value = total_spend / total_orders if total_orders > 0 else 0
         
@@ -493,13 +573,13 @@ class ProcurementInsights:
         
         # Spend concentration
         if not self.items_data.empty:
-            merged_data = self.purchase_orders.merge(self.items_data, on='item_id', how='left')
+            merged_data = self._po_items()
             # Use unit_price from purchase_orders, fallback to items_data if needed
             if 'unit_price' in merged_data.columns:
-                merged_data['total_spend'] = merged_data['quantity'] * merged_data['unit_price']
+                category_spend = self._category_spend()
             else:
-                merged_data['total_spend'] = merged_data['quantity'] * merged_data.get('unit_price_y', 0)
-            category_spend = merged_data.groupby('category')['total_spend'].sum().sort_values(ascending=False)
+                item_price_spend = merged_data['quantity'] * merged_data.get('unit_price_y', 0)
+                category_spend = item_price_spend.groupby(merged_data['category']).sum().sort_values(ascending=False)
             
             if not category_spend.empty:
                 top_category = category_spend.index[0]
@@ -514,22 +594,14 @@ class ProcurementInsights:
         
         # Supplier performance
         if not self.deliveries.empty:
-            delivery_analysis = self.purchase_orders.merge(self.deliveries, on='po_id', how='left')
-            if 'delivery_date_actual' in delivery_analysis.columns and 'delivery_date' in delivery_analysis.columns:
-                delivery_analysis['on_time'] = pd.to_datetime(delivery_analysis['delivery_date_actual']) <= pd.to_datetime(delivery_analysis['delivery_date'])
+            delivery_analysis = self._po_deliveries()
+            if 'on_time' in delivery_analysis.columns:
                 otif_rate = delivery_analysis['on_time'].mean() * 100
                 summary.append(f"**On-Time Delivery Rate**: {otif_rate:.1f}%")
         
         # Budget utilization
         if not self.budgets.empty:
-            budget_analysis = self.purchase_orders.merge(self.budgets, on='budget_code', how='left')
-            # Use unit_price from purchase_orders
-            budget_analysis['total_spend'] = budget_analysis['quantity'] * budget_analysis['unit_price']
-            budget_utilization = budget_analysis.groupby('budget_code').agg({
-                'amount': 'first',
-                'total_spend': 'sum'
-            }).reset_index()
-            budget_utilization['utilization_rate'] = (budget_utilization['total_spend'] / budget_utilization['amount']) * 100
+            budget_utilization = self._budget_utilization()
             avg_utilization = budget_utilization['utilization_rate'].mean()
             summary.append(f"**Average Budget Utilization**: {avg_utilization:.1f}%")
         
@@ -549,10 +621,7 @@ class ProcurementInsights:
         
         # Supplier concentration risk
         if not self.suppliers.empty:
-            supplier_spend = self.purchase_orders.merge(self.suppliers, on='supplier_id', how='left')
-            # Use unit_price from purchase_orders
-            supplier_spend['total_spend'] = supplier_spend['quantity'] * supplier_spend['unit_price']
-            top_suppliers = supplier_spend.groupby('supplier_name')['total_spend'].sum().sort_values(ascending=False)
+            top_suppliers = self._supplier_spend()
             
             if not top_suppliers.empty:
                 top_supplier_pct = (top_suppliers.iloc[0] / total_spend) * 100
@@ -563,10 +632,7 @@ class ProcurementInsights:
         
         # Contract compliance risk
         if not self.contracts.empty:
-            active_contracts = self.contracts[
-                (pd.to_datetime(self.contracts['end_date']) >= datetime.now()) &
-                (self.contracts['compliance_status'] != 'Compliant')
-            ]
+            active_contracts = self._noncompliant_active_contracts()
             if not active_contracts.empty:
                 summary.append(f"**Compliance Risk**: {len(active_contracts)} contracts with issues")
         
@@ -622,253 +688,3 @@ class ProcurementInsights:
             summary.append("No immediate actions required - procurement operations are well-optimized")
         
         return "\n".join(summary)
-
-def display_insights_section(insights_text, title, icon="💡"):
-    """Display insights in a clean, professional table format matching HR system"""
-    import pandas as pd
-    import streamlit as st
-    
-    # For executive summary, use special formatting
-    if "## Executive Overview" in insights_text:
-        display_executive_summary(insights_text, title, icon)
-    else:
-        # Convert insights to table format using Streamlit components
-        display_insights_table(insights_text, title, icon)
-
-def display_insights_table(insights_text, title, icon):
-    """Display insights using professional table format matching HR system"""
-    import pandas as pd
-    import streamlit as st
-    
-    # Parse the insights text
-    lines = insights_text.split('\n')
-    insights_data = []
-    strategic_actions = []
-    in_strategic_section = False
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Check if we're entering strategic actions section
-        if line.lower() == "strategic actions:":
-            in_strategic_section = True
-            continue
-            
-        # Handle strategic actions
-        if in_strategic_section and line.startswith('•'):
-            strategic_actions.append(line[1:].strip())
-            continue
-        elif in_strategic_section:
-            in_strategic_section = False
-            
-        # Remove ** formatting but keep the content
-        line = line.replace('**', '')
-        
-        # Extract metric and value
-        if ':' in line:
-            parts = line.split(':', 1)
-            metric = parts[0].strip()
-            value = parts[1].strip()
-            
-            # Determine status/alert based on content
-            status = "Normal"
-            if any(word in line.lower() for word in ['risk', 'alert', 'issue', 'high', 'above', 'critical', 'concerning']):
-                status = "Alert"
-            elif any(word in line.lower() for word in ['opportunity', 'good', 'excellent', 'low']):
-                status = "Opportunity"
-            elif any(word in line.lower() for word in ['moderate', 'medium']):
-                status = "Monitor"
-            elif any(word in line.lower() for word in ['data not available', 'error', 'unknown']):
-                status = "No Data"
-            
-            insights_data.append({
-                'metric': metric,
-                'value': value,
-                'status': status
-            })
-    
-    if not insights_data:
-        st.info(f"No insights available for {title}")
-        return
-    
-    # Create professional styled container matching HR system
-    st.markdown(f"""
-    <div style="background: white; border: 1px solid #e5e7eb; border-radius: 12px; 
-                padding: 24px; margin: 16px 0; box-shadow: 0 2px 8px rgba(0,0,0,0.08);">
-        <h3 style="color: #1f2937; margin: 0 0 20px 0; font-size: 1.25rem; font-weight: 600; 
-                   border-bottom: 2px solid #667eea; padding-bottom: 8px;">
-            {icon} {title}
-        </h3>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Create DataFrame for table display
-    df_data = []
-    for insight in insights_data:
-        df_data.append({
-            'Metric': insight['metric'],
-            'Value': insight['value'],
-            'Status': insight['status']
-        })
-    
-    df = pd.DataFrame(df_data)
-    
-    # Display table with custom styling matching HR system
-    st.dataframe(
-        df,
-        use_container_width=True,
-        hide_index=True,
-        column_config={
-            "Metric": st.column_config.TextColumn("Metric", width="medium"),
-            "Value": st.column_config.TextColumn("Value", width="medium"),
-            "Status": st.column_config.SelectboxColumn(
-                "Status",
-                width="small",
-                options=["Normal", "Alert", "Monitor", "Opportunity", "No Data"],
-                default="Normal"
-            )
-        }
-    )
-    
-    # Display strategic actions if available
-    if strategic_actions:
-        st.markdown("### Strategic Actions")
-        for action in strategic_actions:
-            st.markdown(f"• {action}")
-
-def display_executive_summary(insights_text, title, icon):
-    """Display executive summary with professional table format matching HR system"""
-    import pandas as pd
-    import streamlit as st
-    
-    # Create professional styled container matching HR system
-    st.markdown(f"""
-    <div style="background: white; border: 1px solid #e5e7eb; border-radius: 12px; 
-                padding: 24px; margin: 16px 0; box-shadow: 0 2px 8px rgba(0,0,0,0.08);">
-        <h3 style="color: #1f2937; margin: 0 0 20px 0; font-size: 1.25rem; font-weight: 600; 
-                   border-bottom: 2px solid #667eea; padding-bottom: 8px;">
-            {icon} {title}
-        </h3>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Parse the insights text
-    lines = insights_text.split('\n')
-    insights_data = []
-    strategic_actions = []
-    in_strategic_section = False
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Check if we're entering strategic actions section
-        if line.lower() == "strategic actions:":
-            in_strategic_section = True
-            continue
-            
-        # Handle strategic actions
-        if in_strategic_section and line.startswith('•'):
-            strategic_actions.append(line[1:].strip())
-            continue
-        elif in_strategic_section:
-            in_strategic_section = False
-            
-        # Remove ** formatting but keep the content
-        line = line.replace('**', '')
-        
-        # Extract metric and value
-        if ':' in line:
-            parts = line.split(':', 1)
-            metric = parts[0].strip()
-            value = parts[1].strip()
-            
-            # Determine status/alert based on content
-            status = "Normal"
-            if any(word in line.lower() for word in ['risk', 'alert', 'issue', 'high', 'above', 'critical', 'concerning']):
-                status = "Alert"
-            elif any(word in line.lower() for word in ['opportunity', 'good', 'excellent', 'low']):
-                status = "Opportunity"
-            elif any(word in line.lower() for word in ['moderate', 'medium']):
-                status = "Monitor"
-            elif any(word in line.lower() for word in ['data not available', 'error', 'unknown']):
-                status = "No Data"
-            
-            insights_data.append({
-                'metric': metric,
-                'value': value,
-                'status': status
-            })
-    
-    if not insights_data:
-        st.info(f"No executive summary data available")
-        return
-    
-    # Create DataFrame for table display
-    df_data = []
-    for insight in insights_data:
-        df_data.append({
-            'Metric': insight['metric'],
-            'Value': insight['value'],
-            'Status': insight['status']
-        })
-    
-    df = pd.DataFrame(df_data)
-    
-    # Display table with custom styling matching HR system
-    st.dataframe(
-        df,
-        use_container_width=True,
-        hide_index=True,
-        column_config={
-            "Metric": st.column_config.TextColumn("Metric", width="medium"),
-            "Value": st.column_config.TextColumn("Value", width="medium"),
-            "Status": st.column_config.SelectboxColumn(
-                "Status",
-                width="small",
-                options=["Normal", "Alert", "Monitor", "Opportunity", "No Data"],
-                default="Normal"
-            )
-        }
-    )
-    
-    # Display strategic actions if available
-    if strategic_actions:
-        st.markdown("### Strategic Actions")
-        for action in strategic_actions:
-            st.markdown(f"• {action}")
-
-def get_section_icon(section_title):
-    """Get appropriate icon for section title"""
-    section_lower = section_title.lower()
-    
-    if 'spend' in section_lower:
-        return "💰"
-    elif 'supplier' in section_lower:
-        return "🏭"
-    elif 'cost' in section_lower:
-        return "💡"
-    elif 'process' in section_lower:
-        return "⚡"
-    elif 'risk' in section_lower or 'compliance' in section_lower:
-        return "⚠️"
-    elif 'sustainability' in section_lower or 'csr' in section_lower:
-        return "🌱"
-    else:
-        return "📊"
-
-def clean_insights_text(text):
-    """Clean and format insights text for display"""
-    # Remove extra whitespace and normalize line breaks
-    lines = text.split('\n')
-    cleaned_lines = []
-    
-    for line in lines:
-        line = line.strip()
-        if line:
-            cleaned_lines.append(line)
-    
-    return '\n'.join(cleaned_lines) 
\ No newline at end of file
@@ -0,0 +1,374 @@
+import os
+import sys
+import json
+import functools
+import inspect
+import argparse
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+import pandas as pd
+import numpy as np
+
+import metrics_calculator
+import advanced_cost_metrics
+from generate_sample_data import generate_procurement_tables
+from utils import COLUMN_MAPPINGS
+from advanced_cost_metrics import (
+    calculate_benchmark_price_efficiency,
+    calculate_negotiation_opportunity_index,
+    calculate_tail_spend_optimization,
+    calculate_unit_cost_trend_analysis,
+    calculate_savings_realization_tracking,
+    calculate_spend_avoidance_detection,
+    calculate_contract_leakage
+)
+
+# Time the calculations themselves, not the shared metric cache
+try:
+    from metric_cache import get_metric_cache
+    get_metric_cache().enabled = False
+except ImportError:
+    pass
+
+# Row counts of the scaled suite
+SUITE_SIZES = [10_000, 100_000, 1_000_000]
+
+DEFAULT_HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_history.json')
+
+# Fitted time ~ rows^k; k above this marks a function as superlinear
+SUPERLINEAR_EXPONENT = 1.2
+
+# Timings below this are dominated by fixed overhead and not used for the scaling fit
+MIN_FIT_SECONDS = 0.005
+
+# Modules whose calculate_* functions are benchmarked, in report order
+SUITE_MODULES = [metrics_calculator, advanced_cost_metrics]
+
+def generate_benchmark_data(n_pos, n_suppliers=500, n_items=2000, n_contracts=1000, n_rfqs=5000, seed=42):
+    """Generate large procurement tables with numpy for benchmarking."""
+
+    rng = np.random.default_rng(seed)
+    categories = np.array(['IT', 'Office Supplies', 'Equipment', 'Services', 'Raw Materials', 'Maintenance'])
+
+    supplier_ids = np.char.add('SUP-', np.arange(1, n_suppliers + 1).astype(str))
+    item_ids = np.char.add('ITEM-', np.arange(1, n_items + 1).astype(str))
+
+    suppliers = pd.DataFrame({
+        'supplier_id': supplier_ids,
+        'supplier_name': np.char.add('Supplier ', np.arange(1, n_suppliers + 1).astype(str))
+    })
+
+    items = pd.DataFrame({
+        'item_id': item_ids,
+        'item_name': np.char.add('Item ', np.arange(1, n_items + 1).astype(str)),
+        'category': rng.choice(categories, n_items)
+    })
+
+    quantity = rng.integers(1, 101, n_pos)
+    unit_price = np.round(rng.uniform(10, 1000, n_pos), 2)
+    purchase_orders = pd.DataFrame({
+        'po_id': np.char.add('PO-', np.arange(1, n_pos + 1).astype(str)),
+        'order_date': pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 366, n_pos), unit='D'),
+        'supplier_id': rng.choice(supplier_ids, n_pos),
+        'item_id': rng.choice(item_ids, n_pos),
+        'quantity': quantity,
+        'unit_price': unit_price,
+        'po_cost': unit_price
+    })
+
+    contracts = pd.DataFrame({
+        'contract_id': np.char.add('CON-', np.arange(1, n_contracts + 1).astype(str)),
+        'supplier_id': rng.choice(supplier_ids, n_contracts),
+        'item_id': rng.choice(item_ids, n_contracts),
+        'contract_value': np.round(rng.uniform(10000, 1000000, n_contracts), 2)
+    }).drop_duplicates(['supplier_id', 'item_id'])
+
+    rfqs = pd.DataFrame({
+        'rfq_id': np.char.add('RFQ-', np.arange(1, n_rfqs + 1).astype(str)),
+        'supplier_id': rng.choice(supplier_ids, n_rfqs),
+        'item_id': rng.choice(item_ids, n_rfqs),
+        'rfq_cost': np.round(rng.uniform(20, 1500, n_rfqs), 2)
+    }).drop_duplicates(['supplier_id', 'item_id'])
+
+    return purchase_orders, suppliers, items, contracts, rfqs
+
+def run_benchmark(n_pos=1_000_000, repeats=1):
+    """Time each advanced cost metric on a synthetic purchase order table."""
+
+    purchase_orders, suppliers, items, contracts, rfqs = generate_benchmark_data(n_pos)
+
+    benchmarks = {
+        'benchmark_price_efficiency': lambda: calculate_benchmark_price_efficiency(purchase_orders, items),
+        'negotiation_opportunity_index': lambda: calculate_negotiation_opportunity_index(purchase_orders, items),
+        'tail_spend_optimization': lambda: calculate_tail_spend_optimization(purchase_orders, suppliers),
+        'unit_cost_trend_analysis': lambda: calculate_unit_cost_trend_analysis(purchase_orders, items),
+        'savings_realization_tracking': lambda: calculate_savings_realization_tracking(purchase_orders, rfqs),
+        'spend_avoidance_detection': lambda: calculate_spend_avoidance_detection(purchase_orders, items),
+        'contract_leakage': lambda: calculate_contract_leakage(purchase_orders, contracts, items)
+    }
+
+    results = []
+    for name, func in benchmarks.items():
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            _, msg = func()
+            timings.append(time.perf_counter() - start)
+
+        results.append({
+            'metric': name,
+            'rows': n_pos,
+            'best_seconds': min(timings),
+            'rows_per_second': n_pos / min(timings) if min(timings) > 0 else 0,
+            'summary': msg
+        })
+
+    return pd.DataFrame(results)
+
+# Tables a module reads under another name: the advanced cost metrics merge RFQs onto
+# POs and read the PO quantity unsuffixed, so they get RFQs trimmed to the standard
+# columns; metrics_calculator reads quantity_rfq and keeps the full RFQ table
+MODULE_TABLES = {
+    'advanced_cost_metrics': {'rfqs': 'standard_rfqs'}
+}
+
+def generate_suite_data(n_pos, seed=42):
+    """
+    All procurement tables for n_pos purchase orders, shaped for both metric modules.
+
+    Adds the columns the advanced cost metrics read (po_cost, rfq_cost and a
+    contracted item per contract), plus standard_rfqs: RFQs trimmed to their
+    standard columns so the advanced metrics' RFQ/PO merge does not suffix
+    quantity away (see MODULE_TABLES).
+    """
+    tables = generate_procurement_tables(n_pos, seed=seed)
+    tables['purchase_orders']['po_cost'] = tables['purchase_orders']['unit_price']
+    tables['rfqs']['rfq_cost'] = tables['rfqs']['unit_price']
+    tables['standard_rfqs'] = tables['rfqs'][list(COLUMN_MAPPINGS['rfqs'].values()) + ['rfq_cost']].copy()
+    items = tables.pop('items')
+    tables['contracts']['item_id'] = items['item_id'].to_numpy()[np.arange(len(tables['contracts'])) % len(items)]
+    tables['items_data'] = items
+    return tables
+
+def discover_metrics(modules=None, only=None):
+    """
+    {name: (function, table arguments)} for every calculate_* function of the suite modules.
+
+    Arguments are bound by parameter name to the generated tables
+    (purchase_orders, items_data, suppliers, ...); optional parameters that
+    are not tables keep their defaults.
+    """
+    table_names = {'purchase_orders', 'suppliers', 'items_data', 'deliveries', 'invoices', 'contracts', 'budgets', 'rfqs'}
+    metrics = {}
+    for module in modules or SUITE_MODULES:
+        for name, func in vars(module).items():
+            if not name.startswith('calculate_') or not callable(func) or getattr(func, '__module__', None) != module.__name__:
+                continue
+            if only and not any(pattern in name for pattern in only):
+                continue
+            params = inspect.signature(func).parameters.values()
+            args = [p.name for p in params if p.name in table_names]
+            if any(p.name not in table_names and p.default is inspect.Parameter.empty for p in params):
+                continue
+            metrics[f"{module.__name__}.{name}"] = (func, args)
+    return metrics
+
+def metric_tables(name, args, tables):
+    """
+    Fresh copies of the tables a metric takes, keyed by parameter name.
+
+    Every call gets its own copies, so a calculator that adds or converts
+    columns in place cannot change what the next one (or the next repeat) sees.
+    """
+    renames = MODULE_TABLES.get(name.split('.')[0], {})
+    return {arg: tables[renames.get(arg, arg)].copy() for arg in args}
+
+def _time_call(func, make_kwargs, repeats):
+    """Best wall time of repeats calls (on fresh tables, copied outside the timing), plus the summary message of the last call."""
+    timings = []
+    msg = None
+    for _ in range(repeats):
+        kwargs = make_kwargs()
+        start = time.perf_counter()
+        result = func(**kwargs)
+        timings.append(time.perf_counter() - start)
+        msg = result[1] if isinstance(result, tuple) and len(result) > 1 else None
+    return min(timings), msg
+
+def _peak_memory(func, make_kwargs):
+    """Peak bytes allocated (as seen by tracemalloc) during one call on fresh tables."""
+    kwargs = make_kwargs()
+    tracemalloc.start()
+    try:
+        func(**kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def scaling_exponent(rows, seconds):
+    """
+    Empirical exponent k of time ~ rows^k, or None with fewer than two usable sizes.
+
+    Taken between the two largest sizes with timings above MIN_FIT_SECONDS:
+    fixed per-call overhead flattens the curve at small sizes and would hide
+    growth that only shows at scale.
+    """
+    points = sorted((n, t) for n, t in zip(rows, seconds) if t is not None and t >= MIN_FIT_SECONDS)
+    if len(points) < 2 or points[-2][0] == points[-1][0]:
+        return None
+    (n_small, t_small), (n_large, t_large) = points[-2], points[-1]
+    return float(np.log(t_large / t_small) / np.log(n_large / n_small))
+
+def run_suite(sizes=None, repeats=1, only=None, measure_memory=True, max_seconds=None, seed=42, progress=None):
+    """
+    Run every discovered metric at each size.
+
+    Returns (results, scaling): one result row per metric and size with wall
+    time, peak memory and rows per second, and one scaling row per metric with
+    its fitted exponent and whether it grows superlinearly. A metric that
+    takes longer than max_seconds at one size is skipped at larger sizes.
+    """
+    sizes = sorted(sizes or SUITE_SIZES)
+    metrics = discover_metrics(only=only)
+    too_slow = set()
+    results = []
+
+    for n_pos in sizes:
+        tables = generate_suite_data(n_pos, seed=seed)
+        for name, (func, args) in metrics.items():
+            row = {'metric': name, 'rows': n_pos, 'best_seconds': None, 'peak_memory_mb': None,
+                   'rows_per_second': None, 'status': 'ok', 'error': None}
+            if name in too_slow:
+                row['status'] = 'skipped'
+                results.append(row)
+                continue
+            make_kwargs = functools.partial(metric_tables, name, args, tables)
+            try:
+                best, msg = _time_call(func, make_kwargs, repeats)
+                row['best_seconds'] = best
+                row['rows_per_second'] = n_pos / best if best > 0 else None
+                if measure_memory:
+                    row['peak_memory_mb'] = _peak_memory(func, make_kwargs) / (1024 * 1024)
+                if isinstance(msg, str) and msg.lower().startswith('error'):
+                    row['status'] = 'error'
+                    row['error'] = msg
+            except Exception as e:
+                row['status'] = 'error'
+                row['error'] = f"{type(e).__name__}: {e}"
+            if max_seconds is not None and row['best_seconds'] is not None and row['best_seconds'] > max_seconds:
+                too_slow.add(name)
+            results.append(row)
+            if progress:
+                progress(row)
+        del tables
+
+    results = pd.DataFrame(results)
+    scaling = []
+    for name, group in results.groupby('metric', sort=False):
+        ok = group[group['status'] == 'ok']
+        exponent = scaling_exponent(ok['rows'].tolist(), ok['best_seconds'].tolist())
+        largest = ok.sort_values('rows').iloc[-1] if not ok.empty else None
+        scaling.append({
+            'metric': name,
+            'scaling_exponent': exponent,
+            'superlinear': bool(exponent is not None and exponent > SUPERLINEAR_EXPONENT),
+            'max_rows_measured': int(largest['rows']) if largest is not None else None,
+            'seconds_at_max_rows': float(largest['best_seconds']) if largest is not None else None,
+            'errors': int((group['status'] == 'error').sum()),
+            'skipped': int((group['status'] == 'skipped').sum())
+        })
+    scaling = pd.DataFrame(scaling)
+    scaling['max_rows_measured'] = scaling['max_rows_measured'].astype('Int64')
+    return results, scaling
+
+def _json_ready(records):
+    """Records with numpy scalars and NaN converted for json.dump."""
+    clean = []
+    for record in records:
+        clean.append({key: (None if isinstance(value, float) and np.isnan(value) else
+                            value.item() if isinstance(value, np.generic) else value)
+                      for key, value in record.items()})
+    return clean
+
+def load_history(history_file=DEFAULT_HISTORY_FILE):
+    """Previous suite runs, oldest first."""
+    if not os.path.exists(history_file):
+        return []
+    with open(history_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def append_history(results, scaling, history_file=DEFAULT_HISTORY_FILE, repeats=1):
+    """Append a suite run (with environment details) to the JSON history and return the run record."""
+    run = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'repeats': repeats,
+        'sizes': sorted(int(n) for n in results['rows'].unique()),
+        'results': _json_ready(results.to_dict('records')),
+        'scaling': _json_ready(scaling.to_dict('records'))
+    }
+    history = load_history(history_file)
+    history.append(run)
+    with open(history_file, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2)
+    return run
+
+def compare_with_previous(results, history):
+    """Ratio of each metric's time to the last recorded run at the same size (above 1 means slower)."""
+    previous = {}
+    for run in history:
+        for record in run.get('results', []):
+            if record.get('best_seconds'):
+                previous[(record['metric'], record['rows'])] = record['best_seconds']
+    ratios = [
+        best / previous[(metric, rows)] if best and (metric, rows) in previous else None
+        for metric, rows, best in zip(results['metric'], results['rows'], results['best_seconds'])
+    ]
+    return pd.Series(ratios, index=results.index, dtype=float)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark procurement metrics on synthetic data at increasing row counts")
+    parser.add_argument('--sizes', type=int, nargs='+', default=SUITE_SIZES, help="Purchase order row counts to run")
+    parser.add_argument('--repeats', type=int, default=1, help="Timing repeats per metric (best is reported)")
+    parser.add_argument('--only', nargs='+', default=None, help="Only metrics whose name contains one of these strings")
+    parser.add_argument('--max-seconds', type=float, default=60.0,
+                        help="Skip a metric at larger sizes once a run exceeds this many seconds")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the traced run that measures peak memory")
+    parser.add_argument('--history', default=DEFAULT_HISTORY_FILE, help="JSON file the run is appended to")
+    parser.add_argument('--no-history', action='store_true', help="Do not record the run")
+    args = parser.parse_args()
+
+    def progress(row):
+        timing = f"{row['best_seconds']:.3f}s" if row['best_seconds'] is not None else row['status']
+        print(f"  {row['rows']:>9,}  {row['metric']}: {timing}", file=sys.stderr)
+
+    history = load_history(args.history)
+    results, scaling = run_suite(args.sizes, args.repeats, args.only, not args.no_memory, args.max_seconds, progress=progress)
+    results['vs_last_run'] = compare_with_previous(results, history)
+
+    print(results[['metric', 'rows', 'best_seconds', 'peak_memory_mb', 'rows_per_second', 'vs_last_run', 'status']]
+          .to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
+    print()
+    print(scaling.sort_values('scaling_exponent', ascending=False, na_position='last')
+          .to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+
+    flagged = scaling[scaling['superlinear']]
+    if not flagged.empty:
+        print(f"\n⚠️ Superlinear (exponent > {SUPERLINEAR_EXPONENT}): {', '.join(flagged['metric'])}")
+    failed = results[results['status'] == 'error']
+    for _, row in failed.drop_duplicates('metric').iterrows():
+        print(f"❌ {row['metric']}: {row['error']}")
+
+    if not args.no_history:
+        append_history(results.drop(columns=['vs_last_run']), scaling, args.history, args.repeats)
+        print(f"\n📝 Recorded run in {args.history}")
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,6 @@ import numpy as np
 from datetime import datetime, timedelta
 import warnings
 from typing import Union, List, Dict, Optional, Tuple
-from sklearn.preprocessing import LabelEncoder
 
 warnings.filterwarnings('ignore')
 
@@ -128,6 +127,8 @@ class DataHandler:
         col_key = column_name if column_name else series.name
         
         if col_key not in self.label_encoders:
+            # scikit-learn is only needed once categorical encoding is requested
+            from sklearn.preprocessing import LabelEncoder
             self.label_encoders[col_key] = LabelEncoder()
             return self.label_encoders[col_key].fit_transform(series_clean)
         else:
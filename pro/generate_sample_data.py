@@ -1,98 +1,166 @@
+import argparse
+import time
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import random
-import string
+
+try:
+    from synthetic_data import (DEFAULT_GENERATOR_CHUNK_ROWS, make_rng, chunk_rng, scaled_size, sequential_ids,
+                                choose, random_dates, add_days, uniform, iter_chunk_bounds)
+    from data_export import write_table_chunks
+except ImportError:
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from synthetic_data import (DEFAULT_GENERATOR_CHUNK_ROWS, make_rng, chunk_rng, scaled_size, sequential_ids,
+                                choose, random_dates, add_days, uniform, iter_chunk_bounds)
+    from data_export import write_table_chunks
+
+# Table sizes of the default sample (100 purchase orders); dimension tables grow with sqrt(scale)
+PROCUREMENT_BASE_SIZES = {
+    'purchase_orders': 100,
+    'suppliers': 20,
+    'items': 25,
+    'contracts': 15,
+    'budgets': 10,
+    'rfqs': 30
+}
+
+# Sheet / file order of the procurement tables
+PROCUREMENT_TABLES = ['purchase_orders', 'suppliers', 'items', 'deliveries', 'invoices', 'contracts', 'budgets', 'rfqs']
 
 def generate_sample_data():
     """Generate comprehensive sample data for procurement analytics with 100+ records."""
-    
-    # Set random seed for reproducibility
-    np.random.seed(42)
-    random.seed(42)
-    
-    # Generate 100 purchase orders
-    purchase_orders = generate_purchase_orders(100)
-    
-    # Generate supporting data
-    suppliers = generate_suppliers(20)
-    items = generate_items(25)
-    deliveries = generate_deliveries(purchase_orders, 100)
-    invoices = generate_invoices(purchase_orders, 100)
-    contracts = generate_contracts(suppliers, 15)
-    budgets = generate_budgets(10)
-    rfqs = generate_rfqs(suppliers, items, 30)
-    
+
+    tables = generate_procurement_tables(PROCUREMENT_BASE_SIZES['purchase_orders'], seed=42)
+
     # Create Excel file with all sheets
     with pd.ExcelWriter('pro.xlsx', engine='openpyxl') as writer:
-        purchase_orders.to_excel(writer, sheet_name='purchase_orders', index=False)
-        suppliers.to_excel(writer, sheet_name='suppliers', index=False)
-        items.to_excel(writer, sheet_name='items', index=False)
-        deliveries.to_excel(writer, sheet_name='deliveries', index=False)
-        invoices.to_excel(writer, sheet_name='invoices', index=False)
-        contracts.to_excel(writer, sheet_name='contracts', index=False)
-        budgets.to_excel(writer, sheet_name='budgets', index=False)
-        rfqs.to_excel(writer, sheet_name='rfqs', index=False)
-    
+        for table_name in PROCUREMENT_TABLES:
+            tables[table_name].to_excel(writer, sheet_name=table_name, index=False)
+
     print("✅ Generated comprehensive sample data with 100+ records")
-    print(f"📊 Purchase Orders: {len(purchase_orders)} records")
-    print(f"🏢 Suppliers: {len(suppliers)} records")
-    print(f"📦 Items: {len(items)} records")
-    print(f"🚚 Deliveries: {len(deliveries)} records")
-    print(f"💰 Invoices: {len(invoices)} records")
-    print(f"📋 Contracts: {len(contracts)} records")
-    print(f"💼 Budgets: {len(budgets)} records")
-    print(f"📝 RFQs: {len(rfqs)} records")
-    
-    return purchase_orders, suppliers, items, deliveries, invoices, contracts, budgets, rfqs
-
-def generate_purchase_orders(n_records):
+    print(f"📊 Purchase Orders: {len(tables['purchase_orders'])} records")
+    print(f"🏢 Suppliers: {len(tables['suppliers'])} records")
+    print(f"📦 Items: {len(tables['items'])} records")
+    print(f"🚚 Deliveries: {len(tables['deliveries'])} records")
+    print(f"💰 Invoices: {len(tables['invoices'])} records")
+    print(f"📋 Contracts: {len(tables['contracts'])} records")
+    print(f"💼 Budgets: {len(tables['budgets'])} records")
+    print(f"📝 RFQs: {len(tables['rfqs'])} records")
+
+    return tuple(tables[table_name] for table_name in PROCUREMENT_TABLES)
+
+def _dimension_sizes(n_purchase_orders):
+    """Row counts of the dimension tables for a dataset with n_purchase_orders purchase orders."""
+    scale = n_purchase_orders / PROCUREMENT_BASE_SIZES['purchase_orders']
+    return {name: scaled_size(size, scale) for name, size in PROCUREMENT_BASE_SIZES.items() if name != 'purchase_orders'}
+
+def generate_procurement_dimensions(n_purchase_orders=100, seed=42):
+    """Suppliers, items, contracts, budgets and RFQs sized for n_purchase_orders purchase orders."""
+    rng = make_rng(seed)
+    sizes = _dimension_sizes(n_purchase_orders)
+    suppliers = generate_suppliers(sizes['suppliers'], rng)
+    items = generate_items(sizes['items'], rng, n_suppliers=len(suppliers))
+    return {
+        'suppliers': suppliers,
+        'items': items,
+        'contracts': generate_contracts(suppliers, sizes['contracts'], rng),
+        'budgets': generate_budgets(sizes['budgets'], rng),
+        'rfqs': generate_rfqs(suppliers, items, sizes['rfqs'], rng)
+    }
+
+def _fact_chunk(n_records, start, sizes, rng):
+    """Purchase orders start+1..start+n_records with one delivery and one invoice each."""
+    purchase_orders = generate_purchase_orders(n_records, rng, start=start, n_suppliers=sizes['suppliers'],
+                                               n_items=sizes['items'], n_budgets=sizes['budgets'])
+    deliveries = generate_deliveries(purchase_orders, n_records, rng, start=start)
+    invoices = generate_invoices(purchase_orders, n_records, rng, start=start)
+    return purchase_orders, deliveries, invoices
+
+def generate_procurement_tables(n_purchase_orders=100, seed=42):
+    """All eight procurement tables in memory, with every foreign key pointing at a generated row."""
+    tables = generate_procurement_dimensions(n_purchase_orders, seed)
+    purchase_orders, deliveries, invoices = _fact_chunk(n_purchase_orders, 0, _dimension_sizes(n_purchase_orders),
+                                                        chunk_rng(seed, 0))
+    tables.update({'purchase_orders': purchase_orders, 'deliveries': deliveries, 'invoices': invoices})
+    return {table_name: tables[table_name] for table_name in PROCUREMENT_TABLES}
+
+def iter_procurement_chunks(n_purchase_orders, chunk_rows=DEFAULT_GENERATOR_CHUNK_ROWS, seed=42):
+    """
+    Yield (table name, chunk) pairs of a procurement dataset without building it in memory.
+
+    Dimension tables come first in one piece; purchase orders then follow in
+    chunks of chunk_rows, each with its deliveries and invoices. Ids are
+    numbered across chunks and every chunk draws from its own seeded
+    generator, so the output is reproducible for a given seed and chunk size.
+    """
+    sizes = _dimension_sizes(n_purchase_orders)
+    for table_name, table in generate_procurement_dimensions(n_purchase_orders, seed).items():
+        yield table_name, table
+    for chunk_index, start, stop in iter_chunk_bounds(n_purchase_orders, chunk_rows):
+        purchase_orders, deliveries, invoices = _fact_chunk(stop - start, start, sizes, chunk_rng(seed, chunk_index + 1))
+        yield 'purchase_orders', purchase_orders
+        yield 'deliveries', deliveries
+        yield 'invoices', invoices
+
+def write_procurement_dataset(path, n_purchase_orders, file_format='parquet', chunk_rows=DEFAULT_GENERATOR_CHUNK_ROWS, seed=42):
+    """
+    Generate a procurement dataset chunk by chunk and write it to disk.
+
+    'parquet' writes one <table>.parquet per table into the directory path;
+    'xlsx' writes one sheet per table into the workbook path (tables beyond
+    Excel's row limit continue on extra sheets). Returns rows written per table.
+    """
+    return write_table_chunks(iter_procurement_chunks(n_purchase_orders, chunk_rows, seed), path, file_format)
+
+def generate_purchase_orders(n_records, rng=None, start=0, n_suppliers=20, n_items=25, n_budgets=10):
     """Generate purchase orders with realistic data."""
-    
+
+    rng = make_rng(rng)
     departments = ['IT', 'HR', 'Finance', 'Operations', 'Marketing', 'Sales', 'Legal', 'Facilities']
     statuses = ['Open', 'In Progress', 'Completed', 'Cancelled']
     priorities = ['High', 'Medium', 'Low']
     approval_statuses = ['Approved', 'Pending', 'Rejected', 'Under Review']
     currencies = ['USD', 'EUR', 'GBP']
-    
-    data = []
-    start_date = datetime(2023, 1, 1)
-    
-    for i in range(n_records):
-        order_date = start_date + timedelta(days=random.randint(0, 365))
-        delivery_date = order_date + timedelta(days=random.randint(7, 60))
-        
-        quantity = random.randint(1, 100)
-        unit_price = round(random.uniform(10, 1000), 2)
-        total_amount = quantity * unit_price
-        
-        data.append({
-            'po_id': f'PO-{str(i+1).zfill(4)}',
-            'order_date': order_date,
-            'department': random.choice(departments),
-            'supplier_id': f'SUP-{random.randint(1, 20)}',
-            'item_id': f'ITEM-{random.randint(1, 25)}',
-            'quantity': quantity,
-            'unit_price': unit_price,
-            'delivery_date': delivery_date,
-            'currency': random.choice(currencies),
-            'budget_code': f'BUD-{random.randint(1, 10)}',
-            'total_amount': total_amount,
-            'status': random.choice(statuses),
-            'priority': random.choice(priorities),
-            'approval_status': random.choice(approval_statuses)
-        })
-    
-    return pd.DataFrame(data)
-
-def generate_suppliers(n_suppliers):
+
+    order_date = random_dates(rng, '2023-01-01', 365, n_records)
+    delivery_date = add_days(order_date, rng.integers(7, 61, n_records))
+    quantity = rng.integers(1, 101, n_records)
+    unit_price = uniform(rng, 10, 1000, n_records, 2)
+
+    return pd.DataFrame({
+        'po_id': sequential_ids('PO-', start, n_records, 4),
+        'order_date': order_date,
+        'department': choose(rng, departments, n_records),
+        'supplier_id': choose(rng, sequential_ids('SUP-', 0, n_suppliers), n_records),
+        'item_id': choose(rng, sequential_ids('ITEM-', 0, n_items), n_records),
+        'quantity': quantity,
+        'unit_price': unit_price,
+        'delivery_date': delivery_date,
+        'currency': choose(rng, currencies, n_records),
+        'budget_code': choose(rng, sequential_ids('BUD-', 0, n_budgets), n_records),
+        'total_amount': quantity * unit_price,
+        'status': choose(rng, statuses, n_records),
+        'priority': choose(rng, priorities, n_records),
+        'approval_status': choose(rng, approval_statuses, n_records)
+    })
+
+def _numbered_names(names, n):
+    """n names cycling through names, with a round suffix after the first pass ('Name', ..., 'Name 2', ...)."""
+    base = np.asarray(names, dtype=object)[np.arange(n) % len(names)]
+    rounds = np.arange(n) // len(names)
+    suffix = np.where(rounds > 0, ' ' + pd.Series(rounds + 1).astype(str).to_numpy(dtype=object), '')
+    return base + suffix
+
+def generate_suppliers(n_suppliers, rng=None):
     """Generate supplier data."""
-    
+
+    rng = make_rng(rng)
     countries = ['USA', 'Germany', 'China', 'Japan', 'UK', 'France', 'Canada', 'Australia']
     regions = ['North America', 'Europe', 'Asia Pacific', 'Middle East', 'Africa']
     payment_terms = ['Net 30', 'Net 45', 'Net 60']
     certifications = ['ISO 9001', 'ISO 14001', 'OHSAS 18001', 'ISO 27001']
-    
+
     supplier_names = [
         'TechCorp Solutions', 'Global Manufacturing Inc', 'Quality Supplies Co',
         'Innovation Systems', 'Reliable Partners Ltd', 'Advanced Technologies',
@@ -102,39 +170,41 @@ def generate_suppliers(n_suppliers):
         'Advanced Manufacturing', 'Smart Components', 'Elite Technologies',
         'Future Systems', 'Reliable Tech'
     ]
-    
-    data = []
-    for i in range(n_suppliers):
-        registration_date = datetime(2020, 1, 1) + timedelta(days=random.randint(0, 1000))
-        
-        data.append({
-            'supplier_id': f'SUP-{i+1}',
-            'supplier_name': supplier_names[i],
-            'country': random.choice(countries),
-            'region': random.choice(regions),
-            'registration_date': registration_date,
-            'diversity_flag': random.choice(['Yes', 'No']),
-            'esg_score': round(random.uniform(50, 95), 1),
-            'certifications': ', '.join(random.sample(certifications, random.randint(1, 3))),
-            'risk_score': round(random.uniform(10, 80), 1),
-            'city': f'City-{i+1}',
-            'contact_person': f'Contact-{i+1}',
-            'email': f'contact{i+1}@supplier{i+1}.com',
-            'phone': f'+1-555-{str(random.randint(100, 999))}-{str(random.randint(1000, 9999))}',
-            'payment_terms': random.choice(payment_terms),
-            'certification_status': random.choice(certifications),
-            'lead_time_days': random.randint(5, 45)
-        })
-    
-    return pd.DataFrame(data)
-
-def generate_items(n_items):
+
+    # 1-3 distinct certifications per supplier: a random permutation of each row, cut at a random length
+    order = np.argsort(rng.random((n_suppliers, len(certifications))), axis=1)
+    n_certs = rng.integers(1, 4, n_suppliers)
+    cert_lists = [', '.join(certifications[j] for j in row[:k]) for row, k in zip(order, n_certs)]
+
+    numbers = sequential_ids('', 0, n_suppliers)
+    return pd.DataFrame({
+        'supplier_id': 'SUP-' + numbers,
+        'supplier_name': _numbered_names(supplier_names, n_suppliers),
+        'country': choose(rng, countries, n_suppliers),
+        'region': choose(rng, regions, n_suppliers),
+        'registration_date': random_dates(rng, '2020-01-01', 1000, n_suppliers),
+        'diversity_flag': choose(rng, ['Yes', 'No'], n_suppliers),
+        'esg_score': uniform(rng, 50, 95, n_suppliers, 1),
+        'certifications': cert_lists,
+        'risk_score': uniform(rng, 10, 80, n_suppliers, 1),
+        'city': 'City-' + numbers,
+        'contact_person': 'Contact-' + numbers,
+        'email': 'contact' + numbers + '@supplier' + numbers + '.com',
+        'phone': ('+1-555-' + pd.Series(rng.integers(100, 1000, n_suppliers)).astype(str)
+                  + '-' + pd.Series(rng.integers(1000, 10000, n_suppliers)).astype(str)).to_numpy(dtype=object),
+        'payment_terms': choose(rng, payment_terms, n_suppliers),
+        'certification_status': choose(rng, certifications, n_suppliers),
+        'lead_time_days': rng.integers(5, 46, n_suppliers)
+    })
+
+def generate_items(n_items, rng=None, n_suppliers=20):
     """Generate item catalog data."""
-    
+
+    rng = make_rng(rng)
     categories = ['Electronics', 'Office Supplies', 'Furniture', 'Software', 'Services', 'Equipment']
     units = ['Piece', 'Box', 'Set', 'License', 'Hour', 'Unit']
     subcategories = ['Premium', 'Standard', 'Economy']
-    
+
     item_names = [
         'Laptop Computer', 'Office Chair', 'Printer', 'Software License', 'Desk Lamp',
         'Filing Cabinet', 'Coffee Machine', 'Projector', 'Whiteboard', 'Telephone',
@@ -142,204 +212,198 @@ def generate_items(n_items):
         'Webcam', 'Tablet', 'Smartphone', 'Server', 'Network Switch', 'Router',
         'Backup System', 'Security Camera', 'Access Control System'
     ]
-    
-    data = []
-    for i in range(n_items):
-        data.append({
-            'item_id': f'ITEM-{i+1}',
-            'item_name': item_names[i],
-            'category': random.choice(categories),
-            'unit': random.choice(units),
-            'recyclable_flag': random.choice(['Yes', 'No']),
-            'carbon_score': round(random.uniform(1, 10), 1),
-            'unit_price': round(random.uniform(50, 2000), 2),
-            'subcategory': random.choice(subcategories),
-            'sustainability_rating': random.randint(1, 5),
-            'supplier_id': f'SUP-{random.randint(1, 20)}',
-            'min_order_quantity': random.randint(1, 10),
-            'lead_time_days': random.randint(3, 30)
-        })
-    
-    return pd.DataFrame(data)
-
-def generate_deliveries(purchase_orders, n_deliveries):
+
+    return pd.DataFrame({
+        'item_id': sequential_ids('ITEM-', 0, n_items),
+        'item_name': _numbered_names(item_names, n_items),
+        'category': choose(rng, categories, n_items),
+        'unit': choose(rng, units, n_items),
+        'recyclable_flag': choose(rng, ['Yes', 'No'], n_items),
+        'carbon_score': uniform(rng, 1, 10, n_items, 1),
+        'unit_price': uniform(rng, 50, 2000, n_items, 2),
+        'subcategory': choose(rng, subcategories, n_items),
+        'sustainability_rating': rng.integers(1, 6, n_items),
+        'supplier_id': choose(rng, sequential_ids('SUP-', 0, n_suppliers), n_items),
+        'min_order_quantity': rng.integers(1, 11, n_items),
+        'lead_time_days': rng.integers(3, 31, n_items)
+    })
+
+def generate_deliveries(purchase_orders, n_deliveries=None, rng=None, start=0):
     """Generate delivery data."""
-    
+
+    rng = make_rng(rng)
+    n_deliveries = len(purchase_orders) if n_deliveries is None else n_deliveries
     carriers = ['FedEx', 'UPS', 'DHL', 'USPS']
     delivery_statuses = ['Delivered', 'In Transit', 'Out for Delivery']
-    
-    data = []
-    for i in range(n_deliveries):
-        po = purchase_orders.iloc[i % len(purchase_orders)]
-        expected_date = po['delivery_date']
-        actual_date = expected_date + timedelta(days=random.randint(-5, 10))
-        
-        delivered_quantity = po['quantity']
-        if random.random() < 0.1:  # 10% chance of partial delivery
-            delivered_quantity = int(delivered_quantity * random.uniform(0.8, 1.0))
-        
-        on_time = actual_date <= expected_date
-        defect_flag = random.random() < 0.05  # 5% defect rate
-        
-        data.append({
-            'delivery_id': f'DEL-{str(i+1).zfill(4)}',
-            'po_id': po['po_id'],
-            'delivery_date_actual': actual_date,
-            'delivered_quantity': delivered_quantity,
-            'defect_flag': defect_flag,
-            'defect_notes': 'Minor damage' if defect_flag else '',
-            'quantity_delivered': delivered_quantity,
-            'quality_score': round(random.uniform(70, 100), 1),
-            'delivery_date': expected_date,
-            'on_time_flag': on_time,
-            'carrier': random.choice(carriers),
-            'tracking_number': f'TRK{random.randint(100000, 999999)}',
-            'delivery_status': 'Delivered' if actual_date <= datetime.now() else random.choice(delivery_statuses)
-        })
-    
-    return pd.DataFrame(data)
-
-def generate_invoices(purchase_orders, n_invoices):
+
+    po = purchase_orders.iloc[np.arange(n_deliveries) % len(purchase_orders)]
+    expected_date = po['delivery_date'].to_numpy(dtype='datetime64[ns]')
+    actual_date = add_days(expected_date, rng.integers(-5, 11, n_deliveries))
+
+    quantity = po['quantity'].to_numpy()
+    partial = rng.random(n_deliveries) < 0.1  # 10% chance of partial delivery
+    delivered_quantity = np.where(partial, (quantity * rng.uniform(0.8, 1.0, n_deliveries)).astype(np.int64), quantity)
+
+    on_time = actual_date <= expected_date
+    defect_flag = rng.random(n_deliveries) < 0.05  # 5% defect rate
+    delivered = actual_date <= np.datetime64(pd.Timestamp.now().to_datetime64(), 'ns')
+
+    return pd.DataFrame({
+        'delivery_id': sequential_ids('DEL-', start, n_deliveries, 4),
+        'po_id': po['po_id'].to_numpy(dtype=object),
+        'delivery_date_actual': actual_date,
+        'delivered_quantity': delivered_quantity,
+        'defect_flag': defect_flag,
+        'defect_notes': np.where(defect_flag, 'Minor damage', '').astype(object),
+        'quantity_delivered': delivered_quantity,
+        'quality_score': uniform(rng, 70, 100, n_deliveries, 1),
+        'delivery_date': expected_date,
+        'on_time_flag': on_time,
+        'carrier': choose(rng, carriers, n_deliveries),
+        'tracking_number': ('TRK' + pd.Series(rng.integers(100000, 1000000, n_deliveries)).astype(str)).to_numpy(dtype=object),
+        'delivery_status': np.where(delivered, 'Delivered', choose(rng, delivery_statuses, n_deliveries)).astype(object)
+    })
+
+def generate_invoices(purchase_orders, n_invoices=None, rng=None, start=0):
     """Generate invoice data."""
-    
+
+    rng = make_rng(rng)
+    n_invoices = len(purchase_orders) if n_invoices is None else n_invoices
     payment_methods = ['Wire Transfer', 'Check', 'Credit Card']
-    payment_statuses = ['Paid', 'Pending', 'Overdue']
-    
-    data = []
-    for i in range(n_invoices):
-        po = purchase_orders.iloc[i % len(purchase_orders)]
-        invoice_date = po['order_date'] + timedelta(days=random.randint(1, 30))
-        due_date = invoice_date + timedelta(days=30)
-        payment_date = due_date + timedelta(days=random.randint(-10, 20))
-        
-        invoice_amount = po['total_amount']
-        tax_amount = round(invoice_amount * random.uniform(0.05, 0.15), 2)
-        discount_amount = round(invoice_amount * random.uniform(0, 0.1), 2)
-        final_amount = invoice_amount + tax_amount - discount_amount
-        
-        payment_status = 'Paid' if payment_date <= datetime.now() else random.choice(['Pending', 'Overdue'])
-        late_payment = payment_date > due_date if payment_status == 'Paid' else False
-        
-        data.append({
-            'invoice_id': f'INV-{str(i+1).zfill(4)}',
-            'po_id': po['po_id'],
-            'invoice_date': invoice_date,
-            'payment_date': payment_date if payment_status == 'Paid' else None,
-            'invoice_amount': invoice_amount,
-            'amount': final_amount,
-            'tax_amount': tax_amount,
-            'discount_amount': discount_amount,
-            'payment_status': payment_status,
-            'payment_method': random.choice(payment_methods),
-            'due_date': due_date,
-            'late_payment_flag': late_payment
-        })
-    
-    return pd.DataFrame(data)
-
-def generate_contracts(suppliers, n_contracts):
+
+    po = purchase_orders.iloc[np.arange(n_invoices) % len(purchase_orders)]
+    invoice_date = add_days(po['order_date'].to_numpy(dtype='datetime64[ns]'), rng.integers(1, 31, n_invoices))
+    due_date = add_days(invoice_date, 30)
+    payment_date = add_days(due_date, rng.integers(-10, 21, n_invoices))
+
+    invoice_amount = po['total_amount'].to_numpy(dtype=float)
+    tax_amount = np.round(invoice_amount * rng.uniform(0.05, 0.15, n_invoices), 2)
+    discount_amount = np.round(invoice_amount * rng.uniform(0, 0.1, n_invoices), 2)
+
+    paid = payment_date <= np.datetime64(pd.Timestamp.now().to_datetime64(), 'ns')
+    payment_status = np.where(paid, 'Paid', choose(rng, ['Pending', 'Overdue'], n_invoices)).astype(object)
+
+    return pd.DataFrame({
+        'invoice_id': sequential_ids('INV-', start, n_invoices, 4),
+        'po_id': po['po_id'].to_numpy(dtype=object),
+        'invoice_date': invoice_date,
+        'payment_date': np.where(paid, payment_date, np.datetime64('NaT', 'ns')),
+        'invoice_amount': invoice_amount,
+        'amount': invoice_amount + tax_amount - discount_amount,
+        'tax_amount': tax_amount,
+        'discount_amount': discount_amount,
+        'payment_status': payment_status,
+        'payment_method': choose(rng, payment_methods, n_invoices),
+        'due_date': due_date,
+        'late_payment_flag': paid & (payment_date > due_date)
+    })
+
+def generate_contracts(suppliers, n_contracts, rng=None):
     """Generate contract data."""
-    
+
+    rng = make_rng(rng)
     contract_types = ['Service', 'Product', 'Mixed']
     compliance_statuses = ['Compliant', 'Under Review', 'Non-Compliant']
-    
-    data = []
-    for i in range(n_contracts):
-        start_date = datetime(2023, 1, 1) + timedelta(days=random.randint(0, 200))
-        end_date = start_date + timedelta(days=random.randint(365, 1095))  # 1-3 years
-        renewal_date = end_date - timedelta(days=30)
-        
-        contract_value = round(random.uniform(50000, 500000), 2)
-        volume_commitment = round(contract_value * random.uniform(0.8, 1.2), 2)
-        
-        data.append({
-            'contract_id': f'CON-{str(i+1).zfill(3)}',
-            'supplier_id': suppliers.iloc[i % len(suppliers)]['supplier_id'],
-            'start_date': start_date,
-            'end_date': end_date,
-            'contract_value': contract_value,
-            'volume_commitment': volume_commitment,
-            'dispute_count': random.randint(0, 3),
-            'compliance_status': random.choice(compliance_statuses),
-            'contract_type': random.choice(contract_types),
-            'renewal_date': renewal_date,
-            'terms_conditions': 'Standard terms and conditions apply',
-            'performance_metrics': 'Quality, Delivery, Cost',
-            'penalty_clauses': 'Late delivery penalties apply'
-        })
-    
-    return pd.DataFrame(data)
-
-def generate_budgets(n_budgets):
+
+    start_date = random_dates(rng, '2023-01-01', 200, n_contracts)
+    end_date = add_days(start_date, rng.integers(365, 1096, n_contracts))  # 1-3 years
+    contract_value = uniform(rng, 50000, 500000, n_contracts, 2)
+
+    return pd.DataFrame({
+        'contract_id': sequential_ids('CON-', 0, n_contracts, 3),
+        'supplier_id': suppliers['supplier_id'].to_numpy(dtype=object)[np.arange(n_contracts) % len(suppliers)],
+        'start_date': start_date,
+        'end_date': end_date,
+        'contract_value': contract_value,
+        'volume_commitment': np.round(contract_value * rng.uniform(0.8, 1.2, n_contracts), 2),
+        'dispute_count': rng.integers(0, 4, n_contracts),
+        'compliance_status': choose(rng, compliance_statuses, n_contracts),
+        'contract_type': choose(rng, contract_types, n_contracts),
+        'renewal_date': add_days(end_date, -30),
+        'terms_conditions': 'Standard terms and conditions apply',
+        'performance_metrics': 'Quality, Delivery, Cost',
+        'penalty_clauses': 'Late delivery penalties apply'
+    })
+
+def generate_budgets(n_budgets, rng=None):
     """Generate budget data."""
-    
+
+    rng = make_rng(rng)
     departments = ['IT', 'HR', 'Finance', 'Operations', 'Marketing', 'Sales', 'Legal', 'Facilities']
     categories = ['Equipment', 'Services', 'Supplies', 'Software', 'Travel', 'Training']
     budget_statuses = ['Active', 'Overspent', 'Underutilized']
     fiscal_years = ['2023', '2024', '2025']
-    
-    data = []
-    for i in range(n_budgets):
-        budget_amount = round(random.uniform(50000, 500000), 2)
-        allocated_amount = round(budget_amount * random.uniform(0.7, 1.0), 2)
-        spent_amount = round(allocated_amount * random.uniform(0.3, 1.1), 2)
-        remaining_amount = allocated_amount - spent_amount
-        
-        approval_date = datetime(2023, 1, 1) + timedelta(days=random.randint(0, 100))
-        
-        data.append({
-            'budget_code': f'BUD-{i+1}',
-            'department': random.choice(departments),
-            'category': random.choice(categories),
-            'fiscal_year': random.choice(fiscal_years),
-            'budget_amount': budget_amount,
-            'amount': budget_amount,
-            'period': 'Annual',
-            'budget_id': f'BID-{i+1}',
-            'allocated_amount': allocated_amount,
-            'spent_amount': spent_amount,
-            'remaining_amount': remaining_amount,
-            'budget_status': budget_statuses[0] if spent_amount <= allocated_amount else budget_statuses[1],
-            'approval_date': approval_date
-        })
-    
-    return pd.DataFrame(data)
-
-def generate_rfqs(suppliers, items, n_rfqs):
+
+    budget_amount = uniform(rng, 50000, 500000, n_budgets, 2)
+    allocated_amount = np.round(budget_amount * rng.uniform(0.7, 1.0, n_budgets), 2)
+    spent_amount = np.round(allocated_amount * rng.uniform(0.3, 1.1, n_budgets), 2)
+    numbers = sequential_ids('', 0, n_budgets)
+
+    return pd.DataFrame({
+        'budget_code': 'BUD-' + numbers,
+        'department': choose(rng, departments, n_budgets),
+        'category': choose(rng, categories, n_budgets),
+        'fiscal_year': choose(rng, fiscal_years, n_budgets),
+        'budget_amount': budget_amount,
+        'amount': budget_amount,
+        'period': 'Annual',
+        'budget_id': 'BID-' + numbers,
+        'allocated_amount': allocated_amount,
+        'spent_amount': spent_amount,
+        'remaining_amount': allocated_amount - spent_amount,
+        'budget_status': np.where(spent_amount <= allocated_amount, budget_statuses[0], budget_statuses[1]).astype(object),
+        'approval_date': random_dates(rng, '2023-01-01', 100, n_budgets)
+    })
+
+def generate_rfqs(suppliers, items, n_rfqs, rng=None):
     """Generate RFQ data."""
-    
+
+    rng = make_rng(rng)
     rfq_statuses = ['Open', 'Closed', 'Awarded', 'Cancelled']
-    
-    data = []
-    for i in range(n_rfqs):
-        issue_date = datetime(2023, 1, 1) + timedelta(days=random.randint(0, 300))
-        due_date = issue_date + timedelta(days=random.randint(7, 30))
-        response_date = issue_date + timedelta(days=random.randint(1, 14))
-        
-        quantity = random.randint(10, 500)
-        unit_price = round(random.uniform(20, 1500), 2)
-        
-        technical_score = round(random.uniform(60, 95), 1)
-        commercial_score = round(random.uniform(60, 95), 1)
-        evaluation_score = (technical_score + commercial_score) / 2
-        
-        data.append({
-            'rfq_id': f'RFQ-{str(i+1).zfill(3)}',
-            'supplier_id': suppliers.iloc[i % len(suppliers)]['supplier_id'],
-            'item_id': items.iloc[i % len(items)]['item_id'],
-            'unit_price': unit_price,
-            'response_date': response_date,
-            'issue_date': issue_date,
-            'due_date': due_date,
-            'status': random.choice(rfq_statuses),
-            'quantity': quantity,
-            'awarded_supplier_id': suppliers.iloc[i % len(suppliers)]['supplier_id'] if random.random() < 0.3 else None,
-            'evaluation_score': evaluation_score,
-            'technical_score': technical_score,
-            'commercial_score': commercial_score
-        })
-    
-    return pd.DataFrame(data)
+
+    issue_date = random_dates(rng, '2023-01-01', 300, n_rfqs)
+    technical_score = uniform(rng, 60, 95, n_rfqs, 1)
+    commercial_score = uniform(rng, 60, 95, n_rfqs, 1)
+    supplier_ids = suppliers['supplier_id'].to_numpy(dtype=object)[np.arange(n_rfqs) % len(suppliers)]
+
+    return pd.DataFrame({
+        'rfq_id': sequential_ids('RFQ-', 0, n_rfqs, 3),
+        'supplier_id': supplier_ids,
+        'item_id': items['item_id'].to_numpy(dtype=object)[np.arange(n_rfqs) % len(items)],
+        'unit_price': uniform(rng, 20, 1500, n_rfqs, 2),
+        'response_date': add_days(issue_date, rng.integers(1, 15, n_rfqs)),
+        'issue_date': issue_date,
+        'due_date': add_days(issue_date, rng.integers(7, 31, n_rfqs)),
+        'status': choose(rng, rfq_statuses, n_rfqs),
+        'quantity': rng.integers(10, 501, n_rfqs),
+        'awarded_supplier_id': np.where(rng.random(n_rfqs) < 0.3, supplier_ids, None),
+        'evaluation_score': (technical_score + commercial_score) / 2,
+        'technical_score': technical_score,
+        'commercial_score': commercial_score
+    })
+
+def main():
+    """Write the demo workbook, or with --rows a scaled dataset in chunks."""
+    parser = argparse.ArgumentParser(description="Generate procurement sample data")
+    parser.add_argument('--rows', type=int, default=None,
+                        help="Purchase orders to generate (deliveries and invoices match; dimensions scale with sqrt)")
+    parser.add_argument('--format', choices=['parquet', 'xlsx'], default='parquet')
+    parser.add_argument('--output', default=None, help="Output directory (parquet) or workbook (xlsx)")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_GENERATOR_CHUNK_ROWS)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if args.rows is None:
+        generate_sample_data()
+        return
+
+    output = args.output or ('procurement_data' if args.format == 'parquet' else 'procurement_data.xlsx')
+    start = time.perf_counter()
+    rows = write_procurement_dataset(output, args.rows, args.format, args.chunk_rows, args.seed)
+    elapsed = time.perf_counter() - start
+    for table_name in PROCUREMENT_TABLES:
+        print(f"{table_name}: {rows.get(table_name, 0):,} rows")
+    print(f"✅ Wrote {sum(rows.values()):,} rows to {output} in {elapsed:.1f}s")
 
 if __name__ == "__main__":
-    generate_sample_data() 
\ No newline at end of file
+    main()
@@ -0,0 +1,217 @@
+import numpy as np
+import pandas as pd
+
+# Columns of a partial state; each one merges by simple addition (count, sum, sum_sq) or min/max
+PARTIAL_COLUMNS = ['count', 'sum', 'sum_sq', 'min', 'max']
+
+# Row identifiers used to skip records that were already appended
+RECORD_ID_COLUMNS = {
+    'purchase_orders': 'po_id',
+    'deliveries': 'delivery_id',
+    'invoices': 'invoice_id'
+}
+
+def partial_stats(values, keys=None):
+    """
+    Partial aggregate state of values grouped by keys.
+
+    Returns a DataFrame indexed by key with count, sum, sum_sq, min and max
+    of the non-missing values. Two partials of disjoint row sets combine with
+    merge_partials into the partial of their union.
+    """
+    values = pd.to_numeric(pd.Series(values).reset_index(drop=True), errors='coerce').astype(float)
+    if keys is None:
+        keys = pd.Series('total', index=values.index)
+    else:
+        keys = pd.Series(keys).reset_index(drop=True)
+
+    valid = values.notna().to_numpy()
+    codes, uniques = pd.factorize(keys[valid], sort=True)
+    vals = values.to_numpy()[valid]
+    if len(vals) == 0 or len(uniques) == 0:
+        return pd.DataFrame(columns=PARTIAL_COLUMNS, dtype=float)
+
+    # Rows with a missing key (code -1) are dropped, as groupby would
+    keyed = codes >= 0
+    codes, vals = codes[keyed], vals[keyed]
+    n_keys = len(uniques)
+    minimum = np.full(n_keys, np.inf)
+    maximum = np.full(n_keys, -np.inf)
+    np.minimum.at(minimum, codes, vals)
+    np.maximum.at(maximum, codes, vals)
+    return pd.DataFrame({
+        'count': np.bincount(codes, minlength=n_keys).astype(float),
+        'sum': np.bincount(codes, weights=vals, minlength=n_keys),
+        'sum_sq': np.bincount(codes, weights=vals * vals, minlength=n_keys),
+        'min': minimum,
+        'max': maximum
+    }, index=pd.Index(uniques))
+
+def merge_partials(left, right):
+    """Combine two partial states key by key."""
+    if left is None or left.empty:
+        return right.copy() if right is not None else pd.DataFrame(columns=PARTIAL_COLUMNS, dtype=float)
+    if right is None or right.empty:
+        return left.copy()
+
+    index = left.index.union(right.index)
+    left = left.reindex(index)
+    right = right.reindex(index)
+    merged = pd.DataFrame(index=index)
+    for col in ['count', 'sum', 'sum_sq']:
+        merged[col] = left[col].fillna(0) + right[col].fillna(0)
+    merged['min'] = np.fmin(left['min'], right['min'])
+    merged['max'] = np.fmax(left['max'], right['max'])
+    return merged
+
+def finalize_partials(partial):
+    """Add mean and sample standard deviation columns to a partial state."""
+    result = partial.copy()
+    count = result['count']
+    result['mean'] = result['sum'] / count.where(count > 0)
+    variance = (result['sum_sq'] - result['sum'] ** 2 / count.where(count > 0)) / (count - 1).where(count > 1)
+    result['std'] = np.sqrt(variance.clip(lower=0))
+    return result
+
+def new_records(existing, delta, table_name):
+    """Rows of delta whose record id is not already present in existing."""
+    id_col = RECORD_ID_COLUMNS.get(table_name)
+    if existing is None or existing.empty or id_col is None or id_col not in delta.columns or id_col not in existing.columns:
+        return delta
+    return delta[~delta[id_col].isin(existing[id_col])]
+
+class ProcurementAggregates:
+    """
+    Running aggregates for purchase orders, deliveries and invoices.
+
+    Every aggregate is kept as a mergeable partial state (count, sum, sum of
+    squares, min, max per key), so appending a batch of rows only aggregates
+    the batch and merges it in; totals and trends never rescan the full tables.
+    """
+
+    def __init__(self):
+        self.partials = {}
+        self.row_counts = {'purchase_orders': 0, 'deliveries': 0, 'invoices': 0}
+        self.sources = {}
+
+    @classmethod
+    def from_tables(cls, purchase_orders=None, deliveries=None, invoices=None):
+        """Build aggregates from complete tables."""
+        aggregates = cls()
+        if purchase_orders is not None and not purchase_orders.empty:
+            aggregates.add_purchase_orders(purchase_orders)
+        if deliveries is not None and not deliveries.empty:
+            aggregates.add_deliveries(deliveries)
+        if invoices is not None and not invoices.empty:
+            aggregates.add_invoices(invoices)
+        return aggregates
+
+    def _merge(self, name, partial):
+        self.partials[name] = merge_partials(self.partials.get(name), partial)
+
+    def add_purchase_orders(self, purchase_orders):
+        """Fold a batch of purchase orders into the spend aggregates."""
+        if purchase_orders.empty:
+            return
+        spend = purchase_orders['quantity'] * purchase_orders['unit_price']
+        self._merge('spend_total', partial_stats(spend))
+        self._merge('spend_by_supplier', partial_stats(spend, purchase_orders['supplier_id']))
+        if 'order_date' in purchase_orders.columns:
+            month = pd.to_datetime(purchase_orders['order_date'], errors='coerce').dt.to_period('M')
+            self._merge('spend_by_month', partial_stats(spend, month))
+        for col in ['department', 'item_id']:
+            if col in purchase_orders.columns:
+                self._merge(f'spend_by_{col}', partial_stats(spend, purchase_orders[col]))
+        self.row_counts['purchase_orders'] += len(purchase_orders)
+
+    def add_deliveries(self, deliveries):
+        """Fold a batch of deliveries into the on-time and defect aggregates."""
+        if deliveries.empty:
+            return
+        if 'delivery_date_actual' in deliveries.columns:
+            actual = pd.to_datetime(deliveries['delivery_date_actual'], errors='coerce')
+            month = actual.dt.to_period('M')
+            if 'delivery_date' in deliveries.columns:
+                expected = pd.to_datetime(deliveries['delivery_date'], errors='coerce')
+                on_time = (actual <= expected).astype(float).where(actual.notna() & expected.notna())
+                self._merge('on_time_by_month', partial_stats(on_time, month))
+                self._merge('delay_days_by_month', partial_stats((actual - expected).dt.days, month))
+            if 'defect_flag' in deliveries.columns:
+                defects = deliveries['defect_flag'].map({True: 1.0, False: 0.0, 'Yes': 1.0, 'No': 0.0, 1: 1.0, 0: 0.0})
+                self._merge('defects_by_month', partial_stats(defects, month))
+        self.row_counts['deliveries'] += len(deliveries)
+
+    def add_invoices(self, invoices):
+        """Fold a batch of invoices into the invoiced amount aggregates."""
+        if invoices.empty:
+            return
+        amount_col = next((col for col in ['invoice_amount', 'amount'] if col in invoices.columns), None)
+        if amount_col is not None:
+            amounts = invoices[amount_col]
+            self._merge('invoice_total', partial_stats(amounts))
+            if 'invoice_date' in invoices.columns:
+                month = pd.to_datetime(invoices['invoice_date'], errors='coerce').dt.to_period('M')
+                self._merge('invoice_by_month', partial_stats(amounts, month))
+        self.row_counts['invoices'] += len(invoices)
+
+    def add(self, table_name, delta):
+        """Fold a batch of rows for 'purchase_orders', 'deliveries' or 'invoices'."""
+        handlers = {
+            'purchase_orders': self.add_purchase_orders,
+            'deliveries': self.add_deliveries,
+            'invoices': self.add_invoices
+        }
+        handlers[table_name](delta)
+
+    def merge(self, other):
+        """Aggregates of the union of both row sets."""
+        merged = ProcurementAggregates()
+        for name in set(self.partials) | set(other.partials):
+            merged.partials[name] = merge_partials(self.partials.get(name), other.partials.get(name))
+        for table in merged.row_counts:
+            merged.row_counts[table] = self.row_counts.get(table, 0) + other.row_counts.get(table, 0)
+        return merged
+
+    def is_current(self, table_name, table):
+        """Whether the aggregates were built from (and kept in step with) this exact table object."""
+        return self.sources.get(table_name) is table and self.row_counts.get(table_name, 0) == len(table)
+
+    def track(self, table_name, table):
+        """Remember which table object the aggregates currently describe."""
+        self.sources[table_name] = table
+
+    def get(self, name):
+        """A finalized aggregate (count, sum, sum_sq, min, max, mean, std per key)."""
+        partial = self.partials.get(name)
+        if partial is None:
+            return pd.DataFrame(columns=PARTIAL_COLUMNS + ['mean', 'std'], dtype=float)
+        return finalize_partials(partial)
+
+    def spend_summary(self):
+        """Headline spend figures: total, order count, supplier count, average and spread of PO value."""
+        total = self.get('spend_total')
+        by_supplier = self.partials.get('spend_by_supplier')
+        if total.empty:
+            return {'total_spend': 0.0, 'total_orders': self.row_counts['purchase_orders'], 'unique_suppliers': 0,
+                    'avg_order_value': 0.0, 'std_order_value': 0.0}
+        row = total.iloc[0]
+        orders = self.row_counts['purchase_orders']
+        return {
+            'total_spend': float(row['sum']),
+            'total_orders': orders,
+            'unique_suppliers': int((by_supplier['count'] > 0).sum()) if by_supplier is not None else 0,
+            'avg_order_value': float(row['sum']) / orders if orders > 0 else 0.0,
+            'std_order_value': float(row['std']) if pd.notna(row['std']) else 0.0
+        }
+
+    def monthly_spend(self):
+        """Spend trend by order month."""
+        monthly = self.get('spend_by_month')
+        if monthly.empty:
+            return pd.DataFrame(columns=['month', 'total_spend', 'po_count', 'avg_po_value'])
+        return pd.DataFrame({
+            'month': monthly.index.astype(str),
+            'total_spend': monthly['sum'].to_numpy(),
+            'po_count': monthly['count'].astype(int).to_numpy(),
+            'avg_po_value': monthly['mean'].to_numpy()
+        })
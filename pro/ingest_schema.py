@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+
+from utils import COLUMN_MAPPINGS
+
+# Session-state attribute holding each COLUMN_MAPPINGS table
+SESSION_TABLE_KEYS = {
+    'purchase_orders': 'purchase_orders',
+    'suppliers': 'suppliers',
+    'items': 'items_data',
+    'contracts': 'contracts',
+    'deliveries': 'deliveries',
+    'invoices': 'invoices',
+    'budgets': 'budgets',
+    'rfqs': 'rfqs'
+}
+
+# Strings become categoricals only when they repeat enough to pay for the category table
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+# Before pandas 3, groupby on a categorical defaults to observed=False and emits rows for
+# categories missing from a filtered frame, which would change metric tables
+CATEGORICALS_ENABLED = int(pd.__version__.split('.')[0]) >= 3
+
+_NUMBER_HINTS = ('quantity', 'price', 'value', 'amount', 'score', 'count', 'commitment', 'cost', 'spend', 'days')
+_CATEGORY_HINTS = ('_id', 'department', 'currency', 'status', 'region', 'country', 'category', 'unit',
+                   'budget_code', '_flag', 'priority', 'method', 'carrier', 'type', 'certifications')
+
+def infer_column_type(column: str) -> str:
+    """Schema type for a procurement column from its standard name: 'date', 'integer', 'number', 'category' or 'text'."""
+    name = column.lower()
+    if name.endswith('_date') or name.endswith('_date_actual') or name == 'date':
+        return 'date'
+    if name in ('fiscal_year', 'year'):
+        return 'integer'
+    if any(hint in name for hint in _NUMBER_HINTS):
+        return 'number'
+    if any(hint in name for hint in _CATEGORY_HINTS):
+        return 'category'
+    return 'text'
+
+def table_schema(table_name: str, columns=None) -> dict:
+    """{column: type} for a procurement table: its COLUMN_MAPPINGS columns plus any extra columns present."""
+    schema = {col: infer_column_type(col) for col in COLUMN_MAPPINGS.get(table_name, {}).values()}
+    for col in columns if columns is not None else []:
+        schema.setdefault(str(col), infer_column_type(str(col)))
+    return schema
+
+def _compact_column(values: pd.Series, col_type: str) -> pd.Series:
+    """Convert one column to its compact dtype, or return it unchanged if that would lose data."""
+    if col_type == 'date':
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values
+        converted = pd.to_datetime(values, errors='coerce')
+        return values if (converted.isna() & values.notna()).any() else converted
+
+    if col_type in ('number', 'integer'):
+        if not pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+            converted = pd.to_numeric(values, errors='coerce')
+            if (converted.isna() & values.notna()).any():
+                return values
+            values = converted
+        if pd.api.types.is_integer_dtype(values) and values.dtype.itemsize > 4:
+            # int32 keeps arithmetic with ordinary constants from overflowing
+            info = np.iinfo(np.int32)
+            if values.empty or (values.min() >= info.min and values.max() <= info.max):
+                return values.astype(np.int32)
+        return values
+
+    if col_type == 'category':
+        if not CATEGORICALS_ENABLED or isinstance(values.dtype, pd.CategoricalDtype):
+            return values
+        if not (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+            return values
+        if len(values) and values.nunique(dropna=True) <= len(values) * CATEGORY_MAX_UNIQUE_RATIO:
+            return values.astype('category')
+        return values
+
+    return values
+
+def compact_table(df: pd.DataFrame, table_name: str):
+    """
+    Apply the ingest schema for a procurement table.
+
+    Dates are parsed once, integer columns are downcast to int32 where they
+    fit, and repetitive strings become categoricals. Returns the compacted
+    frame and a report of memory before and after.
+    """
+    if df is None or df.empty:
+        return df, {'table': table_name, 'rows': 0, 'bytes_before': 0, 'bytes_after': 0, 'bytes_saved': 0, 'converted': []}
+
+    bytes_before = int(df.memory_usage(index=True, deep=True).sum())
+    compacted = df.copy()
+    converted = []
+    for col, col_type in table_schema(table_name, df.columns).items():
+        if col not in compacted.columns:
+            continue
+        before_dtype = compacted[col].dtype
+        compacted[col] = _compact_column(compacted[col], col_type)
+        if compacted[col].dtype != before_dtype:
+            converted.append(f"{col}: {before_dtype} → {compacted[col].dtype}")
+
+    bytes_after = int(compacted.memory_usage(index=True, deep=True).sum())
+    return compacted, {
+        'table': table_name,
+        'rows': len(compacted),
+        'bytes_before': bytes_before,
+        'bytes_after': bytes_after,
+        'bytes_saved': bytes_before - bytes_after,
+        'converted': converted
+    }
+
+def format_compaction_report(reports) -> pd.DataFrame:
+    """Summarize compaction reports as a table for display."""
+    rows = []
+    for report in reports:
+        before = report['bytes_before']
+        rows.append({
+            'Table': report['table'],
+            'Rows': report['rows'],
+            'Before (MB)': round(before / (1024 * 1024), 2),
+            'After (MB)': round(report['bytes_after'] / (1024 * 1024), 2),
+            'Saved (%)': round(report['bytes_saved'] / before * 100, 1) if before > 0 else 0.0,
+            'Converted Columns': ', '.join(report['converted'])
+        })
+    return pd.DataFrame(rows)
+
+def align_categories(existing: pd.DataFrame, delta: pd.DataFrame):
+    """
+    Give delta the categorical dtypes of existing so that concatenating them stays categorical.
+
+    New categories are appended to existing's categories, which keeps its codes unchanged.
+    """
+    existing = existing.copy()
+    delta = delta.copy()
+    for col in existing.columns:
+        if col not in delta.columns or not isinstance(existing[col].dtype, pd.CategoricalDtype):
+            continue
+        known = existing[col].cat.categories
+        incoming = pd.Index(delta[col].dropna().unique())
+        added = incoming[~incoming.isin(known)]
+        if len(added):
+            existing[col] = existing[col].cat.add_categories(added)
+        delta[col] = delta[col].astype(existing[col].dtype)
+    return existing, delta
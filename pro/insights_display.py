@@ -0,0 +1,245 @@
+import pandas as pd
+import streamlit as st
+
+# Rendering for the Streamlit-free insight text produced by auto_insights.ProcurementInsights
+
+def display_insights_section(insights_text, title, icon="💡"):
+    """Display insights in a clean, professional table format matching HR system"""
+    # For executive summary, use special formatting
+    if "## Executive Overview" in insights_text:
+        display_executive_summary(insights_text, title, icon)
+    else:
+        # Convert insights to table format using Streamlit components
+        display_insights_table(insights_text, title, icon)
+
+def display_insights_table(insights_text, title, icon):
+    """Display insights using professional table format matching HR system"""
+    # Parse the insights text
+    lines = insights_text.split('\n')
+    insights_data = []
+    strategic_actions = []
+    in_strategic_section = False
+    
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+            
+        # Check if we're entering strategic actions section
+        if line.lower() == "strategic actions:":
+            in_strategic_section = True
+            continue
+            
+        # Handle strategic actions
+        if in_strategic_section and line.startswith('•'):
+            strategic_actions.append(line[1:].strip())
+            continue
+        elif in_strategic_section:
+            in_strategic_section = False
+            
+        # Remove ** formatting but keep the content
+        line = line.replace('**', '')
+        
+        # Extract metric and value
+        if ':' in line:
+            parts = line.split(':', 1)
+            metric = parts[0].strip()
+            value = parts[1].strip()
+            
+            # Determine status/alert based on content
+            status = "Normal"
+            if any(word in line.lower() for word in ['risk', 'alert', 'issue', 'high', 'above', 'critical', 'concerning']):
+                status = "Alert"
+            elif any(word in line.lower() for word in ['opportunity', 'good', 'excellent', 'low']):
+                status = "Opportunity"
+            elif any(word in line.lower() for word in ['moderate', 'medium']):
+                status = "Monitor"
+            elif any(word in line.lower() for word in ['data not available', 'error', 'unknown']):
+                status = "No Data"
+            
+            insights_data.append({
+                'metric': metric,
+                'value': value,
+                'status': status
+            })
+    
+    if not insights_data:
+        st.info(f"No insights available for {title}")
+        return
+    
+    # Create professional styled container matching HR system
+    st.markdown(f"""
+    <div style="background: white; border: 1px solid #e5e7eb; border-radius: 12px; 
+                padding: 24px; margin: 16px 0; box-shadow: 0 2px 8px rgba(0,0,0,0.08);">
+        <h3 style="color: #1f2937; margin: 0 0 20px 0; font-size: 1.25rem; font-weight: 600; 
+                   border-bottom: 2px solid #667eea; padding-bottom: 8px;">
+            {icon} {title}
+        </h3>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Create DataFrame for table display
+    df_data = []
+    for insight in insights_data:
+        df_data.append({
+            'Metric': insight['metric'],
+            'Value': insight['value'],
+            'Status': insight['status']
+        })
+    
+    df = pd.DataFrame(df_data)
+    
+    # Display table with custom styling matching HR system
+    st.dataframe(
+        df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Metric": st.column_config.TextColumn("Metric", width="medium"),
+            "Value": st.column_config.TextColumn("Value", width="medium"),
+            "Status": st.column_config.SelectboxColumn(
+                "Status",
+                width="small",
+                options=["Normal", "Alert", "Monitor", "Opportunity", "No Data"],
+                default="Normal"
+            )
+        }
+    )
+    
+    # Display strategic actions if available
+    if strategic_actions:
+        st.markdown("### Strategic Actions")
+        for action in strategic_actions:
+            st.markdown(f"• {action}")
+
+def display_executive_summary(insights_text, title, icon):
+    """Display executive summary with professional table format matching HR system"""
+    # Create professional styled container matching HR system
+    st.markdown(f"""
+    <div style="background: white; border: 1px solid #e5e7eb; border-radius: 12px; 
+                padding: 24px; margin: 16px 0; box-shadow: 0 2px 8px rgba(0,0,0,0.08);">
+        <h3 style="color: #1f2937; margin: 0 0 20px 0; font-size: 1.25rem; font-weight: 600; 
+                   border-bottom: 2px solid #667eea; padding-bottom: 8px;">
+            {icon} {title}
+        </h3>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Parse the insights text
+    lines = insights_text.split('\n')
+    insights_data = []
+    strategic_actions = []
+    in_strategic_section = False
+    
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+            
+        # Check if we're entering strategic actions section
+        if line.lower() == "strategic actions:":
+            in_strategic_section = True
+            continue
+            
+        # Handle strategic actions
+        if in_strategic_section and line.startswith('•'):
+            strategic_actions.append(line[1:].strip())
+            continue
+        elif in_strategic_section:
+            in_strategic_section = False
+            
+        # Remove ** formatting but keep the content
+        line = line.replace('**', '')
+        
+        # Extract metric and value
+        if ':' in line:
+            parts = line.split(':', 1)
+            metric = parts[0].strip()
+            value = parts[1].strip()
+            
+            # Determine status/alert based on content
+            status = "Normal"
+            if any(word in line.lower() for word in ['risk', 'alert', 'issue', 'high', 'above', 'critical', 'concerning']):
+                status = "Alert"
+            elif any(word in line.lower() for word in ['opportunity', 'good', 'excellent', 'low']):
+                status = "Opportunity"
+            elif any(word in line.lower() for word in ['moderate', 'medium']):
+                status = "Monitor"
+            elif any(word in line.lower() for word in ['data not available', 'error', 'unknown']):
+                status = "No Data"
+            
+            insights_data.append({
+                'metric': metric,
+                'value': value,
+                'status': status
+            })
+    
+    if not insights_data:
+        st.info(f"No executive summary data available")
+        return
+    
+    # Create DataFrame for table display
+    df_data = []
+    for insight in insights_data:
+        df_data.append({
+            'Metric': insight['metric'],
+            'Value': insight['value'],
+            'Status': insight['status']
+        })
+    
+    df = pd.DataFrame(df_data)
+    
+    # Display table with custom styling matching HR system
+    st.dataframe(
+        df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Metric": st.column_config.TextColumn("Metric", width="medium"),
+            "Value": st.column_config.TextColumn("Value", width="medium"),
+            "Status": st.column_config.SelectboxColumn(
+                "Status",
+                width="small",
+                options=["Normal", "Alert", "Monitor", "Opportunity", "No Data"],
+                default="Normal"
+            )
+        }
+    )
+    
+    # Display strategic actions if available
+    if strategic_actions:
+        st.markdown("### Strategic Actions")
+        for action in strategic_actions:
+            st.markdown(f"• {action}")
+
+def get_section_icon(section_title):
+    """Get appropriate icon for section title"""
+    section_lower = section_title.lower()
+    
+    if 'spend' in section_lower:
+        return "💰"
+    elif 'supplier' in section_lower:
+        return "🏭"
+    elif 'cost' in section_lower:
+        return "💡"
+    elif 'process' in section_lower:
+        return "⚡"
+    elif 'risk' in section_lower or 'compliance' in section_lower:
+        return "⚠️"
+    elif 'sustainability' in section_lower or 'csr' in section_lower:
+        return "🌱"
+    else:
+        return "📊"
+
+def clean_insights_text(text):
+    """Clean and format insights text for display"""
+    # Remove extra whitespace and normalize line breaks
+    lines = text.split('\n')
+    cleaned_lines = []
+    
+    for line in lines:
+        line = line.strip()
+        if line:
+            cleaned_lines.append(line)
+    
+    return '\n'.join(cleaned_lines) 
\ No newline at end of file
@@ -22,25 +22,28 @@ except ImportError:
     def detect_delivery_date_column(df):
         return 'delivery_date' if 'delivery_date' in df.columns else None
 
+from supplier_risk_engine import SupplierRiskEngine, DEFAULT_RISK_WEIGHTS
+from spend_cube import SpendCube, SPEND_DIMENSIONS
+
 # Spend Analysis Functions
+def get_spend_cube(purchase_orders):
+    """Build the spend cube (spend and PO count per month, item, department, supplier and budget code) for rollups and drill-downs"""
+    return SpendCube(purchase_orders)
+
+def _spend_rollup(purchase_orders, dimensions, items_data=None, suppliers=None, unknown=None):
+    """Total spend by dimensions from the purchase orders' spend cube, or None when a dimension is unavailable"""
+    rollup = get_spend_cube(purchase_orders).rollup(dimensions, items_data=items_data, suppliers=suppliers, unknown=unknown)
+    return rollup[[*dimensions, 'total_spend']] if rollup is not None else None
+
 def calculate_spend_trends(purchase_orders, items_data=None, suppliers=None):
     """Calculate comprehensive spend trends over time"""
     if purchase_orders.empty:
         return pd.DataFrame(), "No data available"
     
-    # Convert order_date to datetime
-    po_df = purchase_orders.copy()
-    po_df['order_date'] = pd.to_datetime(po_df['order_date'])
-    
-    # Calculate total spend
-    po_df['total_spend'] = po_df['quantity'] * po_df['unit_price']
-    
-    # Create monthly trends
-    po_df['month'] = po_df['order_date'].dt.to_period('M')
-    
     # Monthly total spend
-    monthly_spend = po_df.groupby('month')['total_spend'].sum().reset_index()
-    monthly_spend['month'] = monthly_spend['month'].astype(str)
+    monthly_spend = _spend_rollup(purchase_orders, ['month'])
+    if monthly_spend is None:
+        return pd.DataFrame(), "No order dates available"
     
     return monthly_spend, "Spend trends calculated"
 
@@ -49,18 +52,10 @@ def calculate_category_spend_trends(purchase_orders, items_data):
     if purchase_orders.empty or items_data.empty:
         return pd.DataFrame(), "No data available"
     
-    # Merge purchase orders with items
-    merged_data = purchase_orders.merge(items_data, on='item_id', how='left')
-    merged_data['order_date'] = pd.to_datetime(merged_data['order_date'])
-    
-    # Handle potential column renaming after merge
-    unit_price_col = 'unit_price' if 'unit_price' in merged_data.columns else 'unit_price_x'
-    merged_data['total_spend'] = merged_data['quantity'] * merged_data[unit_price_col]
-    
-    # Create monthly trends by category
-    merged_data['month'] = merged_data['order_date'].dt.to_period('M')
-    category_trends = merged_data.groupby(['month', 'category'])['total_spend'].sum().reset_index()
-    category_trends['month'] = category_trends['month'].astype(str)
+    # Monthly trends by category (categories come from the items table)
+    category_trends = _spend_rollup(purchase_orders, ['month', 'category'], items_data=items_data)
+    if category_trends is None:
+        return pd.DataFrame(), "No order dates or item categories available"
     
     return category_trends, "Category spend trends calculated"
 
@@ -69,14 +64,10 @@ def calculate_department_spend_trends(purchase_orders):
     if purchase_orders.empty:
         return pd.DataFrame(), "No data available"
     
-    po_df = purchase_orders.copy()
-    po_df['order_date'] = pd.to_datetime(po_df['order_date'])
-    po_df['total_spend'] = po_df['quantity'] * po_df['unit_price']
-    
-    # Create monthly trends by department
-    po_df['month'] = po_df['order_date'].dt.to_period('M')
-    dept_trends = po_df.groupby(['month', 'department'])['total_spend'].sum().reset_index()
-    dept_trends['month'] = dept_trends['month'].astype(str)
+    # Monthly trends by department
+    dept_trends = _spend_rollup(purchase_orders, ['month', 'department'])
+    if dept_trends is None:
+        return pd.DataFrame(), "No order dates or departments available"
     
     return dept_trends, "Department spend trends calculated"
 
@@ -85,18 +76,10 @@ def calculate_supplier_spend_trends(purchase_orders, suppliers):
     if purchase_orders.empty or suppliers.empty:
         return pd.DataFrame(), "No data available"
     
-    # Merge purchase orders with suppliers
-    merged_data = purchase_orders.merge(suppliers, on='supplier_id', how='left')
-    merged_data['order_date'] = pd.to_datetime(merged_data['order_date'])
-    
-    # Handle potential column renaming after merge
-    unit_price_col = 'unit_price' if 'unit_price' in merged_data.columns else 'unit_price_x'
-    merged_data['total_spend'] = merged_data['quantity'] * merged_data[unit_price_col]
-    
-    # Create monthly trends by supplier
-    merged_data['month'] = merged_data['order_date'].dt.to_period('M')
-    supplier_trends = merged_data.groupby(['month', 'supplier_name'])['total_spend'].sum().reset_index()
-    supplier_trends['month'] = supplier_trends['month'].astype(str)
+    # Monthly trends by supplier (names come from the suppliers table)
+    supplier_trends = _spend_rollup(purchase_orders, ['month', 'supplier_name'], suppliers=suppliers)
+    if supplier_trends is None:
+        return pd.DataFrame(), "No order dates or supplier names available"
     
     return supplier_trends, "Supplier spend trends calculated"
 
@@ -105,14 +88,10 @@ def calculate_budget_spend_trends(purchase_orders, budgets):
     if purchase_orders.empty or budgets.empty:
         return pd.DataFrame(), "No data available"
     
-    po_df = purchase_orders.copy()
-    po_df['order_date'] = pd.to_datetime(po_df['order_date'])
-    po_df['total_spend'] = po_df['quantity'] * po_df['unit_price']
-    
-    # Create monthly trends by budget
-    po_df['month'] = po_df['order_date'].dt.to_period('M')
-    budget_trends = po_df.groupby(['month', 'budget_code'])['total_spend'].sum().reset_index()
-    budget_trends['month'] = budget_trends['month'].astype(str)
+    # Monthly trends by budget
+    budget_trends = _spend_rollup(purchase_orders, ['month', 'budget_code'])
+    if budget_trends is None:
+        return pd.DataFrame(), "No order dates or budget codes available"
     
     # Merge with budget data for comparison
     budget_comparison = budget_trends.merge(budgets, on='budget_code', how='left')
@@ -133,21 +112,9 @@ def calculate_spend_by_category(purchase_orders, items_data):
     if not is_valid_items:
         return pd.DataFrame(), items_msg
     
-    # Merge purchase orders with items to get categories
-    merged_data = safe_merge(purchase_orders, items_data, on='item_id', how='left')
-    if merged_data.empty:
-        return pd.DataFrame(), "Failed to merge purchase orders with items data"
-    
-    # Handle missing values consistently
-    merged_data = handle_missing_values(merged_data, categorical_fill='Unknown Category')
-    
-    # Calculate total spend using centralized function
-    merged_data['total_spend'] = calculate_spend(merged_data)
-    if merged_data['total_spend'].empty:
-        return pd.DataFrame(), "Error calculating spend"
-    
-    # Group by category and sum spend
-    category_spend = merged_data.groupby('category')['total_spend'].sum().reset_index()
+    # Roll the spend cube up by category; unmatched items count as 'Unknown Category'
+    category_spend = _spend_rollup(purchase_orders, ['category'], items_data=items_data,
+                                   unknown={'category': 'Unknown Category'})
     category_spend = category_spend.sort_values('total_spend', ascending=False)
     
     # Remove zero spend categories
@@ -172,21 +139,9 @@ def calculate_spend_by_supplier(purchase_orders, suppliers):
     if not is_valid_suppliers:
         return pd.DataFrame(), suppliers_msg
     
-    # Merge purchase orders with suppliers
-    merged_data = safe_merge(purchase_orders, suppliers, on='supplier_id', how='left')
-    if merged_data.empty:
-        return pd.DataFrame(), "Failed to merge purchase orders with suppliers data"
-    
-    # Handle missing values consistently
-    merged_data = handle_missing_values(merged_data, categorical_fill='Unknown Supplier')
-    
-    # Calculate total spend using centralized function
-    merged_data['total_spend'] = calculate_spend(merged_data)
-    if merged_data['total_spend'].empty:
-        return pd.DataFrame(), "Error calculating spend"
-    
-    # Group by supplier and sum spend
-    supplier_spend = merged_data.groupby('supplier_name')['total_spend'].sum().reset_index()
+    # Roll the spend cube up by supplier; unmatched suppliers count as 'Unknown Supplier'
+    supplier_spend = _spend_rollup(purchase_orders, ['supplier_name'], suppliers=suppliers,
+                                   unknown={'supplier_name': 'Unknown Supplier'})
     supplier_spend = supplier_spend.sort_values('total_spend', ascending=False)
     
     # Remove zero spend suppliers
@@ -207,16 +162,8 @@ def calculate_spend_by_department(purchase_orders):
     if not is_valid:
         return pd.DataFrame(), msg
     
-    # Handle missing values consistently
-    po_clean = handle_missing_values(purchase_orders, categorical_fill='Unknown Department')
-    
-    # Calculate total spend using centralized function
-    po_clean['total_spend'] = calculate_spend(po_clean)
-    if po_clean['total_spend'].empty:
-        return pd.DataFrame(), "Error calculating spend"
-    
-    # Group by department and sum spend
-    dept_spend = po_clean.groupby('department')['total_spend'].sum().reset_index()
+    # Roll the spend cube up by department
+    dept_spend = _spend_rollup(purchase_orders, ['department'], unknown={'department': 'Unknown Department'})
     dept_spend = dept_spend.sort_values('total_spend', ascending=False)
     
     # Remove zero spend departments
@@ -236,7 +183,7 @@ def calculate_budget_utilization(purchase_orders, budgets):
         return pd.DataFrame(), "No data available"
     
     # Calculate actual spend by budget code
-    purchase_orders['total_spend'] = purchase_orders['quantity'] * purchase_orders['unit_price']
+    purchase_orders = purchase_orders.assign(total_spend=purchase_orders['quantity'] * purchase_orders['unit_price'])
     actual_spend = purchase_orders.groupby('budget_code')['total_spend'].sum().reset_index()
     
     # Merge with budget data
@@ -402,180 +349,19 @@ def calculate_lead_time_analysis(purchase_orders, deliveries):
     
     return merged_data, "Lead time calculated"
 
-def calculate_supplier_risk_assessment(suppliers, purchase_orders, deliveries=None, invoices=None, contracts=None):
+def get_supplier_risk_engine(suppliers, purchase_orders, deliveries=None, invoices=None, contracts=None):
+    """Build the columnar risk engine (joins and per-supplier components) for re-scoring with different weights"""
+    return SupplierRiskEngine(suppliers, purchase_orders, deliveries, invoices, contracts)
+
+def calculate_supplier_risk_assessment(suppliers, purchase_orders, deliveries=None, invoices=None, contracts=None, weights=None):
     """Calculate comprehensive supplier risk assessment for each supplier"""
     if suppliers.empty or purchase_orders.empty:
         return pd.DataFrame(), "No data available"
     
-    # Create a copy of suppliers for risk analysis
-    risk_data = suppliers.copy()
-    
-    # Calculate spend by supplier
-    purchase_orders['total_spend'] = purchase_orders['quantity'] * purchase_orders['unit_price']
-    supplier_spend = purchase_orders.groupby('supplier_id')['total_spend'].sum().reset_index()
-    
-    # Merge with supplier data
-    risk_data = risk_data.merge(supplier_spend, on='supplier_id', how='left')
-    risk_data['total_spend'] = risk_data['total_spend'].fillna(0)
-    
-    # Calculate spend percentage
-    total_spend = risk_data['total_spend'].sum()
-    risk_data['spend_percentage'] = (risk_data['total_spend'] / total_spend * 100) if total_spend > 0 else 0
-    
-    # 1. Financial Risk Score (0-100)
-    risk_data['esg_score'] = risk_data['esg_score'].fillna(50)  # Default ESG score
-    risk_data['financial_risk'] = 100 - risk_data['esg_score']  # Higher ESG = lower financial risk
-    
-    # 2. Concentration Risk Score (0-100)
-    # Higher spend percentage = higher concentration risk
-    max_spend_pct = risk_data['spend_percentage'].max()
-    risk_data['concentration_risk'] = (risk_data['spend_percentage'] / max_spend_pct * 100) if max_spend_pct > 0 else 0
-    
-    # 3. Geographic Risk Score (0-100)
-    if 'country' in risk_data.columns:
-        country_counts = risk_data['country'].value_counts()
-        risk_data['country_supplier_count'] = risk_data['country'].map(country_counts)
-        # Fewer suppliers in a country = higher geographic risk
-        risk_data['geographic_risk'] = (1 / risk_data['country_supplier_count'] * 100).clip(upper=100)
-    else:
-        risk_data['geographic_risk'] = 50  # Default moderate risk
-    
-    # 4. Performance Risk Score (0-100) - if delivery data available
-    if deliveries is not None and not deliveries.empty:
-        # Merge with delivery data to calculate performance metrics
-        po_delivery = purchase_orders.merge(deliveries, on='po_id', how='left')
-        po_delivery = po_delivery.merge(suppliers[['supplier_id', 'supplier_name']], on='supplier_id', how='left')
-        
-        # Calculate on-time delivery rate by supplier
-        if 'delivery_date_actual' in po_delivery.columns and 'delivery_date' in po_delivery.columns:
-            po_delivery['on_time'] = pd.to_datetime(po_delivery['delivery_date_actual']) <= pd.to_datetime(po_delivery['delivery_date'])
-            supplier_performance = po_delivery.groupby('supplier_id').agg({
-                'on_time': 'mean',
-                'defect_flag': 'sum',
-                'po_id': 'count'
-            }).reset_index()
-            supplier_performance.columns = ['supplier_id', 'on_time_rate', 'defect_count', 'order_count']
-            
-            # Merge performance data
-            risk_data = risk_data.merge(supplier_performance, on='supplier_id', how='left')
-            risk_data['on_time_rate'] = risk_data['on_time_rate'].fillna(0.5)  # Default 50% if no data
-            risk_data['defect_count'] = risk_data['defect_count'].fillna(0)
-            risk_data['order_count'] = risk_data['order_count'].fillna(0)
-            
-            # Calculate performance risk (lower on-time rate = higher risk)
-            risk_data['performance_risk'] = (1 - risk_data['on_time_rate']) * 100
-            
-            # Add defect risk
-            max_defects = risk_data['defect_count'].max()
-            risk_data['defect_risk'] = (risk_data['defect_count'] / max_defects * 100) if max_defects > 0 else 0
-        else:
-            risk_data['performance_risk'] = 50  # Default moderate risk
-            risk_data['defect_risk'] = 0
-    else:
-        risk_data['performance_risk'] = 50  # Default moderate risk
-        risk_data['defect_risk'] = 0
-    
-    # 5. Contract Risk Score (0-100) - if contract data available
-    if contracts is not None and not contracts.empty:
-        # Calculate contract-related risks
-        # Check which date column exists in contracts data
-        date_column = None
-        for col in ['end_date', 'expiry_date', 'contract_end_date']:
-            if col in contracts.columns:
-                date_column = col
-                break
-        
-        if date_column:
-            supplier_contracts = contracts.groupby('supplier_id').agg({
-                'contract_value': 'sum',
-                'contract_id': 'count',
-                date_column: 'min'
-            }).reset_index()
-            supplier_contracts.columns = ['supplier_id', 'total_contract_value', 'contract_count', 'earliest_expiry']
-        else:
-            # If no date column found, create a basic aggregation without expiry
-            supplier_contracts = contracts.groupby('supplier_id').agg({
-                'contract_value': 'sum',
-                'contract_id': 'count'
-            }).reset_index()
-            supplier_contracts.columns = ['supplier_id', 'total_contract_value', 'contract_count']
-            supplier_contracts['earliest_expiry'] = None
-        
-        # Merge contract data
-        risk_data = risk_data.merge(supplier_contracts, on='supplier_id', how='left')
-        risk_data['total_contract_value'] = risk_data['total_contract_value'].fillna(0)
-        risk_data['contract_count'] = risk_data['contract_count'].fillna(0)
-        
-        # Contract concentration risk (higher contract value = higher risk)
-        max_contract_value = risk_data['total_contract_value'].max()
-        risk_data['contract_risk'] = (risk_data['total_contract_value'] / max_contract_value * 100) if max_contract_value > 0 else 0
-        
-        # Contract expiry risk
-        if 'earliest_expiry' in risk_data.columns and risk_data['earliest_expiry'].notna().any():
-            risk_data['earliest_expiry'] = pd.to_datetime(risk_data['earliest_expiry'], errors='coerce')
-            today = pd.Timestamp.now()
-            risk_data['days_to_expiry'] = (risk_data['earliest_expiry'] - today).dt.days
-            # Closer to expiry = higher risk
-            risk_data['expiry_risk'] = ((365 - risk_data['days_to_expiry']) / 365 * 100).clip(lower=0, upper=100)
-            risk_data['expiry_risk'] = risk_data['expiry_risk'].fillna(50)
-        else:
-            risk_data['expiry_risk'] = 50
-    else:
-        risk_data['contract_risk'] = 0
-        risk_data['expiry_risk'] = 50
-    
-    # 6. Compliance Risk Score (0-100)
-    if 'certification_status' in risk_data.columns:
-        # Suppliers without certifications have higher compliance risk
-        risk_data['compliance_risk'] = risk_data['certification_status'].apply(
-            lambda x: 80 if pd.isna(x) or x == 'No' else 20 if x == 'Yes' else 50
-        )
-    else:
-        risk_data['compliance_risk'] = 50  # Default moderate risk
-    
-    # 7. Diversity Risk Score (0-100)
-    if 'diversity_flag' in risk_data.columns:
-        # Non-diverse suppliers might have higher risk
-        risk_data['diversity_risk'] = risk_data['diversity_flag'].apply(
-            lambda x: 30 if pd.isna(x) or x == 'No' else 10 if x == 'Yes' else 20
-        )
-    else:
-        risk_data['diversity_risk'] = 30  # Default moderate risk
-    
-    # Calculate weighted total risk score (0-100)
-    risk_weights = {
-        'financial_risk': 0.20,
-        'concentration_risk': 0.25,
-        'geographic_risk': 0.15,
-        'performance_risk': 0.20,
-        'defect_risk': 0.10,
-        'contract_risk': 0.05,
-        'expiry_risk': 0.02,
-        'compliance_risk': 0.02,
-        'diversity_risk': 0.01
-    }
-    
-    risk_data['total_risk_score'] = sum(
-        risk_data[col] * weight for col, weight in risk_weights.items()
-    )
-    
-    # Categorize risk levels
-    risk_data['risk_level'] = pd.cut(
-        risk_data['total_risk_score'],
-        bins=[0, 30, 60, 100],
-        labels=['Low', 'Medium', 'High'],
-        include_lowest=True
-    )
-    
-    # Sort by risk score (highest risk first)
-    risk_data = risk_data.sort_values('total_risk_score', ascending=False)
-    
-    # Calculate summary statistics
-    high_risk_suppliers = len(risk_data[risk_data['total_risk_score'] > 60])
-    medium_risk_suppliers = len(risk_data[(risk_data['total_risk_score'] > 30) & (risk_data['total_risk_score'] <= 60)])
-    low_risk_suppliers = len(risk_data[risk_data['total_risk_score'] <= 30])
-    
-    risk_msg = f"{high_risk_suppliers} high-risk, {medium_risk_suppliers} medium-risk, {low_risk_suppliers} low-risk suppliers identified"
+    # Components are computed once as supplier-aligned vectors; weights default to DEFAULT_RISK_WEIGHTS
+    engine = get_supplier_risk_engine(suppliers, purchase_orders, deliveries, invoices, contracts)
+    risk_data = engine.to_frame(weights)
+    risk_msg = engine.summary_message(risk_data['total_risk_score'].to_numpy())
     
     return risk_data, risk_msg
 
@@ -1047,12 +833,9 @@ def calculate_industry_procurement_trends(purchase_orders):
     if purchase_orders.empty:
         return pd.DataFrame(), "No data available"
     
-    # Convert order date to datetime
-    purchase_orders['order_date'] = pd.to_datetime(purchase_orders['order_date'])
-    
     # Group by month and calculate trends
-    purchase_orders['month'] = purchase_orders['order_date'].dt.to_period('M')
-    trends = purchase_orders.groupby('month').agg({
+    order_month = pd.to_datetime(purchase_orders['order_date']).dt.to_period('M').rename('month')
+    trends = purchase_orders.groupby(order_month).agg({
         'quantity': 'sum',
         'unit_price': 'mean'
     }).reset_index()
@@ -1130,6 +913,9 @@ def calculate_contract_renewal_analysis(contracts):
     if contracts.empty:
         return pd.DataFrame(), "No data available"
     
+    # Work on a copy so the caller's (cached) contracts table is left untouched
+    contracts = contracts.copy()
+    
     # Convert dates to datetime
     contracts['end_date'] = pd.to_datetime(contracts['end_date'])
     
@@ -1178,6 +964,9 @@ def calculate_contract_risk_assessment(contracts):
     if contracts.empty:
         return pd.DataFrame(), "No data available"
     
+    # Work on a copy so the caller's (cached) contracts table is left untouched
+    contracts = contracts.copy()
+    
     # Calculate risk factors
     contracts['volume_risk'] = contracts['volume_commitment'] / contracts['contract_value']
     contracts['dispute_risk'] = contracts['dispute_count'] / contracts['contract_value'] * 1000
@@ -1317,4 +1106,13 @@ def calculate_sustainable_supplier_development(suppliers):
         'count': [high_esg_suppliers, medium_esg_suppliers, low_esg_suppliers]
     })
     
-    return development_data, development_msg 
\ No newline at end of file
+    return development_data, development_msg
+
+# Memoize every calculate_* function on its input fingerprints (shared metric cache at the repo root)
+try:
+    from metric_cache import cache_calculators, cached_metric
+    cache_calculators(globals())
+    get_supplier_risk_engine = cached_metric(get_supplier_risk_engine)
+    get_spend_cube = cached_metric(get_spend_cube)
+except ImportError:
+    pass
@@ -0,0 +1,345 @@
+import copy
+import weakref
+import numpy as np
+import pandas as pd
+
+# Streaming quantiles are within this relative error of the exact nearest-rank (lower) quantile
+SKETCH_RELATIVE_ACCURACY = 0.01
+_GAMMA = (1 + SKETCH_RELATIVE_ACCURACY) / (1 - SKETCH_RELATIVE_ACCURACY)
+_LOG_GAMMA = np.log(_GAMMA)
+
+# Log buckets per key in the sketch; bucket 0 holds zero and negative prices
+_BUCKET_OFFSET = 2048
+_BUCKET_SPAN = 4096
+
+PRICE_STAT_COLUMNS = ['count', 'mean', 'std', 'min', 'max', 'total_quantity', 'total_spend', 'supplier_count']
+
+def quantile_column(q):
+    """Column name of a quantile in the stats frames, e.g. 0.5 -> 'p50'."""
+    return f"p{q * 100:g}"
+
+def _bucket(prices):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        buckets = np.ceil(np.log(prices) / _LOG_GAMMA) + _BUCKET_OFFSET
+    return np.where(prices > 0, np.clip(buckets, 1, _BUCKET_SPAN - 1), 0).astype(np.int64)
+
+def _bucket_value(buckets):
+    """Representative price of each bucket (within SKETCH_RELATIVE_ACCURACY of every price in it)."""
+    return np.where(buckets > 0, 2 * _GAMMA ** (buckets - _BUCKET_OFFSET).astype(float) / (_GAMMA + 1), 0.0)
+
+def _pad(values, n, fill):
+    return np.concatenate([values, np.full(n - len(values), fill)]) if len(values) < n else values
+
+def _key_values(values):
+    """Key column with categoricals (from the ingest schema) decoded, so keys match across batches."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.astype(values.cat.categories.dtype)
+    return values
+
+def _empty_level(keys):
+    return {
+        'keys': keys,
+        'count': np.zeros(0), 'mean': np.zeros(0), 'm2': np.zeros(0),
+        'min': np.zeros(0), 'max': np.zeros(0), 'quantity': np.zeros(0), 'spend': np.zeros(0),
+        'sketch_keys': np.zeros(0, dtype=np.int64), 'sketch_counts': np.zeros(0)
+    }
+
+def _sorted_group_quantiles(sorted_groups, sorted_values, n_groups, quantiles):
+    """Linearly interpolated quantiles per group from values sorted by (group, value)."""
+    starts = np.searchsorted(sorted_groups, np.arange(n_groups), side='left')
+    counts = np.searchsorted(sorted_groups, np.arange(n_groups), side='right') - starts
+    result = {}
+    for q in quantiles:
+        position = q * np.maximum(counts - 1, 0)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        has = counts > 0
+        low_values = np.full(n_groups, np.nan)
+        high_values = np.full(n_groups, np.nan)
+        low_values[has] = sorted_values[starts[has] + lower[has]]
+        high_values[has] = sorted_values[starts[has] + upper[has]]
+        result[q] = low_values + (high_values - low_values) * (position - lower)
+    return result
+
+class PriceStatsIndex:
+    """
+    Unit price statistics of purchase orders per item and per item/supplier.
+
+    Count, mean, sum of squared deviations, min, max, quantity and spend are
+    kept per key together with a log-bucket quantile sketch, and merged with
+    each appended batch (with_records) without rescanning earlier rows.
+    Streaming quantiles come from the sketch; exact quantiles sort the
+    retained prices on first request. Instances are never modified in place.
+    """
+
+    def __init__(self, purchase_orders=None):
+        self.levels = {
+            'item': _empty_level(pd.Index([], name='item_id')),
+            'item_supplier': _empty_level(pd.MultiIndex.from_arrays([[], []], names=['item_id', 'supplier_id']))
+        }
+        # (item codes, item/supplier codes, prices) of every priced row, one entry per batch
+        self.values = []
+        self.n_orders = 0
+        self.integer_quantity = True
+        self._price_order = None
+        if purchase_orders is not None and not purchase_orders.empty:
+            self._fold(purchase_orders)
+
+    def with_records(self, purchase_orders):
+        """A new index that also covers the given (newly appended) purchase orders."""
+        index = copy.copy(self)
+        index.levels = dict(self.levels)
+        index.values = list(self.values)
+        index._price_order = None
+        if purchase_orders is not None and not purchase_orders.empty:
+            index._fold(purchase_orders)
+        return index
+
+    @property
+    def nbytes(self):
+        arrays = [value for level in self.levels.values() for value in level.values() if isinstance(value, np.ndarray)]
+        arrays += [array for batch in self.values for array in batch]
+        return sum(array.nbytes for array in arrays)
+
+    def _encode(self, name, keys, valid):
+        """Codes of keys in a level (-1 where not valid), registering keys not seen before."""
+        level = self.levels[name]
+        known = level['keys']
+        codes = np.full(len(keys), -1, dtype=np.int64)
+        if not valid.any():
+            return codes
+        codes[valid] = known.get_indexer(keys[valid])
+        unseen = valid & (codes < 0)
+        if unseen.any():
+            known = known.append(keys[unseen].unique())
+            codes[unseen] = known.get_indexer(keys[unseen])
+            self.levels[name] = {**level, 'keys': known}
+        return codes
+
+    def _fold(self, purchase_orders):
+        n_rows = len(purchase_orders)
+        if 'item_id' not in purchase_orders.columns:
+            self.n_orders += n_rows
+            return
+        price = pd.to_numeric(purchase_orders['unit_price'], errors='coerce').to_numpy(dtype=float) \
+            if 'unit_price' in purchase_orders.columns else np.full(n_rows, np.nan)
+        if 'quantity' in purchase_orders.columns:
+            quantity = pd.to_numeric(purchase_orders['quantity'], errors='coerce').to_numpy(dtype=float)
+            self.integer_quantity = self.integer_quantity and pd.api.types.is_integer_dtype(purchase_orders['quantity'])
+        else:
+            quantity = np.full(n_rows, np.nan)
+        spend = np.nan_to_num(quantity * price)
+        quantity = np.nan_to_num(quantity)
+
+        item_ids = _key_values(purchase_orders['item_id'])
+        item_valid = item_ids.notna().to_numpy()
+        item_codes = self._encode('item', pd.Index(item_ids), item_valid)
+        if 'supplier_id' in purchase_orders.columns:
+            supplier_ids = _key_values(purchase_orders['supplier_id'])
+            pair_valid = item_valid & supplier_ids.notna().to_numpy()
+            pairs = pd.MultiIndex.from_arrays([item_ids, supplier_ids], names=['item_id', 'supplier_id'])
+            pair_codes = self._encode('item_supplier', pairs, pair_valid)
+        else:
+            pair_codes = np.full(n_rows, -1, dtype=np.int64)
+
+        self._fold_level('item', item_codes, price, quantity, spend)
+        self._fold_level('item_supplier', pair_codes, price, quantity, spend)
+        priced = (item_codes >= 0) & ~np.isnan(price)
+        self.values.append((item_codes[priced], pair_codes[priced], price[priced]))
+        self.n_orders += n_rows
+
+    def _fold_level(self, name, codes, price, quantity, spend):
+        """Merge a batch's per-key moments, totals and sketch into a level (Chan et al. pairwise update)."""
+        level = self.levels[name]
+        n_keys = len(level['keys'])
+        keyed = codes >= 0
+        batch_codes, batch_price = codes[keyed], price[keyed]
+        priced = ~np.isnan(batch_price)
+        price_codes, prices = batch_codes[priced], batch_price[priced]
+
+        count_b = np.bincount(price_codes, minlength=n_keys).astype(float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_b = np.where(count_b > 0, np.bincount(price_codes, weights=prices, minlength=n_keys) / count_b, 0.0)
+        m2_b = np.bincount(price_codes, weights=(prices - mean_b[price_codes]) ** 2, minlength=n_keys)
+        min_b = np.full(n_keys, np.inf)
+        max_b = np.full(n_keys, -np.inf)
+        np.minimum.at(min_b, price_codes, prices)
+        np.maximum.at(max_b, price_codes, prices)
+
+        count_a = _pad(level['count'], n_keys, 0.0)
+        mean_a = _pad(level['mean'], n_keys, 0.0)
+        count = count_a + count_b
+        delta = mean_b - mean_a
+        with np.errstate(divide='ignore', invalid='ignore'):
+            share = np.where(count > 0, count_b / count, 0.0)
+        sketch_keys = np.concatenate([level['sketch_keys'], price_codes * _BUCKET_SPAN + _bucket(prices)])
+        sketch_counts = np.concatenate([level['sketch_counts'], np.ones(len(prices))])
+        sketch_keys, inverse = np.unique(sketch_keys, return_inverse=True)
+
+        self.levels[name] = {
+            'keys': level['keys'],
+            'count': count,
+            'mean': mean_a + delta * share,
+            'm2': _pad(level['m2'], n_keys, 0.0) + m2_b + delta ** 2 * count_a * share,
+            'min': np.minimum(_pad(level['min'], n_keys, np.inf), min_b),
+            'max': np.maximum(_pad(level['max'], n_keys, -np.inf), max_b),
+            'quantity': _pad(level['quantity'], n_keys, 0.0) + np.bincount(batch_codes, weights=quantity[keyed], minlength=n_keys),
+            'spend': _pad(level['spend'], n_keys, 0.0) + np.bincount(batch_codes, weights=spend[keyed], minlength=n_keys),
+            'sketch_keys': sketch_keys,
+            'sketch_counts': np.bincount(inverse.ravel(), weights=sketch_counts, minlength=len(sketch_keys))
+        }
+
+    def _exact_quantiles(self, name, groups, n_groups, quantiles):
+        if self._price_order is None:
+            prices = np.concatenate([batch[2] for batch in self.values]) if self.values else np.zeros(0)
+            self._price_order = (np.argsort(prices, kind='stable'), prices)
+        order, prices = self._price_order
+        position = 0 if name == 'item' else 1
+        codes = np.concatenate([batch[position] for batch in self.values])[order] if self.values else np.zeros(0, dtype=np.int64)
+        valid = codes >= 0
+        row_groups = np.where(valid, groups[np.maximum(codes, 0)], -1)
+        keep = row_groups >= 0
+        row_groups, row_prices = row_groups[keep], prices[order][keep]
+        # Rows are already in price order; a stable sort by group keeps them so within each group
+        by_group = np.argsort(row_groups, kind='stable')
+        return _sorted_group_quantiles(row_groups[by_group], row_prices[by_group], n_groups, quantiles)
+
+    def _sketch_quantiles(self, name, groups, n_groups, quantiles):
+        level = self.levels[name]
+        key_codes = level['sketch_keys'] // _BUCKET_SPAN
+        buckets = level['sketch_keys'] % _BUCKET_SPAN
+        entry_groups = groups[key_codes] if len(key_codes) else np.zeros(0, dtype=np.int64)
+        keep = entry_groups >= 0
+        combined, inverse = np.unique(entry_groups[keep] * _BUCKET_SPAN + buckets[keep], return_inverse=True)
+        counts = np.bincount(inverse.ravel(), weights=level['sketch_counts'][keep], minlength=len(combined))
+        combined_groups = combined // _BUCKET_SPAN
+        values = _bucket_value(combined % _BUCKET_SPAN)
+
+        cumulative = np.cumsum(counts)
+        totals = np.bincount(combined_groups, weights=counts, minlength=n_groups)
+        before = np.cumsum(totals) - totals
+        result = {}
+        for q in quantiles:
+            rank = np.floor(q * np.maximum(totals - 1, 0))
+            position = np.searchsorted(cumulative, before + rank, side='right')
+            estimate = np.full(n_groups, np.nan)
+            has = totals > 0
+            estimate[has] = values[position[has]]
+            result[q] = estimate
+        return result
+
+    def _supplier_counts(self, groups, n_groups):
+        """Distinct suppliers per group of items."""
+        pairs = self.levels['item_supplier']['keys']
+        if len(pairs) == 0:
+            return np.zeros(n_groups)
+        item_codes = self.levels['item']['keys'].get_indexer(pairs.get_level_values(0))
+        pair_groups = groups[item_codes]
+        supplier_codes = pd.factorize(pairs.get_level_values(1))[0]
+        keep = pair_groups >= 0
+        distinct = np.unique(np.column_stack([pair_groups[keep], supplier_codes[keep]]), axis=0)
+        return np.bincount(distinct[:, 0], minlength=n_groups).astype(float)
+
+    def _frame(self, name, groups, group_index, quantiles, exact):
+        """Statistics of a level rolled up into groups (one row per group_index entry)."""
+        level = self.levels[name]
+        n_groups = len(group_index)
+        valid = groups >= 0
+        g = groups[valid]
+        count_k, mean_k = level['count'][valid], level['mean'][valid]
+
+        count = np.bincount(g, weights=count_k, minlength=n_groups)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.bincount(g, weights=count_k * mean_k, minlength=n_groups) / count
+            m2 = np.bincount(g, weights=level['m2'][valid] + count_k * (mean_k - np.nan_to_num(mean)[g]) ** 2, minlength=n_groups)
+            std = np.where(count > 1, np.sqrt(np.maximum(m2, 0) / (count - 1)), np.nan)
+        minimum = np.full(n_groups, np.inf)
+        maximum = np.full(n_groups, -np.inf)
+        np.minimum.at(minimum, g, level['min'][valid])
+        np.maximum.at(maximum, g, level['max'][valid])
+        quantity = np.bincount(g, weights=level['quantity'][valid], minlength=n_groups)
+
+        frame = group_index.to_frame(index=False)
+        frame['count'] = count.astype(np.int64)
+        frame['mean'] = mean
+        frame['std'] = std
+        frame['min'] = np.where(count > 0, minimum, np.nan)
+        frame['max'] = np.where(count > 0, maximum, np.nan)
+        frame['total_quantity'] = quantity.astype(np.int64) if self.integer_quantity else quantity
+        frame['total_spend'] = np.bincount(g, weights=level['spend'][valid], minlength=n_groups)
+        frame['supplier_count'] = self._supplier_counts(groups, n_groups).astype(np.int64) if name == 'item' else 1
+
+        if quantiles:
+            estimates = (self._exact_quantiles if exact else self._sketch_quantiles)(name, groups, n_groups, quantiles)
+            for q in quantiles:
+                frame[quantile_column(q)] = estimates[q]
+        return frame
+
+    def item_stats(self, quantiles=(), exact=True, labels=None):
+        """
+        Price statistics per item, sorted by item_id.
+
+        labels (a Series from item_id to e.g. item_name) groups the items by
+        label instead; items without a label are left out. quantiles adds a
+        column per quantile (see quantile_column), exact or from the sketch.
+        """
+        keys = self.levels['item']['keys']
+        if labels is None:
+            order = keys.argsort()
+            groups = np.empty(len(keys), dtype=np.int64)
+            groups[order] = np.arange(len(keys))
+            return self._frame('item', groups, keys[order], quantiles, exact)
+        groups, group_labels = pd.factorize(labels.reindex(keys), sort=True)
+        group_index = pd.Index(group_labels, name=labels.name or 'label')
+        return self._frame('item', groups.astype(np.int64), group_index, quantiles, exact)
+
+    def item_supplier_stats(self, quantiles=(), exact=True):
+        """Price statistics per (item_id, supplier_id), sorted by item then supplier."""
+        keys = self.levels['item_supplier']['keys']
+        order = keys.argsort() if len(keys) else np.zeros(0, dtype=np.int64)
+        groups = np.empty(len(keys), dtype=np.int64)
+        groups[order] = np.arange(len(keys))
+        return self._frame('item_supplier', groups, keys[order], quantiles, exact)
+
+def item_lookup(items_data, column):
+    """item_id -> column of the items table (first row per item), for item_stats labels or attributes."""
+    if items_data is None or items_data.empty or 'item_id' not in items_data.columns or column not in items_data.columns:
+        return pd.Series(dtype=object, name=column)
+    return items_data.drop_duplicates('item_id').set_index('item_id')[column]
+
+# id(purchase order table) -> (weak reference, row count, index) of tables whose index was seeded
+_seeded_indexes = {}
+
+def _forget_seeded_index(key, ref):
+    entry = _seeded_indexes.get(key)
+    if entry is not None and entry[0] is ref:
+        del _seeded_indexes[key]
+
+def build_price_stats_index(purchase_orders):
+    """Build the price statistics index of a purchase order table"""
+    return PriceStatsIndex(purchase_orders)
+
+def get_price_stats_index(purchase_orders):
+    """The price statistics index of a purchase order table: the seeded one for this table object, else built (and cached) once."""
+    seeded = _seeded_indexes.get(id(purchase_orders))
+    if seeded is not None and seeded[0]() is purchase_orders and seeded[1] == len(purchase_orders):
+        return seeded[2]
+    return build_price_stats_index(purchase_orders)
+
+def seed_price_stats_index(purchase_orders, index):
+    """
+    Make index the price statistics index of purchase_orders (e.g. after folding appended rows into it).
+
+    The index is kept against the table object itself, so seeding it does not
+    hash the table; it is dropped when the table is.
+    """
+    key = id(purchase_orders)
+    ref = weakref.ref(purchase_orders, lambda ref, key=key: _forget_seeded_index(key, ref))
+    _seeded_indexes[key] = (ref, len(purchase_orders), index)
+
+# Build each purchase order table's index once (shared metric cache at the repo root)
+try:
+    from metric_cache import cached_metric
+    build_price_stats_index = cached_metric(build_price_stats_index)
+except ImportError:
+    pass
@@ -3,7 +3,6 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from datetime import datetime
 import io
 import base64
@@ -15,15 +14,54 @@ import plotly.express as px
 import plotly.graph_objects as go
 import plotly.io as pio
 
-# Machine Learning imports
-from sklearn.ensemble import IsolationForest, RandomForestRegressor
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
 import time
 
 # Import metric calculation functions
 from metrics_calculator import *
 
+# Supplier risk components for the what-if weighting panel
+from supplier_risk_engine import RISK_COMPONENTS, DEFAULT_RISK_WEIGHTS
+
+# Year/quarter partition index over order dates (shared with the HR app)
+try:
+    from date_partitions import DatePartitionIndex, PO_FILTER_MIN_ROWS
+except ImportError:
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from date_partitions import DatePartitionIndex, PO_FILTER_MIN_ROWS
+
+# Background streaming export of loaded tables (Excel or zipped Parquet/CSV)
+try:
+    from data_export import show_export_panel
+except ImportError:
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from data_export import show_export_panel
+
+# Running aggregates for incremental (append-only) data loads
+from incremental_aggregates import ProcurementAggregates, new_records
+from price_stats import get_price_stats_index, seed_price_stats_index, item_lookup, quantile_column, SKETCH_RELATIVE_ACCURACY
+
+# Ingest-time schema (dates, int32 numerics, categoricals) built from COLUMN_MAPPINGS
+from ingest_schema import SESSION_TABLE_KEYS, compact_table, align_categories, format_compaction_report
+
+# Single-pass workbook reader and shared dataset store (available when running inside the integrated dashboard)
+try:
+    from workbook_ingest import read_workbook, read_table_file
+    from dataset_store import load_workbook_tables
+except ImportError:
+    def read_workbook(source, sheet_names=None, schemas=None):
+        return pd.read_excel(source, sheet_name=sheet_names), {}
+    def load_workbook_tables(department, source, sheet_names=None, schemas=None):
+        excel_data = pd.read_excel(source, sheet_name=None)
+        return {sheet: df for sheet, df in excel_data.items() if sheet_names is None or sheet in sheet_names}
+    def read_table_file(source, schema=None):
+        if str(getattr(source, 'name', source)).lower().endswith('.csv'):
+            return pd.read_csv(source), 0.0
+        return pd.read_excel(source), 0.0
+
 # Import advanced cost metrics functions
 from advanced_cost_metrics import (
     calculate_benchmark_price_efficiency, calculate_negotiation_opportunity_index,
@@ -32,11 +70,13 @@ from advanced_cost_metrics import (
     calculate_contract_leakage
 )
 
-# Import auto insights functionality
-from auto_insights import ProcurementInsights, display_insights_section
+# Import auto insights functionality (Streamlit-free generator plus its rendering)
+from auto_insights import ProcurementInsights
+from insights_display import display_insights_section
 
-# Import risk analyzer functionality
-from risk_analyzer import ProcurementRiskAnalyzer, display_risk_dashboard
+# Import risk analyzer functionality (Streamlit-free report plus its rendering)
+from risk_analyzer import calculate_comprehensive_risk_report
+from risk_dashboard import display_risk_dashboard
 
 # Import predictive analytics functionality
 from procurement_predictive_analytics import display_procurement_predictive_analytics_dashboard, ProcurementPredictiveAnalytics
@@ -215,52 +255,38 @@ def get_unit_price_column(merged_data):
     """Helper function to get the correct unit price column name after merge operations."""
     return get_column_name(merged_data, 'unit_price')
 
+def get_po_partitions():
+    """Date-typed purchase orders partitioned by year and quarter, rebuilt only when the PO table is replaced"""
+    po_df = st.session_state.purchase_orders
+    if po_df.empty or 'order_date' not in po_df.columns:
+        return None
+    
+    partitions = st.session_state.get('po_partitions')
+    if partitions is None or not partitions.is_current(po_df):
+        partitions = DatePartitionIndex(po_df, 'order_date')
+        st.session_state.po_partitions = partitions
+    return partitions
+
 def get_filtered_po_df():
     """Get filtered purchase order data with robust fallback logic"""
-    po_df = st.session_state.purchase_orders.copy()
+    po_df = st.session_state.purchase_orders
     
     # If no data, return empty DataFrame
     if po_df.empty:
-        return po_df
+        return po_df.copy()
     
-    # Store original data for fallback
-    original_po_df = po_df.copy()
+    partitions = get_po_partitions()
     
-    if 'order_date' in po_df.columns:
-        po_df['order_date'] = pd.to_datetime(po_df['order_date'], errors='coerce')
-        po_df = po_df.dropna(subset=['order_date'])
-        
-        # If no valid dates, return original data
-        if po_df.empty:
-            return original_po_df
-        
-        po_df['year'] = po_df['order_date'].dt.year
-        po_df['quarter'] = po_df['order_date'].dt.quarter
-        
-        year = st.session_state.get('selected_year')
-        quarter = st.session_state.get('selected_quarter')
-        
-        # Apply year filter with safety check
-        if year is not None:
-            year_filtered = po_df[po_df['year'] == year]
-            if len(year_filtered) >= 5:  # Only apply if we have enough data
-                po_df = year_filtered
-        
-        # Apply quarter filter with safety check
-        if quarter and quarter != 'All':
-            try:
-                quarter_num = int(quarter[1])
-                quarter_filtered = po_df[po_df['quarter'] == quarter_num]
-                if len(quarter_filtered) >= 5:  # Only apply if we have enough data
-                    po_df = quarter_filtered
-            except (ValueError, IndexError):
-                pass
-    
-    # Final safety check - if we somehow ended up with no data, return original
-    if po_df.empty:
-        return original_po_df
+    # No order dates, or no valid ones: return the original data
+    if partitions is None or partitions.table.empty:
+        return po_df.copy()
     
-    return po_df
+    # Year and quarter filters only apply if they keep at least PO_FILTER_MIN_ROWS orders
+    return partitions.select(
+        st.session_state.get('selected_year'),
+        st.session_state.get('selected_quarter'),
+        min_rows=PO_FILTER_MIN_ROWS
+    )
 
 def check_data_quality(po_df, items_data, suppliers):
     """Check data quality and provide warnings if issues are found"""
@@ -773,8 +799,28 @@ def create_template_for_download():
     output.seek(0)
     return output
 
+def get_export_tables():
+    """Procurement tables included in data exports, keyed by sheet name, with a record-count summary"""
+    datasets = {
+        'suppliers': st.session_state.suppliers,
+        'items': st.session_state.items_data,
+        'purchase_orders': st.session_state.purchase_orders,
+        'contracts': st.session_state.contracts,
+        'deliveries': st.session_state.deliveries,
+        'invoices': st.session_state.invoices,
+        'budgets': st.session_state.budgets,
+        'rfqs': st.session_state.rfqs
+    }
+    tables = {name: df for name, df in datasets.items() if not df.empty}
+    tables['Summary'] = pd.DataFrame({
+        'Dataset': list(datasets),
+        'Records': [len(df) for df in datasets.values()],
+        'Status': ['✅ Loaded' if not df.empty else '❌ Empty' for df in datasets.values()]
+    })
+    return tables
+
 def export_data_to_excel():
-    """Export all loaded data to Excel"""
+    """Export all loaded data; the file is written in the background and offered for download when ready"""
     if (st.session_state.purchase_orders.empty and st.session_state.suppliers.empty and 
         st.session_state.items_data.empty and st.session_state.deliveries.empty and 
         st.session_state.invoices.empty and st.session_state.contracts.empty and 
@@ -782,83 +828,8 @@ def export_data_to_excel():
         st.warning("No data to export. Please load data first.")
         return None
     
-    # Create Excel file in memory
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        # Write each dataset to a separate sheet
-        if not st.session_state.suppliers.empty:
-            st.session_state.suppliers.to_excel(writer, sheet_name='suppliers', index=False)
-        
-        if not st.session_state.items_data.empty:
-            st.session_state.items_data.to_excel(writer, sheet_name='items', index=False)
-        
-        if not st.session_state.purchase_orders.empty:
-            st.session_state.purchase_orders.to_excel(writer, sheet_name='purchase_orders', index=False)
-        
-        if not st.session_state.contracts.empty:
-            st.session_state.contracts.to_excel(writer, sheet_name='contracts', index=False)
-        
-        if not st.session_state.deliveries.empty:
-            st.session_state.deliveries.to_excel(writer, sheet_name='deliveries', index=False)
-        
-        if not st.session_state.invoices.empty:
-            st.session_state.invoices.to_excel(writer, sheet_name='invoices', index=False)
-        
-        if not st.session_state.budgets.empty:
-            st.session_state.budgets.to_excel(writer, sheet_name='budgets', index=False)
-        
-        if not st.session_state.rfqs.empty:
-            st.session_state.rfqs.to_excel(writer, sheet_name='rfqs', index=False)
-        
-        # Get the workbook for formatting
-        workbook = writer.book
-        
-        # Add summary sheet
-        summary_data = {
-            'Dataset': ['suppliers', 'items', 'purchase_orders', 'contracts', 'deliveries', 'invoices', 'budgets', 'rfqs'],
-            'Records': [
-                len(st.session_state.suppliers),
-                len(st.session_state.items_data),
-                len(st.session_state.purchase_orders),
-                len(st.session_state.contracts),
-                len(st.session_state.deliveries),
-                len(st.session_state.invoices),
-                len(st.session_state.budgets),
-                len(st.session_state.rfqs)
-            ],
-            'Status': [
-                '✅ Loaded' if not st.session_state.suppliers.empty else '❌ Empty',
-                '✅ Loaded' if not st.session_state.items_data.empty else '❌ Empty',
-                '✅ Loaded' if not st.session_state.purchase_orders.empty else '❌ Empty',
-                '✅ Loaded' if not st.session_state.contracts.empty else '❌ Empty',
-                '✅ Loaded' if not st.session_state.deliveries.empty else '❌ Empty',
-                '✅ Loaded' if not st.session_state.invoices.empty else '❌ Empty',
-                '✅ Loaded' if not st.session_state.budgets.empty else '❌ Empty',
-                '✅ Loaded' if not st.session_state.rfqs.empty else '❌ Empty'
-            ]
-        }
-        
-        summary_df = pd.DataFrame(summary_data)
-        summary_df.to_excel(writer, sheet_name='Summary', index=False)
-        
-        # Format the summary sheet
-        summary_sheet = writer.sheets['Summary']
-        summary_sheet.set_column('A:C', 20)
-        
-        # Add a title
-        title_format = workbook.add_format({
-            'bold': True,
-            'font_size': 14,
-            'bg_color': '#667eea',
-            'font_color': 'white',
-            'align': 'center'
-        })
-        
-        summary_sheet.write('A1', 'Procurement Analytics Data Export', title_format)
-        summary_sheet.merge_range('A1:C1', 'Procurement Analytics Data Export', title_format)
-    
-    output.seek(0)
-    return output
+    return show_export_panel(get_export_tables(), key='pro_export', file_prefix='procurement_analytics_export',
+                             sheet_titles={'Summary': 'Procurement Analytics Data Export'})
 
 # New PDF Report Generation System - Main Function
 # PDF generation function removed as requested
@@ -3233,13 +3204,9 @@ def main():
 
         
         # --- Year and Quarter Filter ---
-        po_df = st.session_state.purchase_orders.copy()
-        if not po_df.empty and 'order_date' in po_df.columns:
-            po_df['order_date'] = pd.to_datetime(po_df['order_date'], errors='coerce')
-            po_df = po_df.dropna(subset=['order_date'])
-            po_df['year'] = po_df['order_date'].dt.year
-            po_df['quarter'] = po_df['order_date'].dt.quarter
-            years = sorted(po_df['year'].dropna().unique())
+        po_partitions = get_po_partitions()
+        if po_partitions is not None:
+            years = po_partitions.years
             quarters = ['All', 'Q1', 'Q2', 'Q3', 'Q4']
             
             # Store default values in session state with validation
@@ -3312,10 +3279,11 @@ def show_home():
     
     # Quick Stats Dashboard
     if not st.session_state.purchase_orders.empty:
-        total_spend = st.session_state.purchase_orders['quantity'].mul(st.session_state.purchase_orders['unit_price']).sum()
-        total_orders = len(st.session_state.purchase_orders)
-        unique_suppliers = st.session_state.purchase_orders['supplier_id'].nunique()
-        avg_order_value = total_spend / total_orders if total_orders > 0 else 0
+        spend_summary = get_procurement_aggregates().spend_summary()
+        total_spend = spend_summary['total_spend']
+        total_orders = spend_summary['total_orders']
+        unique_suppliers = spend_summary['unique_suppliers']
+        avg_order_value = spend_summary['avg_order_value']
         
         st.markdown("### 📊 Quick Overview")
         
@@ -3444,6 +3412,60 @@ def show_home():
     # Add separator between template section and manual entry
 
 
+def get_procurement_aggregates():
+    """Running PO, delivery and invoice aggregates; rebuilt only when a table was replaced rather than appended to"""
+    tables = {name: st.session_state.get(name, pd.DataFrame()) for name in ('purchase_orders', 'deliveries', 'invoices')}
+    aggregates = st.session_state.get('procurement_aggregates')
+    if aggregates is None or not all(aggregates.is_current(name, table) for name, table in tables.items()):
+        aggregates = ProcurementAggregates.from_tables(**tables)
+        for name, table in tables.items():
+            aggregates.track(name, table)
+        st.session_state.procurement_aggregates = aggregates
+    return aggregates
+
+def append_procurement_records(table_name, delta):
+    """Append new rows to a session table and fold only those rows into the running aggregates"""
+    aggregates = get_procurement_aggregates()
+    existing = st.session_state[table_name]
+    delta = new_records(existing, delta, table_name)
+    if delta.empty:
+        return 0
+    
+    # Look the price index up on the session table itself; align_categories below returns copies
+    price_index = get_price_stats_index(existing) if table_name == 'purchase_orders' and not existing.empty else None
+    if existing.empty:
+        combined = compact_table(delta.reset_index(drop=True), table_name)[0]
+    else:
+        existing, delta = align_categories(existing, delta)
+        combined = pd.concat([existing, delta], ignore_index=True)
+    aggregates.add(table_name, delta)
+    aggregates.track(table_name, combined)
+    if price_index is not None:
+        # Fold the new orders into the price statistics index instead of rebuilding it from every order
+        seed_price_stats_index(combined, price_index.with_records(delta))
+    st.session_state[table_name] = combined
+    return len(delta)
+
+def compact_session_tables(table_names):
+    """Apply the ingest schema to freshly loaded session tables and report the memory saved per table"""
+    reports = []
+    for table_name in table_names:
+        session_key = SESSION_TABLE_KEYS[table_name]
+        table = st.session_state.get(session_key)
+        if table is None or table.empty:
+            continue
+        compacted, report = compact_table(table, table_name)
+        st.session_state[session_key] = compacted
+        reports.append(report)
+    
+    if reports:
+        st.session_state.compaction_reports = reports
+        saved = sum(report['bytes_saved'] for report in reports)
+        with st.expander(f"🗜️ Memory Compaction: {saved / (1024 * 1024):.2f} MB saved", expanded=False):
+            st.caption("Dates are parsed once at load time, integer columns are stored as int32 and repetitive text columns as categories.")
+            st.dataframe(format_compaction_report(reports), use_container_width=True, hide_index=True)
+    return reports
+
 def show_data_input():
     st.markdown("""
     <div class="welcome-section">
@@ -3474,9 +3496,6 @@ def show_data_input():
         
         if uploaded_complete_dataset is not None:
             try:
-                # Read all sheets from the Excel file
-                excel_file = pd.ExcelFile(uploaded_complete_dataset)
-                
                 # Dictionary to store loaded data
                 loaded_data = {}
                 
@@ -3492,10 +3511,14 @@ def show_data_input():
                     'rfqs': 'rfqs'
                 }
                 
+                # Read all sheets once; an unchanged workbook is served from the dataset store
+                # (which is also where batch_precompute.py reads it from)
+                excel_data = load_workbook_tables('procurement', uploaded_complete_dataset, list(expected_sheets.keys()))
+                
                 # Load each sheet if it exists
                 for sheet_name, session_key in expected_sheets.items():
-                    if sheet_name in excel_file.sheet_names:
-                        loaded_data[session_key] = pd.read_excel(uploaded_complete_dataset, sheet_name=sheet_name)
+                    if sheet_name in excel_data:
+                        loaded_data[session_key] = excel_data[sheet_name]
                         st.markdown(f"""
                         <div style="background: linear-gradient(135deg, #22c55e 0%, #16a34a 100%); color: white; padding: 10px 15px; border-radius: 10px; margin: 10px 0;">
                             ✅ {sheet_name} loaded: {len(loaded_data[session_key])} records
@@ -3511,6 +3534,7 @@ def show_data_input():
                 # Update session state with loaded data
                 for session_key, data in loaded_data.items():
                     setattr(st.session_state, session_key, data)
+                compact_session_tables([sheet_name for sheet_name, session_key in expected_sheets.items() if session_key in loaded_data])
                 
                 # Show summary
                 total_records = sum(len(data) for data in loaded_data.values())
@@ -3693,6 +3717,89 @@ def show_data_input():
                     ❌ Error loading RFQs data: {str(e)}
                 </div>
                 """, unsafe_allow_html=True)
+        
+        # Apply the ingest schema to whichever individual files were loaded
+        compact_session_tables([table_name for table_name, uploaded in [
+            ('suppliers', uploaded_suppliers), ('items', uploaded_items), ('purchase_orders', uploaded_purchase_orders),
+            ('contracts', uploaded_contracts), ('deliveries', uploaded_deliveries), ('invoices', uploaded_invoices),
+            ('budgets', uploaded_budgets), ('rfqs', uploaded_rfqs)
+        ] if uploaded is not None])
+    
+        # Incremental Append Section
+        st.markdown("---")
+        st.markdown("### ➕ Append New Records")
+        st.caption("Add a new batch of purchase orders, deliveries or invoices to the data already loaded. Rows whose ID is already present are skipped, and running totals are updated from the new rows only.")
+        
+        uploaded_append = st.file_uploader(
+            "➕ New Records (Excel with Purchase_Orders / Deliveries / Invoices sheets, or a single CSV)",
+            type=['xlsx', 'csv'],
+            key="append_upload"
+        )
+        
+        if uploaded_append is not None:
+            append_sheets = {'purchase_orders': 'purchase_orders', 'deliveries': 'deliveries', 'invoices': 'invoices'}
+            if uploaded_append.name.endswith('.csv'):
+                csv_target = st.selectbox(
+                    "Append CSV rows to", list(append_sheets.values()),
+                    format_func=lambda name: name.replace('_', ' ').title(),
+                    key="append_csv_target"
+                )
+            
+            if st.button("➕ Append to Existing Data", key="append_records_button"):
+                try:
+                    if uploaded_append.name.endswith('.csv'):
+                        batch, _ = read_table_file(uploaded_append)
+                        batches = {csv_target: batch}
+                    else:
+                        sheets, _ = read_workbook(uploaded_append)
+                        sheets_by_name = {name.lower(): df for name, df in sheets.items()}
+                        batches = {table: sheets_by_name[sheet] for sheet, table in append_sheets.items() if sheet in sheets_by_name}
+                    
+                    if not batches:
+                        st.warning("No purchase_orders, deliveries or invoices sheet found in the uploaded file")
+                    
+                    for table_name, batch in batches.items():
+                        start_time = time.perf_counter()
+                        added = append_procurement_records(table_name, batch)
+                        elapsed_ms = (time.perf_counter() - start_time) * 1000
+                        skipped = len(batch) - added
+                        st.markdown(f"""
+                        <div style="background: linear-gradient(135deg, #22c55e 0%, #16a34a 100%); color: white; padding: 10px 15px; border-radius: 10px; margin: 10px 0;">
+                            ✅ {table_name.replace('_', ' ').title()}: {added:,} new records appended{f', {skipped:,} already present' if skipped else ''} ({elapsed_ms:.0f} ms) — {len(st.session_state[table_name]):,} total
+                        </div>
+                        """, unsafe_allow_html=True)
+                except Exception as e:
+                    st.markdown(f"""
+                    <div style="background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%); color: white; padding: 10px 15px; border-radius: 10px; margin: 10px 0;">
+                        ❌ Error appending records: {str(e)}
+                    </div>
+                    """, unsafe_allow_html=True)
+        
+        if not st.session_state.purchase_orders.empty:
+            with st.expander("📈 Running Totals"):
+                aggregates = get_procurement_aggregates()
+                summary = aggregates.spend_summary()
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Total Spend", f"${summary['total_spend']:,.0f}")
+                with col2:
+                    st.metric("Purchase Orders", f"{summary['total_orders']:,}")
+                with col3:
+                    st.metric("Avg PO Value", f"${summary['avg_order_value']:,.0f}")
+                with col4:
+                    st.metric("PO Value Std Dev", f"${summary['std_order_value']:,.0f}")
+                
+                monthly = aggregates.monthly_spend()
+                if not monthly.empty:
+                    fig_running = px.line(monthly, x='month', y='total_spend', markers=True, title='Monthly Spend (running aggregate)')
+                    st.plotly_chart(fig_running, use_container_width=True, key="running_totals_chart")
+                
+                quantiles = (0.05, 0.5, 0.95)
+                item_prices = get_price_stats_index(st.session_state.purchase_orders).item_stats(quantiles=quantiles, exact=False)
+                if not item_prices.empty:
+                    item_prices = item_prices.nlargest(10, 'total_spend')[['item_id', 'count', *map(quantile_column, quantiles), 'supplier_count', 'total_spend']]
+                    st.caption(f"Unit price quantiles of the top items by spend, streamed from the price statistics index (within {SKETCH_RELATIVE_ACCURACY:.0%})")
+                    st.dataframe(item_prices, use_container_width=True, hide_index=True)
     
     with upload_tab2:
         st.markdown("""
@@ -3773,8 +3880,10 @@ def show_data_input():
                     'currency': currency,
                     'budget_code': budget_code
                 }])
-                st.session_state.purchase_orders = pd.concat([st.session_state.purchase_orders, new_po], ignore_index=True)
-                st.success("Purchase Order added successfully!")
+                if append_procurement_records('purchase_orders', new_po):
+                    st.success("Purchase Order added successfully!")
+                else:
+                    st.warning(f"PO ID {po_id} already exists; the purchase order was not added.")
             
             # Display existing data
             if not st.session_state.purchase_orders.empty:
@@ -3905,8 +4014,10 @@ def show_data_input():
                     'defect_flag': defect_flag,
                     'defect_notes': defect_notes
                 }])
-                st.session_state.deliveries = pd.concat([st.session_state.deliveries, new_delivery], ignore_index=True)
-                st.success("Delivery added successfully!")
+                if append_procurement_records('deliveries', new_delivery):
+                    st.success("Delivery added successfully!")
+                else:
+                    st.warning(f"Delivery ID {delivery_id} already exists; the delivery was not added.")
             
             # Display existing data
             if not st.session_state.deliveries.empty:
@@ -3934,8 +4045,10 @@ def show_data_input():
                     'payment_date': payment_date,
                     'invoice_amount': invoice_amount
                 }])
-                st.session_state.invoices = pd.concat([st.session_state.invoices, new_invoice], ignore_index=True)
-                st.success("Invoice added successfully!")
+                if append_procurement_records('invoices', new_invoice):
+                    st.success("Invoice added successfully!")
+                else:
+                    st.warning(f"Invoice ID {invoice_id} already exists; the invoice was not added.")
             
             # Display existing data
             if not st.session_state.invoices.empty:
@@ -4034,6 +4147,7 @@ def show_data_input():
                 st.session_state.contracts = contracts
                 st.session_state.budgets = budgets
                 st.session_state.rfqs = rfqs
+                compact_session_tables(list(SESSION_TABLE_KEYS))
                 
                 # Show success message
                 st.markdown(f"""
@@ -4134,14 +4248,7 @@ def show_data_input():
         not st.session_state.invoices.empty or not st.session_state.contracts.empty or 
         not st.session_state.budgets.empty or not st.session_state.rfqs.empty):
         
-        export_output = export_data_to_excel()
-        
-        st.download_button(
-            label="📤 Export All Data",
-            data=export_output.getvalue(),
-            file_name=f"procurement_analytics_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
+        export_data_to_excel()
         
         st.markdown("""
         <div class="chart-container">
@@ -4255,9 +4362,8 @@ def show_auto_insights():
     </div>
     """, unsafe_allow_html=True)
     
-    # Generate and display executive summary
-    executive_summary = insights_generator.generate_executive_summary()
-    display_insights_section(executive_summary, "Executive Summary", "📊")
+    # Placeholder for the executive summary, filled as soon as it is generated
+    summary_container = st.container()
     
     # Detailed Insights Sections
     st.markdown("## 📋 Detailed Analysis")
@@ -4268,89 +4374,60 @@ def show_auto_insights():
         "⚡ Process Efficiency", "⚠️ Risk & Compliance", "🌱 Sustainability"
     ])
     
-    with insight_tab1:
-        spend_insights = insights_generator.generate_spend_insights()
-        display_insights_section(spend_insights, "Spend Analysis Insights", "💰")
-        
-        # Add actionable recommendations
-        st.markdown("### Actionable Recommendations")
-        if "High spend concentration" in spend_insights:
-            st.markdown("""
+    # Section key -> (container, title, icon, follow-up heading, trigger phrase, follow-up actions)
+    insight_sections = {
+        'executive_summary': (summary_container, "Executive Summary", "📊", None, None, None),
+        'spend': (insight_tab1, "Spend Analysis Insights", "💰", "### Actionable Recommendations", "High spend concentration", """
             **Immediate Actions:**
             - Review supplier contracts for high-spend categories
             - Develop category strategies for spend optimization
             - Consider supplier diversification to reduce risk
-            """)
-    
-    with insight_tab2:
-        supplier_insights = insights_generator.generate_supplier_performance_insights()
-        display_insights_section(supplier_insights, "Supplier Performance Insights", "🏭")
-        
-        # Add performance improvement suggestions
-        st.markdown("### Performance Improvement")
-        if "Performance Issue" in supplier_insights:
-            st.markdown("""
+            """),
+        'supplier_performance': (insight_tab2, "Supplier Performance Insights", "🏭", "### Performance Improvement", "Performance Issue", """
             **Recommended Actions:**
             - Schedule performance review meetings with underperforming suppliers
             - Implement supplier development programs
             - Establish clear performance metrics and SLAs
-            """)
-    
-    with insight_tab3:
-        cost_insights = insights_generator.generate_cost_savings_insights()
-        display_insights_section(cost_insights, "Cost Savings Opportunities", "💡")
-        
-        # Add cost optimization strategies
-        st.markdown("### Cost Optimization Strategies")
-        if "Negotiation Opportunity" in cost_insights:
-            st.markdown("""
+            """),
+        'cost_savings': (insight_tab3, "Cost Savings Opportunities", "💡", "### Cost Optimization Strategies", "Negotiation Opportunity", """
             **Strategic Actions:**
             - Leverage competitive quotes for price negotiations
             - Implement volume consolidation strategies
             - Explore alternative suppliers for high-cost items
-            """)
-    
-    with insight_tab4:
-        process_insights = insights_generator.generate_process_efficiency_insights()
-        display_insights_section(process_insights, "Process Efficiency Analysis", "⚡")
-        
-        # Add process improvement recommendations
-        st.markdown("### Process Improvements")
-        if "Process Inconsistency" in process_insights:
-            st.markdown("""
+            """),
+        'process_efficiency': (insight_tab4, "Process Efficiency Analysis", "⚡", "### Process Improvements", "Process Inconsistency", """
             **Optimization Actions:**
             - Standardize procurement processes across departments
             - Implement order consolidation strategies
             - Review and optimize payment cycles
-            """)
-    
-    with insight_tab5:
-        risk_insights = insights_generator.generate_compliance_risk_insights()
-        display_insights_section(risk_insights, "Risk & Compliance Assessment", "⚠️")
-        
-        # Add risk mitigation strategies
-        st.markdown("### Risk Mitigation")
-        if "Contract Compliance" in risk_insights or "Policy Violation" in risk_insights:
-            st.markdown("""
+            """),
+        'compliance_risk': (insight_tab5, "Risk & Compliance Assessment", "⚠️", "### Risk Mitigation", ("Contract Compliance", "Policy Violation"), """
             **Risk Management Actions:**
             - Review and update compliance policies
             - Implement automated compliance monitoring
             - Develop supplier risk assessment frameworks
-            """)
-    
-    with insight_tab6:
-        sustainability_insights = insights_generator.generate_sustainability_insights()
-        display_insights_section(sustainability_insights, "Sustainability & CSR Analysis", "🌱")
-        
-        # Add sustainability improvement strategies
-        st.markdown("### Sustainability Goals")
-        if "Sustainability Opportunity" in sustainability_insights:
-            st.markdown("""
+            """),
+        'sustainability': (insight_tab6, "Sustainability & CSR Analysis", "🌱", "### Sustainability Goals", "Sustainability Opportunity", """
             **Sustainability Actions:**
             - Develop supplier sustainability programs
             - Increase procurement of eco-friendly products
             - Implement diversity supplier programs
             """)
+    }
+    
+    # Generate all sections concurrently and render each one as soon as it finishes
+    progress = st.progress(0.0, text="Generating insights...")
+    for completed, (key, insights_text) in enumerate(insights_generator.iter_insights(), start=1):
+        container, title, icon, follow_up_heading, triggers, follow_up_actions = insight_sections[key]
+        with container:
+            display_insights_section(insights_text, title, icon)
+            if follow_up_heading:
+                st.markdown(follow_up_heading)
+                triggers = triggers if isinstance(triggers, tuple) else (triggers,)
+                if any(trigger in insights_text for trigger in triggers):
+                    st.markdown(follow_up_actions)
+        progress.progress(completed / len(insight_sections), text=f"Generated {title}")
+    progress.empty()
     
     # AI Recommendations Section
     st.markdown("## 🤖 AI-Powered Recommendations")
@@ -4434,6 +4511,49 @@ def show_predictive_analytics():
     )
 
 
+SPEND_DIMENSION_LABELS = {
+    'month': 'Month', 'category': 'Category', 'department': 'Department',
+    'supplier_name': 'Supplier', 'budget_code': 'Budget Code'
+}
+
+def show_spend_drill_down(po_df):
+    """Break spend down by any dimension within a slice, answered from the spend cube"""
+    cube = get_spend_cube(po_df)
+    lookups = {'items_data': st.session_state.items_data, 'suppliers': st.session_state.suppliers}
+    dimensions = {name: cube.dimension(name, **lookups) for name in SPEND_DIMENSIONS}
+    dimensions = {name: resolved for name, resolved in dimensions.items() if resolved is not None}
+    if not dimensions:
+        st.info("Spend drill-down requires order dates, items, departments, suppliers or budget codes.")
+        return
+    
+    group_by = st.selectbox("Break down by", list(dimensions), format_func=SPEND_DIMENSION_LABELS.get, key="spend_drill_group")
+    filter_names = [name for name in dimensions if name != group_by]
+    filters = {}
+    for column, name in zip(st.columns(len(filter_names)) if filter_names else [], filter_names):
+        with column:
+            labels = dimensions[name][1].tolist()
+            selected = st.selectbox(SPEND_DIMENSION_LABELS[name], ['All'] + labels, key=f"spend_drill_{name}")
+            if selected != 'All':
+                filters[name] = selected
+    
+    breakdown = cube.rollup([group_by], filters=filters, **lookups)
+    if breakdown is None or breakdown.empty:
+        st.info("No spend in the selected slice.")
+        return
+    if group_by != 'month':
+        breakdown = breakdown.sort_values('total_spend', ascending=False)
+    
+    fig = px.bar(breakdown.head(25), x=group_by, y='total_spend',
+                 title=f"Spend by {SPEND_DIMENSION_LABELS[group_by]}",
+                 labels={group_by: SPEND_DIMENSION_LABELS[group_by], 'total_spend': 'Total Spend ($)'})
+    fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+    st.plotly_chart(fig, use_container_width=True, key="spend_drill_chart")
+    
+    with st.expander("📊 Drill-Down Data"):
+        drill_display = breakdown.rename(columns={group_by: SPEND_DIMENSION_LABELS[group_by], 'total_spend': 'Total Spend ($)', 'po_count': 'POs'})
+        drill_display['Total Spend ($)'] = drill_display['Total Spend ($)'].apply(lambda x: f"${x:,.0f}")
+        display_dataframe_with_index_1(drill_display)
+
 def show_spend_analysis():
     st.header("💰 Spend Analysis")
     
@@ -4444,13 +4564,9 @@ def show_spend_analysis():
         return
     
     # Add Year and Quarter Filter UI
-    po_df = st.session_state.purchase_orders.copy()
-    if not po_df.empty and 'order_date' in po_df.columns:
-        po_df['order_date'] = pd.to_datetime(po_df['order_date'], errors='coerce')
-        po_df = po_df.dropna(subset=['order_date'])
-        po_df['year'] = po_df['order_date'].dt.year
-        po_df['quarter'] = po_df['order_date'].dt.quarter
-        years = sorted(po_df['year'].dropna().unique())
+    po_partitions = get_po_partitions()
+    if po_partitions is not None:
+        years = po_partitions.years
         quarters = ['All', 'Q1', 'Q2', 'Q3', 'Q4']
         
         # Create filter UI in top-right
@@ -4947,6 +5063,11 @@ def show_spend_analysis():
     else:
         st.info("📅 Order date information is required for trend analysis. Please ensure your purchase order data includes order_date column.")
     
+    # Spend Drill-Down Section
+    st.markdown("---")
+    st.subheader("🔎 Spend Drill-Down")
+    show_spend_drill_down(po_df)
+    
 
     
     # Auto Insights Section
@@ -4994,13 +5115,9 @@ def show_supplier_performance():
         return
     
     # Add Year and Quarter Filter UI
-    po_df = st.session_state.purchase_orders.copy()
-    if not po_df.empty and 'order_date' in po_df.columns:
-        po_df['order_date'] = pd.to_datetime(po_df['order_date'], errors='coerce')
-        po_df = po_df.dropna(subset=['order_date'])
-        po_df['year'] = po_df['order_date'].dt.year
-        po_df['quarter'] = po_df['order_date'].dt.quarter
-        years = sorted(po_df['year'].dropna().unique())
+    po_partitions = get_po_partitions()
+    if po_partitions is not None:
+        years = po_partitions.years
         quarters = ['All', 'Q1', 'Q2', 'Q3', 'Q4']
         
         # Create filter UI in top-right
@@ -5254,13 +5371,9 @@ def show_cost_savings():
         return
     
     # Add Year and Quarter Filter UI
-    po_df = st.session_state.purchase_orders.copy()
-    if not po_df.empty and 'order_date' in po_df.columns:
-        po_df['order_date'] = pd.to_datetime(po_df['order_date'], errors='coerce')
-        po_df = po_df.dropna(subset=['order_date'])
-        po_df['year'] = po_df['order_date'].dt.year
-        po_df['quarter'] = po_df['order_date'].dt.quarter
-        years = sorted(po_df['year'].dropna().unique())
+    po_partitions = get_po_partitions()
+    if po_partitions is not None:
+        years = po_partitions.years
         quarters = ['All', 'Q1', 'Q2', 'Q3', 'Q4']
         
         # Create filter UI in top-right
@@ -5963,13 +6076,9 @@ def show_process_efficiency():
         return
     
     # Add Year and Quarter Filter UI
-    po_df = st.session_state.purchase_orders.copy()
-    if not po_df.empty and 'order_date' in po_df.columns:
-        po_df['order_date'] = pd.to_datetime(po_df['order_date'], errors='coerce')
-        po_df = po_df.dropna(subset=['order_date'])
-        po_df['year'] = po_df['order_date'].dt.year
-        po_df['quarter'] = po_df['order_date'].dt.quarter
-        years = sorted(po_df['year'].dropna().unique())
+    po_partitions = get_po_partitions()
+    if po_partitions is not None:
+        years = po_partitions.years
         quarters = ['All', 'Q1', 'Q2', 'Q3', 'Q4']
         
         # Create filter UI in top-right
@@ -6199,6 +6308,58 @@ def show_process_efficiency():
     
 
 
+def show_risk_weight_what_if():
+    """Re-score suppliers live with user-chosen risk component weights"""
+    st.markdown("---")
+    st.subheader("🎚️ What-If Risk Weighting")
+    
+    engine = get_supplier_risk_engine(
+        st.session_state.suppliers,
+        st.session_state.purchase_orders,
+        st.session_state.deliveries if 'deliveries' in st.session_state else None,
+        st.session_state.invoices if 'invoices' in st.session_state else None,
+        st.session_state.contracts if 'contracts' in st.session_state else None
+    )
+    
+    st.caption("Adjust how much each risk component counts. Weights are rescaled to sum to 1, and suppliers are re-scored without recomputing the underlying joins.")
+    weights = {}
+    slider_cols = st.columns(3)
+    for i, component in enumerate(RISK_COMPONENTS):
+        with slider_cols[i % 3]:
+            weights[component] = st.slider(
+                component.replace('_', ' ').title(),
+                min_value=0.0, max_value=1.0,
+                value=float(DEFAULT_RISK_WEIGHTS[component]), step=0.01,
+                key=f"risk_weight_{component}"
+            )
+    
+    if sum(weights.values()) <= 0:
+        st.warning("Set at least one weight above zero.")
+        return
+    
+    baseline_scores = engine.score()
+    scores = engine.score(weights)
+    high, medium, low = engine.level_counts(scores)
+    base_high, base_medium, base_low = engine.level_counts(baseline_scores)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("High Risk", high, delta=high - base_high, delta_color="inverse")
+    with col2:
+        st.metric("Medium Risk", medium, delta=medium - base_medium, delta_color="off")
+    with col3:
+        st.metric("Low Risk", low, delta=low - base_low)
+    
+    what_if = pd.DataFrame({
+        'Supplier': engine.suppliers['supplier_name'].to_numpy() if 'supplier_name' in engine.suppliers.columns else engine.suppliers['supplier_id'].to_numpy(),
+        'Default Score': baseline_scores,
+        'What-If Score': scores,
+        'Risk Level': engine.risk_levels(scores)
+    })
+    what_if['Change'] = what_if['What-If Score'] - what_if['Default Score']
+    what_if = what_if.sort_values('What-If Score', ascending=False).head(20)
+    display_dataframe_with_index_1(what_if.round(2))
+
 def show_compliance_risk():
     st.header("📋 Compliance & Risk Management")
     
@@ -6207,13 +6368,9 @@ def show_compliance_risk():
         return
     
     # Add Year and Quarter Filter UI
-    po_df = st.session_state.purchase_orders.copy()
-    if not po_df.empty and 'order_date' in po_df.columns:
-        po_df['order_date'] = pd.to_datetime(po_df['order_date'], errors='coerce')
-        po_df = po_df.dropna(subset=['order_date'])
-        po_df['year'] = po_df['order_date'].dt.year
-        po_df['quarter'] = po_df['order_date'].dt.quarter
-        years = sorted(po_df['year'].dropna().unique())
+    po_partitions = get_po_partitions()
+    if po_partitions is not None:
+        years = po_partitions.years
         quarters = ['All', 'Q1', 'Q2', 'Q3', 'Q4']
         
         # Create filter UI in top-right
@@ -6398,7 +6555,9 @@ def show_compliance_risk():
         else:
             st.info("Add supplier data to see risk assessment")
     
-
+    # What-if supplier risk weighting
+    if not st.session_state.suppliers.empty:
+        show_risk_weight_what_if()
     
     # Comprehensive Risk Analysis Section
     st.markdown("---")
@@ -6407,8 +6566,8 @@ def show_compliance_risk():
     if st.session_state.purchase_orders.empty:
         st.warning("Please add purchase order data first to perform comprehensive risk analysis.")
     else:
-        # Initialize risk analyzer
-        risk_analyzer = ProcurementRiskAnalyzer(
+        # Generate comprehensive risk report (cached, or precomputed by batch_precompute.py)
+        risk_report = calculate_comprehensive_risk_report(
             purchase_orders=st.session_state.purchase_orders,
             suppliers=st.session_state.suppliers,
             items_data=st.session_state.items_data,
@@ -6419,9 +6578,6 @@ def show_compliance_risk():
             rfqs=st.session_state.rfqs
         )
         
-        # Generate comprehensive risk report
-        risk_report = risk_analyzer.generate_comprehensive_risk_report()
-        
         # Display risk dashboard
         display_risk_dashboard(risk_report)
 
@@ -6433,13 +6589,9 @@ def show_inventory_management():
         return
     
     # Add Year and Quarter Filter UI
-    po_df = st.session_state.purchase_orders.copy()
-    if not po_df.empty and 'order_date' in po_df.columns:
-        po_df['order_date'] = pd.to_datetime(po_df['order_date'], errors='coerce')
-        po_df = po_df.dropna(subset=['order_date'])
-        po_df['year'] = po_df['order_date'].dt.year
-        po_df['quarter'] = po_df['order_date'].dt.quarter
-        years = sorted(po_df['year'].dropna().unique())
+    po_partitions = get_po_partitions()
+    if po_partitions is not None:
+        years = po_partitions.years
         quarters = ['All', 'Q1', 'Q2', 'Q3', 'Q4']
         
         # Create filter UI in top-right
@@ -6810,13 +6962,9 @@ def show_market_insights():
         return
     
     # Add Year and Quarter Filter UI
-    po_df = st.session_state.purchase_orders.copy()
-    if not po_df.empty and 'order_date' in po_df.columns:
-        po_df['order_date'] = pd.to_datetime(po_df['order_date'], errors='coerce')
-        po_df = po_df.dropna(subset=['order_date'])
-        po_df['year'] = po_df['order_date'].dt.year
-        po_df['quarter'] = po_df['order_date'].dt.quarter
-        years = sorted(po_df['year'].dropna().unique())
+    po_partitions = get_po_partitions()
+    if po_partitions is not None:
+        years = po_partitions.years
         quarters = ['All', 'Q1', 'Q2', 'Q3', 'Q4']
         
         # Create filter UI in top-right
@@ -6877,14 +7025,11 @@ def show_market_insights():
             how='left'
         )
         
-        # Calculate comprehensive price statistics for each item
-        item_price_analysis = po_with_items.groupby('item_name').agg({
-            'unit_price': ['mean', 'std', 'min', 'max', 'count'],
-            'quantity': 'sum',
-            'po_id': 'nunique'
-        }).reset_index()
-        
-        # Flatten column names
+        # Price statistics for each item name from the shared price statistics index
+        item_price_analysis = get_price_stats_index(po_df).item_stats(
+            labels=item_lookup(st.session_state.items_data, 'item_name')
+        )
+        item_price_analysis = item_price_analysis[['item_name', 'mean', 'std', 'min', 'max', 'count', 'total_quantity', 'supplier_count']]
         item_price_analysis.columns = ['Item Name', 'Avg Price', 'Price Std', 'Min Price', 'Max Price', 'Order Count', 'Total Quantity', 'Supplier Count']
         
         # Calculate additional metrics
@@ -7222,13 +7367,9 @@ def show_contract_management():
         return
     
     # Add Year and Quarter Filter UI
-    po_df = st.session_state.purchase_orders.copy()
-    if not po_df.empty and 'order_date' in po_df.columns:
-        po_df['order_date'] = pd.to_datetime(po_df['order_date'], errors='coerce')
-        po_df = po_df.dropna(subset=['order_date'])
-        po_df['year'] = po_df['order_date'].dt.year
-        po_df['quarter'] = po_df['order_date'].dt.quarter
-        years = sorted(po_df['year'].dropna().unique())
+    po_partitions = get_po_partitions()
+    if po_partitions is not None:
+        years = po_partitions.years
         quarters = ['All', 'Q1', 'Q2', 'Q3', 'Q4']
         
         # Create filter UI in top-right
@@ -7484,13 +7625,9 @@ def show_sustainability_csr():
         return
     
     # Add Year and Quarter Filter UI
-    po_df = st.session_state.purchase_orders.copy()
-    if not po_df.empty and 'order_date' in po_df.columns:
-        po_df['order_date'] = pd.to_datetime(po_df['order_date'], errors='coerce')
-        po_df = po_df.dropna(subset=['order_date'])
-        po_df['year'] = po_df['order_date'].dt.year
-        po_df['quarter'] = po_df['order_date'].dt.quarter
-        years = sorted(po_df['year'].dropna().unique())
+    po_partitions = get_po_partitions()
+    if po_partitions is not None:
+        years = po_partitions.years
         quarters = ['All', 'Q1', 'Q2', 'Q3', 'Q4']
         
         # Create filter UI in top-right
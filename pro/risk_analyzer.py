@@ -1,9 +1,10 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import streamlit as st
 from typing import Dict, List, Tuple
 
+from price_stats import get_price_stats_index, item_lookup
+
 class ProcurementRiskAnalyzer:
     """Comprehensive risk analysis tool for procurement operations"""
     
@@ -28,7 +29,88 @@ class ProcurementRiskAnalyzer:
             'compliance_risk': 0.05,
             'process_risk': 0.05
         }
-    
+
+        # Memoized joins shared by all analyze_* methods (see invalidate_cache)
+        self._join_cache = {}
+
+    def invalidate_cache(self):
+        """Drop memoized joins so they are rebuilt from the current input frames"""
+        self._join_cache = {}
+
+    def update_data(self, **frames):
+        """Replace one or more input frames (e.g. purchase_orders=df) and invalidate cached joins"""
+        for name, df in frames.items():
+            if not hasattr(self, name):
+                raise AttributeError(f"Unknown input frame: {name}")
+            setattr(self, name, df)
+        self.invalidate_cache()
+
+    def _cached(self, key: str, builder) -> pd.DataFrame:
+        """Build a joined frame once and reuse it until the cache is invalidated"""
+        if key not in self._join_cache:
+            self._join_cache[key] = builder()
+        return self._join_cache[key]
+
+    @property
+    def po_enriched(self) -> pd.DataFrame:
+        """Purchase orders with total_spend and parsed order/delivery dates"""
+        def build():
+            po = self.purchase_orders.copy()
+            po['total_spend'] = po['quantity'] * po['unit_price']
+            for col in ('order_date', 'delivery_date'):
+                if col in po.columns:
+                    po[col] = pd.to_datetime(po[col], errors='coerce')
+            return po
+        return self._cached('po_enriched', build)
+
+    @property
+    def po_suppliers(self) -> pd.DataFrame:
+        """Enriched purchase orders joined with supplier attributes"""
+        return self._cached('po_suppliers', lambda: self.po_enriched.merge(
+            self.suppliers, on='supplier_id', how='left', suffixes=('', '_supplier')))
+
+    @property
+    def po_items(self) -> pd.DataFrame:
+        """Enriched purchase orders joined with item attributes (PO unit_price is kept)"""
+        return self._cached('po_items', lambda: self.po_enriched.merge(
+            self.items_data, on='item_id', how='left', suffixes=('', '_item')))
+
+    @property
+    def item_price_stats(self) -> pd.DataFrame:
+        """Unit price statistics and supplier counts per item name, from the shared price statistics index"""
+        return self._cached('item_price_stats', lambda: get_price_stats_index(self.purchase_orders).item_stats(
+            labels=item_lookup(self.items_data, 'item_name')))
+
+    @property
+    def po_budgets(self) -> pd.DataFrame:
+        """Enriched purchase orders joined with budget codes"""
+        return self._cached('po_budgets', lambda: self.po_enriched.merge(
+            self.budgets, on='budget_code', how='left', suffixes=('', '_budget')))
+
+    @property
+    def po_deliveries(self) -> pd.DataFrame:
+        """Purchase orders joined with deliveries and suppliers, with on_time and lead_time computed"""
+        def build():
+            deliveries = self.deliveries.copy()
+            if 'delivery_date_actual' in deliveries.columns:
+                deliveries['delivery_date_actual'] = pd.to_datetime(deliveries['delivery_date_actual'], errors='coerce')
+
+            merged = self.po_enriched.merge(deliveries, on='po_id', how='left', suffixes=('', '_delivery'))
+            if 'supplier_id' in merged.columns and 'supplier_id' in self.suppliers.columns:
+                merged = merged.merge(self.suppliers, on='supplier_id', how='left', suffixes=('', '_supplier'))
+
+            # Dates are compared only where one table has the column; when both do (e.g. the PO's
+            # planned and the delivery's recorded delivery_date) the comparison is skipped, as before
+            def unambiguous(col):
+                return col in merged.columns and not (col in self.purchase_orders.columns and col in deliveries.columns)
+
+            if unambiguous('delivery_date_actual') and unambiguous('delivery_date'):
+                merged['on_time'] = merged['delivery_date_actual'] <= pd.to_datetime(merged['delivery_date'], errors='coerce')
+            if unambiguous('delivery_date_actual') and unambiguous('order_date'):
+                merged['lead_time'] = (merged['delivery_date_actual'] - merged['order_date']).dt.days
+            return merged
+        return self._cached('po_deliveries', build)
+
     def analyze_supplier_risk(self) -> Dict:
         """Analyze supplier-related risks"""
         risk_score = 0
@@ -44,10 +126,9 @@ class ProcurementRiskAnalyzer:
             }
         
         # Supplier concentration risk
-        supplier_spend = self.purchase_orders.merge(self.suppliers, on='supplier_id', how='left')
-        supplier_spend['total_spend'] = supplier_spend['quantity'] * supplier_spend['unit_price']
-        top_suppliers = supplier_spend.groupby('supplier_name')['total_spend'].sum().sort_values(ascending=False)
-        
+        top_supplier_pct = 0
+        top_suppliers = self.po_suppliers.groupby('supplier_name')['total_spend'].sum().sort_values(ascending=False)
+
         if not top_suppliers.empty:
             top_supplier_pct = (top_suppliers.iloc[0] / top_suppliers.sum()) * 100
             
@@ -59,17 +140,14 @@ class ProcurementRiskAnalyzer:
                 risk_factors.append(f"Moderate supplier concentration: {top_supplier_pct:.1f}% from top supplier")
         
         # Supplier performance risk
+        otif_rate = 0
         if not self.deliveries.empty:
-            delivery_analysis = self.purchase_orders.merge(self.deliveries, on='po_id', how='left')
-            
-            # Check if supplier_id exists in both dataframes before merging
+            delivery_analysis = self.po_deliveries
+
             if 'supplier_id' in delivery_analysis.columns and 'supplier_id' in self.suppliers.columns:
-                delivery_analysis = delivery_analysis.merge(self.suppliers, on='supplier_id', how='left')
-                
-                if 'delivery_date_actual' in delivery_analysis.columns and 'delivery_date' in delivery_analysis.columns:
-                    delivery_analysis['on_time'] = pd.to_datetime(delivery_analysis['delivery_date_actual']) <= pd.to_datetime(delivery_analysis['delivery_date'])
+                if 'on_time' in delivery_analysis.columns:
                     otif_rate = delivery_analysis['on_time'].mean() * 100
-                    
+
                     if otif_rate < 80:
                         risk_score += 30
                         risk_factors.append(f"Poor delivery performance: {otif_rate:.1f}% on-time rate")
@@ -108,17 +186,7 @@ class ProcurementRiskAnalyzer:
                 "Identify and qualify backup suppliers",
                 "Implement supplier relationship management program"
             ])
-        
-        # Check if otif_rate was calculated
-        otif_rate = 0
-        if not self.deliveries.empty:
-            delivery_analysis = self.purchase_orders.merge(self.deliveries, on='po_id', how='left')
-            if 'supplier_id' in delivery_analysis.columns and 'supplier_id' in self.suppliers.columns:
-                delivery_analysis = delivery_analysis.merge(self.suppliers, on='supplier_id', how='left')
-                if 'delivery_date_actual' in delivery_analysis.columns and 'delivery_date' in delivery_analysis.columns:
-                    delivery_analysis['on_time'] = pd.to_datetime(delivery_analysis['delivery_date_actual']) <= pd.to_datetime(delivery_analysis['delivery_date'])
-                    otif_rate = delivery_analysis['on_time'].mean() * 100
-        
+
         if otif_rate < 90:
             mitigation.extend([
                 "Establish supplier performance improvement programs",
@@ -238,30 +306,24 @@ class ProcurementRiskAnalyzer:
         
         # Price volatility analysis
         if not self.items_data.empty:
-            merged_data = self.purchase_orders.merge(self.items_data, on='item_id', how='left')
-            # Use unit_price from purchase_orders (primary source)
-            unit_price_col = 'unit_price' if 'unit_price' in merged_data.columns else 'unit_price_x'
-            if unit_price_col in merged_data.columns:
-                price_volatility = merged_data.groupby('item_name')[unit_price_col].agg(['mean', 'std']).reset_index()
-                price_volatility['cv'] = price_volatility['std'] / price_volatility['mean']
-                
-                high_volatility = price_volatility[price_volatility['cv'] > 0.3]
-                if not high_volatility.empty:
-                    risk_score += 30
-                    risk_factors.append(f"{len(high_volatility)} items with high price volatility (>30%)")
-        
+            price_volatility = self.item_price_stats[['item_name', 'mean', 'std']]
+            price_volatility = price_volatility.assign(cv=price_volatility['std'] / price_volatility['mean'])
+
+            high_volatility = price_volatility[price_volatility['cv'] > 0.3]
+            if not high_volatility.empty:
+                risk_score += 30
+                risk_factors.append(f"{len(high_volatility)} items with high price volatility (>30%)")
+
         # Abnormal pricing detection
         if not self.items_data.empty:
             # Identify items with prices significantly above average
-            unit_price_col = 'unit_price' if 'unit_price' in merged_data.columns else 'unit_price_x'
-            if unit_price_col in merged_data.columns:
-                item_avg_prices = merged_data.groupby('item_name')[unit_price_col].mean()
-                overall_avg = item_avg_prices.mean()
-                high_price_items = item_avg_prices[item_avg_prices > overall_avg * 2]
-                
-                if not high_price_items.empty:
-                    risk_score += 25
-                    risk_factors.append(f"{len(high_price_items)} items with abnormally high prices")
+            item_avg_prices = price_volatility.set_index('item_name')['mean']
+            overall_avg = item_avg_prices.mean()
+            high_price_items = item_avg_prices[item_avg_prices > overall_avg * 2]
+
+            if not high_price_items.empty:
+                risk_score += 25
+                risk_factors.append(f"{len(high_price_items)} items with abnormally high prices")
         
         # RFQ price variance analysis
         if not self.rfqs.empty:
@@ -278,9 +340,7 @@ class ProcurementRiskAnalyzer:
         
         # Budget overrun risk
         if not self.budgets.empty:
-            budget_analysis = self.purchase_orders.merge(self.budgets, on='budget_code', how='left')
-            budget_analysis['total_spend'] = budget_analysis['quantity'] * budget_analysis['unit_price']
-            budget_utilization = budget_analysis.groupby('budget_code').agg({
+            budget_utilization = self.po_budgets.groupby('budget_code').agg({
                 'budget_amount': 'first',
                 'total_spend': 'sum'
             }).reset_index()
@@ -344,15 +404,10 @@ class ProcurementRiskAnalyzer:
             }
         
         # On-time delivery risk
-        delivery_analysis = self.purchase_orders.merge(self.deliveries, on='po_id', how='left')
+        delivery_analysis = self.po_deliveries
         otif_rate = 0  # Initialize otif_rate
-        
-        # Check if supplier_id exists in both dataframes before merging
-        if 'supplier_id' in delivery_analysis.columns and 'supplier_id' in self.suppliers.columns:
-            delivery_analysis = delivery_analysis.merge(self.suppliers, on='supplier_id', how='left')
-        
-        if 'delivery_date_actual' in delivery_analysis.columns and 'delivery_date' in delivery_analysis.columns:
-            delivery_analysis['on_time'] = pd.to_datetime(delivery_analysis['delivery_date_actual']) <= pd.to_datetime(delivery_analysis['delivery_date'])
+
+        if 'on_time' in delivery_analysis.columns:
             otif_rate = delivery_analysis['on_time'].mean() * 100
             
             if otif_rate < 80:
@@ -365,10 +420,7 @@ class ProcurementRiskAnalyzer:
         # Lead time variability risk
         lead_time_std = 0
         avg_lead_time = 0
-        if 'delivery_date_actual' in delivery_analysis.columns:
-            delivery_analysis['lead_time'] = (pd.to_datetime(delivery_analysis['delivery_date_actual']) - 
-                                            pd.to_datetime(delivery_analysis['order_date'])).dt.days
-            
+        if 'lead_time' in delivery_analysis.columns:
             lead_time_std = delivery_analysis['lead_time'].std()
             avg_lead_time = delivery_analysis['lead_time'].mean()
             
@@ -480,12 +532,11 @@ class ProcurementRiskAnalyzer:
         
         # Price manipulation indicators
         if not self.items_data.empty:
-            merged_data = self.purchase_orders.merge(self.items_data, on='item_id', how='left')
-            
+            merged_data = self.po_items
+
             # Check for unusual price patterns
-            unit_price_col = 'unit_price' if 'unit_price' in merged_data.columns else 'unit_price_x'
-            if unit_price_col in merged_data.columns and 'supplier_id' in merged_data.columns:
-                price_analysis = merged_data.groupby(['item_name', 'supplier_id'])[unit_price_col].agg(['mean', 'count']).reset_index()
+            if 'supplier_id' in merged_data.columns:
+                price_analysis = merged_data.groupby(['item_name', 'supplier_id'])['unit_price'].agg(['mean', 'count']).reset_index()
                 
                 # Suppliers with consistently high prices
                 high_price_suppliers = price_analysis[
@@ -500,7 +551,6 @@ class ProcurementRiskAnalyzer:
         # Bundle manipulation indicators
         if not self.items_data.empty:
             # Check for unusual item combinations
-            merged_data = self.purchase_orders.merge(self.items_data, on='item_id', how='left')
             order_items = merged_data.groupby('po_id')['item_name'].count()
             large_orders = order_items[order_items > order_items.quantile(0.95)]
             
@@ -592,10 +642,9 @@ class ProcurementRiskAnalyzer:
         
         # Supply market diversity
         if not self.items_data.empty:
-            item_supplier_counts = self.purchase_orders.merge(self.items_data, on='item_id', how='left')
-            if 'supplier_id' in item_supplier_counts.columns:
-                item_supplier_counts = item_supplier_counts.groupby('item_name')['supplier_id'].nunique()
-                
+            if 'supplier_id' in self.purchase_orders.columns:
+                item_supplier_counts = self.item_price_stats.set_index('item_name')['supplier_count']
+
                 single_supplier_items = item_supplier_counts[item_supplier_counts == 1]
                 if not single_supplier_items.empty:
                     risk_score += 25
@@ -603,16 +652,13 @@ class ProcurementRiskAnalyzer:
         
         # Market volatility indicators
         if not self.purchase_orders.empty and not self.items_data.empty:
-            merged_data = self.purchase_orders.merge(self.items_data, on='item_id', how='left')
-            unit_price_col = 'unit_price' if 'unit_price' in merged_data.columns else 'unit_price_x'
-            if unit_price_col in merged_data.columns:
-                price_volatility = merged_data.groupby('item_name')[unit_price_col].agg(['mean', 'std']).reset_index()
-                price_volatility['cv'] = price_volatility['std'] / price_volatility['mean']
-                
-                high_volatility_items = price_volatility[price_volatility['cv'] > 0.4]
-                if not high_volatility_items.empty:
-                    risk_score += 20
-                    risk_factors.append(f"{len(high_volatility_items)} items with high market volatility")
+            price_volatility = self.item_price_stats[['item_name', 'mean', 'std']]
+            price_volatility = price_volatility.assign(cv=price_volatility['std'] / price_volatility['mean'])
+
+            high_volatility_items = price_volatility[price_volatility['cv'] > 0.4]
+            if not high_volatility_items.empty:
+                risk_score += 20
+                risk_factors.append(f"{len(high_volatility_items)} items with high market volatility")
         
         # Determine risk level
         if risk_score >= 60:
@@ -743,11 +789,12 @@ class ProcurementRiskAnalyzer:
         
         # Process efficiency indicators
         # Small order analysis
-        avg_order_value = (self.purchase_orders['quantity'] * self.purchase_orders['unit_price']).mean()
-        small_orders = self.purchase_orders[
-            (self.purchase_orders['quantity'] * self.purchase_orders['unit_price']) < avg_order_value * 0.1
-        ]
-        
+        po_enriched = self.po_enriched
+        avg_order_value = po_enriched['total_spend'].mean()
+        small_orders = po_enriched[po_enriched['total_spend'] < avg_order_value * 0.1]
+
+        small_order_pct = 0
+        small_order_depts = pd.DataFrame()
         if not small_orders.empty:
             small_order_pct = (len(small_orders) / len(self.purchase_orders)) * 100
             if small_order_pct > 30:
@@ -773,9 +820,8 @@ class ProcurementRiskAnalyzer:
         
         # Process consistency indicators
         if 'order_date' in self.purchase_orders.columns:
-            # Analyze ordering patterns
-            self.purchase_orders['order_date'] = pd.to_datetime(self.purchase_orders['order_date'])
-            daily_orders = self.purchase_orders.groupby(self.purchase_orders['order_date'].dt.date).size()
+            # Analyze ordering patterns (dates already parsed in po_enriched)
+            daily_orders = po_enriched.groupby(po_enriched['order_date'].dt.date).size()
             
             # Check for unusual ordering patterns
             order_std = daily_orders.std()
@@ -885,114 +931,23 @@ class ProcurementRiskAnalyzer:
             'consolidated_mitigation': unique_mitigation[:10]  # Top 10 strategies
         }
 
-def display_risk_dashboard(risk_report: Dict):
-    """Display comprehensive risk dashboard using Streamlit"""
-    
-    # Overall risk summary
-    st.markdown("## 🚨 Procurement Risk Assessment Dashboard")
-    
-    # Risk level indicator
-    risk_level = risk_report['overall_level']
-    risk_score = risk_report['overall_score']
-    
-    if risk_level == "High":
-        st.error(f"⚠️ **Overall Risk Level: {risk_level}** (Score: {risk_score:.1f})")
-    elif risk_level == "Medium":
-        st.warning(f"⚠️ **Overall Risk Level: {risk_level}** (Score: {risk_score:.1f})")
-    else:
-        st.success(f"✅ **Overall Risk Level: {risk_level}** (Score: {risk_score:.1f})")
-    
-    # Risk category breakdown
-    st.markdown("### Risk Category Analysis")
-    
-    # Create DataFrame for risk categories
-    risk_data = []
-    for category, data in risk_report['risk_categories'].items():
-        risk_data.append({
-            'Risk Category': category,
-            'Risk Level': data['level'],
-            'Risk Score': data['score'],
-            'Risk Factors': len(data['factors'])
-        })
-    
-    df = pd.DataFrame(risk_data)
-    
-    # Display risk categories table
-    st.dataframe(
-        df,
-        use_container_width=True,
-        hide_index=True,
-        column_config={
-            "Risk Category": st.column_config.TextColumn("Risk Category", width="medium"),
-            "Risk Level": st.column_config.SelectboxColumn(
-                "Risk Level",
-                width="small",
-                options=["Low", "Medium", "High"],
-                default="Low"
-            ),
-            "Risk Score": st.column_config.NumberColumn("Risk Score", width="small"),
-            "Risk Factors": st.column_config.NumberColumn("Risk Factors", width="small")
-        }
+def calculate_comprehensive_risk_report(purchase_orders, suppliers, items_data, deliveries, invoices, contracts, budgets, rfqs) -> Dict:
+    """Comprehensive risk report for a procurement dataset (memoized and precomputable like the other calculators)"""
+    risk_analyzer = ProcurementRiskAnalyzer(
+        purchase_orders=purchase_orders,
+        suppliers=suppliers,
+        items_data=items_data,
+        deliveries=deliveries,
+        invoices=invoices,
+        contracts=contracts,
+        budgets=budgets,
+        rfqs=rfqs
     )
-    
-    # Top risks section
-    st.markdown("### 🔥 Top Risk Areas")
-    for i, (category, score) in enumerate(risk_report['top_risks'], 1):
-        risk_data = risk_report['risk_categories'][category]
-        
-        with st.expander(f"{i}. {category} - {risk_data['level']} Risk (Score: {score})"):
-            st.markdown("**Risk Factors:**")
-            for factor in risk_data['factors']:
-                st.markdown(f"• {factor}")
-            
-            st.markdown("**Mitigation Strategies:**")
-            for strategy in risk_data['mitigation']:
-                st.markdown(f"• {strategy}")
-    
-    # Consolidated mitigation strategies
-    st.markdown("### 🛡️ Recommended Mitigation Strategies")
-    for i, strategy in enumerate(risk_report['consolidated_mitigation'], 1):
-        st.markdown(f"{i}. {strategy}")
-    
-    # Risk trend analysis (placeholder for future enhancement)
-    st.markdown("### 📊 Risk Trend Analysis")
-    st.info("Risk trend analysis will be available in future versions with historical data.")
-    
-    # Risk heatmap visualization
-    st.markdown("### 🗺️ Risk Heatmap")
-    
-    # Create a simple heatmap using risk scores
-    heatmap_data = []
-    for category, data in risk_report['risk_categories'].items():
-        heatmap_data.append({
-            'Category': category,
-            'Risk Score': data['score'],
-            'Risk Level': data['level']
-        })
-    
-    heatmap_df = pd.DataFrame(heatmap_data)
-    
-    # Display heatmap using st.bar_chart
-    chart_data = heatmap_df.set_index('Category')['Risk Score']
-    st.bar_chart(chart_data)
-    
-    # Risk summary metrics
-    st.markdown("### 📈 Risk Summary Metrics")
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        high_risk_count = sum(1 for data in risk_report['risk_categories'].values() if data['level'] == 'High')
-        st.metric("High Risk Categories", high_risk_count)
-    
-    with col2:
-        medium_risk_count = sum(1 for data in risk_report['risk_categories'].values() if data['level'] == 'Medium')
-        st.metric("Medium Risk Categories", medium_risk_count)
-    
-    with col3:
-        low_risk_count = sum(1 for data in risk_report['risk_categories'].values() if data['level'] == 'Low')
-        st.metric("Low Risk Categories", low_risk_count)
-    
-    with col4:
-        total_factors = sum(len(data['factors']) for data in risk_report['risk_categories'].values())
-        st.metric("Total Risk Factors", total_factors) 
\ No newline at end of file
+    return risk_analyzer.generate_comprehensive_risk_report()
+
+# Memoize the risk report on its input fingerprints (shared metric cache at the repo root)
+try:
+    from metric_cache import cache_calculators
+    cache_calculators(globals())
+except ImportError:
+    pass
@@ -0,0 +1,117 @@
+import pandas as pd
+import streamlit as st
+from typing import Dict
+
+# Rendering for the Streamlit-free risk report in risk_analyzer.py
+
+def display_risk_dashboard(risk_report: Dict):
+    """Display comprehensive risk dashboard using Streamlit"""
+    
+    # Overall risk summary
+    st.markdown("## 🚨 Procurement Risk Assessment Dashboard")
+    
+    # Risk level indicator
+    risk_level = risk_report['overall_level']
+    risk_score = risk_report['overall_score']
+    
+    if risk_level == "High":
+        st.error(f"⚠️ **Overall Risk Level: {risk_level}** (Score: {risk_score:.1f})")
+    elif risk_level == "Medium":
+        st.warning(f"⚠️ **Overall Risk Level: {risk_level}** (Score: {risk_score:.1f})")
+    else:
+        st.success(f"✅ **Overall Risk Level: {risk_level}** (Score: {risk_score:.1f})")
+    
+    # Risk category breakdown
+    st.markdown("### Risk Category Analysis")
+    
+    # Create DataFrame for risk categories
+    risk_data = []
+    for category, data in risk_report['risk_categories'].items():
+        risk_data.append({
+            'Risk Category': category,
+            'Risk Level': data['level'],
+            'Risk Score': data['score'],
+            'Risk Factors': len(data['factors'])
+        })
+    
+    df = pd.DataFrame(risk_data)
+    
+    # Display risk categories table
+    st.dataframe(
+        df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Risk Category": st.column_config.TextColumn("Risk Category", width="medium"),
+            "Risk Level": st.column_config.SelectboxColumn(
+                "Risk Level",
+                width="small",
+                options=["Low", "Medium", "High"],
+                default="Low"
+            ),
+            "Risk Score": st.column_config.NumberColumn("Risk Score", width="small"),
+            "Risk Factors": st.column_config.NumberColumn("Risk Factors", width="small")
+        }
+    )
+    
+    # Top risks section
+    st.markdown("### 🔥 Top Risk Areas")
+    for i, (category, score) in enumerate(risk_report['top_risks'], 1):
+        risk_data = risk_report['risk_categories'][category]
+        
+        with st.expander(f"{i}. {category} - {risk_data['level']} Risk (Score: {score})"):
+            st.markdown("**Risk Factors:**")
+            for factor in risk_data['factors']:
+                st.markdown(f"• {factor}")
+            
+            st.markdown("**Mitigation Strategies:**")
+            for strategy in risk_data['mitigation']:
+                st.markdown(f"• {strategy}")
+    
+    # Consolidated mitigation strategies
+    st.markdown("### 🛡️ Recommended Mitigation Strategies")
+    for i, strategy in enumerate(risk_report['consolidated_mitigation'], 1):
+        st.markdown(f"{i}. {strategy}")
+    
+    # Risk trend analysis (placeholder for future enhancement)
+    st.markdown("### 📊 Risk Trend Analysis")
+    st.info("Risk trend analysis will be available in future versions with historical data.")
+    
+    # Risk heatmap visualization
+    st.markdown("### 🗺️ Risk Heatmap")
+    
+    # Create a simple heatmap using risk scores
+    heatmap_data = []
+    for category, data in risk_report['risk_categories'].items():
+        heatmap_data.append({
+            'Category': category,
+            'Risk Score': data['score'],
+            'Risk Level': data['level']
+        })
+    
+    heatmap_df = pd.DataFrame(heatmap_data)
+    
+    # Display heatmap using st.bar_chart
+    chart_data = heatmap_df.set_index('Category')['Risk Score']
+    st.bar_chart(chart_data)
+    
+    # Risk summary metrics
+    st.markdown("### 📈 Risk Summary Metrics")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        high_risk_count = sum(1 for data in risk_report['risk_categories'].values() if data['level'] == 'High')
+        st.metric("High Risk Categories", high_risk_count)
+    
+    with col2:
+        medium_risk_count = sum(1 for data in risk_report['risk_categories'].values() if data['level'] == 'Medium')
+        st.metric("Medium Risk Categories", medium_risk_count)
+    
+    with col3:
+        low_risk_count = sum(1 for data in risk_report['risk_categories'].values() if data['level'] == 'Low')
+        st.metric("Low Risk Categories", low_risk_count)
+    
+    with col4:
+        total_factors = sum(len(data['factors']) for data in risk_report['risk_categories'].values())
+        st.metric("Total Risk Factors", total_factors)
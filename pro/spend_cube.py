@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+
+# Dimensions a rollup can group or filter by
+SPEND_DIMENSIONS = ['month', 'category', 'department', 'supplier_name', 'budget_code']
+
+# Purchase order keys the cells are stored on
+CELL_KEYS = ['month', 'item_id', 'department', 'supplier_id', 'budget_code']
+
+# Dimensions resolved from a cell key through a lookup table: (cell key, lookup table argument, label column)
+LOOKUP_DIMENSIONS = {
+    'category': ('item_id', 'items_data', 'category'),
+    'supplier_name': ('supplier_id', 'suppliers', 'supplier_name')
+}
+
+MEASURES = ['total_spend', 'po_count']
+
+def _factorize(values):
+    """Codes (-1 for missing) and sorted labels of a column."""
+    codes, labels = pd.factorize(values, sort=True)
+    return codes.astype(np.int64), pd.Index(labels)
+
+def _group(code_columns, cardinalities):
+    """Group rows by several code columns: (inverse per row, code columns of each group), groups in label order."""
+    # Codes are shifted by one so that missing (-1) sorts first, as its own group
+    shifted = tuple(codes + 1 for codes in code_columns)
+    dims = tuple(card + 1 for card in cardinalities)
+    try:
+        keys = np.ravel_multi_index(shifted, dims)
+    except ValueError:
+        # Too many combinations for one int64 key; group the code rows directly
+        rows, inverse = np.unique(np.column_stack(shifted), axis=0, return_inverse=True)
+        return inverse.ravel(), [rows[:, i] - 1 for i in range(len(dims))]
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    return inverse, [codes - 1 for codes in np.unravel_index(unique_keys, dims)]
+
+class SpendCube:
+    """
+    Pre-aggregated purchase order spend.
+
+    Spend and PO count are summed once per (month, item, department,
+    supplier, budget code) cell. Category and supplier name are resolved
+    per cell through the item and supplier tables at query time, so one
+    cube per purchase order table answers every rollup and drill-down
+    without another pass over the orders. Inputs are never modified.
+    """
+
+    def __init__(self, purchase_orders):
+        n_rows = len(purchase_orders)
+        spend = (purchase_orders['quantity'] * purchase_orders['unit_price']).to_numpy(dtype=float) \
+            if {'quantity', 'unit_price'} <= set(purchase_orders.columns) else np.zeros(n_rows)
+        spend = np.nan_to_num(spend, nan=0.0)
+
+        codes, self.labels = [], {}
+        for key in CELL_KEYS:
+            if key == 'month' and 'order_date' in purchase_orders.columns:
+                values = pd.to_datetime(purchase_orders['order_date'], errors='coerce').dt.to_period('M')
+                key_codes, labels = _factorize(values)
+                labels = pd.Index(labels.astype(str))
+            elif key in purchase_orders.columns:
+                key_codes, labels = _factorize(purchase_orders[key])
+            else:
+                key_codes, labels = np.full(n_rows, -1, dtype=np.int64), pd.Index([])
+            codes.append(key_codes)
+            self.labels[key] = labels
+        self.available = {key for key in CELL_KEYS if key in purchase_orders.columns or (key == 'month' and 'order_date' in purchase_orders.columns)}
+
+        inverse, cell_codes = _group(codes, [len(self.labels[key]) for key in CELL_KEYS])
+        self.codes = dict(zip(CELL_KEYS, cell_codes))
+        self.total_spend = np.bincount(inverse, weights=spend, minlength=len(cell_codes[0]))
+        self.po_count = np.bincount(inverse, minlength=len(cell_codes[0]))
+        self.n_orders = n_rows
+
+    @property
+    def n_cells(self):
+        return len(self.total_spend)
+
+    @property
+    def nbytes(self):
+        """Memory held by the cell arrays and dimension labels."""
+        arrays = [self.total_spend, self.po_count] + list(self.codes.values())
+        return int(sum(array.nbytes for array in arrays) + sum(labels.memory_usage(deep=True) for labels in self.labels.values()))
+
+    def dimension(self, name, items_data=None, suppliers=None):
+        """Per-cell codes and labels of a dimension, or None when the data for it is missing."""
+        if name in self.codes:
+            return (self.codes[name], self.labels[name]) if name in self.available else None
+        key, table_arg, label_col = LOOKUP_DIMENSIONS[name]
+        table = {'items_data': items_data, 'suppliers': suppliers}[table_arg]
+        if key not in self.available or table is None or table.empty or key not in table.columns or label_col not in table.columns:
+            return None
+        # First row per key, like a lookup into a master table
+        lookup = table.drop_duplicates(key).set_index(key)[label_col]
+        key_codes, labels = _factorize(lookup.reindex(self.labels[key]).to_numpy())
+        cell_keys = self.codes[key]
+        return np.where(cell_keys >= 0, key_codes[np.maximum(cell_keys, 0)], -1), labels
+
+    def rollup(self, dimensions, filters=None, items_data=None, suppliers=None, unknown=None):
+        """
+        Spend and PO count grouped by dimensions, in label order.
+
+        filters maps a dimension to a label or list of labels to keep.
+        Cells missing a grouped dimension are dropped, unless unknown gives
+        a label to report them under. Returns None if a dimension is unavailable.
+        """
+        unknown = unknown or {}
+        mask = np.ones(self.n_cells, dtype=bool)
+        for name, wanted in (filters or {}).items():
+            resolved = self.dimension(name, items_data, suppliers)
+            if resolved is None:
+                return None
+            codes, labels = resolved
+            wanted = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+            wanted_codes = labels.get_indexer(list(wanted))
+            mask &= np.isin(codes, wanted_codes[wanted_codes >= 0])
+
+        group_codes, group_labels = [], []
+        for name in dimensions:
+            resolved = self.dimension(name, items_data, suppliers)
+            if resolved is None:
+                return None
+            codes, labels = resolved
+            label = unknown.get(name)
+            if label is not None:
+                if label not in labels:
+                    labels = labels.append(pd.Index([label]))
+                codes = np.where(codes >= 0, codes, labels.get_loc(label))
+            mask &= codes >= 0
+            group_codes.append(codes)
+            group_labels.append(labels)
+
+        total_spend, po_count = self.total_spend[mask], self.po_count[mask]
+        if not dimensions:
+            return pd.DataFrame({'total_spend': [total_spend.sum()], 'po_count': [int(po_count.sum())]})
+
+        inverse, codes = _group([codes[mask] for codes in group_codes], [len(labels) for labels in group_labels])
+        n_groups = len(codes[0])
+        result = pd.DataFrame({
+            name: labels.take(group) for name, labels, group in zip(dimensions, group_labels, codes)
+        })
+        result['total_spend'] = np.bincount(inverse, weights=total_spend, minlength=n_groups)
+        result['po_count'] = np.bincount(inverse, weights=po_count, minlength=n_groups).astype(int)
+        return result
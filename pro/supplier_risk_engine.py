@@ -0,0 +1,279 @@
+import numpy as np
+import pandas as pd
+
+# Risk components in scoring order; each is a 0-100 score per supplier
+RISK_COMPONENTS = [
+    'financial_risk',
+    'concentration_risk',
+    'geographic_risk',
+    'performance_risk',
+    'defect_risk',
+    'contract_risk',
+    'expiry_risk',
+    'compliance_risk',
+    'diversity_risk'
+]
+
+DEFAULT_RISK_WEIGHTS = {
+    'financial_risk': 0.20,
+    'concentration_risk': 0.25,
+    'geographic_risk': 0.15,
+    'performance_risk': 0.20,
+    'defect_risk': 0.10,
+    'contract_risk': 0.05,
+    'expiry_risk': 0.02,
+    'compliance_risk': 0.02,
+    'diversity_risk': 0.01
+}
+
+RISK_LEVEL_BINS = [0, 30, 60, 100]
+RISK_LEVEL_LABELS = ['Low', 'Medium', 'High']
+
+def _merged_column_source(left, right, col, key):
+    """Which frame a column comes from after left.merge(right, on=key), or None if it collides (suffixed)."""
+    if col == key:
+        return 'left'
+    in_left, in_right = col in left.columns, col in right.columns
+    if in_left and in_right:
+        return None
+    if in_left:
+        return 'left'
+    if in_right:
+        return 'right'
+    return None
+
+def _group_sum(codes, values, n_groups):
+    """Sum values per group code, ignoring rows whose code is -1 or value is NaN."""
+    valid = (codes >= 0) & ~np.isnan(values)
+    return np.bincount(codes[valid], weights=values[valid], minlength=n_groups)
+
+def _group_count(codes, mask, n_groups):
+    """Count rows per group code where mask is True."""
+    valid = (codes >= 0) & mask
+    return np.bincount(codes[valid], minlength=n_groups).astype(float)
+
+def _flag_score(values, no_score, yes_score, other_score):
+    """Score a Yes/No flag column: missing or 'No' -> no_score, 'Yes' -> yes_score, anything else -> other_score."""
+    missing = pd.isna(values)
+    return np.select(
+        [missing | (values == 'No'), values == 'Yes'],
+        [no_score, yes_score],
+        default=other_score
+    ).astype(float)
+
+class SupplierRiskEngine:
+    """
+    Columnar supplier risk scoring.
+
+    The joins and aggregations run once when the engine is built and leave
+    every risk component as a NumPy vector aligned with the supplier rows.
+    Scoring is then a single matrix-vector product, so new weights re-score
+    all suppliers without touching the source tables. Inputs are never modified.
+    """
+
+    def __init__(self, suppliers, purchase_orders, deliveries=None, invoices=None, contracts=None, today=None):
+        self.suppliers = suppliers
+        self.today = pd.Timestamp.now() if today is None else pd.Timestamp(today)
+        self.columns = {}
+
+        n_rows = len(suppliers)
+        supplier_codes, supplier_ids = pd.factorize(suppliers['supplier_id'])
+        n_ids = len(supplier_ids)
+
+        def per_row(values_by_id):
+            """Broadcast per-supplier-id values to the supplier rows."""
+            out = np.full(n_rows, np.nan)
+            known = supplier_codes >= 0
+            out[known] = values_by_id[supplier_codes[known]]
+            return out
+
+        def codes_for(ids):
+            return pd.Index(supplier_ids).get_indexer(ids)
+
+        # Spend and concentration
+        po_codes = codes_for(purchase_orders['supplier_id'])
+        po_spend = (purchase_orders['quantity'] * purchase_orders['unit_price']).to_numpy(dtype=float)
+        total_spend = per_row(_group_sum(po_codes, po_spend, n_ids))
+        total_spend = np.nan_to_num(total_spend, nan=0.0)
+        spend_sum = total_spend.sum()
+        spend_percentage = total_spend / spend_sum * 100 if spend_sum > 0 else np.zeros(n_rows)
+        self.columns['total_spend'] = total_spend
+        self.columns['spend_percentage'] = spend_percentage
+
+        # 1. Financial risk: higher ESG = lower financial risk
+        if 'esg_score' in suppliers.columns:
+            esg = pd.to_numeric(suppliers['esg_score'], errors='coerce').to_numpy(dtype=float)
+            esg = np.where(np.isnan(esg), 50.0, esg)
+        else:
+            esg = np.full(n_rows, 50.0)
+        self.columns['esg_score'] = esg
+        self.columns['financial_risk'] = 100 - esg
+
+        # 2. Concentration risk: share of spend relative to the largest supplier
+        max_spend_pct = spend_percentage.max() if n_rows else 0
+        self.columns['concentration_risk'] = spend_percentage / max_spend_pct * 100 if max_spend_pct > 0 else np.zeros(n_rows)
+
+        # 3. Geographic risk: fewer suppliers in a country = higher risk
+        if 'country' in suppliers.columns:
+            country_codes, countries = pd.factorize(suppliers['country'])
+            counts = np.bincount(country_codes[country_codes >= 0], minlength=len(countries)).astype(float)
+            country_count = np.where(country_codes >= 0, counts[np.maximum(country_codes, 0)], np.nan)
+            self.columns['country_supplier_count'] = country_count
+            self.columns['geographic_risk'] = np.minimum(1 / country_count * 100, 100)
+        else:
+            self.columns['geographic_risk'] = np.full(n_rows, 50.0)
+
+        # 4. Performance and defect risk from deliveries
+        if deliveries is None or deliveries.empty or not self._score_performance(purchase_orders, deliveries, codes_for, per_row, n_ids):
+            self.columns['performance_risk'] = np.full(n_rows, 50.0)
+            self.columns['defect_risk'] = np.zeros(n_rows)
+
+        # 5. Contract value and expiry risk
+        if contracts is not None and not contracts.empty:
+            self._score_contracts(contracts, codes_for, per_row, n_ids)
+        else:
+            self.columns['contract_risk'] = np.zeros(n_rows)
+            self.columns['expiry_risk'] = np.full(n_rows, 50.0)
+
+        # 6. Compliance risk: suppliers without certifications are riskier
+        if 'certification_status' in suppliers.columns:
+            self.columns['compliance_risk'] = _flag_score(suppliers['certification_status'].to_numpy(dtype=object), 80, 20, 50)
+        else:
+            self.columns['compliance_risk'] = np.full(n_rows, 50.0)
+
+        # 7. Diversity risk
+        if 'diversity_flag' in suppliers.columns:
+            self.columns['diversity_risk'] = _flag_score(suppliers['diversity_flag'].to_numpy(dtype=object), 30, 10, 20)
+        else:
+            self.columns['diversity_risk'] = np.full(n_rows, 30.0)
+
+        # Supplier x component matrix used for every re-weighting
+        self.component_matrix = np.column_stack([self.columns[c] for c in RISK_COMPONENTS]) if n_rows else np.empty((0, len(RISK_COMPONENTS)))
+
+    def _score_performance(self, purchase_orders, deliveries, codes_for, per_row, n_ids):
+        """On-time and defect components from purchase orders joined to deliveries on po_id; False if the dates are unavailable."""
+        actual_src = _merged_column_source(purchase_orders, deliveries, 'delivery_date_actual', 'po_id')
+        expected_src = _merged_column_source(purchase_orders, deliveries, 'delivery_date', 'po_id')
+        if actual_src is None or expected_src is None:
+            return False
+
+        # Join only the columns the components need
+        sources = {
+            'delivery_date_actual': actual_src,
+            'delivery_date': expected_src,
+            'defect_flag': _merged_column_source(purchase_orders, deliveries, 'defect_flag', 'po_id')
+        }
+        left_cols = ['po_id', 'supplier_id'] + [col for col, src in sources.items() if src == 'left']
+        right_cols = ['po_id'] + [col for col, src in sources.items() if src == 'right']
+        joined = purchase_orders[left_cols].merge(deliveries[right_cols], on='po_id', how='left')
+
+        codes = codes_for(joined['supplier_id'])
+        on_time = (pd.to_datetime(joined['delivery_date_actual']) <= pd.to_datetime(joined['delivery_date'])).to_numpy(dtype=float)
+        if 'defect_flag' in joined.columns:
+            defects = pd.to_numeric(joined['defect_flag'], errors='coerce').to_numpy(dtype=float)
+        else:
+            defects = np.zeros(len(joined))
+
+        row_counts = _group_count(codes, np.ones(len(joined), dtype=bool), n_ids)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            on_time_rate = _group_sum(codes, on_time, n_ids) / row_counts
+        on_time_rate = per_row(on_time_rate)
+        on_time_rate = np.where(np.isnan(on_time_rate), 0.5, on_time_rate)
+
+        defect_count = np.nan_to_num(per_row(_group_sum(codes, defects, n_ids)), nan=0.0)
+        order_count = np.nan_to_num(per_row(_group_count(codes, joined['po_id'].notna().to_numpy(), n_ids)), nan=0.0)
+
+        self.columns['on_time_rate'] = on_time_rate
+        self.columns['defect_count'] = defect_count
+        self.columns['order_count'] = order_count
+        self.columns['performance_risk'] = (1 - on_time_rate) * 100
+        max_defects = defect_count.max() if len(defect_count) else 0
+        self.columns['defect_risk'] = defect_count / max_defects * 100 if max_defects > 0 else np.zeros(len(defect_count))
+        return True
+
+    def _score_contracts(self, contracts, codes_for, per_row, n_ids):
+        """Contract value concentration and time-to-expiry components."""
+        codes = codes_for(contracts['supplier_id'])
+        values = pd.to_numeric(contracts['contract_value'], errors='coerce').to_numpy(dtype=float)
+        contract_value = np.nan_to_num(per_row(_group_sum(codes, values, n_ids)), nan=0.0)
+        contract_count = np.nan_to_num(per_row(_group_count(codes, contracts['contract_id'].notna().to_numpy(), n_ids)), nan=0.0)
+
+        max_value = contract_value.max() if len(contract_value) else 0
+
+        # Earliest expiry per supplier: minimum over int64 nanoseconds, NaT as +inf
+        earliest = np.full(len(contract_value), np.inf)
+        date_dtype = np.dtype('datetime64[ns]')
+        date_column = next((col for col in ['end_date', 'expiry_date', 'contract_end_date'] if col in contracts.columns), None)
+        if date_column is not None:
+            expiry_dates = pd.to_datetime(contracts[date_column], errors='coerce')
+            date_dtype = expiry_dates.dtype if isinstance(expiry_dates.dtype, np.dtype) else date_dtype
+            expiry = expiry_dates.to_numpy(dtype='datetime64[ns]')
+            expiry_ns = np.where(np.isnat(expiry), np.inf, expiry.astype(np.int64).astype(float))
+            earliest_by_id = np.full(n_ids, np.inf)
+            valid = codes >= 0
+            np.minimum.at(earliest_by_id, codes[valid], expiry_ns[valid])
+            earliest = per_row(earliest_by_id)
+        has_expiry = np.isfinite(earliest)
+        earliest_dates = np.full(len(earliest), np.datetime64('NaT'), dtype='datetime64[ns]')
+        earliest_dates[has_expiry] = earliest[has_expiry].astype(np.int64).astype('datetime64[ns]')
+
+        self.columns['total_contract_value'] = contract_value
+        self.columns['contract_count'] = contract_count
+        self.columns['earliest_expiry'] = earliest_dates.astype(date_dtype)
+        self.columns['contract_risk'] = contract_value / max_value * 100 if max_value > 0 else np.zeros(len(contract_value))
+        if not has_expiry.any():
+            self.columns['expiry_risk'] = np.full(len(contract_value), 50.0)
+            return
+
+        days_to_expiry = np.floor((earliest - self.today.value) / 86_400_000_000_000)
+        days_to_expiry[~has_expiry] = np.nan
+        self.columns['days_to_expiry'] = days_to_expiry
+        expiry_risk = np.clip((365 - days_to_expiry) / 365 * 100, 0, 100)
+        self.columns['expiry_risk'] = np.where(np.isnan(expiry_risk), 50.0, expiry_risk)
+
+    @property
+    def nbytes(self):
+        """Memory held by the component vectors."""
+        return int(self.component_matrix.nbytes + sum(values.nbytes for values in self.columns.values()))
+
+    @staticmethod
+    def weight_vector(weights=None):
+        """Turn a {component: weight} mapping into a vector in RISK_COMPONENTS order, rescaled to sum to 1."""
+        weights = DEFAULT_RISK_WEIGHTS if weights is None else weights
+        vector = np.array([float(weights.get(c, 0.0)) for c in RISK_COMPONENTS])
+        total = vector.sum()
+        if total > 0 and not np.isclose(total, 1.0):
+            vector = vector / total
+        return vector
+
+    def score(self, weights=None):
+        """Weighted total risk score (0-100) per supplier row."""
+        return self.component_matrix @ self.weight_vector(weights)
+
+    @staticmethod
+    def risk_levels(scores):
+        """Low / Medium / High category for each score."""
+        return pd.cut(scores, bins=RISK_LEVEL_BINS, labels=RISK_LEVEL_LABELS, include_lowest=True)
+
+    @staticmethod
+    def level_counts(scores):
+        """Number of high, medium and low risk suppliers."""
+        return (
+            int(np.count_nonzero(scores > 60)),
+            int(np.count_nonzero((scores > 30) & (scores <= 60))),
+            int(np.count_nonzero(scores <= 30))
+        )
+
+    def summary_message(self, scores):
+        high, medium, low = self.level_counts(scores)
+        return f"{high} high-risk, {medium} medium-risk, {low} low-risk suppliers identified"
+
+    def to_frame(self, weights=None):
+        """Supplier table with every risk component, the total score and risk level, highest risk first."""
+        risk_data = self.suppliers.reset_index(drop=True).copy()
+        for col, values in self.columns.items():
+            risk_data[col] = values
+        scores = self.score(weights)
+        risk_data['total_risk_score'] = scores
+        risk_data['risk_level'] = self.risk_levels(scores)
+        return risk_data.sort_values('total_risk_score', ascending=False)
@@ -1,7 +1,4 @@
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import streamlit as st
 from typing import Tuple, Dict, Any, Optional
 
 # Standard column name mappings
@@ -77,103 +74,12 @@ COLUMN_MAPPINGS = {
     }
 }
 
-def safe_dataframe_operation(df: pd.DataFrame, operation: str, **kwargs) -> pd.DataFrame:
-    """Safely perform DataFrame operations with error handling"""
-    if df.empty:
-        return pd.DataFrame()
-    
-    try:
-        if operation == 'merge':
-            return df.merge(**kwargs)
-        elif operation == 'groupby':
-            return df.groupby(**kwargs)
-        elif operation == 'sort_values':
-            return df.sort_values(**kwargs)
-        elif operation == 'head':
-            return df.head(**kwargs)
-        elif operation == 'tail':
-            return df.tail(**kwargs)
-        else:
-            return df
-    except Exception as e:
-        st.error(f"Error in DataFrame operation: {e}")
-        return pd.DataFrame()
-
 def calculate_total_spend(df: pd.DataFrame) -> float:
     """Calculate total spend from purchase orders DataFrame"""
     if df.empty or 'quantity' not in df.columns or 'unit_price' not in df.columns:
         return 0.0
     return (df['quantity'] * df['unit_price']).sum()
 
-def create_standard_chart(data: pd.DataFrame, chart_type: str, **kwargs) -> Any:
-    """Create standardized charts with consistent styling"""
-    if data.empty:
-        return None
-    
-    try:
-        if chart_type == 'bar':
-            fig = px.bar(data, **kwargs)
-        elif chart_type == 'pie':
-            fig = px.pie(data, **kwargs)
-        elif chart_type == 'line':
-            fig = px.line(data, **kwargs)
-        elif chart_type == 'scatter':
-            fig = px.scatter(data, **kwargs)
-        elif chart_type == 'histogram':
-            fig = px.histogram(data, **kwargs)
-        else:
-            return None
-        
-        # Apply standard styling
-        fig.update_layout(
-            title_font_size=18,
-            title_font_color='#1e3c72',
-            showlegend=True,
-            legend=dict(bgcolor='rgba(255,255,255,0.8)'),
-            xaxis_tickangle=-45
-        )
-        
-        return fig
-    except Exception as e:
-        st.error(f"Error creating chart: {e}")
-        return None
-
-def display_metric_card(title: str, value: str, color: str = "blue") -> None:
-    """Display standardized metric cards"""
-    color_classes = {
-        "blue": "metric-card-blue",
-        "red": "metric-card-red", 
-        "orange": "metric-card-orange",
-        "teal": "metric-card-teal",
-        "green": "metric-card-green"
-    }
-    
-    css_class = color_classes.get(color, "metric-card-blue")
-    
-    st.markdown(f"""
-    <div class="{css_class}">
-        <h4 style="color: white; margin: 0; font-size: 14px;">{title}</h4>
-        <h2 style="color: white; margin: 5px 0; font-size: 24px;">{value}</h2>
-    </div>
-    """, unsafe_allow_html=True)
-
-def display_dataframe_with_index(df: pd.DataFrame, **kwargs) -> None:
-    """Display dataframe with standardized formatting"""
-    if not df.empty:
-        df_display = df.reset_index(drop=True)
-        df_display.index = df_display.index + 1
-        st.dataframe(df_display, **kwargs)
-    else:
-        st.dataframe(df, **kwargs)
-
-def validate_dataframe_columns(df: pd.DataFrame, required_columns: list, table_name: str) -> bool:
-    """Validate DataFrame has required columns"""
-    missing_columns = [col for col in required_columns if col not in df.columns]
-    if missing_columns:
-        st.error(f"Missing required columns in {table_name}: {', '.join(missing_columns)}")
-        return False
-    return True
-
 def get_summary_metrics(purchase_orders: pd.DataFrame, suppliers: pd.DataFrame, 
                        items: pd.DataFrame, deliveries: pd.DataFrame) -> Dict[str, Any]:
     """Calculate standardized summary metrics"""
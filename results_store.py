@@ -0,0 +1,177 @@
+import os
+import re
+import sys
+import json
+import pickle
+import hashlib
+import threading
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+import pandas as pd
+
+DEFAULT_RESULTS_DIR = os.environ.get(
+    'AZ_RESULTS_STORE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results_store')
+)
+
+INDEX_FILE = 'index.json'
+
+# Bumped whenever the payload layout changes; older payloads are ignored
+PAYLOAD_FORMAT = 1
+
+INDEX_COLUMNS = ['department', 'group', 'function', 'computed_at', 'seconds', 'size_bytes', 'digest']
+
+# Wall-clock reads (datetime.now(), Timestamp.now(), date.today(), 'today') in a module's source
+_CLOCK_PATTERN = re.compile(rb"\.(?:now|utcnow|today)\(|['\"](?:now|today)['\"]")
+
+_source_hashes = {}
+
+def _module_source(func: Callable) -> Tuple[str, bool]:
+    """(SHA-256, reads the wall clock) of the source file defining func, cached by modification time."""
+    module = sys.modules.get(func.__module__)
+    path = getattr(module, '__file__', None)
+    if not path:
+        return '', False
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return '', False
+    cached = _source_hashes.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with open(path, 'rb') as f:
+        source = f.read()
+    info = (hashlib.sha256(source).hexdigest(), bool(_CLOCK_PATTERN.search(source)))
+    _source_hashes[path] = (mtime, info)
+    return info
+
+def module_source_hash(func: Callable) -> str:
+    """
+    SHA-256 of the source file defining func, cached by modification time.
+
+    Stored results are keyed on the whole module file, so editing any metric
+    (or a helper next to it) invalidates that module's precomputed results.
+    """
+    return _module_source(func)[0]
+
+def result_digest(func: Callable, cache_key: tuple) -> str:
+    """
+    Stable file name for a metric result: its metric cache key plus the defining module's source.
+
+    Results of modules that read the current date or time (e.g. days until
+    a contract expires) also carry today's date, so they expire daily.
+    """
+    source_hash, reads_clock = _module_source(func)
+    hasher = hashlib.sha256()
+    hasher.update(repr(cache_key).encode('utf-8'))
+    hasher.update(source_hash.encode('ascii'))
+    if reads_clock:
+        hasher.update(date.today().isoformat().encode('ascii'))
+    return hasher.hexdigest()
+
+class ResultsStore:
+    """
+    On-disk store of precomputed metric results, written by batch_precompute.py.
+
+    Each result is a pickle named by result_digest, so a dashboard asking for
+    the same metric on the same inputs finds it without knowing how it was
+    produced. index.json lists what is stored and is written by one process only.
+    """
+
+    def __init__(self, results_dir: Optional[str] = None):
+        self.results_dir = results_dir or DEFAULT_RESULTS_DIR
+        self.enabled = os.environ.get('AZ_RESULTS_STORE', '1') != '0'
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        """Whether there is a results directory to read from."""
+        return self.enabled and os.path.isdir(self.results_dir)
+
+    def result_path(self, digest: str) -> str:
+        return os.path.join(self.results_dir, f"{digest}.pkl")
+
+    def has(self, digest: str) -> bool:
+        return os.path.exists(self.result_path(digest))
+
+    def get(self, digest: str) -> Tuple[bool, Any]:
+        """Return (True, value) for a stored result, else (False, None)."""
+        if not self.available:
+            return False, None
+        try:
+            with open(self.result_path(digest), 'rb') as f:
+                payload = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError):
+            return False, None
+        # Pickled pandas objects are only trusted by the pandas version that wrote them
+        if payload.get('format') != PAYLOAD_FORMAT or payload.get('pandas') != pd.__version__:
+            return False, None
+        return True, payload['value']
+
+    def put(self, digest: str, value: Any) -> int:
+        """Write a result atomically and return its size in bytes."""
+        os.makedirs(self.results_dir, exist_ok=True)
+        path = self.result_path(digest)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        payload = {'format': PAYLOAD_FORMAT, 'pandas': pd.__version__, 'value': value}
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return os.path.getsize(path)
+
+    def read_index(self) -> Dict[str, Dict[str, Any]]:
+        """Index entries by digest, keeping only results still on disk."""
+        index_path = os.path.join(self.results_dir, INDEX_FILE)
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {digest: entry for digest, entry in entries.items() if self.has(digest)}
+
+    def update_index(self, entries: Iterable[Dict[str, Any]], replace_departments: Iterable[str] = ()):
+        """
+        Merge result entries (each with a 'digest') into the index.
+
+        Results of departments in replace_departments that are not among the
+        new entries are deleted, so re-running a department drops its stale results.
+        """
+        entries = list(entries)
+        replace_departments = set(replace_departments)
+        with self._lock:
+            index = self.read_index()
+            keep = {entry['digest'] for entry in entries}
+            for digest, entry in list(index.items()):
+                if entry.get('department') in replace_departments and digest not in keep:
+                    index.pop(digest)
+                    try:
+                        os.remove(self.result_path(digest))
+                    except OSError:
+                        pass
+            for entry in entries:
+                index[entry['digest']] = {k: v for k, v in entry.items() if k != 'digest'}
+
+            os.makedirs(self.results_dir, exist_ok=True)
+            index_path = os.path.join(self.results_dir, INDEX_FILE)
+            tmp_path = index_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(index, f, indent=2)
+            os.replace(tmp_path, index_path)
+
+    def index_frame(self) -> pd.DataFrame:
+        """Stored results as a table, most recent first."""
+        index = self.read_index()
+        if not index:
+            return pd.DataFrame(columns=INDEX_COLUMNS)
+        frame = pd.DataFrame([{**entry, 'digest': digest} for digest, entry in index.items()])
+        frame = frame.reindex(columns=INDEX_COLUMNS)
+        return frame.sort_values('computed_at', ascending=False, ignore_index=True)
+
+_store = None
+
+def get_results_store() -> ResultsStore:
+    """Return the process-wide results store."""
+    global _store
+    if _store is None:
+        _store = ResultsStore()
+    return _store
@@ -12,6 +12,14 @@ from datetime import timedelta
 
 # Import sales metric calculation functions
 from sales_metrics_calculator import *
+from sales_sample_data import generate_sales_tables, SALES_TABLES
+
+# Memoize metric calculations across reruns (available when running inside the integrated dashboard)
+try:
+    from metric_cache import cache_calculators
+    cache_calculators(globals())
+except ImportError:
+    pass
 
 # ============================================================================
 # AI Recommendation Functions
@@ -906,56 +914,61 @@ def load_custom_css():
     </style>
     """, unsafe_allow_html=True)
 
-# Initialize session state for sales data storage
-if 'customers' not in st.session_state:
-    st.session_state.customers = pd.DataFrame(columns=[
-        'customer_id', 'customer_name', 'email', 'phone', 'company', 'industry', 
-        'region', 'country', 'customer_segment', 'acquisition_date', 'status'
-    ])
+def initialize_session_state():
+    """Initialize sales data tables in session state with their empty schemas"""
+    if 'customers' not in st.session_state:
+        st.session_state.customers = pd.DataFrame(columns=[
+            'customer_id', 'customer_name', 'email', 'phone', 'company', 'industry', 
+            'region', 'country', 'customer_segment', 'acquisition_date', 'status'
+        ])
 
-if 'products' not in st.session_state:
-    st.session_state.products = pd.DataFrame(columns=[
-        'product_id', 'product_name', 'category', 'subcategory', 'unit_price', 
-        'cost_price', 'supplier_id', 'launch_date', 'status'
-    ])
+    if 'products' not in st.session_state:
+        st.session_state.products = pd.DataFrame(columns=[
+            'product_id', 'product_name', 'category', 'subcategory', 'unit_price', 
+            'cost_price', 'supplier_id', 'launch_date', 'status'
+        ])
 
-if 'sales_orders' not in st.session_state:
-    st.session_state.sales_orders = pd.DataFrame(columns=[
-        'order_id', 'customer_id', 'order_date', 'product_id', 'quantity', 
-        'unit_price', 'total_amount', 'sales_rep_id', 'region', 'channel'
-    ])
+    if 'sales_orders' not in st.session_state:
+        st.session_state.sales_orders = pd.DataFrame(columns=[
+            'order_id', 'customer_id', 'order_date', 'product_id', 'quantity', 
+            'unit_price', 'total_amount', 'sales_rep_id', 'region', 'channel'
+        ])
 
-if 'sales_reps' not in st.session_state:
-    st.session_state.sales_reps = pd.DataFrame(columns=[
-        'sales_rep_id', 'first_name', 'last_name', 'email', 'region', 'territory', 
-        'hire_date', 'quota', 'manager_id', 'status'
-    ])
+    if 'sales_reps' not in st.session_state:
+        st.session_state.sales_reps = pd.DataFrame(columns=[
+            'sales_rep_id', 'first_name', 'last_name', 'email', 'region', 'territory', 
+            'hire_date', 'quota', 'manager_id', 'status'
+        ])
 
-if 'leads' not in st.session_state:
-    st.session_state.leads = pd.DataFrame(columns=[
-        'lead_id', 'lead_name', 'email', 'company', 'industry', 'source', 
-        'created_date', 'status', 'assigned_rep_id', 'value'
-    ])
+    if 'leads' not in st.session_state:
+        st.session_state.leads = pd.DataFrame(columns=[
+            'lead_id', 'lead_name', 'email', 'company', 'industry', 'source', 
+            'created_date', 'status', 'assigned_rep_id', 'value'
+        ])
 
-if 'opportunities' not in st.session_state:
-    st.session_state.opportunities = pd.DataFrame(columns=[
-        'opportunity_id', 'lead_id', 'customer_id', 'product_id', 'value', 
-        'stage', 'created_date', 'close_date', 'probability', 'sales_rep_id'
-    ])
+    if 'opportunities' not in st.session_state:
+        st.session_state.opportunities = pd.DataFrame(columns=[
+            'opportunity_id', 'lead_id', 'customer_id', 'product_id', 'value', 
+            'stage', 'created_date', 'close_date', 'probability', 'sales_rep_id'
+        ])
 
-if 'activities' not in st.session_state:
-    st.session_state.activities = pd.DataFrame(columns=[
-        'activity_id', 'sales_rep_id', 'customer_id', 'activity_type', 'date', 
-        'duration_minutes', 'notes', 'outcome'
-    ])
+    if 'activities' not in st.session_state:
+        st.session_state.activities = pd.DataFrame(columns=[
+            'activity_id', 'sales_rep_id', 'customer_id', 'activity_type', 'date', 
+            'duration_minutes', 'notes', 'outcome'
+        ])
+
+    if 'targets' not in st.session_state:
+        st.session_state.targets = pd.DataFrame(columns=[
+            'target_id', 'sales_rep_id', 'period', 'target_amount', 'target_date', 
+            'category', 'status'
+        ])
 
-if 'targets' not in st.session_state:
-    st.session_state.targets = pd.DataFrame(columns=[
-        'target_id', 'sales_rep_id', 'period', 'target_amount', 'target_date', 
-        'category', 'status'
-    ])
 
 def main():
+    # Initialize data tables for this browser session
+    initialize_session_state()
+    
     # Load custom CSS
     load_custom_css()
     
@@ -3202,291 +3215,17 @@ def show_strategic_analytics():
 # Sample Data Generation Functions
 # ============================================================================
 
-def generate_sample_sales_data():
+def generate_sample_sales_data(n_orders=200):
     """Generate comprehensive sample data for sales analytics with 200+ records."""
     
-    # Set random seed for reproducibility
-    np.random.seed(42)
-    random.seed(42)
-    
-    # Generate sample data for all tables
-    customers = generate_sample_customers(50)
-    products = generate_sample_products(30)
-    sales_reps = generate_sample_sales_reps(15)
-    sales_orders = generate_sample_sales_orders(200, customers, products, sales_reps)
-    leads = generate_sample_leads(100, sales_reps)
-    opportunities = generate_sample_opportunities(80, leads, customers, products, sales_reps)
-    activities = generate_sample_activities(150, sales_reps, customers)
-    targets = generate_sample_targets(20, sales_reps)
+    # Vectorized, seeded generation; foreign keys always reference generated rows
+    tables = generate_sales_tables(n_orders, seed=42)
     
     # Store in session state
-    st.session_state.customers = customers
-    st.session_state.products = products
-    st.session_state.sales_reps = sales_reps
-    st.session_state.sales_orders = sales_orders
-    st.session_state.leads = leads
-    st.session_state.opportunities = opportunities
-    st.session_state.activities = activities
-    st.session_state.targets = targets
-    
-    return customers, products, sales_reps, sales_orders, leads, opportunities, activities, targets
-
-def generate_sample_customers(n_customers):
-    """Generate sample customer data."""
-    
-    customer_names = [
-        'Acme Corporation', 'TechStart Inc', 'Global Solutions Ltd', 'Innovation Co',
-        'Premium Services', 'Elite Business Group', 'Future Technologies', 'Smart Solutions',
-        'Quality Products Inc', 'Advanced Systems', 'Reliable Partners', 'Excellence Corp',
-        'NextGen Industries', 'Strategic Solutions', 'Peak Performance', 'Summit Business',
-        'Pinnacle Corp', 'Apex Solutions', 'Prime Technologies', 'Core Business Group'
-    ]
-    
-    industries = ['Technology', 'Healthcare', 'Finance', 'Manufacturing', 'Retail', 'Education', 'Consulting', 'Real Estate']
-    segments = ['Enterprise', 'SMB', 'Startup', 'Individual']
-    countries = ['USA', 'Canada', 'UK', 'Germany', 'France', 'Australia', 'Japan', 'Singapore']
-    regions = ['North America', 'Europe', 'Asia Pacific', 'Middle East', 'Africa']
-    
-    data = []
-    start_date = datetime(2020, 1, 1)
-    
-    for i in range(n_customers):
-        acquisition_date = start_date + timedelta(days=random.randint(0, 1000))
-        
-        data.append({
-            'customer_id': f'CUST-{str(i+1).zfill(3)}',
-            'customer_name': random.choice(customer_names) + f' {i+1}',
-            'email': f'customer{i+1}@example.com',
-            'phone': f'+1-555-{random.randint(100, 999)}-{random.randint(1000, 9999)}',
-            'company': random.choice(customer_names) + f' {i+1}',
-            'industry': random.choice(industries),
-            'region': random.choice(regions),
-            'country': random.choice(countries),
-            'customer_segment': random.choice(segments),
-            'acquisition_date': acquisition_date,
-            'status': random.choice(['Active', 'Active', 'Active', 'Inactive', 'Churned'])
-        })
-    
-    return pd.DataFrame(data)
-
-def generate_sample_products(n_products):
-    """Generate sample product data."""
-    
-    product_names = [
-        'Premium Software Suite', 'Enterprise Solution', 'Cloud Platform', 'Mobile App',
-        'Analytics Dashboard', 'CRM System', 'ERP Solution', 'Security Suite',
-        'Collaboration Tool', 'Project Management', 'Data Analytics', 'AI Platform',
-        'IoT Solution', 'Blockchain Platform', 'Machine Learning Tool', 'API Gateway',
-        'Database System', 'Web Application', 'Desktop Software', 'Mobile Platform'
-    ]
-    
-    categories = ['Software', 'Platform', 'Service', 'Solution', 'Tool', 'System']
-    subcategories = ['Enterprise', 'Cloud', 'Mobile', 'Web', 'Desktop', 'API', 'Database']
-    
-    data = []
-    start_date = datetime(2020, 1, 1)
-    
-    for i in range(n_products):
-        launch_date = start_date + timedelta(days=random.randint(0, 1000))
-        unit_price = round(random.uniform(50, 5000), 2)
-        cost_price = round(unit_price * random.uniform(0.3, 0.7), 2)
-        
-        data.append({
-            'product_id': f'PROD-{str(i+1).zfill(3)}',
-            'product_name': random.choice(product_names) + f' {i+1}',
-            'category': random.choice(categories),
-            'subcategory': random.choice(subcategories),
-            'unit_price': unit_price,
-            'cost_price': cost_price,
-            'supplier_id': f'SUP-{random.randint(1, 10)}',
-            'launch_date': launch_date,
-            'status': random.choice(['Active', 'Active', 'Active', 'Coming Soon', 'Discontinued'])
-        })
-    
-    return pd.DataFrame(data)
-
-def generate_sample_sales_reps(n_reps):
-    """Generate sample sales representative data."""
-    
-    first_names = ['John', 'Sarah', 'Michael', 'Emily', 'David', 'Lisa', 'Robert', 'Jennifer', 'James', 'Amanda']
-    last_names = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez']
-    
-    regions = ['North America', 'Europe', 'Asia Pacific', 'Middle East', 'Africa']
-    territories = ['East Coast', 'West Coast', 'Central', 'Northern', 'Southern', 'International']
-    
-    data = []
-    start_date = datetime(2018, 1, 1)
-    
-    for i in range(n_reps):
-        hire_date = start_date + timedelta(days=random.randint(0, 1500))
-        quota = round(random.uniform(50000, 500000), 2)
-        
-        data.append({
-            'sales_rep_id': f'REP-{str(i+1).zfill(3)}',
-            'first_name': random.choice(first_names),
-            'last_name': random.choice(last_names),
-            'email': f'rep{i+1}@company.com',
-            'region': random.choice(regions),
-            'territory': random.choice(territories),
-            'hire_date': hire_date,
-            'quota': quota,
-            'manager_id': f'REP-{random.randint(1, 5)}' if i >= 5 else None,
-            'status': random.choice(['Active', 'Active', 'Active', 'Inactive'])
-        })
-    
-    return pd.DataFrame(data)
-
-def generate_sample_sales_orders(n_orders, customers, products, sales_reps):
-    """Generate sample sales orders data."""
-    
-    channels = ['Online', 'In-Store', 'Phone', 'Partner']
-    
-    data = []
-    start_date = datetime(2023, 1, 1)
-    
-    for i in range(n_orders):
-        order_date = start_date + timedelta(days=random.randint(0, 365))
-        customer = customers.iloc[random.randint(0, len(customers)-1)]
-        product = products.iloc[random.randint(0, len(products)-1)]
-        sales_rep = sales_reps.iloc[random.randint(0, len(sales_reps)-1)]
-        
-        quantity = random.randint(1, 10)
-        unit_price = product['unit_price']
-        total_amount = quantity * unit_price
-        
-        data.append({
-            'order_id': f'ORD-{str(i+1).zfill(4)}',
-            'customer_id': customer['customer_id'],
-            'order_date': order_date,
-            'product_id': product['product_id'],
-            'quantity': quantity,
-            'unit_price': unit_price,
-            'total_amount': total_amount,
-            'sales_rep_id': sales_rep['sales_rep_id'],
-            'region': customer['region'],
-            'channel': random.choice(channels)
-        })
-    
-    return pd.DataFrame(data)
-
-def generate_sample_leads(n_leads, sales_reps):
-    """Generate sample leads data."""
-    
-    sources = ['Website', 'Referral', 'Cold Call', 'Trade Show', 'Social Media', 'Email Campaign']
-    statuses = ['New', 'Contacted', 'Qualified', 'Proposal', 'Negotiation', 'Closed Won', 'Closed Lost']
-    
-    data = []
-    start_date = datetime(2023, 1, 1)
-    
-    for i in range(n_leads):
-        created_date = start_date + timedelta(days=random.randint(0, 365))
-        sales_rep = sales_reps.iloc[random.randint(0, len(sales_reps)-1)]
-        value = round(random.uniform(5000, 100000), 2)
-        
-        data.append({
-            'lead_id': f'LEAD-{str(i+1).zfill(4)}',
-            'lead_name': f'Lead {i+1}',
-            'email': f'lead{i+1}@example.com',
-            'company': f'Company {i+1}',
-            'industry': random.choice(['Technology', 'Healthcare', 'Finance', 'Manufacturing', 'Retail']),
-            'source': random.choice(sources),
-            'created_date': created_date,
-            'status': random.choice(statuses),
-            'assigned_rep_id': sales_rep['sales_rep_id'],
-            'value': value
-        })
-    
-    return pd.DataFrame(data)
-
-def generate_sample_opportunities(n_opportunities, leads, customers, products, sales_reps):
-    """Generate sample opportunities data."""
-    
-    stages = ['Prospecting', 'Qualification', 'Proposal', 'Negotiation', 'Closed Won', 'Closed Lost']
-    
-    data = []
-    start_date = datetime(2023, 1, 1)
-    
-    for i in range(n_opportunities):
-        created_date = start_date + timedelta(days=random.randint(0, 365))
-        close_date = created_date + timedelta(days=random.randint(30, 180))
-        
-        lead = leads.iloc[random.randint(0, len(leads)-1)]
-        customer = customers.iloc[random.randint(0, len(customers)-1)]
-        product = products.iloc[random.randint(0, len(products)-1)]
-        sales_rep = sales_reps.iloc[random.randint(0, len(sales_reps)-1)]
-        
-        value = round(random.uniform(10000, 200000), 2)
-        probability = random.choice([10, 25, 50, 75, 90])
-        
-        data.append({
-            'opportunity_id': f'OPP-{str(i+1).zfill(4)}',
-            'lead_id': lead['lead_id'],
-            'customer_id': customer['customer_id'],
-            'product_id': product['product_id'],
-            'value': value,
-            'stage': random.choice(stages),
-            'created_date': created_date,
-            'close_date': close_date,
-            'probability': probability,
-            'sales_rep_id': sales_rep['sales_rep_id']
-        })
-    
-    return pd.DataFrame(data)
-
-def generate_sample_activities(n_activities, sales_reps, customers):
-    """Generate sample activities data."""
-    
-    activity_types = ['Call', 'Meeting', 'Email', 'Demo', 'Proposal', 'Follow-up']
-    outcomes = ['Positive', 'Neutral', 'Negative', 'Follow-up Required']
-    
-    data = []
-    start_date = datetime(2023, 1, 1)
-    
-    for i in range(n_activities):
-        date = start_date + timedelta(days=random.randint(0, 365))
-        sales_rep = sales_reps.iloc[random.randint(0, len(sales_reps)-1)]
-        customer = customers.iloc[random.randint(0, len(customers)-1)]
-        
-        duration_minutes = random.randint(15, 120)
-        
-        data.append({
-            'activity_id': f'ACT-{str(i+1).zfill(4)}',
-            'sales_rep_id': sales_rep['sales_rep_id'],
-            'customer_id': customer['customer_id'],
-            'activity_type': random.choice(activity_types),
-            'date': date,
-            'duration_minutes': duration_minutes,
-            'notes': f'Activity notes for {random.choice(activity_types)} with {customer["customer_name"]}',
-            'outcome': random.choice(outcomes)
-        })
-    
-    return pd.DataFrame(data)
-
-def generate_sample_targets(n_targets, sales_reps):
-    """Generate sample targets data."""
-    
-    categories = ['Revenue', 'Deals', 'Activities', 'Leads']
-    periods = ['Q1 2024', 'Q2 2024', 'Q3 2024', 'Q4 2024', 'Annual 2024']
-    statuses = ['Active', 'Completed', 'Overdue']
-    
-    data = []
-    
-    for i in range(n_targets):
-        sales_rep = sales_reps.iloc[random.randint(0, len(sales_reps)-1)]
-        target_amount = round(random.uniform(50000, 500000), 2)
-        target_date = datetime(2024, random.randint(1, 12), random.randint(1, 28))
-        
-        data.append({
-            'target_id': f'TARGET-{str(i+1).zfill(3)}',
-            'sales_rep_id': sales_rep['sales_rep_id'],
-            'period': random.choice(periods),
-            'target_amount': target_amount,
-            'target_date': target_date,
-            'category': random.choice(categories),
-            'status': random.choice(statuses)
-        })
+    for table_name in SALES_TABLES:
+        setattr(st.session_state, table_name, tables[table_name])
     
-    return pd.DataFrame(data)
+    return tuple(tables[table_name] for table_name in SALES_TABLES)
 
 if __name__ == "__main__":
     main()
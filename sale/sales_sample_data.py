@@ -0,0 +1,325 @@
+import argparse
+import time
+import pandas as pd
+import numpy as np
+
+try:
+    from synthetic_data import (DEFAULT_GENERATOR_CHUNK_ROWS, make_rng, chunk_rng, scaled_size, sequential_ids,
+                                choose, random_dates, add_days, uniform, iter_chunk_bounds)
+    from data_export import write_table_chunks
+except ImportError:
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from synthetic_data import (DEFAULT_GENERATOR_CHUNK_ROWS, make_rng, chunk_rng, scaled_size, sequential_ids,
+                                choose, random_dates, add_days, uniform, iter_chunk_bounds)
+    from data_export import write_table_chunks
+
+# Table sizes of the default sample (200 sales orders); dimension tables grow with sqrt(scale)
+SALES_BASE_SIZES = {
+    'sales_orders': 200,
+    'customers': 50,
+    'products': 30,
+    'sales_reps': 15,
+    'targets': 20
+}
+
+# Rows of the other fact tables per sales order
+SALES_FACT_RATIOS = {
+    'leads': 0.5,
+    'opportunities': 0.4,
+    'activities': 0.75
+}
+
+# Order of the sales tables (matches the session-state tables of the Sales app)
+SALES_TABLES = ['customers', 'products', 'sales_reps', 'sales_orders', 'leads', 'opportunities', 'activities', 'targets']
+
+def _dimension_sizes(n_orders):
+    """Row counts of the dimension tables for a dataset with n_orders sales orders."""
+    scale = n_orders / SALES_BASE_SIZES['sales_orders']
+    return {name: scaled_size(size, scale) for name, size in SALES_BASE_SIZES.items() if name != 'sales_orders'}
+
+def _fact_sizes(n_orders):
+    """Row counts of the fact tables generated alongside n_orders sales orders."""
+    return {name: int(round(n_orders * ratio)) for name, ratio in SALES_FACT_RATIOS.items()}
+
+def generate_sales_dimensions(n_orders=200, seed=42):
+    """Customers, products, sales reps and targets sized for n_orders sales orders."""
+    rng = make_rng(seed)
+    sizes = _dimension_sizes(n_orders)
+    sales_reps = generate_sample_sales_reps(sizes['sales_reps'], rng)
+    return {
+        'customers': generate_sample_customers(sizes['customers'], rng),
+        'products': generate_sample_products(sizes['products'], rng),
+        'sales_reps': sales_reps,
+        'targets': generate_sample_targets(sizes['targets'], sales_reps, rng)
+    }
+
+def _fact_chunk(n_orders, start, dimensions, rng):
+    """Sales orders start+1..start+n_orders with their share of leads, opportunities and activities."""
+    # Sizes from cumulative bounds keep ids contiguous whatever the chunk size
+    starts = _fact_sizes(start)
+    sizes = {name: stop - starts[name] for name, stop in _fact_sizes(start + n_orders).items()}
+    customers, products, sales_reps = dimensions['customers'], dimensions['products'], dimensions['sales_reps']
+    leads = generate_sample_leads(sizes['leads'], sales_reps, rng, start=starts['leads'])
+    return {
+        'sales_orders': generate_sample_sales_orders(n_orders, customers, products, sales_reps, rng, start=start),
+        'leads': leads,
+        'opportunities': generate_sample_opportunities(sizes['opportunities'], leads, customers, products, sales_reps, rng,
+                                                       start=starts['opportunities']),
+        'activities': generate_sample_activities(sizes['activities'], sales_reps, customers, rng, start=starts['activities'])
+    }
+
+def generate_sales_tables(n_orders=200, seed=42):
+    """All eight sales tables in memory, with every foreign key pointing at a generated row."""
+    tables = generate_sales_dimensions(n_orders, seed)
+    tables.update(_fact_chunk(n_orders, 0, tables, chunk_rng(seed, 0)))
+    return {table_name: tables[table_name] for table_name in SALES_TABLES}
+
+def iter_sales_chunks(n_orders, chunk_rows=DEFAULT_GENERATOR_CHUNK_ROWS, seed=42):
+    """
+    Yield (table name, chunk) pairs of a sales dataset without building it in memory.
+
+    Dimension tables come first in one piece; sales orders then follow in
+    chunks of chunk_rows, each with its leads, opportunities (referencing
+    leads of the same chunk) and activities. Ids are numbered across chunks.
+    """
+    dimensions = generate_sales_dimensions(n_orders, seed)
+    for table_name in ['customers', 'products', 'sales_reps', 'targets']:
+        yield table_name, dimensions[table_name]
+    for chunk_index, start, stop in iter_chunk_bounds(n_orders, chunk_rows):
+        for table_name, chunk in _fact_chunk(stop - start, start, dimensions, chunk_rng(seed, chunk_index + 1)).items():
+            if len(chunk):
+                yield table_name, chunk
+
+def write_sales_dataset(path, n_orders, file_format='parquet', chunk_rows=DEFAULT_GENERATOR_CHUNK_ROWS, seed=42):
+    """
+    Generate a sales dataset chunk by chunk and write it to disk.
+
+    'parquet' writes one <table>.parquet per table into the directory path;
+    'xlsx' writes one sheet per table into the workbook path. Returns rows
+    written per table.
+    """
+    return write_table_chunks(iter_sales_chunks(n_orders, chunk_rows, seed), path, file_format)
+
+def _numbered(names, rng, n):
+    """Randomly chosen names with a running number appended ('Acme Corporation 7')."""
+    return choose(rng, names, n) + ' ' + sequential_ids('', 0, n)
+
+def generate_sample_customers(n_customers, rng=None):
+    """Generate sample customer data."""
+
+    rng = make_rng(rng)
+    customer_names = [
+        'Acme Corporation', 'TechStart Inc', 'Global Solutions Ltd', 'Innovation Co',
+        'Premium Services', 'Elite Business Group', 'Future Technologies', 'Smart Solutions',
+        'Quality Products Inc', 'Advanced Systems', 'Reliable Partners', 'Excellence Corp',
+        'NextGen Industries', 'Strategic Solutions', 'Peak Performance', 'Summit Business',
+        'Pinnacle Corp', 'Apex Solutions', 'Prime Technologies', 'Core Business Group'
+    ]
+
+    industries = ['Technology', 'Healthcare', 'Finance', 'Manufacturing', 'Retail', 'Education', 'Consulting', 'Real Estate']
+    segments = ['Enterprise', 'SMB', 'Startup', 'Individual']
+    countries = ['USA', 'Canada', 'UK', 'Germany', 'France', 'Australia', 'Japan', 'Singapore']
+    regions = ['North America', 'Europe', 'Asia Pacific', 'Middle East', 'Africa']
+
+    return pd.DataFrame({
+        'customer_id': sequential_ids('CUST-', 0, n_customers, 3),
+        'customer_name': _numbered(customer_names, rng, n_customers),
+        'email': 'customer' + sequential_ids('', 0, n_customers) + '@example.com',
+        'phone': ('+1-555-' + pd.Series(rng.integers(100, 1000, n_customers)).astype(str)
+                  + '-' + pd.Series(rng.integers(1000, 10000, n_customers)).astype(str)).to_numpy(dtype=object),
+        'company': _numbered(customer_names, rng, n_customers),
+        'industry': choose(rng, industries, n_customers),
+        'region': choose(rng, regions, n_customers),
+        'country': choose(rng, countries, n_customers),
+        'customer_segment': choose(rng, segments, n_customers),
+        'acquisition_date': random_dates(rng, '2020-01-01', 1000, n_customers),
+        'status': choose(rng, ['Active', 'Active', 'Active', 'Inactive', 'Churned'], n_customers)
+    })
+
+def generate_sample_products(n_products, rng=None):
+    """Generate sample product data."""
+
+    rng = make_rng(rng)
+    product_names = [
+        'Premium Software Suite', 'Enterprise Solution', 'Cloud Platform', 'Mobile App',
+        'Analytics Dashboard', 'CRM System', 'ERP Solution', 'Security Suite',
+        'Collaboration Tool', 'Project Management', 'Data Analytics', 'AI Platform',
+        'IoT Solution', 'Blockchain Platform', 'Machine Learning Tool', 'API Gateway',
+        'Database System', 'Web Application', 'Desktop Software', 'Mobile Platform'
+    ]
+
+    categories = ['Software', 'Platform', 'Service', 'Solution', 'Tool', 'System']
+    subcategories = ['Enterprise', 'Cloud', 'Mobile', 'Web', 'Desktop', 'API', 'Database']
+
+    unit_price = uniform(rng, 50, 5000, n_products, 2)
+    return pd.DataFrame({
+        'product_id': sequential_ids('PROD-', 0, n_products, 3),
+        'product_name': _numbered(product_names, rng, n_products),
+        'category': choose(rng, categories, n_products),
+        'subcategory': choose(rng, subcategories, n_products),
+        'unit_price': unit_price,
+        'cost_price': np.round(unit_price * rng.uniform(0.3, 0.7, n_products), 2),
+        'supplier_id': choose(rng, sequential_ids('SUP-', 0, 10), n_products),
+        'launch_date': random_dates(rng, '2020-01-01', 1000, n_products),
+        'status': choose(rng, ['Active', 'Active', 'Active', 'Coming Soon', 'Discontinued'], n_products)
+    })
+
+def generate_sample_sales_reps(n_reps, rng=None):
+    """Generate sample sales representative data."""
+
+    rng = make_rng(rng)
+    first_names = ['John', 'Sarah', 'Michael', 'Emily', 'David', 'Lisa', 'Robert', 'Jennifer', 'James', 'Amanda']
+    last_names = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez']
+
+    regions = ['North America', 'Europe', 'Asia Pacific', 'Middle East', 'Africa']
+    territories = ['East Coast', 'West Coast', 'Central', 'Northern', 'Southern', 'International']
+
+    # The first five reps are the managers of everyone else
+    manager_ids = choose(rng, sequential_ids('REP-', 0, min(n_reps, 5), 3), n_reps)
+    manager_ids[:5] = None
+    return pd.DataFrame({
+        'sales_rep_id': sequential_ids('REP-', 0, n_reps, 3),
+        'first_name': choose(rng, first_names, n_reps),
+        'last_name': choose(rng, last_names, n_reps),
+        'email': 'rep' + sequential_ids('', 0, n_reps) + '@company.com',
+        'region': choose(rng, regions, n_reps),
+        'territory': choose(rng, territories, n_reps),
+        'hire_date': random_dates(rng, '2018-01-01', 1500, n_reps),
+        'quota': uniform(rng, 50000, 500000, n_reps, 2),
+        'manager_id': manager_ids,
+        'status': choose(rng, ['Active', 'Active', 'Active', 'Inactive'], n_reps)
+    })
+
+def generate_sample_sales_orders(n_orders, customers, products, sales_reps, rng=None, start=0):
+    """Generate sample sales orders data."""
+
+    rng = make_rng(rng)
+    channels = ['Online', 'In-Store', 'Phone', 'Partner']
+
+    # Row positions into the dimension tables instead of per-order .iloc lookups
+    customer_rows = rng.integers(0, len(customers), n_orders)
+    product_rows = rng.integers(0, len(products), n_orders)
+    rep_rows = rng.integers(0, len(sales_reps), n_orders)
+
+    quantity = rng.integers(1, 11, n_orders)
+    unit_price = products['unit_price'].to_numpy(dtype=float)[product_rows]
+    return pd.DataFrame({
+        'order_id': sequential_ids('ORD-', start, n_orders, 4),
+        'customer_id': customers['customer_id'].to_numpy(dtype=object)[customer_rows],
+        'order_date': random_dates(rng, '2023-01-01', 365, n_orders),
+        'product_id': products['product_id'].to_numpy(dtype=object)[product_rows],
+        'quantity': quantity,
+        'unit_price': unit_price,
+        'total_amount': quantity * unit_price,
+        'sales_rep_id': sales_reps['sales_rep_id'].to_numpy(dtype=object)[rep_rows],
+        'region': customers['region'].to_numpy(dtype=object)[customer_rows],
+        'channel': choose(rng, channels, n_orders)
+    })
+
+def generate_sample_leads(n_leads, sales_reps, rng=None, start=0):
+    """Generate sample leads data."""
+
+    rng = make_rng(rng)
+    sources = ['Website', 'Referral', 'Cold Call', 'Trade Show', 'Social Media', 'Email Campaign']
+    statuses = ['New', 'Contacted', 'Qualified', 'Proposal', 'Negotiation', 'Closed Won', 'Closed Lost']
+
+    numbers = sequential_ids('', start, n_leads)
+    return pd.DataFrame({
+        'lead_id': sequential_ids('LEAD-', start, n_leads, 4),
+        'lead_name': 'Lead ' + numbers,
+        'email': 'lead' + numbers + '@example.com',
+        'company': 'Company ' + numbers,
+        'industry': choose(rng, ['Technology', 'Healthcare', 'Finance', 'Manufacturing', 'Retail'], n_leads),
+        'source': choose(rng, sources, n_leads),
+        'created_date': random_dates(rng, '2023-01-01', 365, n_leads),
+        'status': choose(rng, statuses, n_leads),
+        'assigned_rep_id': choose(rng, sales_reps['sales_rep_id'].to_numpy(dtype=object), n_leads),
+        'value': uniform(rng, 5000, 100000, n_leads, 2)
+    })
+
+def generate_sample_opportunities(n_opportunities, leads, customers, products, sales_reps, rng=None, start=0):
+    """Generate sample opportunities data."""
+
+    rng = make_rng(rng)
+    stages = ['Prospecting', 'Qualification', 'Proposal', 'Negotiation', 'Closed Won', 'Closed Lost']
+
+    created_date = random_dates(rng, '2023-01-01', 365, n_opportunities)
+    return pd.DataFrame({
+        'opportunity_id': sequential_ids('OPP-', start, n_opportunities, 4),
+        'lead_id': choose(rng, leads['lead_id'].to_numpy(dtype=object), n_opportunities),
+        'customer_id': choose(rng, customers['customer_id'].to_numpy(dtype=object), n_opportunities),
+        'product_id': choose(rng, products['product_id'].to_numpy(dtype=object), n_opportunities),
+        'value': uniform(rng, 10000, 200000, n_opportunities, 2),
+        'stage': choose(rng, stages, n_opportunities),
+        'created_date': created_date,
+        'close_date': add_days(created_date, rng.integers(30, 181, n_opportunities)),
+        'probability': choose(rng, [10, 25, 50, 75, 90], n_opportunities).astype(np.int64),
+        'sales_rep_id': choose(rng, sales_reps['sales_rep_id'].to_numpy(dtype=object), n_opportunities)
+    })
+
+def generate_sample_activities(n_activities, sales_reps, customers, rng=None, start=0):
+    """Generate sample activities data."""
+
+    rng = make_rng(rng)
+    activity_types = ['Call', 'Meeting', 'Email', 'Demo', 'Proposal', 'Follow-up']
+    outcomes = ['Positive', 'Neutral', 'Negative', 'Follow-up Required']
+
+    customer_rows = rng.integers(0, len(customers), n_activities)
+    return pd.DataFrame({
+        'activity_id': sequential_ids('ACT-', start, n_activities, 4),
+        'sales_rep_id': choose(rng, sales_reps['sales_rep_id'].to_numpy(dtype=object), n_activities),
+        'customer_id': customers['customer_id'].to_numpy(dtype=object)[customer_rows],
+        'activity_type': choose(rng, activity_types, n_activities),
+        'date': random_dates(rng, '2023-01-01', 365, n_activities),
+        'duration_minutes': rng.integers(15, 121, n_activities),
+        'notes': ('Activity notes for ' + choose(rng, activity_types, n_activities)
+                  + ' with ' + customers['customer_name'].to_numpy(dtype=object)[customer_rows]),
+        'outcome': choose(rng, outcomes, n_activities)
+    })
+
+def generate_sample_targets(n_targets, sales_reps, rng=None):
+    """Generate sample targets data."""
+
+    rng = make_rng(rng)
+    categories = ['Revenue', 'Deals', 'Activities', 'Leads']
+    periods = ['Q1 2024', 'Q2 2024', 'Q3 2024', 'Q4 2024', 'Annual 2024']
+    statuses = ['Active', 'Completed', 'Overdue']
+
+    target_date = pd.to_datetime(pd.DataFrame({
+        'year': np.full(n_targets, 2024),
+        'month': rng.integers(1, 13, n_targets),
+        'day': rng.integers(1, 29, n_targets)
+    })).astype('datetime64[ns]')
+    return pd.DataFrame({
+        'target_id': sequential_ids('TARGET-', 0, n_targets, 3),
+        'sales_rep_id': choose(rng, sales_reps['sales_rep_id'].to_numpy(dtype=object), n_targets),
+        'period': choose(rng, periods, n_targets),
+        'target_amount': uniform(rng, 50000, 500000, n_targets, 2),
+        'target_date': target_date.to_numpy(),
+        'category': choose(rng, categories, n_targets),
+        'status': choose(rng, statuses, n_targets)
+    })
+
+def main():
+    """Write a scaled sales dataset in chunks."""
+    parser = argparse.ArgumentParser(description="Generate sales sample data")
+    parser.add_argument('--rows', type=int, default=SALES_BASE_SIZES['sales_orders'],
+                        help="Sales orders to generate (other fact tables scale linearly, dimensions with sqrt)")
+    parser.add_argument('--format', choices=['parquet', 'xlsx'], default='parquet')
+    parser.add_argument('--output', default=None, help="Output directory (parquet) or workbook (xlsx)")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_GENERATOR_CHUNK_ROWS)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    output = args.output or ('sales_data' if args.format == 'parquet' else 'sales_data.xlsx')
+    start = time.perf_counter()
+    rows = write_sales_dataset(output, args.rows, args.format, args.chunk_rows, args.seed)
+    elapsed = time.perf_counter() - start
+    for table_name in SALES_TABLES:
+        print(f"{table_name}: {rows.get(table_name, 0):,} rows")
+    print(f"✅ Wrote {sum(rows.values()):,} rows to {output} in {elapsed:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,9 @@ import io
 import base64
 from datetime import datetime
 import warnings
+
+# Server-side reduction of large chart series to a point budget
+from chart_reduction import downsample_line, cap_scatter_points
 warnings.filterwarnings('ignore')
 
 # Common color schemes and styling
@@ -360,8 +363,9 @@ def create_bar_chart(data, x_col, y_col, title="Bar Chart", color_col=None):
     )
     return fig
 
-def create_line_chart(data, x_col, y_col, title="Line Chart", color_col=None):
-    """Create a standardized line chart"""
+def create_line_chart(data, x_col, y_col, title="Line Chart", color_col=None, max_points=None):
+    """Create a standardized line chart (each line LTTB-downsampled to the point budget)"""
+    data = downsample_line(data, x_col, y_col, max_points, group_col=color_col)
     fig = px.line(data, x=x_col, y=y_col, color=color_col, title=title, markers=True)
     fig.update_layout(
         plot_bgcolor='rgba(0,0,0,0)',
@@ -380,8 +384,9 @@ def create_pie_chart(data, names_col, values_col, title="Pie Chart"):
     )
     return fig
 
-def create_scatter_chart(data, x_col, y_col, title="Scatter Plot", color_col=None, size_col=None):
-    """Create a standardized scatter plot"""
+def create_scatter_chart(data, x_col, y_col, title="Scatter Plot", color_col=None, size_col=None, max_points=None):
+    """Create a standardized scatter plot (sampled down to the point budget)"""
+    data = cap_scatter_points(data, max_points)
     fig = px.scatter(data, x=x_col, y=y_col, color=color_col, size=size_col, title=title)
     fig.update_layout(
         plot_bgcolor='rgba(0,0,0,0)',
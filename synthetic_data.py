@@ -0,0 +1,60 @@
+import math
+from typing import Iterator, Tuple
+import numpy as np
+import pandas as pd
+
+# Rows generated and written per chunk by the dataset writers
+DEFAULT_GENERATOR_CHUNK_ROWS = 100000
+
+def make_rng(seed=None) -> np.random.Generator:
+    """NumPy generator for a seed (an int, a sequence of ints, or an existing Generator)."""
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+def chunk_rng(seed, chunk_index: int) -> np.random.Generator:
+    """Independent, reproducible generator for one chunk of a chunked dataset."""
+    return np.random.default_rng([0 if seed is None else int(seed), chunk_index])
+
+def scaled_size(base: int, scale: float) -> int:
+    """
+    Size of a dimension table for a dataset scale factor.
+
+    Dimension tables (suppliers, customers, products, ...) grow with the square
+    root of the fact tables, so large datasets keep realistic repeat rates per
+    supplier or customer instead of one order per entity.
+    """
+    return max(base, int(round(base * math.sqrt(max(scale, 0)))))
+
+def sequential_ids(prefix: str, start: int, n: int, width: int = 0) -> np.ndarray:
+    """Ids prefix + (start+1 .. start+n), zero-padded to width digits, as an object array."""
+    numbers = pd.Series(np.arange(start + 1, start + n + 1)).astype(str)
+    if width:
+        numbers = numbers.str.zfill(width)
+    return (prefix + numbers).to_numpy(dtype=object)
+
+def choose(rng: np.random.Generator, options, n: int, p=None) -> np.ndarray:
+    """n values drawn uniformly (or with probabilities p) from options, as an object array."""
+    options = np.asarray(options, dtype=object)
+    if p is None:
+        return options[rng.integers(0, len(options), n)]
+    return options[rng.choice(len(options), n, p=p)]
+
+def random_dates(rng: np.random.Generator, start: str, max_days: int, n: int) -> np.ndarray:
+    """n dates start + randint(0, max_days) days (inclusive), as datetime64[ns]."""
+    return add_days(np.datetime64(start, 'ns'), rng.integers(0, max_days + 1, n))
+
+def add_days(dates, days) -> np.ndarray:
+    """Dates shifted by an integer number of days, as datetime64[ns]."""
+    return np.asarray(dates, dtype='datetime64[ns]') + np.asarray(days, dtype=np.int64).astype('timedelta64[D]')
+
+def uniform(rng: np.random.Generator, low: float, high: float, n: int, decimals=None) -> np.ndarray:
+    """n uniform draws in [low, high), optionally rounded."""
+    values = rng.uniform(low, high, n)
+    return values if decimals is None else np.round(values, decimals)
+
+def iter_chunk_bounds(n_rows: int, chunk_rows: int = DEFAULT_GENERATOR_CHUNK_ROWS) -> Iterator[Tuple[int, int, int]]:
+    """(chunk index, start, stop) for splitting n_rows into chunks of at most chunk_rows."""
+    chunk_rows = max(int(chunk_rows), 1)
+    for chunk_index, start in enumerate(range(0, n_rows, chunk_rows)):
+        yield chunk_index, start, min(start + chunk_rows, n_rows)
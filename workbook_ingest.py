@@ -0,0 +1,157 @@
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+
+# openpyxl's read-only mode streams rows straight from the XLSX archive
+try:
+    from openpyxl import load_workbook
+except ImportError:
+    load_workbook = None
+
+# Column types understood by table schemas (same vocabulary as the department templates)
+SCHEMA_TYPES = ('text', 'number', 'integer', 'date', 'datetime', 'boolean', 'category')
+
+def _column_names(header_row) -> List[str]:
+    """Build column names from a header row the way pandas.read_excel does."""
+    names = []
+    seen = {}
+    for i, value in enumerate(header_row):
+        name = f"Unnamed: {i}" if value is None else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+def _convert_column(values: pd.Series, col_type: str) -> pd.Series:
+    """Convert a parsed column to a schema type, keeping the raw values if conversion would lose data."""
+    if col_type == 'text':
+        return values.map(lambda v: v if pd.isna(v) else str(v)).astype(object)
+    if col_type == 'category':
+        return values.astype('category')
+
+    if col_type in ('number', 'integer'):
+        converted = pd.to_numeric(values, errors='coerce')
+        if col_type == 'integer' and converted.notna().any():
+            whole = converted.dropna()
+            if (whole == whole.round()).all():
+                converted = converted.astype('Int64')
+    elif col_type in ('date', 'datetime'):
+        converted = pd.to_datetime(values, errors='coerce')
+    elif col_type == 'boolean':
+        mapping = {True: True, False: False, 'true': True, 'false': False, 'yes': True, 'no': False, 1: True, 0: False}
+        converted = values.map(lambda v: mapping.get(v.strip().lower() if isinstance(v, str) else v, pd.NA) if pd.notna(v) else pd.NA).astype('boolean')
+    else:
+        return values
+
+    # Never silently turn populated cells into missing values
+    if (converted.isna() & values.notna()).any():
+        return values
+    return converted
+
+def apply_schema(df: pd.DataFrame, schema: Optional[Dict[str, str]]) -> pd.DataFrame:
+    """Apply a {column: type} schema to a DataFrame; unknown columns are left as parsed."""
+    if not schema:
+        return df
+    for col, col_type in schema.items():
+        if col in df.columns:
+            df[col] = _convert_column(df[col], col_type)
+    return df
+
+def _rows_to_frame(rows, schema: Optional[Dict[str, str]]) -> pd.DataFrame:
+    """Turn streamed worksheet rows (header first) into a typed DataFrame."""
+    header = next(rows, None)
+    if header is None:
+        return pd.DataFrame()
+
+    columns = _column_names(header)
+    data = [row for row in rows if any(value is not None for value in row)]
+    width = len(columns)
+    data = [row[:width] + (None,) * (width - len(row)) for row in data]
+
+    df = pd.DataFrame.from_records(data, columns=columns)
+    return apply_schema(df, schema)
+
+def read_workbook(source, sheet_names: Optional[List[str]] = None,
+                  schemas: Optional[Dict[str, Dict[str, str]]] = None) -> Tuple[Dict[str, pd.DataFrame], Dict[str, float]]:
+    """
+    Read every requested sheet of a workbook in a single pass.
+
+    The XLSX archive is opened once in read-only (streaming) mode and each
+    sheet's rows are converted with its optional {column: type} schema.
+    Returns the tables by sheet name and the parse time in seconds per sheet.
+    """
+    schemas = schemas or {}
+    tables = {}
+    timings = {}
+
+    file_name = source if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', '')
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+    if load_workbook is None or str(file_name).lower().endswith('.xls'):
+        # Legacy .xls files (or no openpyxl) go through pandas, still in one call
+        start = time.perf_counter()
+        excel_data = pd.read_excel(source, sheet_name=sheet_names if sheet_names is not None else None)
+        elapsed = time.perf_counter() - start
+        for sheet, df in excel_data.items():
+            tables[sheet] = apply_schema(df, schemas.get(sheet))
+            timings[sheet] = elapsed / max(len(excel_data), 1)
+        return tables, timings
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.sheetnames:
+            if sheet_names is not None and sheet not in sheet_names:
+                continue
+            start = time.perf_counter()
+            rows = workbook[sheet].iter_rows(values_only=True)
+            tables[sheet] = _rows_to_frame(rows, schemas.get(sheet))
+            timings[sheet] = time.perf_counter() - start
+    finally:
+        workbook.close()
+
+    return tables, timings
+
+def read_table_file(source, schema: Optional[Dict[str, str]] = None) -> Tuple[pd.DataFrame, float]:
+    """Read a single-table upload (CSV, or the first sheet of a workbook) with an optional schema."""
+    file_name = source if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', '')
+    start = time.perf_counter()
+
+    if str(file_name).lower().endswith('.csv'):
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        df = apply_schema(pd.read_csv(source), schema)
+        return df, time.perf_counter() - start
+
+    if load_workbook is None or str(file_name).lower().endswith('.xls'):
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        df = apply_schema(pd.read_excel(source), schema)
+        return df, time.perf_counter() - start
+
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        first_sheet = workbook.sheetnames[0]
+        df = _rows_to_frame(workbook[first_sheet].iter_rows(values_only=True), schema)
+    finally:
+        workbook.close()
+
+    return df, time.perf_counter() - start
+
+def format_parse_timings(timings: Dict[str, float], tables: Optional[Dict[str, pd.DataFrame]] = None) -> pd.DataFrame:
+    """Summarize per-sheet parse timings as a table for display."""
+    rows = []
+    for sheet, seconds in timings.items():
+        row_count = len(tables[sheet]) if tables is not None and sheet in tables else None
+        rows.append({
+            'Sheet': sheet,
+            'Rows': row_count,
+            'Parse Time (ms)': round(seconds * 1000, 1)
+        })
+    return pd.DataFrame(rows)